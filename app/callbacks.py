@@ -5,37 +5,113 @@ import os
 import threading
 import time
 from pathlib import Path
-from dash import Input, Output, State, callback_context, html
+from typing import Dict
+from dash import ALL, Input, Output, State, callback_context, html, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-from tkinter import filedialog
-import tkinter as tk
 
+from core.analysis_worker import start_embedded_worker
 from core.file_scanner import FileScanner
-from core.document_processor import DocumentProcessor
-from core.ai_analyzer import AIAnalyzer
 from core.database import DatabaseManager
+from config import config
+from ui.components import create_analytics_figures
 from ui.layouts import create_document_card
+from utils.cache import VersionedCache
+from utils.helpers import split_folder_paths
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Τύποι αρχείων του filter "Εικόνες"
+IMAGE_FILE_TYPES = ['png', 'jpg', 'jpeg']
+
+# Εργασίες που δεν έχουν ολοκληρωθεί (ένα νέο κλικ έναρξης δεν καταχωρεί δεύτερη)
+ACTIVE_JOB_STATUSES = ('queued', 'running', 'watching')
+
+def build_job_params(folder_path, processing_options, file_types) -> Dict:
+    """Παράμετροι εργασίας ανάλυσης από τις επιλογές του UI"""
+    processing_options = processing_options or []
+    file_types = file_types or []
+    
+    # File type mapping
+    extensions = set()
+    if 'pdf' in file_types:
+        extensions.add('.pdf')
+    if 'docx' in file_types:
+        extensions.add('.docx')
+    if 'txt' in file_types:
+        extensions.add('.txt')
+    if 'images' in file_types and 'include_images' in processing_options:
+        extensions.update(['.png', '.jpg', '.jpeg'])
+    
+    return {
+        'folder_paths': split_folder_paths(folder_path, config.FOLDER_SEPARATOR),
+        'recursive': 'recursive' in processing_options,
+        'extensions': sorted(extensions),
+        'detailed_analysis': 'detailed_analysis' in processing_options,
+        'watch': 'watch' in processing_options
+    }
+
 def register_callbacks(app):
     """Εγγραφή όλων των callbacks"""
     
     # Global instances
     file_scanner = FileScanner()
-    doc_processor = DocumentProcessor()
-    ai_analyzer = AIAnalyzer()
     db_manager = DatabaseManager()
     
-    # Processing state
-    processing_state = {
-        'active': False,
-        'thread': None,
-        'progress': 0,
-        'current_file': '',
-        'total_files': 0,
-        'processed_files': 0
+    # Το pipeline (extractors, OCR, LLM client) δημιουργείται στην πρώτη ανάλυση,
+    # ώστε η εκκίνηση του server να μη φορτώνει τις βαριές βιβλιοθήκες
+    pipeline_state = {
+        'pipeline': None,
+        'semantic_search': None,
+        'qa_engine': None,
+        'lock': threading.RLock()
+    }
+    
+    def get_semantic_search():
+        """Το κοινό SemanticSearch (ίδιος index για pipeline και αναζήτηση)"""
+        if not config.EMBEDDING_ENABLED:
+            return None
+        with pipeline_state['lock']:
+            if pipeline_state['semantic_search'] is None:
+                from core.semantic_search import SemanticSearch
+                
+                pipeline_state['semantic_search'] = SemanticSearch(db_manager)
+            return pipeline_state['semantic_search']
+    
+    def get_pipeline():
+        """Το κοινό DocumentPipeline (δημιουργείται μία φορά)"""
+        with pipeline_state['lock']:
+            if pipeline_state['pipeline'] is None:
+                from core.ai_analyzer import AIAnalyzer
+                from core.document_processor import DocumentProcessor
+                from core.pipeline import DocumentPipeline
+                
+                pipeline_state['pipeline'] = DocumentPipeline(DocumentProcessor(), AIAnalyzer(), db_manager,
+                                                              semantic_search=get_semantic_search())
+            return pipeline_state['pipeline']
+    
+    def get_qa_engine():
+        """Το κοινό QAEngine (η cache απαντήσεων μοιράζεται μεταξύ χρηστών)"""
+        with pipeline_state['lock']:
+            if pipeline_state['qa_engine'] is None:
+                from core.qa_engine import QAEngine
+                
+                pipeline_state['qa_engine'] = QAEngine(db_manager, semantic_search=get_semantic_search())
+            return pipeline_state['qa_engine']
+    
+    # Cache γραφημάτων: ακυρώνεται όταν αλλάζει η έκδοση δεδομένων της database
+    analytics_cache = VersionedCache(max_entries=4)
+    analytics_state = {'computed_at': 0.0}
+    
+    # Cache σελίδων αποτελεσμάτων και στατιστικών: το interval ξαναζητά τα ίδια κάθε λίγα
+    # δευτερόλεπτα, και χωρίς νέα δεδομένα απαντιούνται χωρίς queries στη database
+    results_cache = VersionedCache(max_entries=config.RESULTS_CACHE_SIZE)
+    
+    # Validation state: ακύρωση της προηγούμενης εκτίμησης σε κάθε πληκτρολόγηση
+    validation_state = {
+        'cancel_event': None,
+        'lock': threading.Lock()
     }
     
     @app.callback(
@@ -45,20 +121,37 @@ def register_callbacks(app):
     )
     def validate_folder(folder_path):
         """Επικύρωση επιλεγμένου φακέλου"""
-        if not folder_path or not folder_path.strip():
+        folder_paths = split_folder_paths(folder_path, config.FOLDER_SEPARATOR)
+        if not folder_paths:
             return [], True
         
-        validation = file_scanner.validate_directory(folder_path)
+        cancel_event = threading.Event()
+        with validation_state['lock']:
+            if validation_state['cancel_event'] is not None:
+                validation_state['cancel_event'].set()
+            validation_state['cancel_event'] = cancel_event
+        
+        validations = [file_scanner.validate_directory(path, cancel_event=cancel_event)
+                       for path in folder_paths]
         
-        if validation['is_valid']:
+        if cancel_event.is_set():
+            # Νεότερη τιμή του input είναι ήδη σε εξέλιξη
+            raise PreventUpdate
+        
+        if all(validation['is_valid'] for validation in validations):
+            estimated_files = sum(validation['estimated_files'] for validation in validations)
+            truncated = any(validation['estimate_truncated'] for validation in validations)
+            count_label = f"≥{estimated_files}" if truncated else str(estimated_files)
+            label = "Έγκυρος φάκελος" if len(validations) == 1 else f"{len(validations)} έγκυροι φάκελοι"
             return [
                 dbc.Alert([
                     html.I(className="fas fa-check-circle me-2"),
-                    f"Έγκυρος φάκελος ({validation['estimated_files']} εκτιμώμενα αρχεία)"
+                    f"{label} ({count_label} εκτιμώμενα αρχεία)"
                 ], color="success", className="py-2")
             ], False
         else:
-            warnings = validation.get('warnings', ['Μη έγκυρος φάκελος'])
+            warnings = [warning for validation in validations
+                        for warning in validation.get('warnings', [])] or ['Μη έγκυρος φάκελος']
             return [
                 dbc.Alert([
                     html.I(className="fas fa-exclamation-triangle me-2"),
@@ -75,6 +168,9 @@ def register_callbacks(app):
         """Άνοιγμα dialog επιλογής φακέλου"""
         if n_clicks > 0:
             try:
+                import tkinter as tk
+                from tkinter import filedialog
+                
                 # Create hidden tkinter window
                 root = tk.Tk()
                 root.withdraw()
@@ -99,172 +195,139 @@ def register_callbacks(app):
         Output('refresh-interval', 'disabled'),
         Output('start-analysis-btn', 'children'),
         Output('stop-analysis-btn', 'disabled'),
+        Output('analysis-job-store', 'data'),
         Input('start-analysis-btn', 'n_clicks'),
         Input('stop-analysis-btn', 'n_clicks'),
         State('folder-path-input', 'value'),
         State('processing-options', 'value'),
         State('file-types', 'value'),
+        State('analysis-job-store', 'data'),
         prevent_initial_call=True
     )
-    def handle_analysis_control(start_clicks, stop_clicks, folder_path, processing_options, file_types):
-        """Διαχείριση έναρξης/διακοπής ανάλυσης"""
+    def handle_analysis_control(start_clicks, stop_clicks, folder_path, processing_options, file_types, job_id):
+        """Διαχείριση έναρξης/διακοπής ανάλυσης (εργασίες στην ουρά της database)"""
         ctx = callback_context
         
         if not ctx.triggered:
-            return {'display': 'none'}, True, [html.I(className="fas fa-play me-2"), "Έναρξη Ανάλυσης"], True
+            return {'display': 'none'}, True, [html.I(className="fas fa-play me-2"), "Έναρξη Ανάλυσης"], True, job_id
         
         button_id = ctx.triggered[0]['prop_id'].split('.')[0]
         
         if button_id == 'start-analysis-btn' and start_clicks:
-            # Έναρξη ανάλυσης
-            if not processing_state['active']:
-                processing_state['active'] = True
-                processing_state['progress'] = 0
-                
-                # Start analysis in background thread
-                thread = threading.Thread(
-                    target=run_analysis,
-                    args=(folder_path, processing_options, file_types)
-                )
-                thread.daemon = True
-                thread.start()
-                processing_state['thread'] = thread
-                
-                return (
-                    {'display': 'flex'},  # Show loading overlay
-                    False,  # Enable refresh interval
-                    [html.I(className="fas fa-spinner fa-spin me-2"), "Επεξεργασία..."],
-                    False  # Enable stop button
-                )
+            # Έναρξη ανάλυσης: η εργασία εκτελείται από worker (ξεχωριστό process ή EMBEDDED_WORKER)
+            # Με ενεργή εργασία δεν μπαίνει νέα στην ουρά: επιστροφή στην πρόοδο της τρέχουσας
+            job = db_manager.get_analysis_job(job_id) if job_id else None
+            if job is None or job['status'] not in ACTIVE_JOB_STATUSES:
+                params = build_job_params(folder_path, processing_options, file_types)
+                job_id = db_manager.enqueue_analysis_job(params)
+                logger.info(f"Εργασία ανάλυσης {job_id}: {folder_path}")
+                if config.EMBEDDED_WORKER:
+                    start_embedded_worker(get_pipeline)
+            
+            return (
+                {'display': 'flex'},  # Show loading overlay
+                False,  # Enable refresh interval
+                [html.I(className="fas fa-spinner fa-spin me-2"), "Επεξεργασία..."],
+                False,  # Enable stop button
+                job_id
+            )
         
         elif button_id == 'stop-analysis-btn' and stop_clicks:
-            # Διακοπή ανάλυσης
-            processing_state['active'] = False
+            # Διακοπή ανάλυσης (και παρακολούθησης φακέλων) από τον worker της εργασίας
+            db_manager.cancel_analysis_jobs(job_id)
             
             return (
                 {'display': 'none'},  # Hide loading overlay
                 True,  # Disable refresh interval
                 [html.I(className="fas fa-play me-2"), "Έναρξη Ανάλυσης"],
-                True  # Disable stop button
+                True,  # Disable stop button
+                job_id
             )
         
-        return {'display': 'none'}, True, [html.I(className="fas fa-play me-2"), "Έναρξη Ανάλυσης"], True
-    
-    def run_analysis(folder_path, processing_options, file_types):
-        """Εκτέλεση ανάλυσης σε background thread"""
-        try:
-            logger.info(f"Έναρξη ανάλυσης φακέλου: {folder_path}")
-            
-            # Configuration based on user selections
-            recursive = 'recursive' in processing_options
-            include_images = 'include_images' in processing_options
-            detailed_analysis = 'detailed_analysis' in processing_options
-            
-            # File type mapping
-            extensions = set()
-            if 'pdf' in file_types:
-                extensions.add('.pdf')
-            if 'docx' in file_types:
-                extensions.add('.docx')
-            if 'txt' in file_types:
-                extensions.add('.txt')
-            if 'images' in file_types and include_images:
-                extensions.update(['.png', '.jpg', '.jpeg'])
-            
-            # Temporarily update scanner supported formats
-            original_formats = file_scanner.supported_formats
-            file_scanner.supported_formats = extensions
-            
-            # Scan files
-            files = list(file_scanner.scan_directory(folder_path, recursive))
-            processing_state['total_files'] = len(files)
-            processing_state['processed_files'] = 0
-            
-            logger.info(f"Βρέθηκαν {len(files)} αρχεία για επεξεργασία")
-            
-            for i, file_info in enumerate(files):
-                if not processing_state['active']:  # Check if stopped
-                    break
-                
-                processing_state['current_file'] = file_info['filename']
-                processing_state['progress'] = int((i / len(files)) * 100)
-                
-                try:
-                    # Add document to database
-                    doc_id = db_manager.add_document(
-                        filepath=file_info['filepath'],
-                        filename=file_info['filename'],
-                        file_size=file_info['file_size'],
-                        file_type=file_info['file_extension'][1:]  # Remove dot
-                    )
-                    
-                    # Update status to processing
-                    db_manager.update_document_status(doc_id, 'processing')
-                    
-                    # Process document
-                    logger.info(f"Επεξεργασία: {file_info['filename']}")
-                    doc_result = doc_processor.process_document(file_info)
-                    
-                    if not doc_result['success']:
-                        db_manager.update_document_status(doc_id, 'failed', doc_result['error'])
-                        continue
-                    
-                    # Add chunks to database
-                    db_manager.add_document_chunks(doc_id, doc_result['chunks'])
-                    
-                    # AI Analysis
-                    if detailed_analysis:
-                        ai_result = ai_analyzer.analyze_document(doc_id, doc_result['chunks'])
-                    else:
-                        # Quick analysis with fewer features
-                        combined_text = '\n\n'.join(doc_result['chunks'][:3])  # First 3 chunks only
-                        ai_result = ai_analyzer.analyze_document(doc_id, [combined_text])
-                    
-                    if ai_result['success']:
-                        logger.info(f"Ολοκληρώθηκε: {file_info['filename']}")
-                    else:
-                        logger.warning(f"Αποτυχία AI ανάλυσης: {file_info['filename']}")
-                    
-                except Exception as e:
-                    logger.error(f"Σφάλμα επεξεργασίας {file_info['filename']}: {e}")
-                    if 'doc_id' in locals():
-                        db_manager.update_document_status(doc_id, 'failed', str(e))
-                
-                processing_state['processed_files'] += 1
-                time.sleep(0.1)  # Small delay to prevent overwhelming
-            
-            # Restore original formats
-            file_scanner.supported_formats = original_formats
-            
-            logger.info(f"Ανάλυση ολοκληρώθηκε. Επεξεργάστηκαν {processing_state['processed_files']}/{processing_state['total_files']} αρχεία")
-            
-        except Exception as e:
-            logger.error(f"Σφάλμα ανάλυσης: {e}")
-        finally:
-            processing_state['active'] = False
-            processing_state['progress'] = 100
+        return {'display': 'none'}, True, [html.I(className="fas fa-play me-2"), "Έναρξη Ανάλυσης"], True, job_id
     
     @app.callback(
         Output('progress-bar', 'value'),
         Output('progress-text', 'children'),
         Input('refresh-interval', 'n_intervals'),
+        State('analysis-job-store', 'data'),
         prevent_initial_call=True
     )
-    def update_progress(n_intervals):
-        """Ενημέρωση progress bar"""
-        if processing_state['active']:
-            current_file = processing_state.get('current_file', '')
-            processed = processing_state.get('processed_files', 0)
-            total = processing_state.get('total_files', 0)
-            
+    def update_progress(n_intervals, job_id):
+        """Ενημέρωση progress bar από την πρόοδο της εργασίας στη database"""
+        job = db_manager.get_analysis_job(job_id) if job_id else None
+        if job is None:
+            return 0, "Αναμονή..."
+        
+        processed, total = job['processed_files'], job['total_files']
+        if job['status'] == 'queued':
+            return 0, "Αναμονή για worker..."
+        if job['status'] in ('running', 'watching'):
+            current_file = job['current_file'] or ''
             if current_file:
                 text = f"Επεξεργασία: {current_file[:30]}... ({processed}/{total})"
+            elif job['status'] == 'watching':
+                text = f"Παρακολούθηση φακέλων... ({processed}/{total})"
             else:
                 text = f"Επεξεργασία αρχείων... ({processed}/{total})"
             
-            return processing_state['progress'], text
+            return int((processed / total) * 100) if total else 0, text
+        if job['status'] == 'completed':
+            return 100, f"Ολοκληρώθηκε ({processed}/{total})"
+        if job['status'] == 'failed':
+            return 0, f"Σφάλμα: {job['error_message']}"
+        return 0, "Αναμονή..."
+    
+    def load_results(query, search_mode, similar_to, status_filter, type_filter, sort_by, page):
+        """Μία σελίδα αποτελεσμάτων: κατάταξη (αν υπάρχει αναζήτηση) και joined query με τις αναλύσεις"""
+        # Κατάταξη: σημασιολογική (παρόμοια έγγραφα ή query), full-text ή υβριδική
+        semantic_search = get_semantic_search()
+        ranking, semantic_ranking = None, False
+        if semantic_search is not None and (similar_to or (query and search_mode == 'semantic')):
+            ranking = (semantic_search.similar_documents(similar_to) if similar_to
+                       else semantic_search.search(query))
+            semantic_ranking = True
+        elif query:
+            semantic_matches = None
+            if search_mode == 'hybrid' and semantic_search is not None:
+                semantic_matches = semantic_search.search(query, top_k=config.SEARCH_CANDIDATES)
+            ranking = db_manager.hybrid_search(query, semantic_matches=semantic_matches)['results']
+        
+        # Filters, ταξινόμηση και σελίδα στη database (τα αποτελέσματα αναζήτησης κρατούν τη σειρά κατάταξης)
+        if type_filter == 'images':
+            file_types = IMAGE_FILE_TYPES
         else:
-            return 0, "Αναμονή..."
+            file_types = [type_filter] if type_filter != 'all' else None
+        
+        def query_page(page_number):
+            return db_manager.query_documents(
+                status=status_filter if status_filter != 'all' else None,
+                file_types=file_types,
+                sort_by=sort_by,
+                document_ids=[match['document_id'] for match in ranking] if ranking is not None else None,
+                limit=config.ITEMS_PER_PAGE,
+                offset=(page_number - 1) * config.ITEMS_PER_PAGE
+            )
+        
+        result = query_page(page)
+        pages = max(1, -(-result['total'] // config.ITEMS_PER_PAGE))
+        if page > pages:
+            # Λιγότερα αποτελέσματα από πριν (π.χ. άλλα filters): η τελευταία σελίδα
+            page = pages
+            result = query_page(page)
+        
+        documents = result['documents']
+        if ranking is not None:
+            matches = {match['document_id']: match for match in ranking}
+            for doc in documents:
+                match = matches.get(doc['id'], {})
+                if semantic_ranking:
+                    doc['similarity'] = match.get('score')
+                else:
+                    doc['snippet'] = match.get('snippet')
+                    doc['highlights'] = match.get('highlights', [])
+        
+        return {'documents': documents, 'page': page, 'pages': pages}
     
     @app.callback(
         Output('results-container', 'children'),
@@ -272,53 +335,48 @@ def register_callbacks(app):
         Output('processed-docs-stat', 'children'),
         Output('processing-docs-stat', 'children'),
         Output('success-rate-stat', 'children'),
+        Output('results-page', 'active_page'),
+        Output('results-page', 'max_value'),
+        Output('pagination-container', 'style'),
+        Output('results-key-store', 'data'),
         [Input('refresh-interval', 'n_intervals'),
          Input('refresh-btn', 'n_clicks'),
-         Input('search-btn', 'n_clicks')],
+         Input('search-btn', 'n_clicks'),
+         Input('similar-store', 'data'),
+         Input('results-page', 'active_page')],
         [State('search-input', 'value'),
+         State('search-mode', 'value'),
          State('status-filter', 'value'),
          State('type-filter', 'value'),
-         State('sort-by', 'value')],
+         State('sort-by', 'value'),
+         State('results-key-store', 'data')],
         prevent_initial_call=True
     )
-    def update_results(n_intervals, refresh_clicks, search_clicks, search_query, status_filter, type_filter, sort_by):
+    def update_results(n_intervals, refresh_clicks, search_clicks, similar_to, active_page, search_query,
+                       search_mode, status_filter, type_filter, sort_by, current_key):
         """Ενημέρωση αποτελεσμάτων και στατιστικών"""
         try:
-            # Get documents from database
-            if search_query and search_query.strip():
-                documents = db_manager.search_documents(search_query.strip())
-            else:
-                documents = db_manager.get_documents()
-            
-            # Apply filters
-            if status_filter != 'all':
-                documents = [doc for doc in documents if doc['status'] == status_filter]
-            
-            if type_filter != 'all':
-                documents = [doc for doc in documents if doc['file_type'] == type_filter]
+            triggered = callback_context.triggered_id
+            # Νέα αναζήτηση: από την πρώτη σελίδα
+            page = 1 if triggered in ('search-btn', 'similar-store') else max(1, active_page or 1)
+            query = (search_query or '').strip()
             
-            # Sort documents
-            if sort_by == 'date_desc':
-                documents.sort(key=lambda x: x['created_at'], reverse=True)
-            elif sort_by == 'date_asc':
-                documents.sort(key=lambda x: x['created_at'])
-            elif sort_by == 'name_asc':
-                documents.sort(key=lambda x: x['filename'].lower())
-            elif sort_by == 'name_desc':
-                documents.sort(key=lambda x: x['filename'].lower(), reverse=True)
-            elif sort_by == 'size_desc':
-                documents.sort(key=lambda x: x['file_size'], reverse=True)
+            # Σελίδες και στατιστικά από την cache όσο δεν αλλάζει η έκδοση δεδομένων
+            data_version = db_manager.get_data_version()
+            key = (query, search_mode, similar_to, status_filter, type_filter, sort_by, page)
+            results_key = [*key, data_version]
+            if triggered == 'refresh-interval' and results_key == current_key:
+                raise PreventUpdate
             
-            # Get enhanced document data (with analysis results)
-            enhanced_docs = []
-            for doc in documents:
-                enhanced_doc = db_manager.get_document_with_analysis(doc['id'])
-                if enhanced_doc:
-                    enhanced_docs.append(enhanced_doc)
+            results = results_cache.get_or_compute(
+                key, data_version,
+                lambda: load_results(query, search_mode, similar_to, status_filter, type_filter, sort_by, page)
+            )
+            stats = results_cache.get_or_compute('statistics', data_version, db_manager.get_statistics)
             
             # Create result cards
-            if enhanced_docs:
-                result_cards = [create_document_card(doc) for doc in enhanced_docs]
+            if results['documents']:
+                result_cards = [create_document_card(doc) for doc in results['documents']]
             else:
                 result_cards = [
                     html.Div([
@@ -329,24 +387,26 @@ def register_callbacks(app):
                     ], className="text-center py-5")
                 ]
             
-            # Calculate statistics
-            all_docs = db_manager.get_documents()
-            stats = db_manager.get_statistics()
-            
-            total_docs = len(all_docs)
-            completed_docs = len([doc for doc in all_docs if doc['status'] == 'completed'])
-            processing_docs = len([doc for doc in all_docs if doc['status'] == 'processing'])
-            
-            success_rate = (completed_docs / total_docs * 100) if total_docs > 0 else 0
+            # Statistics από τους προϋπολογισμένους counters
+            total_docs = stats['total_documents']
+            completed_docs = stats['by_status'].get('completed', 0)
+            processing_docs = stats['by_status'].get('processing', 0)
+            success_rate = stats['success_rate']
             
             return (
                 result_cards,
                 str(total_docs),
                 str(completed_docs),
                 str(processing_docs),
-                f"{success_rate:.1f}%"
+                f"{success_rate:.1f}%",
+                results['page'],
+                results['pages'],
+                {'display': 'flex'} if results['pages'] > 1 else {'display': 'none'},
+                [*key[:-1], results['page'], data_version]
             )
             
+        except PreventUpdate:
+            raise
         except Exception as e:
             logger.error(f"Σφάλμα ενημέρωσης αποτελεσμάτων: {e}")
             return [
@@ -354,4 +414,140 @@ def register_callbacks(app):
                     html.I(className="fas fa-exclamation-triangle me-2"),
                     f"Σφάλμα φόρτωσης δεδομένων: {str(e)}"
                 ], color="danger")
-            ], "0", "0", "0", "0%"
+            ], "0", "0", "0", "0%", no_update, no_update, no_update, None
+    
+    @app.callback(
+        Output('similar-store', 'data'),
+        Input({'type': 'similar-btn', 'index': ALL}, 'n_clicks'),
+        Input('search-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def select_similar(similar_clicks, search_clicks):
+        """Έγγραφο αναφοράς για τα "Παρόμοια" (μια νέα αναζήτηση το καθαρίζει)"""
+        triggered = callback_context.triggered_id
+        if triggered == 'search-btn':
+            return None
+        # Νέα cards (κάθε ανανέωση) εμφανίζονται με n_clicks=None
+        if not callback_context.triggered or not callback_context.triggered[0]['value']:
+            raise PreventUpdate
+        return triggered['index']
+    
+    def run_question(answer_id, question):
+        """
+        Κατανάλωση της απάντησης (stream) σε background thread
+        
+        Η απάντηση γράφεται στη database ανά QA_FLUSH_INTERVAL, οπότε την
+        ανανέωση μπορεί να την εξυπηρετήσει οποιοδήποτε process του server.
+        """
+        answer, flushed_at = '', 0.0
+        try:
+            for event in get_qa_engine().ask_stream(question):
+                if event['type'] == 'sources':
+                    db_manager.update_qa_answer(answer_id, sources=event['sources'])
+                elif event['type'] == 'token':
+                    answer += event['content']
+                    if time.monotonic() - flushed_at >= config.QA_FLUSH_INTERVAL:
+                        db_manager.update_qa_answer(answer_id, answer=answer)
+                        flushed_at = time.monotonic()
+                else:
+                    db_manager.update_qa_answer(
+                        answer_id, answer=event['answer'],
+                        citations=[source['ref'] for source in event['citations']],
+                        status='completed' if event['success'] else 'failed',
+                        error_message=event['error']
+                    )
+        except Exception as e:
+            logger.error(f"Σφάλμα απάντησης ερώτησης: {str(e)}")
+            db_manager.update_qa_answer(answer_id, status='failed', error_message=str(e))
+    
+    def render_answer(answer_id):
+        """Απάντηση, πηγές (όσες αναφέρθηκαν τονίζονται) και αν συνεχίζεται η παραγωγή"""
+        row = db_manager.get_qa_answer(answer_id)
+        if row is None:
+            raise PreventUpdate
+        answer, sources, citations = row['answer'], row['sources'], set(row['citations'])
+        error, active = row['error_message'], row['status'] == 'running'
+        
+        if error:
+            answer_children = dbc.Alert([
+                html.I(className="fas fa-exclamation-triangle me-2"),
+                f"Σφάλμα: {error}"
+            ], color="danger", className="mb-0")
+        elif answer:
+            answer_children = answer + (" ▍" if active else "")
+        else:
+            answer_children = html.Span("Αναζήτηση πηγών...", className="text-muted")
+        
+        source_items = [
+            html.Small([
+                html.Strong(f"[{source['ref']}] ") if source['ref'] in citations else f"[{source['ref']}] ",
+                f"{source['filename']} (έγγραφο #{source['document_id']})"
+            ], className="d-block " + ("text-primary" if source['ref'] in citations else "text-muted"))
+            for source in sources
+        ]
+        return answer_children, source_items, active
+    
+    @app.callback(
+        Output('qa-answer', 'children'),
+        Output('qa-sources', 'children'),
+        Output('qa-interval', 'disabled'),
+        Output('qa-ask-btn', 'disabled'),
+        Output('qa-answer-store', 'data'),
+        Input('qa-ask-btn', 'n_clicks'),
+        Input('qa-question', 'n_submit'),
+        Input('qa-interval', 'n_intervals'),
+        State('qa-question', 'value'),
+        State('qa-answer-store', 'data'),
+        prevent_initial_call=True
+    )
+    def handle_question(ask_clicks, question_submits, n_intervals, question, answer_id):
+        """Έναρξη ερώτησης και ανανέωση της απάντησης όσο παράγεται"""
+        if callback_context.triggered_id != 'qa-interval':
+            if not question or not question.strip():
+                raise PreventUpdate
+            current = db_manager.get_qa_answer(answer_id) if answer_id else None
+            if current is not None and current['status'] == 'running':
+                raise PreventUpdate
+            answer_id = db_manager.create_qa_answer(question)
+            threading.Thread(target=run_question, args=(answer_id, question), daemon=True).start()
+        elif not answer_id:
+            raise PreventUpdate
+        
+        answer, sources, active = render_answer(answer_id)
+        return answer, sources, not active, active, answer_id
+    
+    @app.callback(
+        Output('processing-time-graph', 'figure'),
+        Output('throughput-graph', 'figure'),
+        Output('categories-graph', 'figure'),
+        Output('sentiment-graph', 'figure'),
+        Output('failures-graph', 'figure'),
+        Output('analytics-version-store', 'data'),
+        Input('analytics-interval', 'n_intervals'),
+        Input('refresh-btn', 'n_clicks'),
+        State('analytics-version-store', 'data')
+    )
+    def update_analytics(n_intervals, refresh_clicks, current_version):
+        """Ενημέρωση γραφημάτων analytics μόνο όταν άλλαξαν τα δεδομένα"""
+        data_version = db_manager.get_data_version()
+        if data_version == current_version:
+            raise PreventUpdate
+        
+        # Κατά τη μαζική επεξεργασία η έκδοση αλλάζει συνεχώς: όριο συχνότητας επανυπολογισμού
+        if current_version is not None and time.time() - analytics_state['computed_at'] < config.ANALYTICS_MIN_REFRESH:
+            raise PreventUpdate
+        analytics_state['computed_at'] = time.time()
+        
+        figures = analytics_cache.get_or_compute(
+            'analytics', data_version,
+            lambda: create_analytics_figures(db_manager.get_analytics())
+        )
+        
+        return (
+            figures['processing_time'],
+            figures['throughput'],
+            figures['categories'],
+            figures['sentiment'],
+            figures['failures'],
+            data_version
+        )
@@ -147,6 +147,10 @@ def create_app():
     from app.callbacks import register_callbacks
     register_callbacks(app)
     
+    # Routes του Flask server (exports)
+    from app.routes import register_routes
+    register_routes(app.server)
+    
     logger.info("Dash εφαρμογή δημιουργήθηκε επιτυχώς")
     
     return app
@@ -0,0 +1,66 @@
+"""
+Flask Routes (εκτός Dash callbacks) για AI Document Analyzer
+"""
+import tempfile
+from pathlib import Path
+from flask import Response, abort, after_this_request, request, send_file
+from core.exporter import EXPORT_FORMATS, PYARROW_AVAILABLE, DocumentExporter
+from utils.logger import setup_logger
+from utils.metrics import render_metrics
+
+logger = setup_logger()
+
+_MIMETYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+def register_routes(server):
+    """Εγγραφή routes στον Flask server του Dash"""
+    exporter = DocumentExporter()
+    
+    @server.route('/metrics')
+    def metrics():
+        """Metrics σε Prometheus text format"""
+        return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    
+    @server.route('/export/<fmt>')
+    def export_results(fmt):
+        """Download αποτελεσμάτων ανάλυσης (streaming για CSV/JSONL)"""
+        if fmt not in EXPORT_FORMATS:
+            abort(404)
+        
+        include_chunks = request.args.get('chunks') == '1'
+        since_analysis_id = request.args.get('since', default=0, type=int)
+        filename = f"analysis_results.{fmt}"
+        
+        if fmt == 'parquet':
+            if not PYARROW_AVAILABLE:
+                return Response("Το export σε Parquet απαιτεί το πακέτο pyarrow", status=501,
+                                content_type='text/plain; charset=utf-8')
+            
+            # Το Parquet γράφεται σε προσωρινό αρχείο (footer στο τέλος)
+            temp_dir = Path(tempfile.mkdtemp(prefix='export_'))
+            output_path = temp_dir / filename
+            result = exporter.export(str(output_path), fmt, since_analysis_id=since_analysis_id,
+                                     include_chunks=include_chunks)
+            if not result['success']:
+                logger.error(f"Αποτυχία export {fmt}: {result['error']}")
+                return Response(result['error'], status=500, content_type='text/plain; charset=utf-8')
+            
+            @after_this_request
+            def cleanup(response):
+                try:
+                    output_path.unlink(missing_ok=True)
+                    temp_dir.rmdir()
+                except OSError:
+                    pass
+                return response
+            
+            return send_file(str(output_path), mimetype=_MIMETYPES[fmt],
+                             as_attachment=True, download_name=filename)
+        
+        stream = exporter.stream(fmt, since_analysis_id=since_analysis_id, include_chunks=include_chunks)
+        return Response(stream, content_type=_MIMETYPES[fmt],
+                        headers={'Content-Disposition': f'attachment; filename="{filename}"'})
@@ -0,0 +1,97 @@
+"""
+Benchmark αποθήκευσης chunks: μέγεθος database και latency ανάγνωσης ανά συμπίεση
+
+Χρήση:
+    python -m benchmarks.bench_chunk_storage [--documents 500] [--chunks 8] [--modes none zlib zstd]
+    python -m benchmarks.bench_chunk_storage --database data/database/documents.db
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import generate_chunk
+from core.chunk_codec import ChunkCodec, ZSTD_AVAILABLE
+from core.database import DatabaseManager
+
+def benchmark_mode(mode: str, documents, reads: int) -> dict:
+    """Εισαγωγή όλων των εγγράφων σε νέα database και μέτρηση"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_manager = DatabaseManager(db_path=Path(temp_dir) / "bench.db")
+        db_manager.chunk_codec = ChunkCodec(algorithm=mode, dict_loader=db_manager._load_compression_dict)
+        db_manager.initialize_database()
+        
+        start = time.perf_counter()
+        document_ids = []
+        for i, chunks in enumerate(documents):
+            doc_id = db_manager.add_document(f"/bench/doc_{i}.txt", f"doc_{i}.txt", 0, 'txt')
+            db_manager.add_document_chunks(doc_id, chunks)
+            document_ids.append(doc_id)
+        insert_seconds = time.perf_counter() - start
+        
+        with db_manager.get_connection() as conn:
+            conn.execute("VACUUM")
+        
+        rng = random.Random(1)
+        latencies = []
+        for _ in range(reads):
+            doc_id = rng.choice(document_ids)
+            start = time.perf_counter()
+            db_manager.get_document_chunks(doc_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        db_manager.search_documents("χρονοδιάγραμμα προϋπολογισμός")
+        search_ms = (time.perf_counter() - start) * 1000
+        
+        report = db_manager.get_chunk_storage_report()
+        latencies.sort()
+        return {
+            'mode': db_manager.chunk_codec.algorithm,
+            'dictionary': db_manager.chunk_codec.active_dict_id is not None,
+            'database_bytes': report['database_bytes'],
+            'raw_bytes': report['raw_bytes'],
+            'stored_bytes': report['stored_bytes'],
+            'ratio': report['ratio'],
+            'insert_seconds': round(insert_seconds, 3),
+            'read_p50_ms': round(statistics.median(latencies), 3),
+            'read_p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 3),
+            'search_ms': round(search_ms, 2)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark αποθήκευσης chunks")
+    parser.add_argument('--documents', type=int, default=500)
+    parser.add_argument('--chunks', type=int, default=8, help="Chunks ανά έγγραφο")
+    parser.add_argument('--words', type=int, default=300, help="Λέξεις ανά chunk")
+    parser.add_argument('--reads', type=int, default=500, help="Αναγνώσεις εγγράφων για latency")
+    parser.add_argument('--modes', nargs='+', default=['none', 'zlib'] + (['zstd'] if ZSTD_AVAILABLE else []))
+    parser.add_argument('--database', help="Αναφορά για υπάρχουσα database αντί για benchmark")
+    args = parser.parse_args()
+    
+    if args.database:
+        print(json.dumps(DatabaseManager(db_path=Path(args.database)).get_chunk_storage_report(),
+                         ensure_ascii=False, indent=2))
+        return
+    
+    rng = random.Random(42)
+    documents = [[generate_chunk(rng, args.words) for _ in range(args.chunks)]
+                 for _ in range(args.documents)]
+    
+    results = [benchmark_mode(mode, documents, args.reads) for mode in args.modes]
+    
+    for result in results:
+        print(f"{result['mode']:>5}: {result['database_bytes'] / 1024 / 1024:8.2f} MB "
+              f"(ratio {result['ratio']}), ανάγνωση p50 {result['read_p50_ms']} ms, "
+              f"p95 {result['read_p95_ms']} ms, αναζήτηση {result['search_ms']} ms")
+    
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark εκκίνησης: χρόνος imports (-X importtime) και χρόνος έως την πρώτη HTTP απάντηση
+
+Ο έλεγχος budget αποτυγχάνει (exit code 1) αν τα imports της εκκίνησης
+ξεπεράσουν το όριο ή αν φορτωθεί κάποιο από τα βαριά modules που πρέπει
+να φορτώνονται μόνο όταν χρειαστούν (OCR, PDF, DOCX, LLM client).
+
+Χρήση:
+    python -m benchmarks.bench_import_time [--budget-ms 1500] [--top 20] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules που δεν πρέπει να φορτώνονται κατά την εκκίνηση του server
+# (το requests δεν περιλαμβάνεται: το φορτώνει ήδη το ίδιο το dash)
+LAZY_MODULES = ['pytesseract', 'pandas', 'PyPDF2', 'pypdfium2', 'pdfminer', 'docx', 'PIL',
+                'tkinter', 'numpy', 'pyarrow', 'core.document_processor', 'core.ai_analyzer',
+                'core.pipeline', 'models.llama_client']
+
+# Εκκίνηση όπως στο main.py, χωρίς app.run
+_STARTUP_CODE = """
+from main import initialize_app
+from app.dash_app import create_app
+initialize_app()
+create_app()
+"""
+
+# Εκκίνηση server σε δοσμένη θύρα (χωρίς debug reloader, που διπλασιάζει την εκκίνηση)
+_SERVER_CODE = """
+import sys
+from main import initialize_app
+from app.dash_app import create_app
+initialize_app()
+create_app().run(debug=False, host='127.0.0.1', port=int(sys.argv[1]))
+"""
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = str(PROJECT_ROOT) + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Γραμμές 'import time: self | cumulative | module' σε dicts (μs)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        name = parts[2]
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1])
+        })
+    return modules
+
+def measure_imports() -> Dict:
+    """Μία εκκίνηση με -X importtime σε νέο process"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _STARTUP_CODE],
+                            cwd=PROJECT_ROOT, env=_environment(), capture_output=True,
+                            text=True, timeout=120)
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Η εκκίνηση απέτυχε:\n{result.stderr[-2000:]}")
+    
+    modules = parse_importtime(result.stderr)
+    top_level = [module for module in modules if module['depth'] == 0]
+    loaded = {module['module'] for module in modules}
+    return {
+        'wall_ms': round(wall_seconds * 1000, 1),
+        'import_ms': round(sum(module['cumulative_us'] for module in top_level) / 1000, 1),
+        'modules': modules,
+        'lazy_violations': sorted(name for name in LAZY_MODULES if name in loaded)
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def measure_first_response(timeout: float = 60.0) -> float:
+    """Seconds από την εκκίνηση του process έως την πρώτη απάντηση στο /"""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', _SERVER_CODE, str(port)], cwd=PROJECT_ROOT,
+                               env=_environment(), stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Ο server τερμάτισε με κωδικό {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"Καμία απάντηση μέσα σε {timeout}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark εκκίνησης")
+    parser.add_argument('--repeat', type=int, default=3, help="Επαναλήψεις (κρατείται η διάμεσος)")
+    parser.add_argument('--top', type=int, default=20, help="Πιο αργά modules στην αναφορά")
+    parser.add_argument('--budget-ms', type=float, default=1500.0,
+                        help="Μέγιστος χρόνος imports εκκίνησης (ms)")
+    parser.add_argument('--no-server', action='store_true', help="Χωρίς μέτρηση πρώτης HTTP απάντησης")
+    args = parser.parse_args()
+    
+    runs = [measure_imports() for _ in range(args.repeat)]
+    first_responses = [] if args.no_server else [measure_first_response() for _ in range(args.repeat)]
+    
+    median_run = sorted(runs, key=lambda run: run['import_ms'])[len(runs) // 2]
+    slowest = sorted((module for module in median_run['modules'] if module['depth'] <= 1),
+                     key=lambda module: module['cumulative_us'], reverse=True)[:args.top]
+    
+    report = {
+        'import_ms': statistics.median(run['import_ms'] for run in runs),
+        'startup_wall_ms': statistics.median(run['wall_ms'] for run in runs),
+        'first_response_ms': (round(statistics.median(first_responses) * 1000, 1)
+                              if first_responses else None),
+        'budget_ms': args.budget_ms,
+        'lazy_violations': median_run['lazy_violations'],
+        'slowest_modules': [{'module': module['module'],
+                             'cumulative_ms': round(module['cumulative_us'] / 1000, 1)}
+                            for module in slowest]
+    }
+    
+    for module in report['slowest_modules']:
+        print(f"{module['cumulative_ms']:>9.1f} ms  {module['module']}", file=sys.stderr)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    
+    failures = []
+    if report['import_ms'] > args.budget_ms:
+        failures.append(f"imports εκκίνησης {report['import_ms']} ms > budget {args.budget_ms} ms")
+    if report['lazy_violations']:
+        failures.append(f"φορτώθηκαν στην εκκίνηση: {', '.join(report['lazy_violations'])}")
+    for failure in failures:
+        print(f"ΑΠΟΤΥΧΙΑ: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
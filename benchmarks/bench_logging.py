@@ -0,0 +1,150 @@
+"""
+Benchmark logging: κόστος ανά έγγραφο για τα μηνύματα του hot path
+
+Κάθε "έγγραφο" εκπέμπει τα ίδια μηνύματα με το pipeline (pipeline, extract,
+analyze, llm) από πολλά threads ταυτόχρονα. Μετριέται ο χρόνος logging ανά
+έγγραφο (συνολικός χρόνος / έγγραφα) και το p99 μιας κλήσης, για κάθε
+συνδυασμό enqueue / sampling / JSON sink.
+
+Χρήση:
+    python -m benchmarks.bench_logging [--documents 2000] [--threads 4] [--budget-us 300]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config
+from utils.logger import configure_logging, document_context, logger, sampled_logger
+
+# (όνομα, LOG_ENQUEUE, LOG_SAMPLE_RATE, LOG_JSON)
+MODES = [
+    ('sync', False, 1.0, False),
+    ('enqueue', True, 1.0, False),
+    ('sampled', False, config.LOG_SAMPLE_RATE, False),
+    ('enqueue_sampled', True, config.LOG_SAMPLE_RATE, False),
+    ('enqueue_sampled_json', True, config.LOG_SAMPLE_RATE, True),
+    ('default', config.LOG_ENQUEUE, config.LOG_SAMPLE_RATE, config.LOG_JSON),
+]
+
+def _log_document(index: int):
+    """Τα μηνύματα ενός εγγράφου όπως τα γράφουν pipeline, processor, analyzer και client"""
+    filepath = f"/corpus/doc_{index:05d}.txt"
+    with document_context(file=filepath):
+        pipeline_logger = sampled_logger('pipeline').bind(document_id=index)
+        pipeline_logger.info(f"Επεξεργασία: doc_{index:05d}.txt")
+        
+        extract_logger = sampled_logger('extract').bind(file=filepath)
+        extract_logger.info(f"Επεξεργασία αρχείου: doc_{index:05d}.txt")
+        extract_logger.debug(f"Χρήση encoding utf-8 για {filepath}")
+        extract_logger.info(f"Επιτυχής επεξεργασία: doc_{index:05d}.txt (5120 λέξεις, 6 chunks)")
+        
+        analysis_logger = sampled_logger('analyze').bind(document_id=index)
+        analysis_logger.info(f"Έναρξη AI ανάλυσης για document ID: {index}")
+        analysis_logger.info("Εκτέλεση AI ανάλυσης για 12000 χαρακτήρες")
+        
+        llm_logger = sampled_logger('llm')
+        llm_logger.info("Έναρξη πλήρους ανάλυσης κειμένου")
+        for operation in ('summary', 'keywords', 'categories', 'sentiment'):
+            llm_logger.debug(f"Αποστολή {operation} prompt στο model")
+        llm_logger.info("Ανάλυση ολοκληρώθηκε σε 4.20s (confidence: 0.80)")
+        
+        analysis_logger.info(f"AI ανάλυση ολοκληρώθηκε επιτυχώς για document {index} σε 4.31s")
+        pipeline_logger.info(f"Ολοκληρώθηκε: doc_{index:05d}.txt")
+
+MESSAGES_PER_DOCUMENT = 14
+
+def run_mode(name: str, enqueue: bool, sample_rate: float, json_logs: bool,
+             documents: int, threads: int) -> dict:
+    """Μέτρηση ενός συνδυασμού ρυθμίσεων σε νέο φάκελο logs"""
+    with tempfile.TemporaryDirectory(prefix="docanalyzer_logs_") as logs_dir:
+        type(config).LOGS_DIR = Path(logs_dir)
+        type(config).LOG_ENQUEUE = enqueue
+        type(config).LOG_SAMPLE_RATE = sample_rate
+        type(config).LOG_JSON = json_logs
+        configure_logging()
+        
+        per_thread = [[] for _ in range(threads)]
+        
+        def worker(slot: int):
+            for index in range(slot, documents, threads):
+                start = time.perf_counter()
+                _log_document(index)
+                per_thread[slot].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        emit_seconds = time.perf_counter() - start
+        
+        # Άδειασμα της ουράς των enqueued sinks (εκτός hot path)
+        drain_start = time.perf_counter()
+        logger.complete()
+        drain_seconds = time.perf_counter() - drain_start
+        
+        log_bytes = sum(path.stat().st_size for path in Path(logs_dir).iterdir())
+        logger.remove()
+    
+    durations = sorted(duration for slot in per_thread for duration in slot)
+    return {
+        'mode': name,
+        'enqueue': enqueue,
+        'sample_rate': sample_rate,
+        'json': json_logs,
+        'us_per_document': round(emit_seconds / documents * 1e6, 1),
+        'p99_us_per_document': round(durations[int(len(durations) * 0.99) - 1] * 1e6, 1),
+        'documents_per_second': round(documents / emit_seconds, 1),
+        'drain_ms': round(drain_seconds * 1000, 1),
+        'log_kb': round(log_bytes / 1024, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark κόστους logging ανά έγγραφο")
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4, help="Ταυτόχρονα threads (όπως οι workers)")
+    parser.add_argument('--level', default="DEBUG", help="LOG_LEVEL κατά τη μέτρηση")
+    parser.add_argument('--budget-us', type=float, default=300.0,
+                        help="Μέγιστο μέσο κόστος logging ανά έγγραφο για τις default ρυθμίσεις (μs)")
+    args = parser.parse_args()
+    
+    type(config).LOG_LEVEL = args.level
+    
+    # Το console sink γράφει σε /dev/null ώστε να μετριέται το κόστος χωρίς terminal
+    stdout = sys.stdout
+    results = []
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            for name, enqueue, sample_rate, json_logs in MODES:
+                results.append(run_mode(name, enqueue, sample_rate, json_logs,
+                                        args.documents, args.threads))
+        finally:
+            sys.stdout = stdout
+    
+    report = {
+        'documents': args.documents,
+        'threads': args.threads,
+        'messages_per_document': MESSAGES_PER_DOCUMENT,
+        'level': args.level,
+        'budget_us': args.budget_us,
+        'modes': results
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    
+    default = next(result for result in results if result['mode'] == 'default')
+    if default['us_per_document'] > args.budget_us:
+        print(f"ΑΠΟΤΥΧΙΑ: logging {default['us_per_document']} μs/έγγραφο > budget {args.budget_us} μs",
+              file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
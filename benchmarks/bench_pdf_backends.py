@@ -0,0 +1,85 @@
+"""
+Benchmark PDF backends: σελίδες/δευτερόλεπτο ανά backend
+
+Χρήση:
+    python -m benchmarks.bench_pdf_backends file1.pdf [file2.pdf ...] [--parallel] [--repeat 3]
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import config
+from core.pdf_backends import extract_page_range, get_available_backends, get_pdf_backend
+
+def benchmark_backend(backend_name: str, filepaths, parallel: bool, workers: int, repeat: int) -> dict:
+    """Μέτρηση χρόνου εξαγωγής για ένα backend"""
+    backend = get_pdf_backend(backend_name)
+    total_pages = 0
+    total_chars = 0
+    best_time = None
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = 0
+        chars = 0
+        
+        for filepath in filepaths:
+            page_count = backend.page_count(filepath)
+            pages += page_count
+            
+            if parallel and workers > 1:
+                pages_per_task = max(1, -(-page_count // workers))
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(extract_page_range, backend_name, filepath,
+                                               first, min(first + pages_per_task, page_count))
+                               for first in range(0, page_count, pages_per_task)]
+                    texts = {}
+                    for future in futures:
+                        texts.update(future.result())
+            else:
+                texts = backend.extract_pages(filepath, list(range(page_count)))
+            
+            chars += sum(len(text) for text in texts.values())
+        
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+        total_pages, total_chars = pages, chars
+    
+    return {
+        'backend': backend_name,
+        'parallel': parallel,
+        'pages': total_pages,
+        'chars': total_chars,
+        'seconds': round(best_time, 4),
+        'pages_per_second': round(total_pages / best_time, 2) if best_time else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends")
+    parser.add_argument('files', nargs='+', help="Αρχεία PDF")
+    parser.add_argument('--parallel', action='store_true', help="Μέτρηση και με worker processes")
+    parser.add_argument('--workers', type=int, default=config.PDF_WORKERS)
+    parser.add_argument('--repeat', type=int, default=3, help="Επαναλήψεις (κρατείται η καλύτερη)")
+    args = parser.parse_args()
+    
+    results = []
+    for backend_name in get_available_backends():
+        results.append(benchmark_backend(backend_name, args.files, False, args.workers, args.repeat))
+        if args.parallel:
+            results.append(benchmark_backend(backend_name, args.files, True, args.workers, args.repeat))
+    
+    for result in results:
+        mode = 'parallel' if result['parallel'] else 'serial'
+        print(f"{result['backend']:>10} {mode:>8}: {result['pages_per_second']:>10} σελ/s "
+              f"({result['pages']} σελίδες, {result['seconds']}s)")
+    
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Συνθετικό corpus για benchmarks (TXT, DOCX, PDF, εικόνες)
+
+Όλα τα αρχεία παράγονται ντετερμινιστικά από το seed, οπότε δύο εκτελέσεις
+σε διαφορετικά commits μετράνε ακριβώς την ίδια είσοδο.
+
+Χρήση:
+    python -m benchmarks.corpus /tmp/corpus [--txt 50] [--docx 20] [--pdf 20] [--images 5] [--size-kb 40]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_VOCABULARY = (
+    "σύμβαση άρθρο παράγραφος εταιρεία υπηρεσία πελάτης προμηθευτής τιμολόγιο ποσό "
+    "ημερομηνία πληρωμή όροι υποχρεώσεις δικαιώματα διάρκεια λύση ανανέωση εγγύηση "
+    "ευθύνη αποζημίωση εμπιστευτικότητα δεδομένα προσωπικά επεξεργασία έκθεση αναφορά "
+    "αποτελέσματα ανάλυση στοιχεία πίνακας έργο χρονοδιάγραμμα προϋπολογισμός έγκριση "
+    "και του της των το η ο σε με για από στο στην που να είναι θα ή δεν ως κατά"
+).split()
+
+def generate_chunk(rng: random.Random, words: int) -> str:
+    """Συνθετικό chunk με κατανομή Zipf πάνω στο λεξιλόγιο"""
+    weights = [1 / (rank + 1) for rank in range(len(_VOCABULARY))]
+    text = rng.choices(_VOCABULARY, weights=weights, k=words)
+    sentences = [' '.join(text[i:i + 12]).capitalize() + '.' for i in range(0, words, 12)]
+    return ' '.join(sentences) + f" Αρ. πρωτ. {rng.randint(1000, 99999)}/{rng.randint(2015, 2025)}."
+
+# Λατινικό λεξιλόγιο για PDF/εικόνες (οι standard PDF fonts δεν έχουν ελληνικά)
+_LATIN_VOCABULARY = (
+    "contract article paragraph company service client supplier invoice amount date "
+    "payment terms obligations rights duration termination renewal warranty liability "
+    "report analysis results data table project schedule budget approval the of and to "
+    "in for with on by is are will be as at from"
+).split()
+
+def generate_text(rng: random.Random, size_bytes: int) -> str:
+    """Ελληνικό κείμενο σε παραγράφους, περίπου size_bytes σε UTF-8"""
+    paragraphs = []
+    total = 0
+    while total < size_bytes:
+        paragraph = generate_chunk(rng, rng.randint(60, 200))
+        paragraphs.append(paragraph)
+        total += len(paragraph.encode('utf-8')) + 2
+    return '\n\n'.join(paragraphs)
+
+def generate_latin_lines(rng: random.Random, lines: int, words_per_line: int = 12) -> List[str]:
+    weights = [1 / (rank + 1) for rank in range(len(_LATIN_VOCABULARY))]
+    return [' '.join(rng.choices(_LATIN_VOCABULARY, weights=weights, k=words_per_line)).capitalize()
+            for _ in range(lines)]
+
+def write_txt(path: Path, rng: random.Random, size_bytes: int):
+    path.write_text(generate_text(rng, size_bytes), encoding='utf-8')
+
+def write_docx(path: Path, rng: random.Random, size_bytes: int):
+    from docx import Document
+    
+    document = Document()
+    for paragraph in generate_text(rng, size_bytes).split('\n\n'):
+        document.add_paragraph(paragraph)
+    
+    # Ένας μικρός πίνακας ώστε να μετριέται και η εξαγωγή πινάκων
+    table = document.add_table(rows=5, cols=3)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = generate_chunk(rng, 4)
+    document.save(str(path))
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def write_pdf(path: Path, rng: random.Random, pages: int, lines_per_page: int = 60):
+    """Ελάχιστο έγκυρο PDF με κείμενο (Helvetica) χωρίς εξωτερικές βιβλιοθήκες"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, συμπληρώνεται όταν είναι γνωστά τα ids των σελίδων
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    page_ids = []
+    
+    for _ in range(pages):
+        lines = generate_latin_lines(rng, lines_per_page)
+        text_ops = ''.join(f"({_pdf_escape(line)}) '\n" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td\n{text_ops}ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    
+    kids = ' '.join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(output))
+
+def write_image(path: Path, rng: random.Random, lines: int = 30):
+    """Σελίδα A4 στα 150 DPI με γραμμές κειμένου για OCR"""
+    from PIL import Image, ImageDraw
+    
+    image = Image.new('L', (1240, 1754), 255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(generate_latin_lines(rng, lines, 8)):
+        draw.text((60, 60 + i * 50), line, fill=0)
+    image.save(str(path))
+
+def generate_corpus(output_dir: str, counts: Dict[str, int], size_kb: int = 40,
+                    seed: int = 42) -> List[Path]:
+    """
+    Δημιουργία corpus
+    
+    Args:
+        output_dir: Φάκελος εξόδου (δημιουργείται αν δεν υπάρχει)
+        counts: Πλήθος αρχείων ανά τύπο ('txt', 'docx', 'pdf', 'images')
+        size_kb: Μέγεθος κειμένου ανά TXT/DOCX (τα PDF παίρνουν size_kb / 4 σελίδες)
+        seed: Seed για αναπαραγωγιμότητα
+    
+    Returns:
+        Λίστα με τα αρχεία που δημιουργήθηκαν
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    size_bytes = size_kb * 1024
+    files = []
+    
+    for i in range(counts.get('txt', 0)):
+        path = output_dir / "txt" / f"doc_{i:05d}.txt"
+        path.parent.mkdir(exist_ok=True)
+        write_txt(path, rng, size_bytes)
+        files.append(path)
+    
+    for i in range(counts.get('docx', 0)):
+        path = output_dir / "docx" / f"doc_{i:05d}.docx"
+        path.parent.mkdir(exist_ok=True)
+        write_docx(path, rng, size_bytes)
+        files.append(path)
+    
+    for i in range(counts.get('pdf', 0)):
+        path = output_dir / "pdf" / f"doc_{i:05d}.pdf"
+        path.parent.mkdir(exist_ok=True)
+        write_pdf(path, rng, max(1, size_kb // 4))
+        files.append(path)
+    
+    for i in range(counts.get('images', 0)):
+        path = output_dir / "images" / f"scan_{i:05d}.png"
+        path.parent.mkdir(exist_ok=True)
+        write_image(path, rng)
+        files.append(path)
+    
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Δημιουργία συνθετικού corpus")
+    parser.add_argument('output_dir')
+    parser.add_argument('--txt', type=int, default=50)
+    parser.add_argument('--docx', type=int, default=20)
+    parser.add_argument('--pdf', type=int, default=20)
+    parser.add_argument('--images', type=int, default=5)
+    parser.add_argument('--size-kb', type=int, default=40, help="Μέγεθος κειμένου ανά έγγραφο")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    files = generate_corpus(args.output_dir, {'txt': args.txt, 'docx': args.docx,
+                                              'pdf': args.pdf, 'images': args.images},
+                            args.size_kb, args.seed)
+    total_bytes = sum(path.stat().st_size for path in files)
+    print(f"{len(files)} αρχεία, {total_bytes / 1024 / 1024:.2f} MB στο {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Τοπικός stand-in του Ollama για benchmarks
+
+Απαντά στα /api/tags, /api/generate (και με "stream": true, NDJSON) και /api/embed
+με ρυθμιζόμενη καθυστέρηση και ρυθμούς tokens, και επιστρέφει τα ίδια πεδία
+durations (nanoseconds) με το Ollama.
+Τα embeddings είναι feature hashing των λέξεων, οπότε κείμενα με κοινές λέξεις
+έχουν πραγματικά υψηλή ομοιότητα συνημιτόνου.
+
+Χρήση:
+    python -m benchmarks.mock_ollama [--port 11434] [--latency 0.05] [--eval-rate 40]
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockOllamaServer:
+    """
+    HTTP server που μιμείται το Ollama API
+    
+    Args:
+        latency: Σταθερή καθυστέρηση ανά κλήση (seconds)
+        prompt_rate: Tokens/s επεξεργασίας prompt
+        eval_rate: Tokens/s παραγωγής απάντησης
+        eval_tokens: Tokens απάντησης ανά κλήση
+        model: Όνομα model στο /api/tags
+        embedding_dim: Διάσταση των embeddings
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05,
+                 prompt_rate: float = 500.0, eval_rate: float = 40.0, eval_tokens: int = 40,
+                 model: str = "llama3.1:8b", embedding_dim: int = 256):
+        self.latency = latency
+        self.prompt_rate = prompt_rate
+        self.eval_rate = eval_rate
+        self.eval_tokens = eval_tokens
+        self.model = model
+        self.embedding_dim = embedding_dim
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    @staticmethod
+    def _response_text(prompt: str) -> str:
+        # Οι ερωτήσεις πρώτα: οι πηγές του prompt μπορεί να περιέχουν τις άλλες φράσεις
+        if "Ερώτηση:" in prompt:
+            return "Σύμφωνα με τις πηγές, οι όροι πληρωμής ορίζονται στη σύμβαση [1]."
+        if "συναισθηματικό" in prompt:
+            return "0.2"
+        if "κατηγοριοποίησέ" in prompt:
+            return "Νομικό, Οικονομικό"
+        if "λέξεις-κλειδιά" in prompt:
+            return "σύμβαση, πληρωμή, τιμολόγιο, προμηθευτής, όροι"
+        return "Συνθετική περίληψη για benchmark. Περιγράφει τα κύρια σημεία του εγγράφου."
+    
+    def _timings(self, prompt: str) -> tuple:
+        with self._lock:
+            self.requests += 1
+        # Χοντρική εκτίμηση tokens: ~4 χαρακτήρες ανά token
+        prompt_tokens = max(1, len(prompt) // 4)
+        return prompt_tokens, prompt_tokens / self.prompt_rate, self.eval_tokens / self.eval_rate
+    
+    def generate(self, prompt: str) -> dict:
+        """Απάντηση /api/generate με καθυστέρηση ανάλογη των tokens"""
+        prompt_tokens, prompt_seconds, eval_seconds = self._timings(prompt)
+        time.sleep(self.latency + prompt_seconds + eval_seconds)
+        return self._final_response(self._response_text(prompt), prompt_tokens, prompt_seconds, eval_seconds)
+    
+    def generate_stream(self, prompt: str):
+        """Απάντηση /api/generate με stream: ένα JSON object ανά λέξη, στατιστικά στο τελευταίο"""
+        prompt_tokens, prompt_seconds, eval_seconds = self._timings(prompt)
+        time.sleep(self.latency + prompt_seconds)
+        
+        words = self._response_text(prompt).split(' ')
+        for index, word in enumerate(words):
+            time.sleep(eval_seconds / len(words))
+            yield {'model': self.model, 'response': word if index == 0 else ' ' + word, 'done': False}
+        yield self._final_response('', prompt_tokens, prompt_seconds, eval_seconds)
+    
+    def _final_response(self, response: str, prompt_tokens: int, prompt_seconds: float,
+                        eval_seconds: float) -> dict:
+        return {
+            'model': self.model,
+            'response': response,
+            'done': True,
+            'total_duration': int((self.latency + prompt_seconds + eval_seconds) * 1e9),
+            'load_duration': int(self.latency * 1e9),
+            'prompt_eval_count': prompt_tokens,
+            'prompt_eval_duration': int(prompt_seconds * 1e9),
+            'eval_count': self.eval_tokens,
+            'eval_duration': int(eval_seconds * 1e9)
+        }
+    
+    def embedding(self, text: str) -> list:
+        """Feature hashing: κάθε λέξη προσθέτει ±1 σε μια θέση του vector"""
+        vector = [0.0] * self.embedding_dim
+        for word in re.findall(r'\w+', text.lower()):
+            digest = zlib.crc32(word.encode('utf-8'))
+            vector[digest % self.embedding_dim] += 1.0 if digest & 0x80000000 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+    
+    def embed(self, texts: list) -> dict:
+        """Απάντηση /api/embed (παρτίδα κειμένων)"""
+        with self._lock:
+            self.requests += 1
+        
+        prompt_tokens = sum(max(1, len(text) // 4) for text in texts)
+        prompt_seconds = prompt_tokens / self.prompt_rate
+        time.sleep(self.latency + prompt_seconds)
+        
+        return {
+            'model': self.model,
+            'embeddings': [self.embedding(text) for text in texts],
+            'total_duration': int((self.latency + prompt_seconds) * 1e9),
+            'load_duration': int(self.latency * 1e9),
+            'prompt_eval_count': prompt_tokens
+        }
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _send_json(self, payload: dict, status: int = 200):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _send_stream(self, parts):
+                """NDJSON με chunked transfer encoding, όπως το Ollama"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for part in parts:
+                    line = json.dumps(part, ensure_ascii=False).encode('utf-8') + b'\n'
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                    self.wfile.flush()
+                self.wfile.write(b'0\r\n\r\n')
+            
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send_json({'models': [{'name': server.model}]})
+                else:
+                    self._send_json({'error': 'not found'}, 404)
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    self._send_json({'error': 'invalid json'}, 400)
+                    return
+                
+                if self.path == '/api/generate' and payload.get('stream'):
+                    self._send_stream(server.generate_stream(payload.get('prompt', '')))
+                elif self.path == '/api/generate':
+                    self._send_json(server.generate(payload.get('prompt', '')))
+                elif self.path == '/api/embed':
+                    texts = payload.get('input', [])
+                    self._send_json(server.embed([texts] if isinstance(texts, str) else texts))
+                elif self.path == '/api/embeddings':
+                    self._send_json({'embedding': server.embed([payload.get('prompt', '')])['embeddings'][0]})
+                else:
+                    self._send_json({'error': 'not found'}, 404)
+        
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ollama server")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds ανά κλήση")
+    parser.add_argument('--prompt-rate', type=float, default=500.0, help="prompt tokens/s")
+    parser.add_argument('--eval-rate', type=float, default=40.0, help="generated tokens/s")
+    parser.add_argument('--eval-tokens', type=int, default=40, help="tokens ανά απάντηση")
+    parser.add_argument('--model', default="llama3.1:8b")
+    args = parser.parse_args()
+    
+    server = MockOllamaServer(args.host, args.port, args.latency, args.prompt_rate,
+                              args.eval_rate, args.eval_tokens, args.model)
+    print(f"Mock Ollama στο {server.url} (Ctrl+C για τερματισμό)")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
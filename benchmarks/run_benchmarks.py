@@ -0,0 +1,408 @@
+"""
+Αναπαραγώγιμο benchmark suite: scanner, processor, database, LLM client και end-to-end
+
+Κάθε φάση τρέχει σε δικό της process ώστε το peak RSS να αφορά μόνο αυτή.
+Το LLM είναι ο τοπικός mock Ollama server με ρυθμιζόμενη καθυστέρηση.
+Τα αποτελέσματα γράφονται σε JSON και συγκρίνονται με προηγούμενη εκτέλεση.
+
+Χρήση:
+    python -m benchmarks.run_benchmarks [--output results.json] [--compare baseline.json]
+    python -m benchmarks.run_benchmarks --txt 200 --pdf 50 --size-kb 100 --phases processor database
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.mock_ollama import MockOllamaServer
+
+PHASES = ['scanner', 'processor', 'database', 'llm', 'end_to_end']
+
+# Μετρικές που συγκρίνονται: (φάση, κλειδί, True αν μεγαλύτερο = καλύτερο,
+# ελάχιστη απόλυτη διαφορά ώστε ο θόρυβος σε μικρές τιμές να μη μετράει ως χειροτέρευση)
+COMPARED_METRICS = [
+    ('scanner', 'files_per_second', True, 0),
+    ('processor', 'docs_per_second', True, 0),
+    ('processor', 'latency_ms.p95', False, 2.0),
+    ('database', 'insert_latency_ms.p95', False, 2.0),
+    ('database', 'statistics_latency_ms.p95', False, 2.0),
+    ('llm', 'client_overhead_ms.p95', False, 5.0),
+    ('end_to_end', 'docs_per_second', True, 0),
+    ('end_to_end', 'latency_ms.p95', False, 10.0),
+    ('end_to_end', 'peak_rss_mb', False, 10.0)
+]
+
+def percentiles(values: List[float]) -> Dict:
+    """p50/p95/p99/max/mean σε milliseconds από τιμές σε seconds"""
+    if not values:
+        return {}
+    ordered = sorted(value * 1000 for value in values)
+    
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+    
+    return {
+        'p50': round(statistics.median(ordered), 3),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'max': round(ordered[-1], 3),
+        'mean': round(statistics.fmean(ordered), 3)
+    }
+
+def peak_rss_mb() -> Dict:
+    """Peak RSS του process και των children (MB)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows: μόνο το τρέχον RSS μέσω psutil αν υπάρχει
+        try:
+            import psutil
+            return {'self': round(psutil.Process().memory_info().peak_wset / 1024 / 1024, 1),
+                    'children': None}
+        except (ImportError, AttributeError):
+            return {'self': None, 'children': None}
+    
+    # ru_maxrss σε KB στο Linux, σε bytes στο macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+def _configure(settings: Dict):
+    """Ρυθμίσεις του phase process πριν φορτωθούν τα core modules"""
+    from config import config
+    
+    # Στην κλάση ώστε να τα βλέπει και το create_directories (classmethod)
+    for key, value in settings['config'].items():
+        setattr(type(config), key, value)
+    config.create_directories()
+
+def _scan(settings: Dict) -> List[Dict]:
+    from core.file_scanner import FileScanner
+    return list(FileScanner().scan_directories([settings['corpus_dir']], True))
+
+def phase_scanner(settings: Dict) -> Dict:
+    """Σάρωση του corpus (καλύτερη από repeat εκτελέσεις)"""
+    timings = []
+    files = []
+    for _ in range(settings['repeat']):
+        start = time.perf_counter()
+        files = _scan(settings)
+        timings.append(time.perf_counter() - start)
+    
+    best = min(timings)
+    return {
+        'files': len(files),
+        'seconds': round(best, 4),
+        'files_per_second': round(len(files) / best, 1) if best else None,
+        'latency_ms': percentiles(timings)
+    }
+
+def phase_processor(settings: Dict) -> Dict:
+    """Εξαγωγή κειμένου ανά έγγραφο στο ίδιο process (χωρίς απομόνωση)"""
+    from core.document_processor import DocumentProcessor
+    
+    processor = DocumentProcessor(use_process_pools=settings['process_pools'])
+    files = _scan(settings)
+    timings = []
+    by_type: Dict[str, List[float]] = {}
+    failures = 0
+    ocr_seconds = 0.0
+    
+    start = time.perf_counter()
+    for file_info in files:
+        file_start = time.perf_counter()
+        result = processor.process_document(file_info)
+        elapsed = time.perf_counter() - file_start
+        timings.append(elapsed)
+        by_type.setdefault(file_info['file_extension'][1:], []).append(elapsed)
+        if not result['success']:
+            failures += 1
+        ocr_seconds += result['metadata'].get('ocr_time', 0.0)
+    total = time.perf_counter() - start
+    
+    return {
+        'documents': len(files),
+        'failures': failures,
+        'seconds': round(total, 3),
+        'docs_per_second': round(len(files) / total, 2) if total else None,
+        'ocr_seconds': round(ocr_seconds, 3),
+        'latency_ms': percentiles(timings),
+        'latency_ms_by_type': {file_type: percentiles(values) for file_type, values in sorted(by_type.items())}
+    }
+
+def phase_database(settings: Dict) -> Dict:
+    """Εγγραφές εγγράφων/chunks/αναλύσεων και βασικά queries του UI"""
+    from benchmarks.corpus import generate_chunk
+    import random
+    from core.database import DatabaseManager
+    
+    db_manager = DatabaseManager()
+    db_manager.initialize_database()
+    rng = random.Random(7)
+    documents = settings['db_documents']
+    chunks = [[generate_chunk(rng, 300) for _ in range(8)] for _ in range(min(documents, 200))]
+    
+    insert_timings = []
+    for i in range(documents):
+        start = time.perf_counter()
+        doc_id = db_manager.add_document(f"/bench/db/doc_{i}.txt", f"doc_{i}.txt", 40960, 'txt')
+        db_manager.add_document_chunks(doc_id, chunks[i % len(chunks)])
+        db_manager.add_analysis_result(doc_id, "Περίληψη", ["σύμβαση", "πληρωμή"], ["Νομικό"],
+                                       0.2, 1.0, 1.5)
+        db_manager.update_document_status(doc_id, 'completed')
+        insert_timings.append(time.perf_counter() - start)
+    
+    def timed(function, repeat: int) -> List[float]:
+        values = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            values.append(time.perf_counter() - start)
+        return values
+    
+    return {
+        'documents': documents,
+        'insert_latency_ms': percentiles(insert_timings),
+        'statistics_latency_ms': percentiles(timed(db_manager.get_statistics, 50)),
+        'documents_latency_ms': percentiles(timed(lambda: db_manager.get_documents(limit=20), 50)),
+        'search_latency_ms': percentiles(timed(lambda: db_manager.search_documents("χρονοδιάγραμμα"), 10)),
+        'ranked_search_latency_ms': percentiles(timed(
+            lambda: db_manager.hybrid_search("χρονοδιάγραμμα προϋπολογισμός", budget_ms=10000), 10)),
+        'analytics_latency_ms': percentiles(timed(db_manager.get_analytics, 5)),
+        'database_bytes': db_manager.get_chunk_storage_report()['database_bytes']
+    }
+
+def phase_llm(settings: Dict) -> Dict:
+    """comprehensive_analysis απέναντι στον mock Ollama"""
+    from models.llama_client import LlamaClient
+    from benchmarks.corpus import generate_text
+    import random
+    
+    client = LlamaClient()
+    rng = random.Random(11)
+    texts = [generate_text(rng, 8000) for _ in range(settings['llm_documents'])]
+    mock = settings['mock']
+    timings = []
+    overhead = []
+    tokens_per_second = []
+    
+    for text in texts:
+        start = time.perf_counter()
+        result = client.comprehensive_analysis(text)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        if result.get('tokens_per_second'):
+            tokens_per_second.append(result['tokens_per_second'])
+        
+        # Χρόνος του client πέρα από την προσομοιωμένη καθυστέρηση του model (4 κλήσεις)
+        simulated = (4 * mock['latency'] + result['prompt_tokens'] / mock['prompt_rate']
+                     + result['eval_tokens'] / mock['eval_rate'])
+        overhead.append(max(0.0, elapsed - simulated))
+    
+    return {
+        'documents': len(texts),
+        'latency_ms': percentiles(timings),
+        'client_overhead_ms': percentiles(overhead),
+        'tokens_per_second': round(statistics.fmean(tokens_per_second), 2) if tokens_per_second else None
+    }
+
+def phase_end_to_end(settings: Dict) -> Dict:
+    """Πλήρες pipeline (καταχώρηση, εξαγωγή, dedup, embeddings, LLM, αποθήκευση) για όλο το corpus"""
+    from core.database import DatabaseManager
+    from core.pipeline import DocumentPipeline
+    from utils.metrics import STAGE_SECONDS
+    
+    DatabaseManager().initialize_database()
+    pipeline = DocumentPipeline()
+    files = _scan(settings)
+    timings = []
+    failures = 0
+    
+    start = time.perf_counter()
+    try:
+        queued_at = time.monotonic()
+        for file_info in files:
+            file_info['queued_at'] = queued_at
+            file_start = time.perf_counter()
+            result = pipeline.process_file(file_info, settings['detailed_analysis'])
+            timings.append(time.perf_counter() - file_start)
+            if not result['success']:
+                failures += 1
+    finally:
+        pipeline.shutdown()
+    total = time.perf_counter() - start
+    
+    # Μέσος χρόνος ανά στάδιο από τα metrics του pipeline
+    stages = {}
+    for stage in ('queue_wait', 'db_write', 'extract', 'ocr', 'dedup', 'keywords', 'embed', 'analyze_local',
+                  'analyze'):
+        snapshot = STAGE_SECONDS.snapshot(stage=stage)
+        if snapshot['count']:
+            stages[stage] = {'count': snapshot['count'],
+                             'mean_ms': round(snapshot['sum'] / snapshot['count'] * 1000, 3)}
+    
+    return {
+        'documents': len(files),
+        'failures': failures,
+        'seconds': round(total, 3),
+        'docs_per_second': round(len(files) / total, 3) if total else None,
+        'latency_ms': percentiles(timings),
+        'stages': stages
+    }
+
+def _run_phase(name: str, settings: Dict) -> Dict:
+    """Entry point του phase process"""
+    _configure(settings)
+    result = globals()[f"phase_{name}"](settings)
+    rss = peak_rss_mb()
+    result['peak_rss_mb'] = rss['self']
+    result['peak_rss_children_mb'] = rss['children']
+    return result
+
+def run_phase(name: str, settings: Dict) -> Dict:
+    """Εκτέλεση φάσης σε νέο (spawn) process για ανεξάρτητο peak RSS"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_phase, name, settings).result()
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=Path(__file__).resolve().parent.parent,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def _lookup(results: Dict, phase: str, key: str):
+    value = results.get(phase, {})
+    for part in key.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """Μετρικές που χειροτέρεψαν περισσότερο από threshold (π.χ. 0.1 = 10%)"""
+    regressions = []
+    for phase, key, higher_is_better, noise_floor in COMPARED_METRICS:
+        new_value = _lookup(current['results'], phase, key)
+        old_value = _lookup(baseline['results'], phase, key)
+        if not new_value or not old_value or abs(new_value - old_value) < noise_floor:
+            continue
+        
+        change = (new_value - old_value) / old_value
+        worse = -change if higher_is_better else change
+        if worse > threshold:
+            regressions.append({'metric': f"{phase}.{key}", 'baseline': old_value,
+                                'current': new_value, 'change': round(change, 3)})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite του AI Document Analyzer")
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=PHASES)
+    parser.add_argument('--txt', type=int, default=40)
+    parser.add_argument('--docx', type=int, default=10)
+    parser.add_argument('--pdf', type=int, default=10)
+    parser.add_argument('--images', type=int, default=0, help="Εικόνες για OCR (απαιτεί tesseract)")
+    parser.add_argument('--size-kb', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5, help="Επαναλήψεις σάρωσης")
+    parser.add_argument('--db-documents', type=int, default=2000)
+    parser.add_argument('--llm-documents', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02, help="Mock LLM seconds ανά κλήση")
+    parser.add_argument('--prompt-rate', type=float, default=2000.0, help="Mock LLM prompt tokens/s")
+    parser.add_argument('--eval-rate', type=float, default=400.0, help="Mock LLM generated tokens/s")
+    parser.add_argument('--eval-tokens', type=int, default=40)
+    parser.add_argument('--isolation', action='store_true', help="Εξαγωγή σε worker processes (end-to-end)")
+    parser.add_argument('--process-pools', action='store_true', help="Παράλληλο PDF/OCR στο processor")
+    parser.add_argument('--detailed', action='store_true', help="Detailed analysis στο end-to-end")
+    parser.add_argument('--analysis-mode', choices=['llm', 'local', 'tiered'], default='tiered',
+                        help="ANALYSIS_MODE στο end-to-end (llm: κάθε έγγραφο στο mock LLM)")
+    parser.add_argument('--output', help="Αρχείο JSON αποτελεσμάτων")
+    parser.add_argument('--compare', help="JSON προηγούμενης εκτέλεσης για σύγκριση")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Ανοχή χειροτέρευσης (0.15 = 15%%)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="docanalyzer_bench_") as temp_dir:
+        temp_dir = Path(temp_dir)
+        corpus_dir = temp_dir / "corpus"
+        files = generate_corpus(str(corpus_dir), {'txt': args.txt, 'docx': args.docx,
+                                                  'pdf': args.pdf, 'images': args.images},
+                                args.size_kb, args.seed)
+        
+        with MockOllamaServer(latency=args.latency, prompt_rate=args.prompt_rate,
+                              eval_rate=args.eval_rate, eval_tokens=args.eval_tokens) as mock:
+            results = {}
+            for phase in args.phases:
+                data_dir = temp_dir / f"data_{phase}"
+                settings = {
+                    'corpus_dir': str(corpus_dir),
+                    'repeat': args.repeat,
+                    'process_pools': args.process_pools,
+                    'db_documents': args.db_documents,
+                    'llm_documents': args.llm_documents,
+                    'detailed_analysis': args.detailed,
+                    'mock': {'latency': args.latency, 'prompt_rate': args.prompt_rate,
+                             'eval_rate': args.eval_rate},
+                    'config': {
+                        'DATA_DIR': data_dir,
+                        'DATABASE_DIR': data_dir / "database",
+                        'DATABASE_PATH': data_dir / "database" / "documents.db",
+                        'LOGS_DIR': data_dir / "logs",
+                        'TEMP_DIR': data_dir / "temp",
+                        'OCR_CACHE_DIR': data_dir / "temp" / "ocr_cache",
+                        'AI_API_URL': mock.url,
+                        'EXTRACTION_ISOLATION': args.isolation,
+                        'ANALYSIS_MODE': args.analysis_mode,
+                        # Μόνο warnings: το logging δεν πρέπει να κυριαρχεί στις μετρήσεις
+                        'LOG_LEVEL': "WARNING"
+                    }
+                }
+                print(f"Φάση {phase}...", file=sys.stderr)
+                results[phase] = run_phase(phase, settings)
+    
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': multiprocessing.cpu_count(),
+            'corpus_files': len(files),
+            'args': vars(args)
+        },
+        'results': results
+    }
+    
+    text = json.dumps(output, ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    print(text)
+    
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare_results(output, baseline, args.threshold)
+        for regression in regressions:
+            print(f"ΧΕΙΡΟΤΕΡΕΥΣΗ {regression['metric']}: {regression['baseline']} -> "
+                  f"{regression['current']} ({regression['change']:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"Καμία χειροτέρευση πάνω από {args.threshold:.0%} σε σχέση με "
+              f"{baseline['meta'].get('commit')}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ class Config:
     
     # Database
     DATABASE_PATH = DATABASE_DIR / "documents.db"
+    DATABASE_JOURNAL_MODE = "wal"  # Οι αναγνώσεις του web server δεν μπλοκάρουν τον worker
     
     # AI Model Settings
     AI_MODEL_NAME = "llama3.1:8b"  # Default Ollama model
@@ -25,19 +26,139 @@ class Config:
     SUPPORTED_FORMATS = {'.pdf', '.docx', '.txt', '.png', '.jpg', '.jpeg'}
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
     MAX_DEPTH = 5  # Μέγιστο βάθος φακέλων
+    SCAN_WORKERS = 8  # Threads για παράλληλη σάρωση φακέλων (network shares)
+    FOLDER_SEPARATOR = ";"  # Διαχωριστικό για πολλαπλούς φακέλους στο UI
+    VALIDATION_MAX_ENTRIES = 5000  # Όριο entries για εκτίμηση πλήθους αρχείων
+    VALIDATION_TIME_BUDGET = 0.5  # seconds για εκτίμηση πλήθους αρχείων
+    VALIDATION_CACHE_TTL = 60  # seconds cache εκτιμήσεων ανά φάκελο
+    WATCH_DEBOUNCE = 2.0  # seconds ησυχίας πριν επεξεργαστεί ένα αλλαγμένο αρχείο
+    WATCH_POLL_INTERVAL = 10.0  # seconds για polling όταν δεν υπάρχει inotify
+    
+    # PDF extraction
+    PDF_BACKEND = "auto"  # auto, pypdfium2, pdfminer, pypdf2
+    PDF_WORKERS = os.cpu_count() or 1  # Processes για μεγάλα PDF
+    PDF_PARALLEL_MIN_PAGES = 50  # Από τόσες σελίδες και πάνω η εξαγωγή μοιράζεται
+    
+    # Συμπίεση chunks στη database
+    CHUNK_COMPRESSION = "zlib"  # none, zlib, zstd, auto (zstd αν είναι εγκατεστημένο)
+    CHUNK_COMPRESSION_LEVEL = 6
+    CHUNK_COMPRESSION_MIN_SIZE = 256  # bytes - μικρότερα chunks μένουν ως κείμενο
+    CHUNK_DICT_SIZE = 32 * 1024  # bytes κοινού dictionary
+    CHUNK_DICT_MIN_CHUNKS = 200  # Chunks που χρειάζονται πριν δημιουργηθεί dictionary
+    CHUNK_DICT_SAMPLE_SIZE = 1000  # Chunks δείγματος για το dictionary
+    
+    # Ανάγνωση TXT
+    TXT_SAMPLE_SIZE = 64 * 1024  # bytes δείγματος για ανίχνευση encoding
+    TXT_MMAP_THRESHOLD = 8 * 1024 * 1024  # Από τόσα bytes και πάνω χρήση mmap
+    TXT_STREAM_THRESHOLD = 64 * 1024 * 1024  # Από τόσα bytes και πάνω streaming decode/καθαρισμός
+    TXT_BLOCK_SIZE = 1024 * 1024  # bytes ανά block στο streaming
+    
+    # Απομόνωση εξαγωγής (worker processes με όρια ανά έγγραφο)
+    # Ένα έγγραφο που κολλάει ή γεμίζει τη μνήμη τερματίζεται χωρίς να ρίξει τον server.
+    # Κάθε worker έχει δικά του pools OCR/PDF, οπότε ταυτόχρονα τρέχουν έως
+    # EXTRACTION_WORKERS × EXTRACTION_POOL_WORKERS processes εξαγωγής. Το όριο μνήμης
+    # μετράει και τα pools (με psutil), και σε τερματισμό χάνεται όλο το έγγραφο, όχι μία σελίδα.
+    # Με False η εξαγωγή τρέχει στο process της ανάλυσης με OCR_WORKERS / PDF_WORKERS.
+    EXTRACTION_ISOLATION = True
+    EXTRACTION_WORKERS = 2  # Ένας για την αρχική επεξεργασία, ένας για τον watcher
+    EXTRACTION_POOL_WORKERS = None  # Processes OCR/PDF ανά worker (None: πυρήνες / EXTRACTION_WORKERS)
+    EXTRACTION_TIMEOUT = 300  # seconds ανά έγγραφο
+    EXTRACTION_MAX_RSS_MB = 2048  # Όριο μνήμης ανά worker
+    EXTRACTION_SHUTDOWN_TIMEOUT = 10  # seconds για ομαλό τερματισμό worker και pools
+    
+    # Export αποτελεσμάτων
+    EXPORT_BATCH_SIZE = 1000  # Γραμμές ανά fetchmany / row group Parquet
+    EXPORT_DIR = DATA_DIR / "exports"
+    
+    # OCR
+    OCR_LANG = "ell+eng"  # Ελληνικά και αγγλικά
+    OCR_TESSERACT_CONFIG = "--psm 6"  # Uniform text block
+    OCR_TARGET_DPI = 300  # DPI για σμίκρυνση εικόνων / rasterization PDF
+    OCR_MAX_DIMENSION = 4000  # Μέγιστη πλευρά (px) όταν το DPI είναι άγνωστο
+    OCR_WORKERS = os.cpu_count() or 1  # Processes για OCR
+    OCR_CACHE_DIR = TEMP_DIR / "ocr_cache"
+    OCR_MIN_PAGE_CHARS = 20  # Σελίδες PDF με λιγότερους χαρακτήρες περνούν από OCR
+    
+    # Deduplication (MinHash + LSH)
+    DEDUP_ENABLED = True
+    DEDUP_NUM_PERM = 128  # Μήκος MinHash υπογραφής
+    DEDUP_LSH_BANDS = 16  # 16 bands x 8 rows -> κατώφλι LSH ~0.7
+    DEDUP_SHINGLE_SIZE = 5  # Λέξεις ανά shingle
+    DEDUP_SIMILARITY_THRESHOLD = 0.8  # Ελάχιστη Jaccard για near-duplicate
+    DEDUP_REUSE_THRESHOLD = 0.9  # Πάνω από αυτό επαναχρησιμοποιείται η ανάλυση
+    DEDUP_DIFF_MAX_RATIO = 0.3  # Κάτω από το reuse: έως τόσο νέο κείμενο αναλύεται μόνο η διαφορά
+    DEDUP_SEED = 42
+    
+    # Τοπική ανάλυση (χωρίς LLM) για μικρά ή απλά έγγραφα
+    ANALYSIS_MODE = "tiered"  # llm, local, tiered (τοπικά και κλιμάκωση στο LLM όταν χρειάζεται)
+    LOCAL_ANALYSIS_TRIVIAL_WORDS = 60  # Έως τόσες λέξεις η τοπική ανάλυση αρκεί πάντα
+    LOCAL_ANALYSIS_MAX_WORDS = 400  # Από τόσες λέξεις και πάνω κλιμάκωση στο LLM
+    LOCAL_ANALYSIS_MIN_CONFIDENCE = 0.8  # Κλιμάκωση στο LLM με χαμηλότερο confidence
+    LOCAL_SUMMARY_CHARS = 300  # Μήκος εξαγωγικής περίληψης
+    
+    # Λέξεις-κλειδιά σε επίπεδο συλλογής (TF-IDF με σταδιακά document frequencies)
+    KEYWORD_INDEX_ENABLED = True
+    KEYWORD_SOURCE = "auto"  # auto (TF-IDF για τοπικές αναλύσεις), llm, tfidf, merge
+    KEYWORD_TOP_K = 10
+    KEYWORD_BATCH_SIZE = 1000  # Έγγραφα ανά batch βαθμολόγησης
+    
+    # Σημασιολογική αναζήτηση (embeddings ανά chunk)
+    EMBEDDING_ENABLED = True
+    EMBEDDING_MODEL = "nomic-embed-text"  # Ollama embedding model
+    EMBEDDING_BATCH_SIZE = 32  # Chunks ανά κλήση στο /api/embed
+    EMBEDDING_DIR = DATA_DIR / "embeddings"  # Memory-mapped πίνακες vectors
+    SEMANTIC_TOP_K = 20  # Έγγραφα ανά σημασιολογική αναζήτηση
+    SEMANTIC_MIN_SCORE = 0.3  # Ελάχιστη ομοιότητα συνημιτόνου
+    SEMANTIC_IVF_MIN_VECTORS = 50000  # Από τόσα vectors και πάνω IVF index αντί για πλήρη σάρωση
+    SEMANTIC_IVF_PROBES = 8  # Clusters που ελέγχονται ανά query
+    
+    # Υβριδική αναζήτηση (FTS5 + embeddings)
+    SEARCH_TOP_K = 20  # Αποτελέσματα ανά αναζήτηση
+    SEARCH_CANDIDATES = 100  # Υποψήφιοι ανά λίστα κατάταξης πριν το fusion
+    SEARCH_FUSION = "rrf"  # rrf (reciprocal rank fusion) ή weighted
+    SEARCH_RRF_K = 60  # Σταθερά RRF: 1 / (k + θέση)
+    SEARCH_SEMANTIC_WEIGHT = 0.5  # Βάρος ομοιότητας στο weighted fusion
+    SEARCH_BUDGET_MS = 250  # Όριο χρόνου των queries· μετά επιστρέφονται τα μερικά αποτελέσματα
+    SEARCH_SNIPPET_WORDS = 24  # Λέξεις ανά απόσπασμα
+    
+    # Ερωτήσεις-απαντήσεις πάνω στα έγγραφα (retrieval-augmented)
+    QA_TOP_K = 8  # Chunks που ανακτώνται ανά ερώτηση
+    QA_MAX_CHUNKS_PER_DOCUMENT = 3  # Ποικιλία πηγών στο context
+    QA_CONTEXT_TOKENS = 3000  # Tokens των πηγών στο prompt
+    QA_NUM_CTX = 4096  # Context window του model για τις ερωτήσεις
+    QA_CHARS_PER_TOKEN = 2.5  # Εκτίμηση tokens (συντηρητική για ελληνικό κείμενο)
+    QA_CACHE_SIZE = 256  # Απαντήσεις στην cache (ανά ερώτηση και έκδοση δεδομένων)
+    QA_FLUSH_INTERVAL = 0.25  # seconds μεταξύ εγγραφών της απάντησης που παράγεται στη database
+    QA_RETENTION_HOURS = 24  # Παλαιότερες απαντήσεις διαγράφονται
+    
+    # Ουρά εργασιών ανάλυσης (analysis_jobs στη database)
+    EMBEDDED_WORKER = True  # Worker thread μέσα στον server· αλλιώς `python main.py worker`
+    JOB_POLL_INTERVAL = 1.0  # seconds αναμονής του worker όταν η ουρά είναι άδεια
+    JOB_HEARTBEAT_INTERVAL = 15  # seconds μεταξύ heartbeats των εργασιών ενός worker
+    JOB_HEARTBEAT_TIMEOUT = 120  # seconds χωρίς heartbeat: η εργασία ξαναμπαίνει στην ουρά
+    WORKER_METRICS_PORT = 9101  # /metrics του worker στο HOST (0: χωρίς)· ένα port ανά worker
     
     # Dash App Settings
+    # Η εφαρμογή δεν έχει authentication: ακούει μόνο τοπικά και η πρόσβαση από το
+    # δίκτυο γίνεται μέσω reverse proxy με authentication (βλ. README). Άλλη διεύθυνση
+    # (π.χ. APP_HOST=0.0.0.0 σε container πίσω από τον proxy) μόνο ρητά από το environment.
     DEBUG = True
-    HOST = "127.0.0.1"
-    PORT = 8050
+    HOST = os.environ.get('APP_HOST', '127.0.0.1')
+    PORT = int(os.environ.get('APP_PORT', '8050'))
+    SERVER_THREADS = 8  # Threads του waitress (production server χωρίς gunicorn)
     
     # UI Settings
     ITEMS_PER_PAGE = 20
+    RESULTS_CACHE_SIZE = 64  # Σελίδες αποτελεσμάτων στην cache (ανά αναζήτηση, filters, σελίδα και έκδοση)
     REFRESH_INTERVAL = 1000  # ms
+    ANALYTICS_MIN_REFRESH = 30  # seconds ελάχιστη απόσταση επανυπολογισμού γραφημάτων
     
     # Logging
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
+    LOG_ENQUEUE = True  # Τα file sinks γράφουν σε background thread (rotation/δίσκος εκτός hot path)
+    LOG_JSON = False  # Επιπλέον JSON Lines αρχείο με πεδία stage/document_id/file
+    LOG_SAMPLE_RATE = 0.1  # Ποσοστό αρχείων που κρατούν τα μηνύματα ανά αρχείο (INFO/DEBUG)
     
     @classmethod
     def create_directories(cls):
@@ -54,6 +175,16 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     DEBUG = False
     LOG_LEVEL = "WARNING"
+    LOG_JSON = True
+    EMBEDDED_WORKER = False  # Οι workers τρέχουν ως ξεχωριστά processes
+
+CONFIGS = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig
+}
 
-# Default configuration
-config = DevelopmentConfig()
+# Configuration από το APP_ENV (default: development)
+APP_ENV = os.environ.get('APP_ENV', 'development').lower()
+if APP_ENV not in CONFIGS:
+    raise ValueError(f"Άγνωστο APP_ENV: {APP_ENV} (επιλογές: {', '.join(CONFIGS)})")
+config = CONFIGS[APP_ENV]()
@@ -2,53 +2,66 @@
 AI Analyzer Manager για AI Document Analyzer
 """
 import time
+from itertools import zip_longest
 from typing import Dict, List
-from models.llama_client import LlamaClient
+from config import config
 from core.database import DatabaseManager
-from utils.logger import setup_logger
+from core.keyword_engine import KeywordEngine
+from core.local_analyzer import LocalAnalyzer
+from core.text_search import fold_search_text
+from utils.logger import sampled_logger, setup_logger
+from utils.metrics import ANALYSES, stage_timer
 
 logger = setup_logger()
+# Μηνύματα ανά έγγραφο (structured πεδία, sampling)
+analysis_logger = sampled_logger('analyze')
 
 class AIAnalyzer:
     """Κεντρική κλάση για AI ανάλυση εγγράφων"""
     
     def __init__(self):
-        self.llama_client = LlamaClient()
+        self._llama_client = None
         self.db_manager = DatabaseManager()
+        self.local_analyzer = LocalAnalyzer()
+        self.keyword_engine = KeywordEngine(self.db_manager)
+    
+    @property
+    def llama_client(self):
+        """LlamaClient (και requests) φορτώνεται στην πρώτη κλήση στο Ollama"""
+        if self._llama_client is None:
+            from models.llama_client import LlamaClient
+            self._llama_client = LlamaClient()
+        return self._llama_client
         
-    def analyze_document(self, document_id: int, text_chunks: List[str]) -> Dict:
+    def analyze_document(self, document_id: int, text_chunks: List[str], allow_local: bool = True,
+                         base_analysis: Dict = None) -> Dict:
         """
         Πλήρης ανάλυση εγγράφου με AI
         
+        Με ANALYSIS_MODE "tiered" το έγγραφο αναλύεται πρώτα τοπικά και πηγαίνει
+        στο LLM μόνο αν είναι μεγάλο ή η τοπική ανάλυση δεν είναι βέβαιη.
+        
         Args:
             document_id: ID εγγράφου στη database
             text_chunks: Λίστα με chunks κειμένου
+            allow_local: False για ανάλυση πάντα με το LLM (λεπτομερής ανάλυση)
+            base_analysis: Διαφορές near-duplicate (DocumentDeduplicator.diff_against): τα
+                chunks είναι μόνο το νέο κείμενο και η ανάλυσή του συγχωνεύεται με του canonical
             
         Returns:
             Dict με αποτελέσματα ανάλυσης
         """
-        logger.info(f"Έναρξη AI ανάλυσης για document ID: {document_id}")
+        log = analysis_logger.bind(document_id=document_id)
+        log.info(f"Έναρξη AI ανάλυσης για document ID: {document_id}")
         start_time = time.time()
         
         try:
-            # Έλεγχος σύνδεσης με AI model
-            connection_test = self.llama_client.test_connection()
-            if not connection_test['success']:
-                error_msg = f"AI model δεν είναι διαθέσιμο: {connection_test['error']}"
-                logger.error(error_msg)
-                self.db_manager.update_document_status(document_id, 'failed', error_msg)
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'document_id': document_id
-                }
-            
             # Συνδυασμός όλων των chunks σε ένα κείμενο για ανάλυση
             full_text = self._combine_chunks(text_chunks)
             
-            if not full_text.strip():
+            if not full_text.strip() and base_analysis is None:
                 error_msg = "Δεν βρέθηκε κείμενο για ανάλυση"
-                logger.warning(error_msg)
+                log.warning(error_msg)
                 self.db_manager.update_document_status(document_id, 'failed', error_msg)
                 return {
                     'success': False,
@@ -56,54 +69,94 @@ class AIAnalyzer:
                     'document_id': document_id
                 }
             
-            # AI ανάλυση
-            logger.info(f"Εκτέλεση AI ανάλυσης για {len(full_text)} χαρακτήρες")
-            analysis_result = self.llama_client.comprehensive_analysis(full_text)
+            # Τοπική ανάλυση: τα μικρά και απλά έγγραφα δεν περνούν από το LLM
+            analysis_result, analysis_tier = None, 'llm'
+            if base_analysis is not None and not full_text.strip():
+                # Καμία νέα πρόταση: μόνο αναδιάταξη του canonical κειμένου
+                analysis_result = {'success': True, 'processing_time': 0.0}
+                analysis_tier = base_analysis['base'].get('analysis_tier') or 'local'
+            elif allow_local and config.ANALYSIS_MODE in ('local', 'tiered'):
+                with stage_timer('analyze_local'):
+                    local_result = self.local_analyzer.analyze(full_text)
+                if config.ANALYSIS_MODE == 'local' or not self.local_analyzer.needs_llm(local_result):
+                    analysis_result, analysis_tier = local_result, 'local'
+                else:
+                    log.info(f"Κλιμάκωση στο LLM ({local_result['word_count']} λέξεις, "
+                             f"confidence {local_result['confidence_score']:.2f})")
             
-            if not analysis_result['success']:
-                error_msg = f"AI ανάλυση απέτυχε: {'; '.join(analysis_result.get('errors', ['Άγνωστο σφάλμα']))}"
-                logger.error(error_msg)
-                self.db_manager.update_document_status(document_id, 'failed', error_msg)
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'document_id': document_id
-                }
+            if analysis_result is None:
+                # Έλεγχος σύνδεσης με AI model (μόνο αν υπάρχει κείμενο)
+                connection_test = self.llama_client.test_connection()
+                if not connection_test['success']:
+                    error_msg = f"AI model δεν είναι διαθέσιμο: {connection_test['error']}"
+                    log.error(error_msg)
+                    self.db_manager.update_document_status(document_id, 'failed', error_msg)
+                    return {
+                        'success': False,
+                        'error': error_msg,
+                        'document_id': document_id
+                    }
+                
+                # AI ανάλυση
+                log.info(f"Εκτέλεση AI ανάλυσης για {len(full_text)} χαρακτήρες")
+                with stage_timer('analyze'):
+                    analysis_result = self.llama_client.comprehensive_analysis(full_text)
+                
+                if not analysis_result['success']:
+                    error_msg = f"AI ανάλυση απέτυχε: {'; '.join(analysis_result.get('errors', ['Άγνωστο σφάλμα']))}"
+                    log.error(error_msg)
+                    self.db_manager.update_document_status(document_id, 'failed', error_msg)
+                    return {
+                        'success': False,
+                        'error': error_msg,
+                        'document_id': document_id
+                    }
+            ANALYSES.inc(tier=analysis_tier)
+            if base_analysis is not None:
+                analysis_result = self._merge_analysis(base_analysis['base'], analysis_result, base_analysis['ratio'])
+            keywords = self._select_keywords(document_id, analysis_result.get('keywords', []), analysis_tier)
             
             # Αποθήκευση αποτελεσμάτων στη database
             try:
-                self.db_manager.add_analysis_result(
-                    document_id=document_id,
-                    summary=analysis_result.get('summary', ''),
-                    keywords=analysis_result.get('keywords', []),
-                    categories=analysis_result.get('categories', []),
-                    sentiment_score=analysis_result.get('sentiment_score', 0.0),
-                    confidence_score=analysis_result.get('confidence_score', 0.0),
-                    processing_time=analysis_result.get('processing_time', 0.0)
-                )
-                
-                # Ενημέρωση status του document
-                self.db_manager.update_document_status(document_id, 'completed')
+                with stage_timer('db_write'):
+                    self.db_manager.add_analysis_result(
+                        document_id=document_id,
+                        summary=analysis_result.get('summary', ''),
+                        keywords=keywords,
+                        categories=analysis_result.get('categories', []),
+                        sentiment_score=analysis_result.get('sentiment_score', 0.0),
+                        confidence_score=analysis_result.get('confidence_score', 0.0),
+                        processing_time=analysis_result.get('processing_time', 0.0),
+                        prompt_tokens=analysis_result.get('prompt_tokens'),
+                        eval_tokens=analysis_result.get('eval_tokens'),
+                        tokens_per_second=analysis_result.get('tokens_per_second'),
+                        analysis_tier=analysis_tier
+                    )
+                    
+                    # Ενημέρωση status του document
+                    self.db_manager.update_document_status(document_id, 'completed')
                 
                 total_time = time.time() - start_time
-                logger.info(f"AI ανάλυση ολοκληρώθηκε επιτυχώς για document {document_id} "
-                           f"σε {total_time:.2f}s")
+                log.info(f"AI ανάλυση ({analysis_tier}) ολοκληρώθηκε επιτυχώς για document {document_id} "
+                         f"σε {total_time:.2f}s")
                 
                 return {
                     'success': True,
                     'document_id': document_id,
                     'summary': analysis_result.get('summary', ''),
-                    'keywords': analysis_result.get('keywords', []),
+                    'keywords': keywords,
                     'categories': analysis_result.get('categories', []),
                     'sentiment_score': analysis_result.get('sentiment_score', 0.0),
                     'confidence_score': analysis_result.get('confidence_score', 0.0),
                     'processing_time': total_time,
-                    'ai_processing_time': analysis_result.get('processing_time', 0.0)
+                    'ai_processing_time': analysis_result.get('processing_time', 0.0),
+                    'tokens_per_second': analysis_result.get('tokens_per_second'),
+                    'analysis_tier': analysis_tier
                 }
                 
             except Exception as e:
                 error_msg = f"Σφάλμα αποθήκευσης αποτελεσμάτων: {str(e)}"
-                logger.error(error_msg)
+                log.error(error_msg)
                 self.db_manager.update_document_status(document_id, 'failed', error_msg)
                 return {
                     'success': False,
@@ -113,7 +166,7 @@ class AIAnalyzer:
                 
         except Exception as e:
             error_msg = f"Απροσδόκητο σφάλμα AI ανάλυσης: {str(e)}"
-            logger.error(error_msg)
+            log.error(error_msg)
             self.db_manager.update_document_status(document_id, 'failed', error_msg)
             return {
                 'success': False,
@@ -121,6 +174,60 @@ class AIAnalyzer:
                 'document_id': document_id
             }
     
+    @staticmethod
+    def _merge_analysis(base: Dict, diff: Dict, ratio: float) -> Dict:
+        """
+        Ανάλυση near-duplicate από την ανάλυση του canonical και των διαφορών του
+        
+        Η περίληψη συμπληρώνεται με τις διαφορές, τα keywords και οι κατηγορίες
+        ενώνονται, το sentiment σταθμίζεται με το μερίδιο του νέου κειμένου και
+        κρατιέται το μικρότερο confidence.
+        """
+        merged = dict(diff)
+        summary = base.get('summary') or ''
+        if diff.get('summary'):
+            summary = f"{summary}\n\nΔιαφορές: {diff['summary']}"
+        merged['summary'] = summary
+        
+        keywords = list(base.get('keywords') or [])
+        merged['keywords'] = keywords + [keyword for keyword in diff.get('keywords', []) if keyword not in keywords]
+        categories = list(base.get('categories') or [])
+        merged['categories'] = categories + [category for category in diff.get('categories', [])
+                                             if category not in categories]
+        
+        base_sentiment = base.get('sentiment_score') or 0.0
+        merged['sentiment_score'] = base_sentiment * (1 - ratio) + diff.get('sentiment_score', base_sentiment) * ratio
+        merged['confidence_score'] = min(base.get('confidence_score') or 0.0,
+                                         diff.get('confidence_score', base.get('confidence_score') or 0.0))
+        return merged
+    
+    def _select_keywords(self, document_id: int, keywords: List[str], analysis_tier: str) -> List[str]:
+        """
+        Λέξεις-κλειδιά σύμφωνα με το KEYWORD_SOURCE
+        
+        auto: TF-IDF της συλλογής για τις τοπικές αναλύσεις, του LLM για τις υπόλοιπες
+        tfidf: πάντα TF-IDF, merge: εναλλάξ LLM και TF-IDF χωρίς επαναλήψεις
+        Χωρίς καταχωρημένους όρους για το έγγραφο μένουν τα keywords της ανάλυσης.
+        """
+        source = config.KEYWORD_SOURCE
+        if source == 'llm' or (source == 'auto' and analysis_tier != 'local'):
+            return keywords
+        
+        corpus_keywords = self.keyword_engine.keywords_for([document_id]).get(document_id)
+        if not corpus_keywords:
+            return keywords
+        if source != 'merge':
+            return corpus_keywords
+        
+        merged, seen = [], set()
+        for pair in zip_longest(keywords, corpus_keywords, fillvalue=''):
+            for keyword in pair:
+                folded = fold_search_text(keyword.strip())
+                if folded and folded not in seen:
+                    seen.add(folded)
+                    merged.append(keyword.strip())
+        return merged[:config.KEYWORD_TOP_K]
+    
     def _combine_chunks(self, chunks: List[str], max_length: int = 8000) -> str:
         """Συνδυασμός chunks σε ένα κείμενο για ανάλυση"""
         if not chunks:
@@ -149,7 +256,8 @@ class AIAnalyzer:
     
     def analyze_chunk_individually(self, document_id: int, text_chunks: List[str]) -> Dict:
         """Ανάλυση κάθε chunk ξεχωριστά (για πολύ μεγάλα έγγραφα)"""
-        logger.info(f"Έναρξη chunk-by-chunk ανάλυσης για document {document_id}")
+        log = analysis_logger.bind(document_id=document_id)
+        log.info(f"Έναρξη chunk-by-chunk ανάλυσης για document {document_id}")
         start_time = time.time()
         
         all_summaries = []
@@ -159,7 +267,7 @@ class AIAnalyzer:
         errors = []
         
         for i, chunk in enumerate(text_chunks):
-            logger.debug(f"Ανάλυση chunk {i+1}/{len(text_chunks)}")
+            log.debug(f"Ανάλυση chunk {i+1}/{len(text_chunks)}")
             
             try:
                 # Περίληψη για κάθε chunk
@@ -184,7 +292,7 @@ class AIAnalyzer:
                 
             except Exception as e:
                 error_msg = f"Σφάλμα ανάλυσης chunk {i+1}: {str(e)}"
-                logger.warning(error_msg)
+                log.warning(error_msg)
                 errors.append(error_msg)
         
         # Συνδυασμός αποτελεσμάτων
@@ -213,7 +321,7 @@ class AIAnalyzer:
             
             self.db_manager.update_document_status(document_id, 'completed')
             
-            logger.info(f"Chunk-by-chunk ανάλυση ολοκληρώθηκε για document {document_id}")
+            log.info(f"Chunk-by-chunk ανάλυση ολοκληρώθηκε για document {document_id}")
             
             return {
                 'success': True,
@@ -231,7 +339,7 @@ class AIAnalyzer:
             
         except Exception as e:
             error_msg = f"Σφάλμα αποθήκευσης chunk analysis: {str(e)}"
-            logger.error(error_msg)
+            log.error(error_msg)
             self.db_manager.update_document_status(document_id, 'failed', error_msg)
             return {
                 'success': False,
@@ -322,15 +430,8 @@ class AIAnalyzer:
         logger.info(f"Επανάληψη ανάλυσης για document {document_id}")
         
         try:
-            # Ανάκτηση chunks από τη database
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.execute("""
-                    SELECT content FROM document_chunks 
-                    WHERE document_id = ? 
-                    ORDER BY chunk_index
-                """, (document_id,))
-                
-                chunks = [row['content'] for row in cursor.fetchall()]
+            # Ανάκτηση chunks από τη database (με αποσυμπίεση)
+            chunks = self.db_manager.get_document_chunks(document_id)
             
             if not chunks:
                 return {
@@ -0,0 +1,201 @@
+"""
+Worker ανάλυσης εγγράφων για AI Document Analyzer
+
+Ο web server μόνο καταχωρεί εργασίες (φάκελοι και επιλογές) στον πίνακα
+analysis_jobs. Ένας ή περισσότεροι workers (`python main.py worker`) τις
+δεσμεύουν, τρέχουν το pipeline και γράφουν την πρόοδο στη database, οπότε ο
+web server κλιμακώνεται σε πολλά processes ανεξάρτητα από την ανάλυση. Η
+διακοπή ζητείται επίσης μέσω της database. Στο development ο ίδιος worker
+τρέχει ως thread μέσα στον server (EMBEDDED_WORKER).
+"""
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional
+from config import config
+from core.database import DatabaseManager
+from core.file_scanner import FileScanner
+from core.file_watcher import FileWatcher
+from utils.logger import setup_logger
+from utils.metrics import stage_timer
+
+logger = setup_logger()
+
+# Ο worker του web server στο development (ένας ανά process)
+_embedded_worker: Optional['AnalysisWorker'] = None
+_embedded_lock = threading.Lock()
+
+class AnalysisWorker:
+    """Εκτέλεση των εργασιών ανάλυσης της ουράς"""
+    
+    def __init__(self, db_manager: DatabaseManager = None, pipeline_factory: Callable = None,
+                 name: str = None):
+        """
+        Args:
+            db_manager: Database με την ουρά εργασιών
+            pipeline_factory: Επιστρέφει το DocumentPipeline (default: νέο, στην πρώτη εργασία)
+            name: Όνομα του worker στις εργασίες (default: host:pid)
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._pipeline_factory = pipeline_factory
+        self._pipeline = None
+        self._watchers: Dict[int, FileWatcher] = {}
+        self._stop_event = threading.Event()
+    
+    @property
+    def pipeline(self):
+        """Το DocumentPipeline (οι βαριές βιβλιοθήκες φορτώνονται στην πρώτη εργασία)"""
+        if self._pipeline is None:
+            if self._pipeline_factory is not None:
+                self._pipeline = self._pipeline_factory()
+            else:
+                from core.ai_analyzer import AIAnalyzer
+                from core.document_processor import DocumentProcessor
+                from core.pipeline import DocumentPipeline
+                
+                semantic_search = None
+                if config.EMBEDDING_ENABLED:
+                    from core.semantic_search import SemanticSearch
+                    semantic_search = SemanticSearch(self.db_manager)
+                self._pipeline = DocumentPipeline(DocumentProcessor(), AIAnalyzer(), self.db_manager,
+                                                  semantic_search=semantic_search)
+        return self._pipeline
+    
+    def run(self, once: bool = False):
+        """
+        Εκτέλεση εργασιών μέχρι το stop()
+        
+        Args:
+            once: Τερματισμός όταν αδειάσει η ουρά (χωρίς παρακολουθήσεις φακέλων)
+        """
+        logger.info(f"Worker {self.name}: αναμονή εργασιών")
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            while not self._stop_event.is_set():
+                self._check_watchers()
+                job = self.db_manager.claim_analysis_job(self.name, config.JOB_HEARTBEAT_TIMEOUT)
+                if job is not None:
+                    self.process_job(job)
+                elif once and not self._watchers:
+                    break
+                else:
+                    self._stop_event.wait(config.JOB_POLL_INTERVAL)
+        finally:
+            # Οι παρακολουθήσεις μένουν 'watching' και συνεχίζονται από άλλον worker
+            for watcher in self._watchers.values():
+                watcher.stop()
+            self._watchers.clear()
+            self._stop_event.set()
+            heartbeat.join(timeout=5)
+            logger.info(f"Worker {self.name}: τερματισμός")
+    
+    def stop(self):
+        """Τερματισμός μετά το τρέχον αρχείο"""
+        self._stop_event.set()
+    
+    def process_job(self, job: Dict) -> str:
+        """
+        Σάρωση των φακέλων της εργασίας και ανάλυση των αρχείων
+        
+        Returns:
+            Η τελική κατάσταση της εργασίας
+        """
+        job_id, params = job['id'], job['params']
+        try:
+            logger.info(f"Εργασία {job_id}: ανάλυση φακέλων {', '.join(params['folder_paths'])}")
+            scanner = FileScanner()
+            scanner.supported_formats = set(params['extensions'])
+            
+            # Scan files (παράλληλα σε όλους τους επιλεγμένους φακέλους)
+            with stage_timer('scan'):
+                files = list(scanner.scan_directories(params['folder_paths'], params['recursive']))
+            
+            # Χρόνος αναμονής στην ουρά μετριέται από το τέλος της σάρωσης
+            queued_at = time.monotonic()
+            for file_info in files:
+                file_info['queued_at'] = queued_at
+            logger.info(f"Βρέθηκαν {len(files)} αρχεία για επεξεργασία")
+            
+            status, processed = 'completed', 0
+            for file_info in files:
+                if self.db_manager.update_analysis_job(job_id, total_files=len(files), processed_files=processed,
+                                                       current_file=file_info['filename']):
+                    status = 'cancelled'
+                    break
+                if self._stop_event.is_set():
+                    # Ο worker τερματίζεται: η εργασία ξαναμπαίνει στην ουρά
+                    status = 'queued'
+                    break
+                self.pipeline.process_file(file_info, params['detailed_analysis'])
+                processed += 1
+            
+            logger.info(f"Εργασία {job_id}: επεξεργάστηκαν {processed}/{len(files)} αρχεία")
+            
+            # Συνεχής παρακολούθηση: μόνο τα νέα/τροποποιημένα αρχεία περνούν στο pipeline
+            if status == 'completed' and params.get('watch'):
+                self._start_watcher(job_id, params, processed)
+                status = 'watching'
+            
+            self.db_manager.update_analysis_job(job_id, status=status, total_files=len(files),
+                                                processed_files=processed, current_file='')
+            return status
+        
+        except Exception as e:
+            logger.error(f"Σφάλμα εργασίας {job_id}: {e}")
+            self.db_manager.update_analysis_job(job_id, status='failed', error_message=str(e))
+            return 'failed'
+    
+    def _start_watcher(self, job_id: int, params: Dict, processed: int):
+        """Έναρξη file watcher που τροφοδοτεί το pipeline με αλλαγμένα αρχεία"""
+        watch_scanner = FileScanner()
+        watch_scanner.supported_formats = set(params['extensions'])
+        counters = {'total': processed, 'processed': processed}
+        
+        def on_files(batch):
+            queued_at = time.monotonic()
+            for file_info in batch:
+                file_info['queued_at'] = queued_at
+            counters['total'] += len(batch)
+            for file_info in batch:
+                if job_id not in self._watchers:  # Stopped
+                    break
+                self.db_manager.update_analysis_job(job_id, total_files=counters['total'],
+                                                    processed_files=counters['processed'],
+                                                    current_file=file_info['filename'])
+                self.pipeline.process_file(file_info, params['detailed_analysis'])
+                counters['processed'] += 1
+            self.db_manager.update_analysis_job(job_id, processed_files=counters['processed'], current_file='')
+        
+        watcher = FileWatcher(watch_scanner, on_files)
+        watcher.start(params['folder_paths'], params['recursive'])
+        self._watchers[job_id] = watcher
+    
+    def _check_watchers(self):
+        """Διακοπή των παρακολουθήσεων που ακυρώθηκαν"""
+        for job_id in list(self._watchers):
+            job = self.db_manager.get_analysis_job(job_id)
+            if job is None or job['cancel_requested']:
+                watcher = self._watchers.pop(job_id)
+                watcher.stop()
+                self.db_manager.update_analysis_job(job_id, status='cancelled', current_file='')
+                logger.info(f"Εργασία {job_id}: τέλος παρακολούθησης")
+    
+    def _heartbeat_loop(self):
+        """Heartbeat των εργασιών του worker, και όσο ένα αρχείο αναλύεται για πολύ"""
+        while not self._stop_event.wait(config.JOB_HEARTBEAT_INTERVAL):
+            try:
+                self.db_manager.heartbeat_analysis_jobs(self.name)
+            except Exception as e:
+                logger.warning(f"Σφάλμα heartbeat worker {self.name}: {e}")
+
+def start_embedded_worker(pipeline_factory: Callable = None) -> Optional[AnalysisWorker]:
+    """Worker σε daemon thread μέσα στον web server (EMBEDDED_WORKER), μία φορά ανά process"""
+    global _embedded_worker
+    with _embedded_lock:
+        if _embedded_worker is None:
+            _embedded_worker = AnalysisWorker(pipeline_factory=pipeline_factory)
+            threading.Thread(target=_embedded_worker.run, name="analysis-worker", daemon=True).start()
+        return _embedded_worker
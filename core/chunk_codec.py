@@ -0,0 +1,191 @@
+"""
+Chunk Codec για AI Document Analyzer
+"""
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+from config import config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Το zlib χρησιμοποιεί μόνο τα τελευταία 32KB του dictionary (μέγεθος παραθύρου)
+ZLIB_MAX_DICT_SIZE = 32 * 1024
+
+class ChunkCodec:
+    """
+    Συμπίεση περιεχομένου chunks (zlib/zstd με κοινό dictionary)
+    
+    Το πεδίο compression κάθε chunk έχει τη μορφή "zlib", "zlib:<dict_id>",
+    "zstd" ή "zstd:<dict_id>". NULL σημαίνει ασυμπίεστο κείμενο στο content.
+    """
+    
+    def __init__(self, algorithm: str = None, level: int = None,
+                 dict_loader: Callable[[int], Optional[Tuple[str, bytes]]] = None):
+        """
+        Args:
+            algorithm: none, zlib, zstd ή auto (default: config.CHUNK_COMPRESSION)
+            level: Επίπεδο συμπίεσης
+            dict_loader: Ανάκτηση (algorithm, dictionary) από τη database για άγνωστο dict_id
+        """
+        algorithm = (algorithm or config.CHUNK_COMPRESSION).lower()
+        if algorithm == 'auto':
+            algorithm = 'zstd' if ZSTD_AVAILABLE else 'zlib'
+        if algorithm == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("Το zstandard δεν είναι εγκατεστημένο, χρήση zlib για τα chunks")
+            algorithm = 'zlib'
+        
+        self.algorithm = algorithm
+        self.level = level or config.CHUNK_COMPRESSION_LEVEL
+        self.min_size = config.CHUNK_COMPRESSION_MIN_SIZE
+        self.dict_loader = dict_loader
+        
+        self._dictionaries: Dict[int, Tuple[str, bytes]] = {}
+        self._zstd_dicts: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._active_dict_id: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.algorithm != 'none'
+    
+    @property
+    def active_dict_id(self) -> Optional[int]:
+        return self._active_dict_id
+    
+    def register_dictionary(self, dict_id: int, algorithm: str, dictionary: bytes):
+        """Καταχώρηση dictionary (το νεότερο του ίδιου αλγορίθμου γίνεται ενεργό)"""
+        with self._lock:
+            self._dictionaries[dict_id] = (algorithm, dictionary)
+            if algorithm == self.algorithm and (self._active_dict_id is None or dict_id > self._active_dict_id):
+                self._active_dict_id = dict_id
+    
+    def encode(self, text: str) -> Tuple[Optional[str], Optional[bytes], Optional[str]]:
+        """
+        Συμπίεση chunk
+        
+        Returns:
+            (content, content_blob, compression) - ακριβώς ένα από content/content_blob δεν είναι None
+        """
+        raw = text.encode('utf-8')
+        if not self.enabled or len(raw) < self.min_size:
+            return text, None, None
+        
+        dict_id = self._active_dict_id
+        dictionary = self._dictionaries[dict_id][1] if dict_id is not None else None
+        
+        if self.algorithm == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=self.level,
+                                                  dict_data=self._zstd_dict(dict_id))
+            blob = compressor.compress(raw)
+        else:
+            compressor = zlib.compressobj(self.level, zdict=dictionary) if dictionary else zlib.compressobj(self.level)
+            blob = compressor.compress(raw) + compressor.flush()
+        
+        # Πολύ μικρά ή ασυμπίεστα chunks μένουν ως κείμενο
+        if len(blob) >= len(raw):
+            return text, None, None
+        
+        compression = self.algorithm if dict_id is None else f"{self.algorithm}:{dict_id}"
+        return None, blob, compression
+    
+    def decode(self, content: Optional[str], blob: Optional[bytes], compression: Optional[str]) -> str:
+        """Αποσυμπίεση chunk (ή επιστροφή του content αν είναι ασυμπίεστο)"""
+        if not compression:
+            return content or ''
+        
+        algorithm, _, dict_part = compression.partition(':')
+        dict_id = int(dict_part) if dict_part else None
+        
+        if algorithm == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise Exception("Το chunk είναι συμπιεσμένο με zstd αλλά το zstandard δεν είναι εγκατεστημένο")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict(dict_id))
+            raw = decompressor.decompress(blob)
+        elif algorithm == 'zlib':
+            if dict_id is None:
+                raw = zlib.decompress(blob)
+            else:
+                decompressor = zlib.decompressobj(zdict=self._get_dictionary(dict_id))
+                raw = decompressor.decompress(blob) + decompressor.flush()
+        else:
+            raise ValueError(f"Άγνωστη συμπίεση chunk: {compression}")
+        
+        return raw.decode('utf-8')
+    
+    def train_dictionary(self, samples: List[str], dict_size: int = None) -> Optional[bytes]:
+        """
+        Δημιουργία κοινού dictionary από δείγμα chunks
+        
+        Για zstd χρησιμοποιείται ο trainer του zstandard. Για zlib το dictionary
+        είναι οι πιο συχνές φράσεις του δείγματος, με τις συχνότερες στο τέλος
+        (μικρότερες αποστάσεις αναφοράς).
+        """
+        if not samples:
+            return None
+        
+        dict_size = dict_size or config.CHUNK_DICT_SIZE
+        
+        if self.algorithm == 'zstd':
+            try:
+                trained = zstandard.train_dictionary(dict_size, [s.encode('utf-8') for s in samples])
+                return trained.as_bytes()
+            except zstandard.ZstdError as e:
+                logger.warning(f"Αποτυχία εκπαίδευσης zstd dictionary: {e}")
+                return None
+        
+        dict_size = min(dict_size, ZLIB_MAX_DICT_SIZE)
+        phrases = Counter()
+        for sample in samples:
+            words = re.findall(r'\w+[^\w\n]{0,2}', sample)
+            for n in (1, 2, 3):
+                for i in range(len(words) - n + 1):
+                    phrases[''.join(words[i:i + n])] += 1
+        
+        # Κέρδος ≈ συχνότητα × μήκος, μόνο φράσεις που επαναλαμβάνονται
+        scored = sorted(((count * len(phrase), phrase) for phrase, count in phrases.items()
+                         if count > 1 and len(phrase) > 3), reverse=True)
+        
+        selected = []
+        total = 0
+        for _, phrase in scored:
+            encoded = phrase.encode('utf-8')
+            if total + len(encoded) > dict_size:
+                continue
+            selected.append(encoded)
+            total += len(encoded)
+        
+        if not selected:
+            return None
+        
+        return b''.join(reversed(selected))
+    
+    def _get_dictionary(self, dict_id: int) -> bytes:
+        """Dictionary από την cache ή τη database (π.χ. δημιουργήθηκε από άλλο process)"""
+        entry = self._dictionaries.get(dict_id)
+        if entry is None and self.dict_loader is not None:
+            entry = self.dict_loader(dict_id)
+            if entry is not None:
+                self.register_dictionary(dict_id, *entry)
+        if entry is None:
+            raise Exception(f"Δεν βρέθηκε το compression dictionary {dict_id}")
+        return entry[1]
+    
+    def _zstd_dict(self, dict_id: Optional[int]):
+        if dict_id is None:
+            return None
+        
+        zstd_dict = self._zstd_dicts.get(dict_id)
+        if zstd_dict is None:
+            zstd_dict = zstandard.ZstdCompressionDict(self._get_dictionary(dict_id))
+            self._zstd_dicts[dict_id] = zstd_dict
+        return zstd_dict
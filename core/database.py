@@ -1,82 +1,58 @@
 """
 Database Manager για AI Document Analyzer
 """
+import heapq
 import sqlite3
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from config import config
+from core.chunk_codec import ChunkCodec
+from core.migrations import rebuild_stat_counters, run_migrations
+from core.text_search import build_match_query, fold_search_text, make_snippet
 from utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Ταξινόμηση της λίστας εγγράφων (τα ονόματα συγκρίνονται χωρίς τόνους και κεφαλαία)
+_DOCUMENT_SORTS = {
+    'date_desc': "d.created_at DESC",
+    'date_asc': "d.created_at ASC",
+    'name_asc': "search_text(d.filename) ASC",
+    'name_desc': "search_text(d.filename) DESC",
+    'size_desc': "d.file_size DESC"
+}
+
 class DatabaseManager:
     """Διαχείριση database operations"""
     
-    def __init__(self):
-        self.db_path = config.DATABASE_PATH
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or config.DATABASE_PATH
+        self.chunk_codec = ChunkCodec(dict_loader=self._load_compression_dict)
+        self._dicts_loaded = False
     
     def get_connection(self):
         """Δημιουργία σύνδεσης με database"""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row  # Για dict-like access
+        conn.execute("PRAGMA foreign_keys = ON")  # Εφαρμογή ON DELETE CASCADE
+        # Τα delete triggers των στατιστικών εκτελούνται και στο INSERT OR REPLACE
+        conn.execute("PRAGMA recursive_triggers = ON")
+        # Αποσυμπίεση chunks μέσα σε SQL (π.χ. αναζήτηση με LIKE)
+        conn.create_function('chunk_text', 3, self.chunk_codec.decode, deterministic=True)
+        # Κανονικοποίηση κειμένου για τους FTS5 indexes (triggers και queries)
+        conn.create_function('search_text', 1, fold_search_text, deterministic=True)
         return conn
     
     def initialize_database(self):
-        """Δημιουργία database tables"""
+        """Δημιουργία ή αναβάθμιση του database schema (versioned migrations)"""
         with self.get_connection() as conn:
-            # Table για documents
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS documents (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filepath TEXT UNIQUE NOT NULL,
-                    filename TEXT NOT NULL,
-                    file_size INTEGER,
-                    file_type TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    modified_at TIMESTAMP,
-                    processed_at TIMESTAMP,
-                    status TEXT DEFAULT 'pending',
-                    error_message TEXT
-                )
-            ''')
-            
-            # Table για AI analysis results
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS analysis_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    document_id INTEGER,
-                    summary TEXT,
-                    keywords TEXT,  -- JSON array
-                    categories TEXT,  -- JSON array
-                    sentiment_score REAL,
-                    confidence_score REAL,
-                    processing_time REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (document_id) REFERENCES documents (id)
-                )
-            ''')
-            
-            # Table για document content chunks
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS document_chunks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    document_id INTEGER,
-                    chunk_index INTEGER,
-                    content TEXT,
-                    word_count INTEGER,
-                    FOREIGN KEY (document_id) REFERENCES documents (id)
-                )
-            ''')
-            
-            # Indexes για καλύτερη απόδοση
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_filepath ON documents(filepath)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_document_id ON analysis_results(document_id)')
-            
-            conn.commit()
-            logger.info("Database tables δημιουργήθηκαν επιτυχώς")
+            # Το journal mode αποθηκεύεται στο αρχείο (WAL: αναγνώσεις παράλληλα με τον writer)
+            conn.execute(f"PRAGMA journal_mode = {config.DATABASE_JOURNAL_MODE}")
+            version = run_migrations(conn)
+            logger.info(f"Database schema στην έκδοση {version}")
     
     def add_document(self, filepath: str, filename: str, file_size: int, file_type: str) -> int:
         """Προσθήκη νέου document"""
@@ -104,29 +80,463 @@ class DatabaseManager:
     
     def add_analysis_result(self, document_id: int, summary: str, keywords: List[str], 
                           categories: List[str], sentiment_score: float, 
-                          confidence_score: float, processing_time: float):
-        """Προσθήκη αποτελεσμάτων ανάλυσης"""
+                          confidence_score: float, processing_time: float,
+                          prompt_tokens: int = None, eval_tokens: int = None,
+                          tokens_per_second: float = None, analysis_tier: str = 'llm'):
+        """
+        Προσθήκη αποτελεσμάτων ανάλυσης (με τα στατιστικά tokens του LLM αν υπάρχουν)
+        
+        analysis_tier: 'llm' ή 'local' (τοπική ανάλυση χωρίς LLM)
+        """
         with self.get_connection() as conn:
             conn.execute('''
                 INSERT INTO analysis_results 
                 (document_id, summary, keywords, categories, sentiment_score, 
-                 confidence_score, processing_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                 confidence_score, processing_time, prompt_tokens, eval_tokens, tokens_per_second,
+                 analysis_tier)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (document_id, summary, json.dumps(keywords), json.dumps(categories),
-                  sentiment_score, confidence_score, processing_time))
+                  sentiment_score, confidence_score, processing_time,
+                  prompt_tokens, eval_tokens, tokens_per_second, analysis_tier))
             conn.commit()
     
     def add_document_chunks(self, document_id: int, chunks: List[str]):
-        """Προσθήκη chunks εγγράφου"""
+        """Προσθήκη chunks εγγράφου (συμπιεσμένα αν είναι ενεργή η συμπίεση)"""
         with self.get_connection() as conn:
+            if self.chunk_codec.enabled:
+                self._ensure_compression_dict(conn)
+            
+            rows = []
             for i, chunk in enumerate(chunks):
                 word_count = len(chunk.split())
-                conn.execute('''
-                    INSERT INTO document_chunks 
-                    (document_id, chunk_index, content, word_count)
-                    VALUES (?, ?, ?, ?)
-                ''', (document_id, i, chunk, word_count))
+                content, content_blob, compression = self.chunk_codec.encode(chunk)
+                rows.append((document_id, i, content, content_blob, compression,
+                             len(chunk.encode('utf-8')), word_count))
+            
+            conn.executemany('''
+                INSERT INTO document_chunks 
+                (document_id, chunk_index, content, content_blob, compression, raw_size, word_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+    
+    def iter_document_chunks(self, document_id: int):
+        """Chunks εγγράφου με τη σειρά, με αποσυμπίεση κατά την ανάγνωση"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT content, content_blob, compression FROM document_chunks 
+                WHERE document_id = ? 
+                ORDER BY chunk_index
+            ''', (document_id,))
+            for row in cursor:
+                yield self.chunk_codec.decode(row['content'], row['content_blob'], row['compression'])
+    
+    def get_document_chunks(self, document_id: int) -> List[str]:
+        """Όλα τα chunks εγγράφου"""
+        return list(self.iter_document_chunks(document_id))
+    
+    def get_document_chunk_rows(self, document_id: int) -> List[Tuple[int, str]]:
+        """(chunk_id, κείμενο) των chunks εγγράφου με τη σειρά"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT id, content, content_blob, compression FROM document_chunks 
+                WHERE document_id = ? 
+                ORDER BY chunk_index
+            ''', (document_id,))
+            return [(row['id'], self.chunk_codec.decode(row['content'], row['content_blob'], row['compression']))
+                    for row in cursor]
+    
+    def add_chunk_embeddings(self, model: str, dim: int, rows: List[Tuple[int, int, bytes]]):
+        """Αποθήκευση embeddings (chunk_id, document_id, float32 bytes)"""
+        with self.get_connection() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO chunk_embeddings (chunk_id, document_id, model, dim, vector)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(chunk_id, document_id, model, dim, vector) for chunk_id, document_id, vector in rows])
+            conn.commit()
+    
+    def iter_chunk_embeddings(self, model: str, batch_size: int = 1000):
+        """(chunk_id, document_id, vector bytes) για όλα τα embeddings του model, κατά chunk_id"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT chunk_id, document_id, vector FROM chunk_embeddings 
+                WHERE model = ? 
+                ORDER BY chunk_id
+            ''', (model,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row['chunk_id'], row['document_id'], row['vector']
+    
+    def get_embedding_stats(self, model: str) -> Dict:
+        """Πλήθος, μεγαλύτερο chunk_id και διάσταση των embeddings ενός model"""
+        with self.get_connection() as conn:
+            row = conn.execute('''
+                SELECT COUNT(*) AS count, MAX(chunk_id) AS max_chunk_id, MAX(dim) AS dim 
+                FROM chunk_embeddings WHERE model = ?
+            ''', (model,)).fetchone()
+            return {'count': row['count'], 'max_chunk_id': row['max_chunk_id'] or 0, 'dim': row['dim']}
+    
+    def get_documents_without_embeddings(self, model: str, limit: int = None) -> List[int]:
+        """Έγγραφα με chunks χωρίς embeddings (εκτός διπλοτύπων)"""
+        with self.get_connection() as conn:
+            query = '''
+                SELECT d.id FROM documents d
+                WHERE EXISTS (SELECT 1 FROM document_chunks c WHERE c.document_id = d.id)
+                  AND NOT EXISTS (SELECT 1 FROM chunk_embeddings e 
+                                  WHERE e.document_id = d.id AND e.model = ?)
+                  AND NOT EXISTS (SELECT 1 FROM document_duplicates dup WHERE dup.document_id = d.id)
+                ORDER BY d.id
+            '''
+            params = [model]
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+            return [row['id'] for row in conn.execute(query, params)]
+    
+    def set_document_terms(self, document_id: int, term_counts: Dict[str, Tuple[int, str]]):
+        """
+        Όροι εγγράφου για TF-IDF: κανονικοποιημένος όρος -> (συχνότητα, μορφή εμφάνισης)
+        
+        Η προηγούμενη γραμμή του εγγράφου διαγράφεται πρώτα, ώστε τα triggers
+        να αφαιρέσουν τα document frequencies της πριν προστεθούν τα νέα.
+        """
+        terms = list(term_counts)
+        with self.get_connection() as conn:
+            conn.executemany("INSERT OR IGNORE INTO keyword_terms (term, display) VALUES (?, ?)",
+                             [(term, term_counts[term][1]) for term in terms])
+            term_ids = {row['term']: row['id'] for row in conn.execute(
+                "SELECT id, term FROM keyword_terms WHERE term IN (SELECT value FROM json_each(?))",
+                (json.dumps(terms),))}
+            conn.execute("DELETE FROM document_terms WHERE document_id = ?", (document_id,))
+            conn.execute("INSERT INTO document_terms (document_id, term_ids, counts) VALUES (?, ?, ?)",
+                         (document_id, json.dumps([term_ids[term] for term in terms]),
+                          json.dumps([term_counts[term][0] for term in terms])))
+            conn.commit()
+    
+    def iter_document_terms(self, document_ids: List[int] = None, batch_size: int = 1000):
+        """
+        Batches από (document_id, term_ids, counts): οι sparse γραμμές του πίνακα
+        όρων-εγγράφων, για όλα τα έγγραφα ή μόνο τα δοσμένα
+        
+        Τα term_ids και counts μένουν JSON κείμενο ώστε να αναλύονται μαζικά (KeywordEngine).
+        """
+        with self.get_connection() as conn:
+            if document_ids is None:
+                cursor = conn.execute("SELECT document_id, term_ids, counts FROM document_terms "
+                                      "ORDER BY document_id")
+            else:
+                cursor = conn.execute('''
+                    SELECT document_id, term_ids, counts FROM document_terms 
+                    WHERE document_id IN (SELECT value FROM json_each(?)) 
+                    ORDER BY document_id
+                ''', (json.dumps(document_ids),))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [(row['document_id'], row['term_ids'], row['counts']) for row in rows]
+    
+    def get_term_statistics(self, term_ids: List[int] = None) -> Tuple[int, List[Tuple[int, int]]]:
+        """Πλήθος εγγράφων της συλλογής και (term_id, document frequency) όλων ή των δοσμένων όρων"""
+        with self.get_connection() as conn:
+            documents = conn.execute("SELECT documents FROM keyword_corpus WHERE id = 1").fetchone()
+            if term_ids is None:
+                cursor = conn.execute("SELECT id, document_frequency FROM keyword_terms")
+            else:
+                cursor = conn.execute("SELECT id, document_frequency FROM keyword_terms "
+                                      "WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(term_ids),))
+            return (documents['documents'] if documents else 0), [tuple(row) for row in cursor]
+    
+    def get_term_display(self, term_ids: List[int]) -> Dict[int, str]:
+        """Μορφή εμφάνισης των όρων"""
+        with self.get_connection() as conn:
+            cursor = conn.execute("SELECT id, display FROM keyword_terms "
+                                  "WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(term_ids),))
+            return {row['id']: row['display'] for row in cursor}
+    
+    def get_documents_without_terms(self, limit: int = None) -> List[int]:
+        """Έγγραφα με chunks που δεν έχουν μπει στα στατιστικά όρων (εκτός διπλοτύπων)"""
+        with self.get_connection() as conn:
+            query = '''
+                SELECT d.id FROM documents d
+                WHERE EXISTS (SELECT 1 FROM document_chunks c WHERE c.document_id = d.id)
+                  AND NOT EXISTS (SELECT 1 FROM document_terms t WHERE t.document_id = d.id)
+                  AND NOT EXISTS (SELECT 1 FROM document_duplicates dup WHERE dup.document_id = d.id)
+                ORDER BY d.id
+            '''
+            params = []
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+            return [row['id'] for row in conn.execute(query, params)]
+    
+    def update_analysis_keywords(self, keywords_by_document: Dict[int, List[str]], tier: str = None) -> int:
+        """
+        Αντικατάσταση των keywords της πιο πρόσφατης ανάλυσης κάθε εγγράφου
+        
+        Args:
+            keywords_by_document: document_id -> keywords
+            tier: Μόνο αναλύσεις αυτού του επιπέδου ('llm', 'local'), None για όλες
+        
+        Returns:
+            Πλήθος αναλύσεων που ενημερώθηκαν
+        """
+        with self.get_connection() as conn:
+            cursor = conn.executemany('''
+                UPDATE analysis_results SET keywords = ? 
+                WHERE id = (SELECT MAX(id) FROM analysis_results WHERE document_id = ?)
+                  AND (? IS NULL OR analysis_tier = ?)
+            ''', [(json.dumps(keywords), document_id, tier, tier)
+                  for document_id, keywords in keywords_by_document.items()])
+            conn.commit()
+            return cursor.rowcount
+    
+    def compress_existing_chunks(self, batch_size: int = 500, vacuum: bool = False) -> Dict:
+        """
+        Συμπίεση των ασυμπίεστων chunks (π.χ. μετά από αναβάθμιση database)
+        
+        Args:
+            batch_size: Chunks ανά transaction
+            vacuum: VACUUM στο τέλος ώστε να μικρύνει το αρχείο της database
+        
+        Returns:
+            Dict με chunks, bytes_before, bytes_after
+        """
+        stats = {'chunks': 0, 'bytes_before': 0, 'bytes_after': 0}
+        if not self.chunk_codec.enabled:
+            return stats
+        
+        last_id = 0
+        with self.get_connection() as conn:
+            self._ensure_compression_dict(conn)
+            
+            while True:
+                rows = conn.execute('''
+                    SELECT id, content FROM document_chunks 
+                    WHERE compression IS NULL AND content IS NOT NULL AND id > ?
+                    ORDER BY id LIMIT ?
+                ''', (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for row in rows:
+                    raw_size = len(row['content'].encode('utf-8'))
+                    content, content_blob, compression = self.chunk_codec.encode(row['content'])
+                    stats['bytes_before'] += raw_size
+                    stats['bytes_after'] += len(content_blob) if content_blob is not None else raw_size
+                    if compression is not None:
+                        updates.append((content, content_blob, compression, raw_size, row['id']))
+                
+                conn.executemany('''
+                    UPDATE document_chunks 
+                    SET content = ?, content_blob = ?, compression = ?, raw_size = ?
+                    WHERE id = ?
+                ''', updates)
+                conn.commit()
+                
+                stats['chunks'] += len(updates)
+                last_id = rows[-1]['id']
+        
+        if vacuum:
+            with self.get_connection() as conn:
+                conn.execute("VACUUM")
+        
+        logger.info(f"Συμπιέστηκαν {stats['chunks']} chunks "
+                    f"({stats['bytes_before']} -> {stats['bytes_after']} bytes)")
+        return stats
+    
+    def get_chunk_storage_report(self) -> Dict:
+        """Μέγεθος αποθήκευσης chunks ανά τύπο συμπίεσης και μέγεθος αρχείου database"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT COALESCE(compression, 'none') AS compression,
+                       COUNT(*) AS chunks,
+                       SUM(COALESCE(raw_size, length(CAST(content AS BLOB)))) AS raw_bytes,
+                       SUM(COALESCE(length(content_blob), length(CAST(content AS BLOB)))) AS stored_bytes
+                FROM document_chunks
+                GROUP BY COALESCE(compression, 'none')
+            ''')
+            by_compression = {row['compression']: dict(row) for row in cursor.fetchall()}
+            
+            raw_bytes = sum(entry['raw_bytes'] or 0 for entry in by_compression.values())
+            stored_bytes = sum(entry['stored_bytes'] or 0 for entry in by_compression.values())
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            
+            return {
+                'by_compression': by_compression,
+                'raw_bytes': raw_bytes,
+                'stored_bytes': stored_bytes,
+                'ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+                'database_bytes': page_size * page_count
+            }
+    
+    def _ensure_compression_dict(self, conn):
+        """Φόρτωση dictionaries και εκπαίδευση νέου όταν υπάρχουν αρκετά chunks"""
+        if not self._dicts_loaded:
+            for row in conn.execute("SELECT id, algorithm, dictionary FROM compression_dicts"):
+                self.chunk_codec.register_dictionary(row['id'], row['algorithm'], row['dictionary'])
+            self._dicts_loaded = True
+        
+        if self.chunk_codec.active_dict_id is not None:
+            return
+        
+        # Άλλο instance/process μπορεί να έχει ήδη δημιουργήσει dictionary
+        row = conn.execute('''
+            SELECT id, algorithm, dictionary FROM compression_dicts 
+            WHERE algorithm = ? ORDER BY id DESC LIMIT 1
+        ''', (self.chunk_codec.algorithm,)).fetchone()
+        if row:
+            self.chunk_codec.register_dictionary(row['id'], row['algorithm'], row['dictionary'])
+            return
+        
+        available = conn.execute('''
+            SELECT COUNT(*) FROM (SELECT 1 FROM document_chunks LIMIT ?)
+        ''', (config.CHUNK_DICT_MIN_CHUNKS,)).fetchone()[0]
+        if available < config.CHUNK_DICT_MIN_CHUNKS:
+            return
+        
+        cursor = conn.execute('''
+            SELECT content, content_blob, compression FROM document_chunks 
+            ORDER BY RANDOM() LIMIT ?
+        ''', (config.CHUNK_DICT_SAMPLE_SIZE,))
+        samples = [self.chunk_codec.decode(row['content'], row['content_blob'], row['compression'])
+                   for row in cursor.fetchall()]
+        
+        dictionary = self.chunk_codec.train_dictionary(samples)
+        if not dictionary:
+            return
+        
+        cursor = conn.execute('''
+            INSERT INTO compression_dicts (algorithm, dictionary, sample_count)
+            VALUES (?, ?, ?)
+        ''', (self.chunk_codec.algorithm, dictionary, len(samples)))
+        self.chunk_codec.register_dictionary(cursor.lastrowid, self.chunk_codec.algorithm, dictionary)
+        logger.info(f"Νέο compression dictionary {cursor.lastrowid} ({self.chunk_codec.algorithm}, "
+                    f"{len(dictionary)} bytes από {len(samples)} chunks)")
+    
+    def _load_compression_dict(self, dict_id: int):
+        """Ανάκτηση dictionary για αποσυμπίεση (νέα σύνδεση, καλείται και μέσα από SQL)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute("SELECT algorithm, dictionary FROM compression_dicts WHERE id = ?",
+                               (dict_id,)).fetchone()
+            return (row[0], row[1]) if row else None
+        finally:
+            conn.close()
+    
+    def add_document_signature(self, document_id: int, content_hash: str, minhash: bytes):
+        """Αποθήκευση υπογραφής περιεχομένου εγγράφου"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO document_signatures 
+                (document_id, content_hash, minhash)
+                VALUES (?, ?, ?)
+            ''', (document_id, content_hash, minhash))
+            conn.commit()
+    
+    def iter_document_signatures(self):
+        """Ανάκτηση (document_id, minhash) για όλα τα υπάρχοντα documents"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT s.document_id, s.minhash FROM document_signatures s
+                JOIN documents d ON d.id = s.document_id
+                WHERE s.minhash IS NOT NULL
+            ''')
+            for row in cursor:
+                yield row['document_id'], row['minhash']
+    
+    def find_document_by_content_hash(self, content_hash: str, exclude_id: int = None) -> Optional[int]:
+        """Εύρεση document με ίδιο περιεχόμενο (προτίμηση σε ολοκληρωμένα)"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT d.id FROM document_signatures s
+                JOIN documents d ON d.id = s.document_id
+                WHERE s.content_hash = ? AND d.id != ?
+                ORDER BY (d.status = 'completed') DESC, d.id ASC
+                LIMIT 1
+            ''', (content_hash, exclude_id if exclude_id is not None else -1))
+            
+            row = cursor.fetchone()
+            return row['id'] if row else None
+    
+    def filter_existing_documents(self, document_ids: List[int]) -> List[int]:
+        """Φιλτράρισμα ids που αντιστοιχούν σε υπάρχοντα documents"""
+        if not document_ids:
+            return []
+        
+        with self.get_connection() as conn:
+            placeholders = ','.join('?' * len(document_ids))
+            cursor = conn.execute(f"SELECT id FROM documents WHERE id IN ({placeholders})",
+                                  document_ids)
+            return [row['id'] for row in cursor.fetchall()]
+    
+    def get_canonical_document_id(self, document_id: int) -> int:
+        """Ο canonical document της ομάδας διπλότυπων (ή το ίδιο το document)"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT canonical_id FROM document_duplicates WHERE document_id = ?",
+                (document_id,)
+            )
+            row = cursor.fetchone()
+            return row['canonical_id'] if row else document_id
+    
+    def add_duplicate(self, document_id: int, canonical_id: int, similarity: float, match_type: str):
+        """Καταγραφή εγγράφου ως διπλότυπο άλλου"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO document_duplicates 
+                (document_id, canonical_id, similarity, match_type)
+                VALUES (?, ?, ?, ?)
+            ''', (document_id, canonical_id, similarity, match_type))
+            conn.commit()
+    
+    def copy_analysis_result(self, source_document_id: int, target_document_id: int) -> bool:
+        """Αντιγραφή του τελευταίου αποτελέσματος ανάλυσης σε άλλο document"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO analysis_results 
+                (document_id, summary, keywords, categories, sentiment_score, 
+                 confidence_score, processing_time, analysis_tier)
+                SELECT ?, summary, keywords, categories, sentiment_score, 
+                       confidence_score, 0.0, analysis_tier
+                FROM analysis_results
+                WHERE document_id = ?
+                ORDER BY id DESC
+                LIMIT 1
+            ''', (target_document_id, source_document_id))
             conn.commit()
+            return cursor.rowcount > 0
+    
+    def get_duplicate_groups(self) -> List[Dict]:
+        """Ομάδες διπλότυπων εγγράφων ανά canonical document"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT dup.canonical_id, dup.document_id, dup.similarity, dup.match_type,
+                       d.filename
+                FROM document_duplicates dup
+                JOIN documents d ON d.id = dup.document_id
+                ORDER BY dup.canonical_id, dup.similarity DESC
+            ''')
+            
+            groups = {}
+            for row in cursor.fetchall():
+                group = groups.setdefault(row['canonical_id'], {
+                    'canonical_id': row['canonical_id'],
+                    'duplicates': []
+                })
+                group['duplicates'].append({
+                    'document_id': row['document_id'],
+                    'filename': row['filename'],
+                    'similarity': row['similarity'],
+                    'match_type': row['match_type']
+                })
+            
+            return list(groups.values())
     
     def get_documents(self, status: str = None, limit: int = None) -> List[Dict]:
         """Ανάκτηση documents"""
@@ -148,27 +558,111 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
     
     def get_document_with_analysis(self, document_id: int) -> Optional[Dict]:
-        """Ανάκτηση document με analysis results"""
+        """Ανάκτηση document με την τελευταία ανάλυσή του"""
         with self.get_connection() as conn:
             cursor = conn.execute('''
                 SELECT d.*, a.summary, a.keywords, a.categories, 
-                       a.sentiment_score, a.confidence_score, a.processing_time
+                       a.sentiment_score, a.confidence_score, a.processing_time, a.analysis_tier,
+                       dup.canonical_id AS duplicate_of, dup.match_type AS duplicate_type
                 FROM documents d
-                LEFT JOIN analysis_results a ON d.id = a.document_id
+                LEFT JOIN analysis_results a
+                    ON a.id = (SELECT MAX(id) FROM analysis_results WHERE document_id = d.id)
+                LEFT JOIN document_duplicates dup ON d.id = dup.document_id
                 WHERE d.id = ?
             ''', (document_id,))
             
             row = cursor.fetchone()
             if row:
-                result = dict(row)
-                # Parse JSON fields
-                if result.get('keywords'):
-                    result['keywords'] = json.loads(result['keywords'])
-                if result.get('categories'):
-                    result['categories'] = json.loads(result['categories'])
-                return result
+                return self._document_row(row)
             return None
     
+    def query_documents(self, status: str = None, file_types: List[str] = None, sort_by: str = 'date_desc',
+                        document_ids: List[int] = None, limit: int = None, offset: int = 0) -> Dict:
+        """
+        Σελίδα documents με την τελευταία ανάλυσή τους (ένα joined query αντί για ένα ανά document)
+        
+        Args:
+            status: Μόνο documents με αυτό το status
+            file_types: Μόνο αυτοί οι τύποι αρχείων (χωρίς τελεία)
+            sort_by: date_desc, date_asc, name_asc, name_desc ή size_desc
+            document_ids: Μόνο αυτά τα documents, με τη σειρά τους (κατάταξη αναζήτησης)
+            limit, offset: Η σελίδα μετά τα filters
+        
+        Returns:
+            Dict με documents της σελίδας και total (πλήθος μετά τα filters)
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("d.status = ?")
+            params.append(status)
+        if file_types:
+            conditions.append(f"d.file_type IN ({','.join('?' * len(file_types))})")
+            params.extend(file_types)
+        
+        with self.get_connection() as conn:
+            if document_ids is not None:
+                # Τα filters εφαρμόζονται στη database, η σειρά κατάταξης στην Python
+                matching = set()
+                for start in range(0, len(document_ids), 500):
+                    batch = document_ids[start:start + 500]
+                    where = ' AND '.join([f"d.id IN ({','.join('?' * len(batch))})"] + conditions)
+                    matching.update(row[0] for row in conn.execute(
+                        f"SELECT d.id FROM documents d WHERE {where}", batch + params))
+                ordered = [document_id for document_id in document_ids if document_id in matching]
+                total = len(ordered)
+                page = ordered[offset:offset + limit] if limit else ordered[offset:]
+                if not page:
+                    return {'documents': [], 'total': total}
+                conditions = [f"d.id IN ({','.join('?' * len(page))})"]
+                params = list(page)
+                order, page_clause = "", ""
+            else:
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                total = conn.execute(f"SELECT COUNT(*) FROM documents d {where}", params).fetchone()[0]
+                order = f"ORDER BY {_DOCUMENT_SORTS.get(sort_by, _DOCUMENT_SORTS['date_desc'])}, d.id DESC"
+                page_clause = "LIMIT ? OFFSET ?"
+                params = params + [limit if limit else -1, offset]
+            
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor = conn.execute(f'''
+                SELECT d.*, a.summary, a.keywords, a.categories,
+                       a.sentiment_score, a.confidence_score, a.processing_time, a.analysis_tier,
+                       dup.canonical_id AS duplicate_of, dup.match_type AS duplicate_type
+                FROM documents d
+                LEFT JOIN analysis_results a
+                    ON a.id = (SELECT MAX(id) FROM analysis_results WHERE document_id = d.id)
+                LEFT JOIN document_duplicates dup ON d.id = dup.document_id
+                {where}
+                {order}
+                {page_clause}
+            ''', params)
+            documents = [self._document_row(row) for row in cursor.fetchall()]
+        
+        if document_ids is not None:
+            position = {document_id: index for index, document_id in enumerate(page)}
+            documents.sort(key=lambda doc: position[doc['id']])
+        return {'documents': documents, 'total': total}
+    
+    @staticmethod
+    def _document_row(row: sqlite3.Row) -> Dict:
+        """Document με analysis results, με τα JSON πεδία αναλυμένα"""
+        result = dict(row)
+        if result.get('keywords'):
+            result['keywords'] = json.loads(result['keywords'])
+        if result.get('categories'):
+            result['categories'] = json.loads(result['categories'])
+        return result
+    
+    def get_documents_by_ids(self, document_ids: List[int]) -> List[Dict]:
+        """Documents με τη σειρά των ids (π.χ. κατάταξη σημασιολογικής αναζήτησης)"""
+        if not document_ids:
+            return []
+        with self.get_connection() as conn:
+            placeholders = ','.join('?' * len(document_ids))
+            cursor = conn.execute(f"SELECT * FROM documents WHERE id IN ({placeholders})", document_ids)
+            by_id = {row['id']: dict(row) for row in cursor.fetchall()}
+        return [by_id[document_id] for document_id in document_ids if document_id in by_id]
+    
     def search_documents(self, query: str) -> List[Dict]:
         """Αναζήτηση στα documents"""
         with self.get_connection() as conn:
@@ -179,35 +673,642 @@ class DatabaseManager:
                 WHERE d.filename LIKE ? 
                    OR a.summary LIKE ? 
                    OR a.keywords LIKE ?
-                   OR c.content LIKE ?
+                   OR chunk_text(c.content, c.content_blob, c.compression) LIKE ?
                 ORDER BY d.created_at DESC
             ''', (f'%{query}%', f'%{query}%', f'%{query}%', f'%{query}%'))
             
             return [dict(row) for row in cursor.fetchall()]
     
-    def get_statistics(self) -> Dict:
-        """Στατιστικά της εφαρμογής"""
+    def hybrid_search(self, query: str, top_k: int = None, semantic_matches: List[Dict] = None,
+                      budget_ms: float = None) -> Dict:
+        """
+        Αναζήτηση με κατάταξη: BM25 (FTS5) σε documents και chunks, συγχωνευμένο
+        με τη σημασιολογική κατάταξη (reciprocal rank fusion ή weighted)
+        
+        Args:
+            query: Κείμενο αναζήτησης
+            top_k: Πλήθος αποτελεσμάτων (default: config.SEARCH_TOP_K)
+            semantic_matches: Αποτελέσματα του SemanticSearch.search (document_id, chunk_id, score)
+            budget_ms: Όριο χρόνου των queries· όταν ξεπεραστεί επιστρέφονται όσα βρέθηκαν
+        
+        Returns:
+            Dict με results (document_id, score, chunk_id, snippet, highlights, sources),
+            truncated και elapsed_ms
+        """
+        top_k = top_k or config.SEARCH_TOP_K
+        candidates = max(config.SEARCH_CANDIDATES, top_k)
+        budget_ms = config.SEARCH_BUDGET_MS if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000
+        
+        # Λίστες κατάταξης: document_id -> (θέση, score, chunk_id) του καλύτερου hit
+        rankings = {}
+        if semantic_matches:
+            rankings['semantic'] = self._rank_by_document(
+                (match['document_id'], match['score'], match.get('chunk_id')) for match in semantic_matches)
+        
+        match_query = build_match_query(query)
+        truncated = False
         with self.get_connection() as conn:
-            stats = {}
+            # Διακοπή του τρέχοντος query όταν περάσει το όριο χρόνου
+            conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+            try:
+                if match_query:
+                    cursor = conn.execute('''
+                        SELECT rowid, -bm25(document_fts, 4.0, 2.0, 2.0) AS score
+                        FROM document_fts WHERE document_fts MATCH ?
+                        ORDER BY bm25(document_fts, 4.0, 2.0, 2.0) LIMIT ?
+                    ''', (match_query, candidates))
+                    rankings['documents'] = self._rank_by_document(
+                        (row['rowid'], row['score'], None) for row in cursor)
+                    
+                    # Περισσότεροι υποψήφιοι chunks: ένα έγγραφο έχει πολλά chunks στη λίστα
+                    cursor = conn.execute('''
+                        SELECT c.document_id, f.chunk_id, -f.rank_score AS score
+                        FROM (SELECT rowid AS chunk_id, rank AS rank_score FROM chunk_fts 
+                              WHERE chunk_fts MATCH ? ORDER BY rank LIMIT ?) f
+                        JOIN document_chunks c ON c.id = f.chunk_id
+                        ORDER BY f.rank_score
+                    ''', (match_query, candidates * 4))
+                    rankings['chunks'] = self._rank_by_document(
+                        (row['document_id'], row['score'], row['chunk_id']) for row in cursor)
+            except sqlite3.OperationalError as e:
+                if 'interrupted' not in str(e):
+                    raise
+                truncated = True
             
-            # Συνολικά documents
-            cursor = conn.execute("SELECT COUNT(*) as total FROM documents")
-            stats['total_documents'] = cursor.fetchone()['total']
+            results = self._fuse_rankings(rankings, top_k)
             
-            # Documents by status
-            cursor = conn.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM documents 
-                GROUP BY status
+            # Αποσπάσματα μόνο για τα τελικά αποτελέσματα (αν μένει χρόνος)
+            try:
+                if results and not truncated:
+                    self._add_snippets(conn, results, query)
+            except sqlite3.OperationalError as e:
+                if 'interrupted' not in str(e):
+                    raise
+                truncated = True
+            finally:
+                conn.set_progress_handler(None, 0)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if truncated:
+            logger.warning(f"Η αναζήτηση ξεπέρασε το όριο {budget_ms} ms, μερικά αποτελέσματα")
+        return {'results': results, 'truncated': truncated, 'elapsed_ms': round(elapsed_ms, 2)}
+    
+    @staticmethod
+    def _rank_by_document(hits) -> Dict[int, Tuple[int, float, Optional[int]]]:
+        """Πρώτο (καλύτερο) hit ανά document από λίστα ταξινομημένη κατά score"""
+        ranking = {}
+        for document_id, score, chunk_id in hits:
+            if document_id not in ranking:
+                ranking[document_id] = (len(ranking) + 1, score, chunk_id)
+        return ranking
+    
+    @staticmethod
+    def _fuse_scores(rankings: Dict[str, Dict]) -> Dict[int, float]:
+        """Συνδυασμένο score ανά κλειδί (RRF ή weighted) από λίστες {κλειδί: (θέση, score, ...)}"""
+        fused = {}
+        if config.SEARCH_FUSION == 'weighted':
+            # Scores κανονικοποιημένα ως προς το μέγιστο κάθε λίστας
+            normalized = {}
+            for name, ranking in rankings.items():
+                top_score = max((entry[1] for entry in ranking.values()), default=0) or 1.0
+                normalized[name] = {key: entry[1] / top_score for key, entry in ranking.items()}
+            lexical_names = [name for name in normalized if name != 'semantic']
+            if 'semantic' not in normalized:
+                weight = 0.0
+            elif not lexical_names:
+                weight = 1.0
+            else:
+                weight = config.SEARCH_SEMANTIC_WEIGHT
+            for key in set().union(*normalized.values()):
+                lexical = max((normalized[name].get(key, 0.0) for name in lexical_names), default=0.0)
+                semantic = normalized.get('semantic', {}).get(key, 0.0)
+                fused[key] = (1 - weight) * lexical + weight * semantic
+        else:
+            for ranking in rankings.values():
+                for key, entry in ranking.items():
+                    fused[key] = fused.get(key, 0.0) + 1.0 / (config.SEARCH_RRF_K + entry[0])
+        return fused
+    
+    @classmethod
+    def _fuse_rankings(cls, rankings: Dict[str, Dict], top_k: int) -> List[Dict]:
+        """Συγχώνευση λιστών κατάταξης και επιλογή top-k με heap (χωρίς πλήρη ταξινόμηση)"""
+        fused = cls._fuse_scores(rankings)
+        results = []
+        for document_id, score in heapq.nlargest(top_k, fused.items(), key=lambda item: item[1]):
+            # Το chunk του αποσπάσματος: πρώτα το lexical hit, μετά το σημασιολογικό
+            chunk_id = next((rankings[name][document_id][2] for name in ('chunks', 'semantic')
+                             if document_id in rankings.get(name, {})), None)
+            results.append({
+                'document_id': document_id,
+                'score': round(score, 6),
+                'chunk_id': chunk_id,
+                'sources': [name for name, ranking in rankings.items() if document_id in ranking],
+                'snippet': None,
+                'highlights': []
+            })
+        return results
+    
+    def search_chunks(self, query: str, top_k: int = None, semantic_matches: List[Dict] = None,
+                      max_per_document: int = None, budget_ms: float = None) -> Dict:
+        """
+        Τα πιο σχετικά chunks για ένα query (BM25 + σημασιολογική κατάταξη chunks)
+        
+        Args:
+            query: Κείμενο αναζήτησης
+            top_k: Πλήθος chunks
+            semantic_matches: Αποτελέσματα του SemanticSearch.search_chunks
+            max_per_document: Μέγιστα chunks ανά έγγραφο (ποικιλία πηγών)
+            budget_ms: Όριο χρόνου του full-text query
+        
+        Returns:
+            Dict με chunks (chunk_id, document_id, filename, chunk_index, text, score),
+            truncated και elapsed_ms
+        """
+        top_k = top_k or config.SEARCH_TOP_K
+        budget_ms = config.SEARCH_BUDGET_MS if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000
+        
+        # Λίστες κατάταξης: chunk_id -> (θέση, score)
+        rankings = {}
+        if semantic_matches:
+            rankings['semantic'] = {match['chunk_id']: (position, match['score'])
+                                    for position, match in enumerate(semantic_matches, start=1)}
+        
+        match_query = build_match_query(query)
+        truncated = False
+        with self.get_connection() as conn:
+            conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+            try:
+                if match_query:
+                    # Τα διπλότυπα έγγραφα θα επαναλάμβαναν το ίδιο κείμενο στο context
+                    cursor = conn.execute('''
+                        SELECT f.chunk_id, -f.rank_score AS score
+                        FROM (SELECT rowid AS chunk_id, rank AS rank_score FROM chunk_fts 
+                              WHERE chunk_fts MATCH ? ORDER BY rank LIMIT ?) f
+                        JOIN document_chunks c ON c.id = f.chunk_id
+                        WHERE c.document_id NOT IN (SELECT document_id FROM document_duplicates)
+                        ORDER BY f.rank_score
+                    ''', (match_query, max(config.SEARCH_CANDIDATES, top_k * 4)))
+                    rankings['chunks'] = {row['chunk_id']: (position, row['score'])
+                                          for position, row in enumerate(cursor, start=1)}
+            except sqlite3.OperationalError as e:
+                if 'interrupted' not in str(e):
+                    raise
+                truncated = True
+            finally:
+                conn.set_progress_handler(None, 0)
+            
+            # Με όριο ανά έγγραφο χρειάζονται περισσότεροι υποψήφιοι από τα top_k
+            fused = self._fuse_scores(rankings)
+            candidates = heapq.nlargest(top_k * 4 if max_per_document else top_k,
+                                        fused.items(), key=lambda item: item[1])
+            
+            chunks = []
+            if candidates:
+                placeholders = ','.join('?' * len(candidates))
+                rows = {row['id']: row for row in conn.execute(f'''
+                    SELECT c.id, c.document_id, c.chunk_index, c.content, c.content_blob, c.compression,
+                           d.filename
+                    FROM document_chunks c JOIN documents d ON d.id = c.document_id
+                    WHERE c.id IN ({placeholders})
+                ''', [chunk_id for chunk_id, _ in candidates])}
+                
+                per_document = {}
+                for chunk_id, score in candidates:
+                    row = rows.get(chunk_id)
+                    if row is None or len(chunks) == top_k:
+                        continue
+                    if max_per_document and per_document.get(row['document_id'], 0) >= max_per_document:
+                        continue
+                    per_document[row['document_id']] = per_document.get(row['document_id'], 0) + 1
+                    chunks.append({
+                        'chunk_id': chunk_id,
+                        'document_id': row['document_id'],
+                        'filename': row['filename'],
+                        'chunk_index': row['chunk_index'],
+                        'text': self.chunk_codec.decode(row['content'], row['content_blob'], row['compression']),
+                        'score': round(score, 6)
+                    })
+        
+        return {'chunks': chunks, 'truncated': truncated,
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)}
+    
+    def _add_snippets(self, conn: sqlite3.Connection, results: List[Dict], query: str):
+        """Απόσπασμα από το chunk του hit ή από την περίληψη του εγγράφου"""
+        chunk_ids = [result['chunk_id'] for result in results if result['chunk_id'] is not None]
+        texts = {}
+        if chunk_ids:
+            placeholders = ','.join('?' * len(chunk_ids))
+            for row in conn.execute(f'''
+                SELECT id, content, content_blob, compression FROM document_chunks 
+                WHERE id IN ({placeholders})
+            ''', chunk_ids):
+                texts[row['id']] = self.chunk_codec.decode(row['content'], row['content_blob'], row['compression'])
+        
+        document_ids = [result['document_id'] for result in results if result['chunk_id'] is None]
+        summaries = {}
+        if document_ids:
+            placeholders = ','.join('?' * len(document_ids))
+            for row in conn.execute(f'''
+                SELECT document_id, summary FROM analysis_results 
+                WHERE document_id IN ({placeholders}) ORDER BY id
+            ''', document_ids):
+                summaries[row['document_id']] = row['summary']
+        
+        for result in results:
+            text = (texts.get(result['chunk_id']) if result['chunk_id'] is not None
+                    else summaries.get(result['document_id']))
+            result['snippet'], result['highlights'] = make_snippet(text or '', query, config.SEARCH_SNIPPET_WORDS)
+    
+    def get_statistics(self) -> Dict:
+        """Στατιστικά της εφαρμογής (από τον πίνακα counters, χωρίς scan των documents)"""
+        with self.get_connection() as conn:
+            counters = {}
+            for row in conn.execute("SELECT scope, key, value FROM stat_counters"):
+                counters.setdefault(row['scope'], {})[row['key']] = row['value']
+        
+        totals = counters.get('total', {})
+        analysis = counters.get('analysis', {})
+        by_status = {key: int(value) for key, value in counters.get('status', {}).items() if value}
+        by_type = {key: int(value) for key, value in counters.get('type', {}).items() if value}
+        
+        total_documents = int(totals.get('documents', 0))
+        analysis_count = int(analysis.get('count', 0))
+        
+        return {
+            'total_documents': total_documents,
+            'total_bytes': int(totals.get('bytes', 0)),
+            'by_status': by_status,
+            'by_type': by_type,
+            'success_rate': (by_status.get('completed', 0) / total_documents * 100) if total_documents else 0.0,
+            'analysis_count': analysis_count,
+            'avg_processing_time': (analysis.get('processing_time', 0) / analysis_count) if analysis_count else 0.0
+        }
+    
+    def reconcile_statistics(self) -> Dict:
+        """
+        Επανυπολογισμός των counters από τα δεδομένα (διόρθωση απόκλισης)
+        
+        Returns:
+            Dict (scope, key) -> (παλιά τιμή, νέα τιμή) για τους counters που διέφεραν
+        """
+        with self.get_connection() as conn:
+            before = {(row['scope'], row['key']): row['value']
+                      for row in conn.execute("SELECT scope, key, value FROM stat_counters WHERE scope != 'meta'")}
+            rebuild_stat_counters(conn)
+            conn.execute('''
+                INSERT INTO stat_counters (scope, key, value) VALUES ('meta', 'data_version', 1)
+                ON CONFLICT (scope, key) DO UPDATE SET value = value + 1
             ''')
-            stats['by_status'] = {row['status']: row['count'] for row in cursor.fetchall()}
+            after = {(row['scope'], row['key']): row['value']
+                     for row in conn.execute("SELECT scope, key, value FROM stat_counters WHERE scope != 'meta'")}
+            conn.commit()
+        
+        drift = {}
+        for counter in set(before) | set(after):
+            old_value, new_value = before.get(counter, 0), after.get(counter, 0)
+            if old_value != new_value:
+                drift[counter] = (old_value, new_value)
+        
+        if drift:
+            logger.warning(f"Διορθώθηκαν {len(drift)} counters στατιστικών")
+        return drift
+    
+    def iter_export_rows(self, since_analysis_id: int = 0, include_chunks: bool = False,
+                         batch_size: int = 1000):
+        """
+        Streaming των αποτελεσμάτων ανάλυσης με τα στοιχεία του εγγράφου
+        
+        Οι γραμμές διαβάζονται σε batches (fetchmany) με σειρά analysis id,
+        οπότε η μνήμη δεν εξαρτάται από το μέγεθος του αποτελέσματος.
+        
+        Args:
+            since_analysis_id: Μόνο αναλύσεις με μεγαλύτερο id (watermark)
+            include_chunks: Προσθήκη του πλήρους κειμένου (content)
+            batch_size: Γραμμές ανά fetchmany
+        """
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT a.id AS analysis_id, d.id AS document_id, d.filepath, d.filename,
+                       d.file_type, d.file_size, d.status, d.created_at, d.processed_at,
+                       a.summary, a.keywords, a.categories, a.sentiment_score,
+                       a.confidence_score, a.processing_time, a.tokens_per_second, a.analysis_tier,
+                       a.created_at AS analyzed_at,
+                       dup.canonical_id AS duplicate_of
+                FROM analysis_results a
+                JOIN documents d ON d.id = a.document_id
+                LEFT JOIN document_duplicates dup ON dup.document_id = d.id
+                WHERE a.id > ?
+                ORDER BY a.id
+            ''', (since_analysis_id,))
             
-            # Documents by type
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                
+                for row in rows:
+                    record = dict(row)
+                    record['keywords'] = json.loads(record['keywords']) if record['keywords'] else []
+                    record['categories'] = json.loads(record['categories']) if record['categories'] else []
+                    if include_chunks:
+                        record['content'] = '\n\n'.join(self.iter_document_chunks(record['document_id']))
+                    yield record
+    
+    def export_results(self, output_path: str, fmt: str = 'csv', name: str = None,
+                       since_analysis_id: int = None, include_chunks: bool = False) -> Dict:
+        """Export αποτελεσμάτων ανάλυσης σε CSV/JSONL/Parquet (βλ. DocumentExporter)"""
+        from core.exporter import DocumentExporter
+        return DocumentExporter(self).export(output_path, fmt, name=name,
+                                             since_analysis_id=since_analysis_id,
+                                             include_chunks=include_chunks)
+    
+    def get_export_watermark(self, name: str) -> int:
+        """Τελευταίο analysis id που έχει εξαχθεί για το export"""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT last_analysis_id FROM export_watermarks WHERE name = ?",
+                               (name,)).fetchone()
+            return row['last_analysis_id'] if row else 0
+    
+    def set_export_watermark(self, name: str, last_analysis_id: int, row_count: int):
+        """Αποθήκευση watermark μετά από επιτυχές export"""
+        with self.get_connection() as conn:
+            conn.execute('''
+                INSERT INTO export_watermarks (name, last_analysis_id, row_count, exported_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    last_analysis_id = excluded.last_analysis_id,
+                    row_count = excluded.row_count,
+                    exported_at = excluded.exported_at
+            ''', (name, last_analysis_id, row_count, datetime.now()))
+            conn.commit()
+    
+    def enqueue_analysis_job(self, params: Dict) -> int:
+        """Καταχώρηση εργασίας ανάλυσης στην ουρά (εκτελείται από worker)"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO analysis_jobs (params, created_at) VALUES (?, ?)",
+                (json.dumps(params, ensure_ascii=False), datetime.now())
+            )
+            conn.commit()
+            return cursor.lastrowid
+    
+    def claim_analysis_job(self, worker: str, stale_after: float) -> Optional[Dict]:
+        """
+        Η παλαιότερη εργασία σε αναμονή (ή εγκαταλελειμμένη από worker χωρίς
+        heartbeat για stale_after seconds), δεσμευμένη για τον worker
+        
+        Η επιλογή και η δέσμευση γίνονται σε ένα UPDATE, οπότε δύο workers
+        δεν παίρνουν ποτέ την ίδια εργασία.
+        """
+        now = datetime.now()
+        with self.get_connection() as conn:
+            row = conn.execute('''
+                UPDATE analysis_jobs
+                SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?,
+                    total_files = 0, processed_files = 0, current_file = NULL
+                WHERE id = (
+                    SELECT id FROM analysis_jobs
+                    WHERE status = 'queued'
+                       OR (status IN ('running', 'watching') AND heartbeat_at < ?)
+                    ORDER BY id LIMIT 1
+                )
+                RETURNING *
+            ''', (worker, now, now, now - timedelta(seconds=stale_after))).fetchone()
+            conn.commit()
+        return self._job_row(row) if row else None
+    
+    def update_analysis_job(self, job_id: int, status: str = None, total_files: int = None,
+                            processed_files: int = None, current_file: str = None,
+                            error_message: str = None) -> bool:
+        """
+        Πρόοδος ή κατάσταση εργασίας (μαζί και heartbeat)
+        
+        Returns:
+            True αν ζητήθηκε διακοπή της εργασίας
+        """
+        fields = {'heartbeat_at': datetime.now()}
+        for column, value in (('status', status), ('total_files', total_files),
+                              ('processed_files', processed_files), ('current_file', current_file),
+                              ('error_message', error_message)):
+            if value is not None:
+                fields[column] = value
+        if status in ('completed', 'failed', 'cancelled', 'queued'):
+            fields['finished_at'] = datetime.now() if status != 'queued' else None
+        
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self.get_connection() as conn:
+            row = conn.execute(
+                f"UPDATE analysis_jobs SET {assignments} WHERE id = ? RETURNING cancel_requested",
+                [*fields.values(), job_id]
+            ).fetchone()
+            conn.commit()
+        return bool(row and row[0])
+    
+    def heartbeat_analysis_jobs(self, worker: str) -> int:
+        """Heartbeat για όλες τις ενεργές εργασίες του worker"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "UPDATE analysis_jobs SET heartbeat_at = ? WHERE worker = ? AND status IN ('running', 'watching')",
+                (datetime.now(), worker)
+            )
+            conn.commit()
+            return cursor.rowcount
+    
+    def cancel_analysis_jobs(self, job_id: int = None) -> int:
+        """
+        Διακοπή εργασιών (όλων των ενεργών ή μίας): όσες περιμένουν ακυρώνονται
+        αμέσως, όσες εκτελούνται σταματούν από τον worker τους
+        """
+        condition, params = ("AND id = ?", [job_id]) if job_id is not None else ("", [])
+        with self.get_connection() as conn:
+            cancelled = conn.execute(
+                f"UPDATE analysis_jobs SET status = 'cancelled', finished_at = ? WHERE status = 'queued' {condition}",
+                [datetime.now(), *params]
+            ).rowcount
+            cancelled += conn.execute(
+                f"UPDATE analysis_jobs SET cancel_requested = 1 "
+                f"WHERE status IN ('running', 'watching') {condition}",
+                params
+            ).rowcount
+            conn.commit()
+            return cancelled
+    
+    def get_analysis_job(self, job_id: int) -> Optional[Dict]:
+        """Εργασία ανάλυσης με την πρόοδό της"""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT * FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_row(row) if row else None
+    
+    def get_active_analysis_job(self) -> Optional[Dict]:
+        """Η πιο πρόσφατη εργασία που δεν έχει ολοκληρωθεί"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM analysis_jobs WHERE status IN ('queued', 'running', 'watching') "
+                "ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return self._job_row(row) if row else None
+    
+    @staticmethod
+    def _job_row(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+    
+    def create_qa_answer(self, question: str) -> int:
+        """Νέα απάντηση σε εξέλιξη (οι παλιές πέρα από QA_RETENTION_HOURS διαγράφονται)"""
+        now = datetime.now()
+        with self.get_connection() as conn:
+            conn.execute("DELETE FROM qa_answers WHERE created_at < ?",
+                         (now - timedelta(hours=config.QA_RETENTION_HOURS),))
+            cursor = conn.execute(
+                "INSERT INTO qa_answers (question, created_at, updated_at) VALUES (?, ?, ?)",
+                (question, now, now)
+            )
+            conn.commit()
+            return cursor.lastrowid
+    
+    def update_qa_answer(self, answer_id: int, answer: str = None, sources: List[Dict] = None,
+                         citations: List[int] = None, status: str = None, error_message: str = None):
+        """Ενημέρωση απάντησης που παράγεται (ή ολοκληρώθηκε)"""
+        fields = {'updated_at': datetime.now()}
+        for column, value in (('answer', answer), ('status', status), ('error_message', error_message)):
+            if value is not None:
+                fields[column] = value
+        for column, value in (('sources', sources), ('citations', citations)):
+            if value is not None:
+                fields[column] = json.dumps(value, ensure_ascii=False)
+        
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self.get_connection() as conn:
+            conn.execute(f"UPDATE qa_answers SET {assignments} WHERE id = ?", [*fields.values(), answer_id])
+            conn.commit()
+    
+    def get_qa_answer(self, answer_id: int) -> Optional[Dict]:
+        """Απάντηση με πηγές και αναφορές"""
+        with self.get_connection() as conn:
+            row = conn.execute("SELECT * FROM qa_answers WHERE id = ?", (answer_id,)).fetchone()
+        if not row:
+            return None
+        result = dict(row)
+        result['sources'] = json.loads(result['sources'])
+        result['citations'] = json.loads(result['citations'])
+        return result
+    
+    def get_data_version(self) -> int:
+        """Έκδοση δεδομένων: αυξάνεται σε κάθε αλλαγή documents/analysis_results"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM stat_counters WHERE scope = 'meta' AND key = 'data_version'"
+            ).fetchone()
+            return int(row['value']) if row else 0
+    
+    def get_processing_time_histogram(self, bins: int = 20) -> List[Dict]:
+        """Histogram χρόνων AI ανάλυσης (οι επαναχρησιμοποιημένες αναλύσεις εξαιρούνται)"""
+        with self.get_connection() as conn:
+            bounds = conn.execute('''
+                SELECT MIN(processing_time) AS low, MAX(processing_time) AS high
+                FROM analysis_results WHERE processing_time > 0
+            ''').fetchone()
+            if bounds['low'] is None:
+                return []
+            
+            low, high = bounds['low'], bounds['high']
+            width = (high - low) / bins or 1.0
             cursor = conn.execute('''
-                SELECT file_type, COUNT(*) as count 
-                FROM documents 
-                GROUP BY file_type
-            ''')
-            stats['by_type'] = {row['file_type']: row['count'] for row in cursor.fetchall()}
+                SELECT MIN(CAST((processing_time - ?) / ? AS INTEGER), ? - 1) AS bucket,
+                       COUNT(*) AS count
+                FROM analysis_results
+                WHERE processing_time > 0
+                GROUP BY bucket
+                ORDER BY bucket
+            ''', (low, width, bins))
             
-            return stats
+            return [{'start': low + row['bucket'] * width, 'end': low + (row['bucket'] + 1) * width,
+                     'count': row['count']} for row in cursor.fetchall()]
+    
+    def get_throughput(self, bucket: str = 'hour') -> List[Dict]:
+        """Επεξεργασμένα έγγραφα ανά ώρα/ημέρα με σωρευτικό σύνολο (window function)"""
+        period_format = '%Y-%m-%d %H:00' if bucket == 'hour' else '%Y-%m-%d'
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT period, completed, failed,
+                       SUM(completed + failed) OVER (ORDER BY period) AS cumulative
+                FROM (
+                    SELECT strftime(?, processed_at) AS period,
+                           SUM(status = 'completed') AS completed,
+                           SUM(status = 'failed') AS failed
+                    FROM documents
+                    WHERE processed_at IS NOT NULL AND status IN ('completed', 'failed')
+                    GROUP BY period
+                )
+                ORDER BY period
+            ''', (period_format,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_category_distribution(self, limit: int = 15) -> List[Dict]:
+        """Συχνότερες κατηγορίες στην τελευταία ανάλυση κάθε εγγράφου"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                WITH latest AS (
+                    SELECT MAX(id) AS id FROM analysis_results GROUP BY document_id
+                )
+                SELECT category.value AS category, COUNT(*) AS count
+                FROM analysis_results a
+                JOIN latest ON latest.id = a.id,
+                     json_each(a.categories) AS category
+                WHERE a.categories IS NOT NULL AND json_valid(a.categories)
+                GROUP BY category.value
+                ORDER BY count DESC
+                LIMIT ?
+            ''', (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_sentiment_distribution(self, bins: int = 10) -> List[Dict]:
+        """Κατανομή sentiment (-1 έως 1) στην τελευταία ανάλυση κάθε εγγράφου"""
+        width = 2.0 / bins
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                WITH latest AS (
+                    SELECT MAX(id) AS id FROM analysis_results GROUP BY document_id
+                )
+                SELECT MAX(0, MIN(CAST((a.sentiment_score + 1.0) / ? AS INTEGER), ? - 1)) AS bucket,
+                       COUNT(*) AS count
+                FROM analysis_results a
+                JOIN latest ON latest.id = a.id
+                WHERE a.sentiment_score IS NOT NULL
+                GROUP BY bucket
+                ORDER BY bucket
+            ''', (width, bins))
+            return [{'start': -1.0 + row['bucket'] * width, 'end': -1.0 + (row['bucket'] + 1) * width,
+                     'count': row['count']} for row in cursor.fetchall()]
+    
+    def get_failure_reasons(self, limit: int = 10) -> List[Dict]:
+        """Συχνότερες αιτίες αποτυχίας (το μήνυμα μέχρι το πρώτο ':' ώστε να ομαδοποιούνται)"""
+        with self.get_connection() as conn:
+            cursor = conn.execute('''
+                SELECT CASE WHEN instr(error_message, ':') > 0
+                            THEN substr(error_message, 1, instr(error_message, ':') - 1)
+                            ELSE COALESCE(error_message, 'Άγνωστο σφάλμα') END AS reason,
+                       COUNT(*) AS count
+                FROM documents
+                WHERE status = 'failed'
+                GROUP BY reason
+                ORDER BY count DESC
+                LIMIT ?
+            ''', (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_analytics(self) -> Dict:
+        """Όλες οι συναθροίσεις του analytics dashboard"""
+        return {
+            'processing_time': self.get_processing_time_histogram(),
+            'throughput': self.get_throughput(),
+            'categories': self.get_category_distribution(),
+            'sentiment': self.get_sentiment_distribution(),
+            'failures': self.get_failure_reasons()
+        }
@@ -0,0 +1,216 @@
+"""
+Document Deduplicator για AI Document Analyzer
+"""
+import hashlib
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Set
+import numpy as np
+from config import config
+from core.database import DatabaseManager
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Πρώτος > 2^32 ώστε το (a * x + b) να χωράει σε uint64 για a < 2^31
+_MINHASH_PRIME = np.uint64((1 << 32) + 15)
+
+# Προτάσεις: η σύγκριση με το canonical έγγραφο γίνεται ανά πρόταση
+_SENTENCE_RE = re.compile(r'(?<=[.!;?·])\s+|\n+')
+
+class DocumentDeduplicator:
+    """Εντοπισμός ίδιων και σχεδόν ίδιων εγγράφων πριν την AI ανάλυση"""
+    
+    def __init__(self, db_manager: DatabaseManager = None):
+        self.db_manager = db_manager or DatabaseManager()
+        self.num_perm = config.DEDUP_NUM_PERM
+        self.bands = config.DEDUP_LSH_BANDS
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = config.DEDUP_SHINGLE_SIZE
+        self.similarity_threshold = config.DEDUP_SIMILARITY_THRESHOLD
+        self.reuse_threshold = config.DEDUP_REUSE_THRESHOLD
+        
+        # Σταθερό seed: οι υπογραφές πρέπει να είναι συγκρίσιμες μεταξύ εκτελέσεων
+        rng = np.random.default_rng(config.DEDUP_SEED)
+        self._perm_a = rng.integers(1, 1 << 31, size=self.num_perm, dtype=np.uint64)
+        self._perm_b = rng.integers(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        
+        # LSH index: ένα dict ανά band, band hash -> document ids
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._index_lock = threading.Lock()
+        # Ξεχωριστό lock για τη φόρτωση: το _add_to_index παίρνει το _index_lock
+        self._load_lock = threading.Lock()
+        self._index_loaded = False
+    
+    def check_document(self, document_id: int, cleaned_text: str) -> Optional[Dict]:
+        """
+        Έλεγχος εγγράφου για διπλότυπα και καταχώρηση της υπογραφής του
+        
+        Args:
+            document_id: ID εγγράφου στη database
+            cleaned_text: Καθαρισμένο κείμενο από DocumentProcessor
+        
+        Returns:
+            Dict με canonical_id, similarity, match_type ή None αν δεν βρέθηκε
+        """
+        if not cleaned_text or not cleaned_text.strip():
+            return None
+        
+        self._ensure_index_loaded()
+        
+        content_hash = self.content_hash(cleaned_text)
+        signature = self.minhash_signature(cleaned_text)
+        
+        match = None
+        existing_id = self.db_manager.find_document_by_content_hash(content_hash, exclude_id=document_id)
+        if existing_id is not None:
+            match = {'canonical_id': existing_id, 'similarity': 1.0, 'match_type': 'exact'}
+        else:
+            match = self._find_near_duplicate(document_id, signature)
+        
+        self.db_manager.add_document_signature(document_id, content_hash, signature.tobytes())
+        self._add_to_index(document_id, signature)
+        
+        if match:
+            # Ομαδοποίηση πάντα γύρω από τον αρχικό canonical (όχι αλυσίδες)
+            match['canonical_id'] = self.db_manager.get_canonical_document_id(match['canonical_id'])
+            self.db_manager.add_duplicate(document_id, match['canonical_id'],
+                                          match['similarity'], match['match_type'])
+            logger.info(f"Document {document_id} είναι {match['match_type']} διπλότυπο του "
+                        f"{match['canonical_id']} (ομοιότητα {match['similarity']:.2f})")
+        
+        return match
+    
+    def reuse_analysis(self, document_id: int, match: Dict) -> bool:
+        """Αντιγραφή της ανάλυσης του canonical εγγράφου αν η ομοιότητα αρκεί"""
+        if match['similarity'] < self.reuse_threshold:
+            return False
+        
+        if not self.db_manager.copy_analysis_result(match['canonical_id'], document_id):
+            return False
+        
+        self.db_manager.update_document_status(document_id, 'completed')
+        logger.info(f"Επαναχρησιμοποίηση ανάλυσης του document {match['canonical_id']} "
+                    f"για το {document_id}")
+        return True
+    
+    def diff_against(self, document_id: int, match: Dict, cleaned_text: str) -> Optional[Dict]:
+        """
+        Οι διαφορές ενός near-duplicate από το canonical έγγραφο, για ανάλυση μόνο του νέου κειμένου
+        
+        Returns:
+            Dict με text (οι προτάσεις που λείπουν από το canonical), ratio (μερίδιο
+            του νέου κειμένου) και base (η ανάλυση του canonical), ή None όταν
+            χρειάζεται πλήρης ανάλυση: το canonical δεν έχει ανάλυση ή το νέο
+            κείμενο ξεπερνά το DEDUP_DIFF_MAX_RATIO
+        """
+        base = self.db_manager.get_document_with_analysis(match['canonical_id'])
+        if not base or not base.get('summary'):
+            return None
+        
+        canonical_text = '\n\n'.join(self.db_manager.iter_document_chunks(match['canonical_id']))
+        known = {self._normalize(sentence) for sentence in _SENTENCE_RE.split(canonical_text)}
+        sentences = [sentence.strip() for sentence in _SENTENCE_RE.split(cleaned_text) if sentence.strip()]
+        novel = [sentence for sentence in sentences if self._normalize(sentence) not in known]
+        
+        total = sum(len(sentence) for sentence in sentences)
+        ratio = sum(len(sentence) for sentence in novel) / total if total else 0.0
+        if ratio > config.DEDUP_DIFF_MAX_RATIO:
+            return None
+        
+        logger.info(f"Document {document_id}: ανάλυση μόνο των διαφορών από το {match['canonical_id']} "
+                    f"({ratio:.0%} νέο κείμενο)")
+        return {'text': ' '.join(novel), 'ratio': ratio, 'base': base}
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r'\s+', ' ', text.lower()).strip()
+    
+    def content_hash(self, text: str) -> str:
+        """SHA-256 του κανονικοποιημένου κειμένου"""
+        normalized = self._normalize(text)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    def minhash_signature(self, text: str) -> np.ndarray:
+        """MinHash υπογραφή πάνω σε shingles λέξεων"""
+        words = re.findall(r'\w+', text.lower())
+        size = self.shingle_size
+        
+        if len(words) < size:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        
+        # Όλες οι μεταθέσεις μαζί, σε blocks ώστε ο πίνακας να μένει μικρός
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(hashes), 4096):
+            block = hashes[start:start + 4096]
+            permuted = (np.outer(self._perm_a, block) + self._perm_b[:, None]) % _MINHASH_PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        
+        return signature.astype(np.uint32)
+    
+    def estimate_similarity(self, signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """Εκτίμηση Jaccard ομοιότητας από δύο υπογραφές"""
+        return float(np.count_nonzero(signature_a == signature_b)) / self.num_perm
+    
+    def _find_near_duplicate(self, document_id: int, signature: np.ndarray) -> Optional[Dict]:
+        """Αναζήτηση υποψηφίων μέσω LSH και επαλήθευση με την πλήρη υπογραφή"""
+        candidates = set()
+        with self._index_lock:
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(document_id)
+            candidate_signatures = {doc_id: self._signatures[doc_id] for doc_id in candidates}
+        
+        if not candidate_signatures:
+            return None
+        
+        # Τα documents που αντικαταστάθηκαν (INSERT OR REPLACE) δεν είναι υποψήφιοι
+        existing = self.db_manager.filter_existing_documents(list(candidate_signatures))
+        
+        best = None
+        for doc_id in existing:
+            similarity = self.estimate_similarity(signature, candidate_signatures[doc_id])
+            if similarity >= self.similarity_threshold and (best is None or similarity > best['similarity']):
+                best = {'canonical_id': doc_id, 'similarity': similarity, 'match_type': 'near'}
+        
+        return best
+    
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+    
+    def _add_to_index(self, document_id: int, signature: np.ndarray):
+        with self._index_lock:
+            self._signatures[document_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(document_id)
+    
+    def _ensure_index_loaded(self):
+        """Φόρτωση των αποθηκευμένων υπογραφών στο LSH index (μία φορά)"""
+        if self._index_loaded:
+            return
+        
+        # Όσοι καλούν ταυτόχρονα (watcher, worker) περιμένουν να γεμίσει ο index
+        with self._load_lock:
+            if self._index_loaded:
+                return
+            
+            count = 0
+            for document_id, minhash in self.db_manager.iter_document_signatures():
+                signature = np.frombuffer(minhash, dtype=np.uint32)
+                if len(signature) == self.num_perm:
+                    self._add_to_index(document_id, signature)
+                    count += 1
+            
+            self._index_loaded = True
+        
+        logger.debug(f"Φορτώθηκαν {count} υπογραφές στο LSH index")
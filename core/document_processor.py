@@ -1,23 +1,42 @@
 """
 Document Processor για AI Document Analyzer
 """
-import PyPDF2
-from docx import Document
-import pytesseract
-from PIL import Image
+import math
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import re
 from config import config
-from utils.logger import setup_logger
+from core.ocr_engine import OCREngine, PDFIUM_AVAILABLE
+from core.pdf_backends import PyPDF2Backend, extract_page_range, get_pdf_backend
+from utils.helpers import detect_text_encoding, get_file_encoding, iter_decoded_blocks
+from utils.logger import sampled_logger, setup_logger
 
 logger = setup_logger()
+# Μηνύματα ανά αρχείο (structured πεδία, sampling)
+file_logger = sampled_logger('extract')
 
 class DocumentProcessor:
     """Επεξεργασία και εξαγωγή κειμένου από έγγραφα"""
     
-    def __init__(self):
+    def __init__(self, use_process_pools: bool = True, pool_workers: int = None):
+        """
+        Args:
+            use_process_pools: Παράλληλο OCR/PDF σε processes
+            pool_workers: Processes ανά pool (default: OCR_WORKERS / PDF_WORKERS)
+        """
         self.max_chunk_size = config.MAX_CHUNK_SIZE
+        self.use_process_pools = use_process_pools
+        self.pdf_workers = pool_workers or config.PDF_WORKERS
+        self.ocr_engine = OCREngine(max_workers=pool_workers, use_process_pool=use_process_pools)
+        self.pdf_backend = get_pdf_backend(config.PDF_BACKEND)
+        self._pdf_executor = None
+        # Χρόνος OCR ανά κλήση (το processor μπορεί να μοιράζεται μεταξύ threads)
+        self._timing = threading.local()
         
     def process_document(self, file_info: Dict) -> Dict:
         """
@@ -32,34 +51,43 @@ class DocumentProcessor:
         filepath = file_info['filepath']
         file_extension = file_info['file_extension']
         
-        logger.info(f"Επεξεργασία αρχείου: {file_info['filename']}")
+        file_logger.bind(file=filepath).info(f"Επεξεργασία αρχείου: {file_info['filename']}")
+        self._timing.ocr_time = 0.0
         
         try:
-            # Εξαγωγή κειμένου ανάλογα με τον τύπο αρχείου
-            if file_extension == '.pdf':
-                text = self._extract_from_pdf(filepath)
-            elif file_extension == '.docx':
-                text = self._extract_from_docx(filepath)
-            elif file_extension == '.txt':
-                text = self._extract_from_txt(filepath)
-            elif file_extension in ['.png', '.jpg', '.jpeg']:
-                text = self._extract_from_image(filepath)
+            # Πολύ μεγάλα TXT: streaming αποκωδικοποίηση και καθαρισμός
+            if file_extension == '.txt' and file_info.get('file_size', 0) >= config.TXT_STREAM_THRESHOLD:
+                original_length, cleaned_text = self._extract_from_txt_streaming(filepath)
+                text = cleaned_text
             else:
-                raise ValueError(f"Μη υποστηριζόμενος τύπος αρχείου: {file_extension}")
-            
-            # Καθαρισμός κειμένου
-            cleaned_text = self._clean_text(text)
+                # Εξαγωγή κειμένου ανάλογα με τον τύπο αρχείου
+                if file_extension == '.pdf':
+                    text = self._extract_from_pdf(filepath)
+                elif file_extension == '.docx':
+                    text = self._extract_from_docx(filepath)
+                elif file_extension == '.txt':
+                    text = self._extract_from_txt(filepath)
+                elif file_extension in ['.png', '.jpg', '.jpeg']:
+                    text = self._extract_from_image(filepath)
+                else:
+                    raise ValueError(f"Μη υποστηριζόμενος τύπος αρχείου: {file_extension}")
+                
+                original_length = len(text)
+                
+                # Καθαρισμός κειμένου
+                cleaned_text = self._clean_text(text)
             
             # Διαίρεση σε chunks
             chunks = self._split_into_chunks(cleaned_text)
             
             # Metadata εξαγωγής
             extraction_meta = {
-                'original_length': len(text),
+                'original_length': original_length,
                 'cleaned_length': len(cleaned_text),
                 'chunk_count': len(chunks),
                 'word_count': len(cleaned_text.split()),
-                'extraction_method': file_extension[1:]  # Αφαίρεση της τελείας
+                'extraction_method': file_extension[1:],  # Αφαίρεση της τελείας
+                'ocr_time': self._timing.ocr_time
             }
             
             result = {
@@ -71,8 +99,9 @@ class DocumentProcessor:
                 'error': None
             }
             
-            logger.info(f"Επιτυχής επεξεργασία: {file_info['filename']} "
-                       f"({extraction_meta['word_count']} λέξεις, {len(chunks)} chunks)")
+            file_logger.bind(file=filepath).info(
+                f"Επιτυχής επεξεργασία: {file_info['filename']} "
+                f"({extraction_meta['word_count']} λέξεις, {len(chunks)} chunks)")
             
             return result
             
@@ -88,33 +117,104 @@ class DocumentProcessor:
             }
     
     def _extract_from_pdf(self, filepath: str) -> str:
-        """Εξαγωγή κειμένου από PDF"""
-        text = ""
+        """Εξαγωγή κειμένου από PDF (με OCR στις σελίδες χωρίς κείμενο)"""
         try:
-            with open(filepath, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"\n--- Σελίδα {page_num + 1} ---\n"
-                            text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(f"Σφάλμα ανάγνωσης σελίδας {page_num + 1}: {e}")
-                        continue
-                
-                if not text.strip():
-                    logger.warning(f"Δεν βρέθηκε κείμενο στο PDF: {filepath}")
-                    
+            page_texts = self._extract_pdf_pages(filepath, self.pdf_backend)
         except Exception as e:
-            raise Exception(f"Σφάλμα ανάγνωσης PDF: {e}")
+            if isinstance(self.pdf_backend, PyPDF2Backend):
+                raise Exception(f"Σφάλμα ανάγνωσης PDF: {e}")
+            
+            # Fallback στο PyPDF2 αν το γρήγορο backend αποτύχει
+            logger.warning(f"Σφάλμα PDF backend {self.pdf_backend.name} για {filepath}: {e}. "
+                           f"Χρήση PyPDF2")
+            try:
+                page_texts = self._extract_pdf_pages(filepath, PyPDF2Backend())
+            except Exception as e:
+                raise Exception(f"Σφάλμα ανάγνωσης PDF: {e}")
+        
+        # Σελίδες με χαμηλή απόδοση κειμένου (πιθανώς scanned) περνούν από OCR
+        low_yield_pages = [page_num for page_num, page_text in page_texts.items()
+                           if len(page_text.strip()) < config.OCR_MIN_PAGE_CHARS]
+        if low_yield_pages:
+            page_texts.update(self._ocr_pdf_pages(filepath, low_yield_pages, page_texts))
+        
+        # Συνένωση με τη σειρά των σελίδων
+        text = ""
+        for page_num in sorted(page_texts):
+            page_text = page_texts[page_num]
+            if page_text.strip():
+                text += f"\n--- Σελίδα {page_num + 1} ---\n"
+                text += page_text + "\n"
+        
+        if not text.strip():
+            logger.warning(f"Δεν βρέθηκε κείμενο στο PDF: {filepath}")
         
         return text
     
+    def _extract_pdf_pages(self, filepath: str, backend) -> Dict[int, str]:
+        """Εξαγωγή σελίδων PDF, μοιρασμένων σε worker processes για μεγάλα αρχεία"""
+        page_count = backend.page_count(filepath)
+        workers = self.pdf_workers
+        
+        if not self.use_process_pools or page_count < config.PDF_PARALLEL_MIN_PAGES or workers <= 1:
+            return backend.extract_pages(filepath, list(range(page_count)))
+        
+        # Συνεχόμενα εύρη σελίδων: κάθε worker ανοίγει το PDF μία φορά
+        pages_per_task = math.ceil(page_count / workers)
+        executor = self._get_pdf_executor()
+        futures = [
+            executor.submit(extract_page_range, backend.name, filepath,
+                            start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        
+        file_logger.bind(file=filepath).debug(
+            f"Παράλληλη εξαγωγή {page_count} σελίδων σε {len(futures)} εύρη ({backend.name})")
+        
+        page_texts = {}
+        for future in futures:
+            page_texts.update(future.result())
+        return page_texts
+    
+    def _get_pdf_executor(self) -> ProcessPoolExecutor:
+        if self._pdf_executor is None:
+            self._pdf_executor = ProcessPoolExecutor(max_workers=self.pdf_workers)
+        return self._pdf_executor
+    
+    def shutdown(self, wait: bool = False):
+        """Τερματισμός των process pools OCR και PDF"""
+        self.ocr_engine.shutdown(wait)
+        if self._pdf_executor is not None:
+            self._pdf_executor.shutdown(wait=wait, cancel_futures=True)
+            self._pdf_executor = None
+    
+    def _ocr_pdf_pages(self, filepath: str, page_numbers: List[int], page_texts: Dict[int, str]) -> Dict[int, str]:
+        """OCR συγκεκριμένων σελίδων PDF παράλληλα (κρατάει το μεγαλύτερο κείμενο)"""
+        if not PDFIUM_AVAILABLE:
+            logger.warning(f"{len(page_numbers)} σελίδες χωρίς κείμενο στο {filepath} "
+                           f"(το OCR σελίδων απαιτεί pypdfium2)")
+            return {}
+        
+        file_logger.bind(file=filepath).info(
+            f"OCR σε {len(page_numbers)}/{len(page_texts)} σελίδες χωρίς κείμενο: {filepath}")
+        
+        start = time.perf_counter()
+        try:
+            ocr_texts = self.ocr_engine.ocr_pdf(filepath, page_numbers)
+        except Exception as e:
+            logger.warning(f"Σφάλμα OCR σελίδων PDF {filepath}: {e}")
+            return {}
+        finally:
+            self._add_ocr_time(time.perf_counter() - start)
+        
+        return {page_num: ocr_text for page_num, ocr_text in ocr_texts.items()
+                if len(ocr_text.strip()) > len(page_texts.get(page_num, '').strip())}
+    
     def _extract_from_docx(self, filepath: str) -> str:
         """Εξαγωγή κειμένου από DOCX"""
         try:
+            from docx import Document
+            
             doc = Document(filepath)
             
             # Εξαγωγή κειμένου από παραγράφους
@@ -148,23 +248,79 @@ class DocumentProcessor:
             raise Exception(f"Σφάλμα ανάγνωσης DOCX: {e}")
     
     def _extract_from_txt(self, filepath: str) -> str:
-        """Εξαγωγή κειμένου από TXT"""
+        """Εξαγωγή κειμένου από TXT (μία ανάγνωση, ανίχνευση encoding από δείγμα)"""
         try:
-            # Δοκιμή διαφορετικών encodings
-            encodings = ['utf-8', 'utf-8-sig', 'cp1253', 'iso-8859-7', 'latin1']
+            with open(filepath, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    raise Exception("Το αρχείο είναι κενό")
+                
+                # Μεγάλα αρχεία: memory map αντί για αντιγραφή σε bytes
+                if size >= config.TXT_MMAP_THRESHOLD:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        return self._decode_text(data, filepath)
+                
+                return self._decode_text(file.read(), filepath)
             
-            for encoding in encodings:
-                try:
-                    with open(filepath, 'r', encoding=encoding) as file:
-                        content = file.read()
-                        if content:  # Αν διαβάστηκε επιτυχώς
-                            logger.debug(f"Χρήση encoding {encoding} για {filepath}")
-                            return content
-                except UnicodeDecodeError:
-                    continue
+        except Exception as e:
+            raise Exception(f"Σφάλμα ανάγνωσης TXT: {e}")
+    
+    def _decode_text(self, data, filepath: str) -> str:
+        """Αποκωδικοποίηση με το encoding που ανιχνεύθηκε από δείγμα (ένα decode)"""
+        encoding = detect_text_encoding(data[:config.TXT_SAMPLE_SIZE])
+        
+        try:
+            content = str(data, encoding)
+        except LookupError:
+            encoding = 'latin1'
+            content = str(data, encoding)
+        except UnicodeDecodeError as e:
+            # Λίγα χαλασμένα bytes (π.χ. στο τέλος ενός log) δεν αλλάζουν το encoding όλου του αρχείου
+            logger.warning(f"Μη έγκυρα bytes για {encoding} στη θέση {e.start}: {filepath}")
+            content = str(data, encoding, errors='replace')
+        
+        file_logger.bind(file=filepath).debug(f"Χρήση encoding {encoding} για {filepath}")
+        return content
+    
+    def _extract_from_txt_streaming(self, filepath: str) -> Tuple[int, str]:
+        """
+        Streaming εξαγωγή και καθαρισμός πολύ μεγάλων TXT
+        
+        Το αρχείο αποκωδικοποιείται και καθαρίζεται ανά block, οπότε δεν
+        κρατιούνται ταυτόχρονα στη μνήμη τα bytes, το αρχικό και το καθαρό κείμενο.
+        
+        Returns:
+            (μήκος αρχικού κειμένου, καθαρισμένο κείμενο)
+        """
+        try:
+            encoding = get_file_encoding(filepath, config.TXT_SAMPLE_SIZE)
+            file_logger.bind(file=filepath).debug(f"Streaming ανάγνωση με encoding {encoding}: {filepath}")
             
-            # Αν δεν δούλεψε κανένα encoding
-            raise Exception("Δεν μπόρεσα να ανοίξω το αρχείο με κανένα γνωστό encoding")
+            original_length = 0
+            cleaned_parts = []
+            carry = ""
+            
+            for block in iter_decoded_blocks(filepath, encoding, config.TXT_BLOCK_SIZE):
+                original_length += len(block)
+                block = carry + block
+                
+                # Κόψιμο στο τελευταίο whitespace ώστε καμία λέξη να μη μοιράζεται σε δύο blocks
+                cut = len(block)
+                while cut > 0 and not block[cut - 1].isspace():
+                    cut -= 1
+                
+                cleaned = self._clean_text(block[:cut])
+                if cleaned:
+                    cleaned_parts.append(cleaned)
+                carry = block[cut:]
+            
+            cleaned = self._clean_text(carry)
+            if cleaned:
+                cleaned_parts.append(cleaned)
+            
+            # Ο καθαρισμός συμπτύσσει κάθε whitespace σε ένα κενό, άρα η ένωση
+            # με κενό δίνει το ίδιο αποτέλεσμα με τον καθαρισμό ολόκληρου του κειμένου
+            return original_length, ' '.join(cleaned_parts)
             
         except Exception as e:
             raise Exception(f"Σφάλμα ανάγνωσης TXT: {e}")
@@ -172,15 +328,12 @@ class DocumentProcessor:
     def _extract_from_image(self, filepath: str) -> str:
         """Εξαγωγή κειμένου από εικόνα με OCR"""
         try:
-            # Άνοιγμα εικόνας
-            image = Image.open(filepath)
-            
-            # OCR με υποστήριξη ελληνικών και αγγλικών
-            text = pytesseract.image_to_string(
-                image, 
-                lang='ell+eng',
-                config='--psm 6'  # Uniform text block
-            )
+            # OCR σε process pool με προεπεξεργασία (grayscale, DPI, binarization)
+            start = time.perf_counter()
+            try:
+                text = self.ocr_engine.ocr_image(filepath)
+            finally:
+                self._add_ocr_time(time.perf_counter() - start)
             
             if not text.strip():
                 logger.warning(f"Δεν βρέθηκε κείμενο στην εικόνα: {filepath}")
@@ -190,6 +343,9 @@ class DocumentProcessor:
         except Exception as e:
             raise Exception(f"Σφάλμα OCR: {e}")
     
+    def _add_ocr_time(self, seconds: float):
+        self._timing.ocr_time = getattr(self._timing, 'ocr_time', 0.0) + seconds
+    
     def _clean_text(self, text: str) -> str:
         """Καθαρισμός κειμένου"""
         if not text:
@@ -0,0 +1,179 @@
+"""
+Document Exporter για AI Document Analyzer
+"""
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+from config import config
+from core.database import DatabaseManager
+from utils.helpers import module_available
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Το pyarrow φορτώνεται μόνο όταν ζητηθεί Parquet export
+PYARROW_AVAILABLE = module_available('pyarrow')
+
+EXPORT_FORMATS = ['csv', 'jsonl', 'parquet']
+
+EXPORT_COLUMNS = [
+    'analysis_id', 'document_id', 'filepath', 'filename', 'file_type', 'file_size',
+    'status', 'created_at', 'processed_at', 'summary', 'keywords', 'categories',
+    'sentiment_score', 'confidence_score', 'processing_time', 'tokens_per_second',
+    'analysis_tier', 'analyzed_at', 'duplicate_of'
+]
+
+class DocumentExporter:
+    """Streaming export αποτελεσμάτων ανάλυσης σε CSV, JSONL ή Parquet"""
+    
+    def __init__(self, db_manager: DatabaseManager = None):
+        self.db_manager = db_manager or DatabaseManager()
+        self.batch_size = config.EXPORT_BATCH_SIZE
+    
+    def columns(self, include_chunks: bool = False) -> List[str]:
+        return EXPORT_COLUMNS + (['content'] if include_chunks else [])
+    
+    def export(self, output_path: str, fmt: str = 'csv', name: str = None,
+               since_analysis_id: int = None, include_chunks: bool = False) -> Dict:
+        """
+        Export σε αρχείο
+        
+        Args:
+            output_path: Αρχείο εξόδου
+            fmt: csv, jsonl ή parquet
+            name: Όνομα incremental export - εξάγονται μόνο οι νέες αναλύσεις
+                  και το watermark ενημερώνεται μετά την επιτυχία
+            since_analysis_id: Ρητό watermark (υπερισχύει του αποθηκευμένου)
+            include_chunks: Προσθήκη του πλήρους κειμένου
+        
+        Returns:
+            Dict με success, rows, watermark, path και error
+        """
+        if fmt not in EXPORT_FORMATS:
+            return {'success': False, 'rows': 0, 'error': f"Μη υποστηριζόμενη μορφή export: {fmt}"}
+        if fmt == 'parquet' and not PYARROW_AVAILABLE:
+            return {'success': False, 'rows': 0, 'error': "Το export σε Parquet απαιτεί το πακέτο pyarrow"}
+        
+        if since_analysis_id is None:
+            since_analysis_id = self.db_manager.get_export_watermark(name) if name else 0
+        
+        output_path = Path(output_path)
+        temp_path = output_path.with_name(output_path.name + '.partial')
+        tracker = _WatermarkTracker(since_analysis_id)
+        records = tracker.track(self.db_manager.iter_export_rows(
+            since_analysis_id, include_chunks, self.batch_size))
+        
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if fmt == 'parquet':
+                self._write_parquet(temp_path, records, include_chunks)
+            else:
+                with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+                    for block in self.stream(fmt, records=records, include_chunks=include_chunks):
+                        file.write(block)
+            # Το αρχείο εμφανίζεται μόνο ολοκληρωμένο
+            temp_path.replace(output_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.error(f"Σφάλμα export: {e}")
+            return {'success': False, 'rows': tracker.rows, 'error': str(e)}
+        
+        if name:
+            self.db_manager.set_export_watermark(name, tracker.last_id, tracker.rows)
+        
+        logger.info(f"Export {tracker.rows} γραμμών σε {output_path} ({fmt})")
+        return {
+            'success': True,
+            'rows': tracker.rows,
+            'watermark': tracker.last_id,
+            'path': str(output_path),
+            'error': None
+        }
+    
+    def stream(self, fmt: str, records: Iterator[Dict] = None, since_analysis_id: int = 0,
+               include_chunks: bool = False) -> Iterator[str]:
+        """
+        Streaming CSV/JSONL σε κομμάτια κειμένου (για αρχείο ή HTTP response)
+        
+        Κάθε κομμάτι περιέχει έως batch_size γραμμές.
+        """
+        if records is None:
+            records = self.db_manager.iter_export_rows(since_analysis_id, include_chunks, self.batch_size)
+        
+        columns = self.columns(include_chunks)
+        buffer = io.StringIO()
+        writer = None
+        
+        if fmt == 'csv':
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+        elif fmt != 'jsonl':
+            raise ValueError(f"Η μορφή {fmt} δεν υποστηρίζει streaming")
+        
+        pending = 0
+        for record in records:
+            if writer is not None:
+                writer.writerow([self._csv_value(record.get(column)) for column in columns])
+            else:
+                buffer.write(json.dumps({column: record.get(column) for column in columns},
+                                        ensure_ascii=False, default=str))
+                buffer.write('\n')
+            
+            pending += 1
+            if pending >= self.batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    def _write_parquet(self, path: Path, records: Iterator[Dict], include_chunks: bool):
+        """Parquet με ένα row group ανά batch"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ('analysis_id', pa.int64()), ('document_id', pa.int64()),
+            ('filepath', pa.string()), ('filename', pa.string()), ('file_type', pa.string()),
+            ('file_size', pa.int64()), ('status', pa.string()),
+            ('created_at', pa.string()), ('processed_at', pa.string()),
+            ('summary', pa.string()),
+            ('keywords', pa.list_(pa.string())), ('categories', pa.list_(pa.string())),
+            ('sentiment_score', pa.float64()), ('confidence_score', pa.float64()),
+            ('processing_time', pa.float64()), ('tokens_per_second', pa.float64()),
+            ('analysis_tier', pa.string()), ('analyzed_at', pa.string()),
+            ('duplicate_of', pa.int64())
+        ] + ([('content', pa.string())] if include_chunks else []))
+        
+        with pq.ParquetWriter(str(path), schema, compression='zstd') as writer:
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    
+    def _csv_value(self, value):
+        """Λίστες ως κείμενο χωρισμένο με '; ' για CSV"""
+        if isinstance(value, list):
+            return '; '.join(str(item) for item in value)
+        return value
+
+class _WatermarkTracker:
+    """Μέτρηση γραμμών και μέγιστου analysis id κατά το streaming"""
+    
+    def __init__(self, start_id: int):
+        self.last_id = start_id or 0
+        self.rows = 0
+    
+    def track(self, records: Iterator[Dict]) -> Iterator[Dict]:
+        for record in records:
+            self.rows += 1
+            self.last_id = max(self.last_id, record['analysis_id'])
+            yield record
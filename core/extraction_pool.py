@@ -0,0 +1,220 @@
+"""
+Extraction Pool για AI Document Analyzer
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Dict, List, Optional
+from config import config
+from utils.logger import setup_logger
+from utils.metrics import EXTRACTION_WORKER_RESTARTS
+
+logger = setup_logger()
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _worker_main(conn, pool_workers: int):
+    """Κύριος βρόχος worker: εξαγωγή κειμένου για κάθε file_info που λαμβάνει"""
+    from core.document_processor import DocumentProcessor
+    
+    # Τα pools OCR/PDF του worker είναι παιδιά του: μετράνε στο όριο μνήμης και
+    # τερματίζονται μαζί του. Ένα daemon process δεν επιτρέπεται να έχει παιδιά.
+    multiprocessing.current_process().daemon = False
+    if hasattr(os, 'setpgrp'):
+        # Δική του process group: το kill() τερματίζει και τα pools χωρίς psutil
+        os.setpgrp()
+    processor = DocumentProcessor(use_process_pools=pool_workers > 1, pool_workers=pool_workers)
+    
+    try:
+        while True:
+            try:
+                file_info = conn.recv()
+            except (EOFError, KeyboardInterrupt):
+                break
+            
+            if file_info is None:
+                break
+            
+            conn.send(processor.process_document(file_info))
+    finally:
+        processor.shutdown(wait=True)
+
+class _Worker:
+    """Ένα worker process με το κανάλι επικοινωνίας του"""
+    
+    def __init__(self, context, pool_workers: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, pool_workers),
+                                       name="extraction-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+    
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory του worker και των παιδιών του (π.χ. tesseract)"""
+        try:
+            if psutil is not None:
+                process = psutil.Process(self.process.pid)
+                return sum(p.memory_info().rss for p in [process] + process.children(recursive=True))
+            
+            with open(f"/proc/{self.process.pid}/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except Exception:
+            return None
+    
+    def kill(self):
+        """Άμεσος τερματισμός worker και των παιδιών του"""
+        if psutil is not None:
+            try:
+                for child in psutil.Process(self.process.pid).children(recursive=True):
+                    child.kill()
+            except Exception:
+                pass
+        elif hasattr(os, 'killpg'):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+    
+    def close(self):
+        """Ομαλός τερματισμός worker"""
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=config.EXTRACTION_SHUTDOWN_TIMEOUT)
+        if self.process.is_alive():
+            self.kill()
+
+class ExtractionPool:
+    """Εξαγωγή κειμένου σε απομονωμένα processes με όριο χρόνου και μνήμης ανά έγγραφο"""
+    
+    def __init__(self, workers: int = None, timeout: float = None, max_rss_mb: int = None,
+                 pool_workers: int = None):
+        """
+        Args:
+            workers: Πλήθος worker processes (default: config.EXTRACTION_WORKERS)
+            timeout: Μέγιστος χρόνος ανά έγγραφο σε seconds
+            max_rss_mb: Μέγιστη μνήμη (RSS) ανά worker σε MB
+            pool_workers: Processes OCR/PDF ανά worker (default: config.EXTRACTION_POOL_WORKERS,
+                αλλιώς οι πυρήνες μοιρασμένοι στους workers)
+        """
+        self.workers = workers or config.EXTRACTION_WORKERS
+        self.pool_workers = (pool_workers or config.EXTRACTION_POOL_WORKERS
+                             or max(1, (os.cpu_count() or 1) // self.workers))
+        self.timeout = timeout or config.EXTRACTION_TIMEOUT
+        self.max_rss_bytes = (max_rss_mb or config.EXTRACTION_MAX_RSS_MB) * 1024 * 1024
+        self.poll_interval = 0.2
+        
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._lock = threading.Lock()
+    
+    def process_document(self, file_info: Dict) -> Dict:
+        """
+        Εξαγωγή κειμένου σε worker (ίδιο format αποτελέσματος με DocumentProcessor)
+        
+        Αν ο worker ξεπεράσει το όριο χρόνου ή μνήμης τερματίζεται, αντικαθίσταται
+        από νέο και το έγγραφο επιστρέφεται ως αποτυχημένο με την αιτία.
+        """
+        worker = self._acquire_worker()
+        start_time = time.monotonic()
+        
+        try:
+            worker.conn.send(file_info)
+            
+            while True:
+                if worker.conn.poll(self.poll_interval):
+                    result = worker.conn.recv()
+                    self._release_worker(worker)
+                    return result
+                
+                if not worker.process.is_alive():
+                    reason = (f"Ο worker εξαγωγής τερματίστηκε απροσδόκητα "
+                              f"(exit code {worker.process.exitcode})")
+                    return self._fail(worker, file_info, reason, 'crash')
+                
+                elapsed = time.monotonic() - start_time
+                if elapsed > self.timeout:
+                    reason = f"Υπέρβαση χρόνου εξαγωγής ({self.timeout:.0f}s)"
+                    return self._fail(worker, file_info, reason, 'timeout')
+                
+                rss = worker.rss_bytes()
+                if rss is not None and rss > self.max_rss_bytes:
+                    reason = (f"Υπέρβαση ορίου μνήμης εξαγωγής "
+                              f"({rss // (1024 * 1024)}MB > {self.max_rss_bytes // (1024 * 1024)}MB)")
+                    return self._fail(worker, file_info, reason, 'memory')
+        
+        except (EOFError, OSError, BrokenPipeError) as e:
+            return self._fail(worker, file_info, f"Σφάλμα επικοινωνίας με worker εξαγωγής: {e}", 'ipc')
+    
+    def _fail(self, worker: _Worker, file_info: Dict, reason: str, kind: str) -> Dict:
+        """Τερματισμός και αντικατάσταση worker, αποτέλεσμα αποτυχίας"""
+        logger.error(f"{reason}: {file_info['filename']}")
+        EXTRACTION_WORKER_RESTARTS.inc(reason=kind)
+        
+        worker.kill()
+        with self._lock:
+            if worker in self._all:
+                self._all.remove(worker)
+        self._replace_worker()
+        
+        return {
+            'success': False,
+            'original_text': '',
+            'cleaned_text': '',
+            'chunks': [],
+            'metadata': {},
+            'error': reason
+        }
+    
+    def _acquire_worker(self) -> _Worker:
+        """Idle worker ή νέος αν δεν έχει συμπληρωθεί το πλήθος"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if len(self._all) < self.workers:
+                worker = _Worker(self._context, self.pool_workers)
+                self._all.append(worker)
+                return worker
+        
+        return self._idle.get()
+    
+    def _release_worker(self, worker: _Worker):
+        self._idle.put(worker)
+    
+    def _replace_worker(self):
+        """Νέος worker στη θέση αυτού που τερματίστηκε"""
+        with self._lock:
+            if len(self._all) >= self.workers:
+                return
+            worker = _Worker(self._context, self.pool_workers)
+            self._all.append(worker)
+        self._idle.put(worker)
+    
+    def shutdown(self):
+        """Τερματισμός όλων των workers"""
+        with self._lock:
+            workers, self._all = self._all, []
+        
+        for worker in workers:
+            worker.close()
+        
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
@@ -2,8 +2,12 @@
 File Scanner για AI Document Analyzer
 """
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Generator
+from typing import List, Dict, Generator, Iterable, Optional, Set, Tuple
 import mimetypes
 from config import config
 from utils.logger import setup_logger
@@ -13,10 +17,15 @@ logger = setup_logger()
 class FileScanner:
     """Σάρωση και εντοπισμός αρχείων"""
     
+    # Cache εκτιμήσεων πλήθους αρχείων: (path, formats) -> (timestamp, estimate)
+    _estimate_cache: Dict[Tuple[str, frozenset], Tuple[float, Dict]] = {}
+    _estimate_cache_lock = threading.Lock()
+    
     def __init__(self):
         self.supported_formats = config.SUPPORTED_FORMATS
         self.max_file_size = config.MAX_FILE_SIZE
         self.max_depth = config.MAX_DEPTH
+        self.scan_workers = config.SCAN_WORKERS
     
     def scan_directory(self, directory_path: str, recursive: bool = True) -> Generator[Dict, None, None]:
         """
@@ -59,6 +68,133 @@ class FileScanner:
         except Exception as e:
             logger.error(f"Σφάλμα κατά τη σάρωση: {e}")
     
+    def scan_directories(self, directory_paths: Iterable[str], recursive: bool = True,
+                         max_workers: int = None) -> Generator[Dict, None, None]:
+        """
+        Παράλληλη σάρωση πολλών φακέλων με thread pool
+        
+        Κάθε listing φακέλου εκτελείται σε ξεχωριστό thread, ώστε σε network
+        shares ο συνολικός χρόνος να καθορίζεται από το παράλληλο I/O και όχι
+        από τα σειριακά round trips. Τα αποτελέσματα επιστρέφονται με τη σειρά
+        που ολοκληρώνονται τα listings.
+        
+        Args:
+            directory_paths: Μονοπάτια φακέλων (root folders)
+            recursive: Αν θα σαρώσει υποφακέλους
+            max_workers: Μέγεθος thread pool (default: config.SCAN_WORKERS)
+            
+        Yields:
+            Dict με πληροφορίες αρχείου
+        """
+        roots = self._resolve_roots(directory_paths)
+        if not roots:
+            return
+        
+        max_workers = max_workers or self.scan_workers
+        # Snapshot των ρυθμίσεων ώστε όλα τα threads να βλέπουν τις ίδιες τιμές
+        supported_formats = set(self.supported_formats)
+        
+        logger.info(f"Έναρξη παράλληλης σάρωσης {len(roots)} φακέλων "
+                    f"με {max_workers} threads")
+        
+        total_files = 0
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix="scanner") as executor:
+            pending = {
+                executor.submit(self._list_directory, root, supported_formats): 0
+                for root in roots
+            }
+            
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    
+                    for future in done:
+                        depth = pending.pop(future)
+                        files, subdirectories = future.result()
+                        
+                        # Fan out υποφακέλων πριν το yield, ώστε το pool να
+                        # δουλεύει όσο ο καταναλωτής επεξεργάζεται αρχεία
+                        if recursive:
+                            if depth + 1 < self.max_depth:
+                                for subdirectory in subdirectories:
+                                    next_future = executor.submit(
+                                        self._list_directory, subdirectory, supported_formats
+                                    )
+                                    pending[next_future] = depth + 1
+                            elif subdirectories:
+                                logger.warning(f"Συμπλήρωση μέγιστου βάθους ({self.max_depth}) "
+                                               f"σε: {subdirectories[0].parent}")
+                        
+                        for file_info in files:
+                            total_files += 1
+                            yield file_info
+            finally:
+                # Αν ο καταναλωτής σταματήσει νωρίς, ακύρωση όσων δεν ξεκίνησαν
+                for future in pending:
+                    future.cancel()
+        
+        logger.info(f"Παράλληλη σάρωση ολοκληρώθηκε. Βρέθηκαν {total_files} αρχεία")
+    
+    def _resolve_roots(self, directory_paths: Iterable[str]) -> List[Path]:
+        """Επικύρωση root φακέλων και αφαίρεση διπλότυπων/εμφωλευμένων"""
+        roots = []
+        seen: Set[Path] = set()
+        
+        for directory_path in directory_paths:
+            if not directory_path or not str(directory_path).strip():
+                continue
+            
+            directory = Path(str(directory_path).strip())
+            if not directory.exists():
+                logger.error(f"Ο φάκελος δεν υπάρχει: {directory_path}")
+                continue
+            if not directory.is_dir():
+                logger.error(f"Το μονοπάτι δεν είναι φάκελος: {directory_path}")
+                continue
+            
+            # Το resolve() χρησιμοποιείται μόνο για σύγκριση, ώστε τα filepaths
+            # να μένουν όπως τα έδωσε ο χρήστης (π.χ. mapped drives)
+            resolved = directory.resolve()
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            roots.append((resolved, directory.absolute()))
+        
+        # Αν ένας root είναι υποφάκελος άλλου, σαρώνεται ήδη από τον γονικό
+        return [root for resolved, root in roots
+                if not any(other in resolved.parents for other, _ in roots)]
+    
+    def _list_directory(self, directory: Path, supported_formats: Set[str]) -> Tuple[List[Dict], List[Path]]:
+        """Listing ενός φακέλου: υποστηριζόμενα αρχεία και μη κρυφοί υποφάκελοι"""
+        files = []
+        subdirectories = []
+        
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectory = Path(entry.path)
+                            if not self._is_hidden_directory(subdirectory):
+                                subdirectories.append(subdirectory)
+                        elif entry.is_file():
+                            # Φθηνός έλεγχος επέκτασης πριν το stat
+                            if os.path.splitext(entry.name)[1].lower() not in supported_formats:
+                                continue
+                            file_info = self._get_file_info(Path(entry.path))
+                            if file_info and self._is_supported_file(file_info, supported_formats):
+                                files.append(file_info)
+                    except OSError as e:
+                        logger.warning(f"Δεν μπόρεσα να διαβάσω το {entry.path}: {e}")
+                        
+        except PermissionError:
+            logger.warning(f"Δεν υπάρχει άδεια πρόσβασης στον φάκελο: {directory}")
+        except Exception as e:
+            logger.error(f"Σφάλμα ανάγνωσης φακέλου {directory}: {e}")
+        
+        return files, subdirectories
+    
     def _scan_recursive(self, directory: Path, current_depth: int) -> Generator[Dict, None, None]:
         """Recursive σάρωση φακέλου"""
         if current_depth >= self.max_depth:
@@ -124,10 +260,13 @@ class FileScanner:
         except Exception:
             return 'unknown'
     
-    def _is_supported_file(self, file_info: Dict) -> bool:
+    def _is_supported_file(self, file_info: Dict, supported_formats: Set[str] = None) -> bool:
         """Έλεγχος αν το αρχείο υποστηρίζεται"""
+        if supported_formats is None:
+            supported_formats = self.supported_formats
+        
         # Έλεγχος επέκτασης
-        if file_info['file_extension'] not in self.supported_formats:
+        if file_info['file_extension'] not in supported_formats:
             return False
         
         # Έλεγχος μεγέθους
@@ -184,7 +323,79 @@ class FileScanner:
         
         return stats
     
-    def validate_directory(self, directory_path: str) -> Dict:
+    def estimate_file_count(self, directory_path: str, max_entries: int = None,
+                            time_budget: float = None,
+                            cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Φθηνή εκτίμηση πλήθους υποστηριζόμενων αρχείων
+        
+        Η σάρωση γίνεται breadth-first και σταματά μόλις εξαντληθεί ο
+        προϋπολογισμός entries ή χρόνου, ή όταν ακυρωθεί μέσω cancel_event.
+        Σε αυτή την περίπτωση το 'count' είναι κάτω όριο ('truncated': True).
+        Τα ολοκληρωμένα αποτελέσματα αποθηκεύονται σε cache με TTL.
+        
+        Args:
+            directory_path: Μονοπάτι φακέλου
+            max_entries: Μέγιστος αριθμός entries (default: config.VALIDATION_MAX_ENTRIES)
+            time_budget: Μέγιστος χρόνος σε seconds (default: config.VALIDATION_TIME_BUDGET)
+            cancel_event: Event για ακύρωση (π.χ. όταν ο χρήστης συνεχίζει να πληκτρολογεί)
+            
+        Returns:
+            Dict με count, truncated, cancelled, error
+        """
+        max_entries = max_entries or config.VALIDATION_MAX_ENTRIES
+        time_budget = time_budget or config.VALIDATION_TIME_BUDGET
+        supported_formats = frozenset(self.supported_formats)
+        cache_key = (os.path.normcase(os.path.abspath(directory_path)), supported_formats)
+        
+        with self._estimate_cache_lock:
+            cached = self._estimate_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < config.VALIDATION_CACHE_TTL:
+                return dict(cached[1])
+        
+        estimate = {'count': 0, 'truncated': False, 'cancelled': False, 'error': None}
+        deadline = time.monotonic() + time_budget
+        entries_seen = 0
+        queue = deque([(Path(directory_path), 0)])
+        
+        try:
+            while queue:
+                directory, depth = queue.popleft()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            entries_seen += 1
+                            if (entries_seen >= max_entries or time.monotonic() >= deadline
+                                    or (cancel_event is not None and cancel_event.is_set())):
+                                estimate['truncated'] = True
+                                estimate['cancelled'] = cancel_event is not None and cancel_event.is_set()
+                                break
+                            
+                            if entry.is_dir(follow_symlinks=False):
+                                # Ίδιοι κανόνες με το scan_directories για τους φακέλους που μετράνε
+                                subdirectory = Path(entry.path)
+                                if depth + 1 < self.max_depth and not self._is_hidden_directory(subdirectory):
+                                    queue.append((subdirectory, depth + 1))
+                            elif os.path.splitext(entry.name)[1].lower() in supported_formats:
+                                estimate['count'] += 1
+                except PermissionError:
+                    continue
+                
+                if estimate['truncated']:
+                    break
+        
+        except Exception as e:
+            estimate['error'] = str(e)
+        
+        # Cache μόνο για ολοκληρωμένες ή χρονικά κομμένες εκτιμήσεις
+        if not estimate['cancelled'] and not estimate['error']:
+            with self._estimate_cache_lock:
+                self._estimate_cache[cache_key] = (time.monotonic(), dict(estimate))
+        
+        return estimate
+    
+    def validate_directory(self, directory_path: str,
+                           cancel_event: Optional[threading.Event] = None) -> Dict:
         """Επικύρωση φακέλου πριν τη σάρωση"""
         validation = {
             'is_valid': False,
@@ -192,6 +403,7 @@ class FileScanner:
             'is_directory': False,
             'is_readable': False,
             'estimated_files': 0,
+            'estimate_truncated': False,
             'warnings': []
         }
         
@@ -215,16 +427,17 @@ class FileScanner:
             validation['warnings'].append(f"Δεν υπάρχει άδεια ανάγνωσης: {directory_path}")
             return validation
         
-        # Εκτίμηση αριθμού αρχείων
-        try:
-            file_count = sum(1 for _ in directory.rglob('*') if _.is_file())
-            validation['estimated_files'] = file_count
-            
-            if file_count > 10000:
-                validation['warnings'].append(f"Μεγάλος αριθμός αρχείων ({file_count}). Η επεξεργασία μπορεί να πάρει χρόνο.")
+        # Εκτίμηση αριθμού αρχείων (με όριο χρόνου/entries)
+        estimate = self.estimate_file_count(directory_path, cancel_event=cancel_event)
+        validation['estimated_files'] = estimate['count']
+        validation['estimate_truncated'] = estimate['truncated']
         
-        except Exception as e:
-            validation['warnings'].append(f"Δεν μπόρεσα να εκτιμήσω τον αριθμό αρχείων: {e}")
+        # Η εκτίμηση σταματά στο VALIDATION_MAX_ENTRIES: μεγάλος φάκελος σημαίνει κομμένη εκτίμηση
+        if estimate['error']:
+            validation['warnings'].append(f"Δεν μπόρεσα να εκτιμήσω τον αριθμό αρχείων: {estimate['error']}")
+        elif estimate['truncated'] and not estimate['cancelled']:
+            validation['warnings'].append(f"Μεγάλος φάκελος (≥{estimate['count']} αρχεία). "
+                                          f"Η επεξεργασία μπορεί να πάρει χρόνο.")
         
         validation['is_valid'] = (validation['exists'] and 
                                 validation['is_directory'] and 
@@ -0,0 +1,236 @@
+"""
+File Watcher για AI Document Analyzer
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from config import config
+from core.file_scanner import FileScanner
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+try:
+    # Το watchdog χρησιμοποιεί inotify σε Linux και ReadDirectoryChangesW σε Windows
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+class _EventHandler(FileSystemEventHandler):
+    """Προώθηση filesystem events στον FileWatcher"""
+    
+    def __init__(self, watcher: 'FileWatcher'):
+        super().__init__()
+        self.watcher = watcher
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.dest_path)
+
+class FileWatcher:
+    """Συνεχής παρακολούθηση φακέλων για νέα και τροποποιημένα αρχεία"""
+    
+    def __init__(self, file_scanner: FileScanner, on_files: Callable[[List[Dict]], None],
+                 debounce: float = None, poll_interval: float = None,
+                 use_native: bool = True):
+        """
+        Args:
+            file_scanner: Scanner για φιλτράρισμα και πληροφορίες αρχείων
+            on_files: Callback που δέχεται batch από file_info των αλλαγμένων αρχείων
+            debounce: Χρόνος ησυχίας (s) πριν ένα αρχείο θεωρηθεί σταθερό
+            poll_interval: Διάστημα (s) για το polling fallback
+            use_native: Χρήση native events (inotify) όταν είναι διαθέσιμα
+        """
+        self.file_scanner = file_scanner
+        self.on_files = on_files
+        self.debounce = debounce if debounce is not None else config.WATCH_DEBOUNCE
+        self.poll_interval = poll_interval if poll_interval is not None else config.WATCH_POLL_INTERVAL
+        self.use_native = use_native and WATCHDOG_AVAILABLE
+        
+        self.roots: List[Path] = []
+        self.recursive = True
+        self.backend = None
+        
+        # filepath -> χρόνος τελευταίου event (coalescing επαναλαμβανόμενων αλλαγών)
+        self._pending: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+        # filepath -> (mtime, size) για το polling και για αγνόηση "κενών" events
+        self._snapshot: Dict[str, Tuple[float, int]] = {}
+    
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads) and not self._stop_event.is_set()
+    
+    def start(self, directory_paths: Iterable[str], recursive: bool = True):
+        """Έναρξη παρακολούθησης φακέλων"""
+        if self.is_running:
+            logger.warning("Ο file watcher τρέχει ήδη")
+            return
+        
+        self.roots = [Path(path).absolute() for path in directory_paths if Path(path).is_dir()]
+        if not self.roots:
+            logger.error("Δεν βρέθηκαν έγκυροι φάκελοι για παρακολούθηση")
+            return
+        
+        self.recursive = recursive
+        self._stop_event.clear()
+        
+        # Αρχικό snapshot: τα υπάρχοντα αρχεία δεν θεωρούνται αλλαγές
+        self._snapshot = {
+            info['filepath']: (info['modified_time'], info['file_size'])
+            for info in self.file_scanner.scan_directories([str(root) for root in self.roots], recursive)
+        }
+        
+        if self.use_native:
+            self.backend = 'native'
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for root in self.roots:
+                self._observer.schedule(handler, str(root), recursive=recursive)
+            self._observer.start()
+        else:
+            self.backend = 'polling'
+            self._start_thread(self._poll_loop, "watcher-poll")
+        
+        self._start_thread(self._dispatch_loop, "watcher-dispatch")
+        
+        logger.info(f"Παρακολούθηση {len(self.roots)} φακέλων ({self.backend}, "
+                    f"debounce {self.debounce}s)")
+    
+    def stop(self):
+        """Διακοπή παρακολούθησης"""
+        self._stop_event.set()
+        
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+        self._threads = []
+        
+        with self._pending_lock:
+            self._pending.clear()
+        
+        logger.info("Η παρακολούθηση φακέλων σταμάτησε")
+    
+    def notify(self, filepath: str):
+        """Καταγραφή event για αρχείο (debounce με ανανέωση του χρόνου)"""
+        if not self._is_watched_path(Path(filepath)):
+            return
+        
+        with self._pending_lock:
+            self._pending[str(Path(filepath).absolute())] = time.monotonic()
+    
+    def _start_thread(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+    
+    def _is_watched_path(self, path: Path) -> bool:
+        """Έλεγχος επέκτασης, κρυφών φακέλων και βάθους όπως στον FileScanner"""
+        if path.suffix.lower() not in self.file_scanner.supported_formats:
+            return False
+        
+        for root in self.roots:
+            try:
+                relative = path.absolute().relative_to(root)
+            except ValueError:
+                continue
+            
+            directories = relative.parts[:-1]
+            if any(part.startswith('.') for part in directories):
+                return False
+            if not self.recursive:
+                return not directories
+            return len(directories) < self.file_scanner.max_depth
+        
+        return False
+    
+    def _poll_loop(self):
+        """Polling fallback: σύγκριση mtime/size με το προηγούμενο snapshot"""
+        # Τελευταία υπογραφή που είδε το polling, ώστε ένα αμετάβλητο αρχείο
+        # να μην ανανεώνει συνεχώς το debounce πριν σταλεί
+        last_seen = dict(self._snapshot)
+        
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                roots = [str(root) for root in self.roots]
+                for info in self.file_scanner.scan_directories(roots, self.recursive):
+                    signature = (info['modified_time'], info['file_size'])
+                    if last_seen.get(info['filepath']) != signature:
+                        last_seen[info['filepath']] = signature
+                        self.notify(info['filepath'])
+            except Exception as e:
+                logger.error(f"Σφάλμα polling φακέλων: {e}")
+    
+    def _dispatch_loop(self):
+        """Αποστολή των αρχείων που δεν άλλαξαν για διάστημα debounce"""
+        tick = max(0.1, self.debounce / 2)
+        
+        while not self._stop_event.wait(tick):
+            ready = self._collect_ready()
+            if not ready:
+                continue
+            
+            try:
+                self.on_files(ready)
+            except Exception as e:
+                logger.error(f"Σφάλμα επεξεργασίας αλλαγμένων αρχείων: {e}")
+    
+    def _collect_ready(self) -> List[Dict]:
+        """Αρχεία χωρίς νέα events για debounce seconds, που άλλαξαν πράγματι"""
+        now = time.monotonic()
+        with self._pending_lock:
+            paths = [path for path, last_event in self._pending.items()
+                     if now - last_event >= self.debounce]
+            for path in paths:
+                del self._pending[path]
+        
+        ready = []
+        for path in paths:
+            file_info = self.file_scanner._get_file_info(Path(path))
+            if not file_info or not self.file_scanner._is_supported_file(file_info):
+                continue
+            
+            signature = (file_info['modified_time'], file_info['file_size'])
+            if self._snapshot.get(path) == signature:
+                continue  # π.χ. μόνο αλλαγή metadata/access
+            
+            self._snapshot[path] = signature
+            ready.append(file_info)
+        
+        if ready:
+            logger.info(f"Εντοπίστηκαν {len(ready)} νέα/τροποποιημένα αρχεία")
+        
+        return ready
+    
+    def get_status(self) -> Dict:
+        """Κατάσταση watcher για το UI"""
+        with self._pending_lock:
+            pending = len(self._pending)
+        
+        return {
+            'running': self.is_running,
+            'backend': self.backend,
+            'roots': [str(root) for root in self.roots],
+            'pending': pending
+        }
@@ -0,0 +1,137 @@
+"""
+Τοπική ανάλυση εγγράφων (χωρίς LLM) για AI Document Analyzer
+
+Για μικρά ή απλά έγγραφα οι τέσσερις κλήσεις στο Ollama κοστίζουν δευτερόλεπτα
+για αποτέλεσμα που βγαίνει και με κανόνες σε λίγα ms: λέξεις-κλειδιά με TF-IDF
+(οι προτάσεις του εγγράφου ως συλλογή), συναίσθημα από λεξικό, κατηγορίες από
+λέξεις-ενδείξεις και εξαγωγική περίληψη. Το αποτέλεσμα έχει τη μορφή του
+LlamaClient.comprehensive_analysis, με confidence που αποφασίζει αν η ανάλυση
+κλιμακώνεται στο LLM.
+"""
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+from config import config
+from core.text_search import fold_search_text, stem_term
+from utils.helpers import CATEGORY_KEYWORDS, STOP_WORDS
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+_SENTENCE_RE = re.compile(r'(?<=[.!;?·])\s+|\n{2,}')
+
+# Λεξικό συναισθήματος (ελληνικά και αγγλικά)
+POSITIVE_WORDS = [
+    'καλός', 'εξαιρετικός', 'θετικός', 'επιτυχία', 'ικανοποίηση', 'ευχαριστώ', 'συγχαρητήρια',
+    'βελτίωση', 'κέρδος', 'ανάπτυξη', 'χαρά', 'άριστος', 'αποτελεσματικός', 'συμφωνία',
+    'good', 'great', 'excellent', 'success', 'improve', 'thanks', 'happy'
+]
+NEGATIVE_WORDS = [
+    'κακός', 'αρνητικός', 'πρόβλημα', 'αποτυχία', 'καθυστέρηση', 'ζημιά', 'παράπονο',
+    'λάθος', 'κίνδυνος', 'απώλεια', 'καταγγελία', 'ακύρωση', 'ελλιπής', 'διαφωνία',
+    'bad', 'poor', 'problem', 'failure', 'delay', 'loss', 'risk', 'complaint'
+]
+
+# Όσες ενδείξεις κατηγορίας δίνουν πλήρη βεβαιότητα
+_FULL_CONFIDENCE_HITS = 3
+
+def _prefix_pattern(words: List[str]) -> re.Pattern:
+    """Regex που βρίσκει όλους τους τύπους των λέξεων (θέμα + οποιαδήποτε κατάληξη)"""
+    stems = sorted({stem_term(fold_search_text(word)) for word in words}, key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, stems)) + r')\w*')
+
+_CATEGORY_PATTERNS = {category: _prefix_pattern(words) for category, words in CATEGORY_KEYWORDS.items()}
+_POSITIVE_PATTERN = _prefix_pattern(POSITIVE_WORDS)
+_NEGATIVE_PATTERN = _prefix_pattern(NEGATIVE_WORDS)
+_STOP_WORDS = {fold_search_text(word) for word in STOP_WORDS}
+
+class LocalAnalyzer:
+    """Ανάλυση με κανόνες και TF-IDF, χωρίς κλήσεις στο model"""
+    
+    def __init__(self, max_keywords: int = 10):
+        self.max_keywords = max_keywords
+    
+    def analyze(self, text: str) -> Dict:
+        """
+        Περίληψη, λέξεις-κλειδιά, κατηγορίες και συναίσθημα
+        
+        Returns:
+            Dict όπως το LlamaClient.comprehensive_analysis, με επιπλέον word_count
+        """
+        start_time = time.perf_counter()
+        folded = fold_search_text(text or '')
+        sentences = [sentence for sentence in _SENTENCE_RE.split((text or '').strip()) if sentence.strip()]
+        
+        categories, top_hits = self._categorize(folded)
+        positive = sum(1 for _ in _POSITIVE_PATTERN.finditer(folded))
+        negative = sum(1 for _ in _NEGATIVE_PATTERN.finditer(folded))
+        
+        return {
+            'success': True,
+            'summary': self._summarize(sentences),
+            'keywords': self._keywords(sentences),
+            'categories': categories,
+            'sentiment_score': round((positive - negative) / (positive + negative + 1), 2),
+            'confidence_score': round(0.4 + 0.6 * min(1.0, top_hits / _FULL_CONFIDENCE_HITS), 2),
+            'word_count': sum(1 for _ in _WORD_RE.finditer(folded)),
+            'processing_time': time.perf_counter() - start_time,
+            'errors': []
+        }
+    
+    def needs_llm(self, result: Dict) -> bool:
+        """Κλιμάκωση στο LLM: μεγάλο έγγραφο ή χαμηλό confidence (εκτός από τα πολύ μικρά)"""
+        if result['word_count'] <= config.LOCAL_ANALYSIS_TRIVIAL_WORDS:
+            return False
+        return (result['word_count'] > config.LOCAL_ANALYSIS_MAX_WORDS
+                or result['confidence_score'] < config.LOCAL_ANALYSIS_MIN_CONFIDENCE)
+    
+    def _keywords(self, sentences: List[str]) -> List[str]:
+        """
+        TF-IDF με τις προτάσεις ως έγγραφα: ο όρος βαθμολογείται με τη συχνότητά
+        του, με έκπτωση όσο περισσότερες προτάσεις τον περιέχουν
+        """
+        terms, sentence_ids, surface_forms = [], [], {}
+        for sentence_id, sentence in enumerate(sentences):
+            for match in _WORD_RE.finditer(sentence.lower()):
+                word = match.group()
+                term = fold_search_text(word)
+                if len(term) <= 3 or term in _STOP_WORDS:
+                    continue
+                terms.append(term)
+                sentence_ids.append(sentence_id)
+                surface_forms.setdefault(term, Counter())[word] += 1
+        if not terms:
+            return []
+        
+        vocabulary, term_ids = np.unique(np.array(terms), return_inverse=True)
+        term_frequency = np.bincount(term_ids, minlength=len(vocabulary))
+        # Μοναδικά ζεύγη (πρόταση, όρος) -> σε πόσες προτάσεις εμφανίζεται ο όρος
+        pairs = np.unique(np.array(sentence_ids, dtype=np.int64) * len(vocabulary) + term_ids)
+        document_frequency = np.bincount(pairs % len(vocabulary), minlength=len(vocabulary))
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+        scores = term_frequency * idf
+        
+        # Σταθερή ταξινόμηση: σε ισοβαθμία προηγείται ο αλφαβητικά πρώτος όρος
+        top = np.argsort(-scores, kind='stable')[:self.max_keywords]
+        return [surface_forms[vocabulary[index]].most_common(1)[0][0] for index in top]
+    
+    def _categorize(self, folded: str) -> Tuple[List[str], int]:
+        """Έως 3 κατηγορίες με τις περισσότερες ενδείξεις και οι ενδείξεις της πρώτης"""
+        hits = {category: sum(1 for _ in pattern.finditer(folded))
+                for category, pattern in _CATEGORY_PATTERNS.items()}
+        ranked = sorted((category for category in hits if hits[category]), key=lambda c: -hits[c])
+        if not ranked:
+            return ['Άλλο'], 0
+        return ranked[:3], hits[ranked[0]]
+    
+    def _summarize(self, sentences: List[str]) -> str:
+        """Εξαγωγική περίληψη: οι πρώτες προτάσεις μέχρι LOCAL_SUMMARY_CHARS"""
+        summary = ''
+        for sentence in sentences:
+            sentence = ' '.join(sentence.split())
+            if summary and len(summary) + len(sentence) + 1 > config.LOCAL_SUMMARY_CHARS:
+                break
+            summary = f"{summary} {sentence}".strip()
+        if len(summary) > config.LOCAL_SUMMARY_CHARS:
+            summary = summary[:config.LOCAL_SUMMARY_CHARS].rsplit(' ', 1)[0] + '...'
+        return summary
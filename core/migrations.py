@@ -0,0 +1,547 @@
+"""
+Database Migrations για AI Document Analyzer
+
+Κάθε migration έχει αριθμό έκδοσης και εφαρμόζεται μία φορά, σε δικό της
+transaction. Η τρέχουσα έκδοση του schema αποθηκεύεται στο PRAGMA user_version.
+"""
+import sqlite3
+from typing import Callable, List, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+def _migrate_v1_base_schema(conn: sqlite3.Connection):
+    """Βασικό schema (idempotent: οι databases πριν το versioning έχουν ήδη μέρος του)"""
+    # Table για documents
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filepath TEXT UNIQUE NOT NULL,
+            filename TEXT NOT NULL,
+            file_size INTEGER,
+            file_type TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            modified_at TIMESTAMP,
+            processed_at TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            error_message TEXT
+        )
+    ''')
+    
+    # Table για AI analysis results
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id INTEGER,
+            summary TEXT,
+            keywords TEXT,  -- JSON array
+            categories TEXT,  -- JSON array
+            sentiment_score REAL,
+            confidence_score REAL,
+            processing_time REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (document_id) REFERENCES documents (id)
+        )
+    ''')
+    
+    # Table για document content chunks
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS document_chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id INTEGER,
+            chunk_index INTEGER,
+            content TEXT,
+            word_count INTEGER,
+            content_blob BLOB,  -- συμπιεσμένο περιεχόμενο (content = NULL)
+            compression TEXT,  -- 'zlib', 'zlib:<dict_id>', 'zstd:<dict_id>' ή NULL
+            raw_size INTEGER,  -- bytes UTF-8 του ασυμπίεστου κειμένου
+            FOREIGN KEY (document_id) REFERENCES documents (id)
+        )
+    ''')
+    
+    # Υπάρχουσες databases: προσθήκη των στηλών συμπίεσης
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(document_chunks)")}
+    for column, column_type in [('content_blob', 'BLOB'), ('compression', 'TEXT'),
+                                ('raw_size', 'INTEGER')]:
+        if column not in existing_columns:
+            conn.execute(f"ALTER TABLE document_chunks ADD COLUMN {column} {column_type}")
+    
+    # Κοινά dictionaries συμπίεσης chunks
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS compression_dicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            algorithm TEXT NOT NULL,
+            dictionary BLOB NOT NULL,
+            sample_count INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Table για υπογραφές περιεχομένου (deduplication)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS document_signatures (
+            document_id INTEGER PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            minhash BLOB,
+            FOREIGN KEY (document_id) REFERENCES documents (id)
+        )
+    ''')
+    
+    # Table για ομάδες διπλότυπων εγγράφων
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS document_duplicates (
+            document_id INTEGER PRIMARY KEY,
+            canonical_id INTEGER NOT NULL,
+            similarity REAL,
+            match_type TEXT,  -- 'exact' ή 'near'
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (document_id) REFERENCES documents (id),
+            FOREIGN KEY (canonical_id) REFERENCES documents (id)
+        )
+    ''')
+    
+    # Indexes για καλύτερη απόδοση
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_status ON documents(status)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_filepath ON documents(filepath)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_document_id ON analysis_results(document_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_signatures_content_hash ON document_signatures(content_hash)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_duplicates_canonical_id ON document_duplicates(canonical_id)')
+
+def _rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str, columns: List[str],
+                   where: str):
+    """Αναδημιουργία table με νέο ορισμό (τα orphan rows δεν αντιγράφονται)"""
+    column_list = ', '.join(columns)
+    conn.execute(create_sql.format(table=f"{table}_new"))
+    conn.execute(f"INSERT INTO {table}_new ({column_list}) SELECT {column_list} FROM {table} WHERE {where}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+def _migrate_v2_cascade_deletes(conn: sqlite3.Connection):
+    """ON DELETE CASCADE στα tables που εξαρτώνται από documents"""
+    existing_document = "document_id IN (SELECT id FROM documents)"
+    
+    _rebuild_table(conn, 'analysis_results', '''
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id INTEGER NOT NULL,
+            summary TEXT,
+            keywords TEXT,  -- JSON array
+            categories TEXT,  -- JSON array
+            sentiment_score REAL,
+            confidence_score REAL,
+            processing_time REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''', ['id', 'document_id', 'summary', 'keywords', 'categories', 'sentiment_score',
+          'confidence_score', 'processing_time', 'created_at'], existing_document)
+    
+    _rebuild_table(conn, 'document_chunks', '''
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id INTEGER NOT NULL,
+            chunk_index INTEGER,
+            content TEXT,
+            word_count INTEGER,
+            content_blob BLOB,  -- συμπιεσμένο περιεχόμενο (content = NULL)
+            compression TEXT,  -- 'zlib', 'zlib:<dict_id>', 'zstd:<dict_id>' ή NULL
+            raw_size INTEGER,  -- bytes UTF-8 του ασυμπίεστου κειμένου
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''', ['id', 'document_id', 'chunk_index', 'content', 'word_count', 'content_blob',
+          'compression', 'raw_size'], existing_document)
+    
+    _rebuild_table(conn, 'document_signatures', '''
+        CREATE TABLE {table} (
+            document_id INTEGER PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            minhash BLOB,
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''', ['document_id', 'content_hash', 'minhash'], existing_document)
+    
+    _rebuild_table(conn, 'document_duplicates', '''
+        CREATE TABLE {table} (
+            document_id INTEGER PRIMARY KEY,
+            canonical_id INTEGER NOT NULL,
+            similarity REAL,
+            match_type TEXT,  -- 'exact' ή 'near'
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE,
+            FOREIGN KEY (canonical_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''', ['document_id', 'canonical_id', 'similarity', 'match_type', 'created_at'],
+        existing_document + " AND canonical_id IN (SELECT id FROM documents)")
+    
+    # Τα indexes διαγράφονται μαζί με τα παλιά tables
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_document_id ON analysis_results(document_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_signatures_content_hash ON document_signatures(content_hash)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_duplicates_canonical_id ON document_duplicates(canonical_id)')
+    
+    violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+    if violations:
+        raise sqlite3.IntegrityError(f"Παραβιάσεις foreign keys μετά την αναδημιουργία: {len(violations)}")
+
+def _migrate_v3_query_indexes(conn: sqlite3.Connection):
+    """Indexes για τα πραγματικά queries (ταξινόμηση, φίλτρα, chunks ανά έγγραφο)"""
+    # Chunks με τη σειρά τους για reanalyze_document και το join της αναζήτησης
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_chunks_document_chunk ON document_chunks(document_id, chunk_index)')
+    
+    # get_documents: φίλτρο status και ταξινόμηση κατά created_at με ένα index
+    conn.execute('DROP INDEX IF EXISTS idx_documents_status')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_status_created ON documents(status, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents(created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_file_type ON documents(file_type)')
+    
+    # Διπλότυπο του UNIQUE autoindex στο filepath
+    conn.execute('DROP INDEX IF EXISTS idx_documents_filepath')
+
+def rebuild_stat_counters(conn: sqlite3.Connection):
+    """Υπολογισμός όλων των counters από την αρχή (αρχικοποίηση ή διόρθωση απόκλισης)"""
+    # Το scope 'meta' (π.χ. data_version) δεν προκύπτει από τα δεδομένα και διατηρείται
+    conn.execute("DELETE FROM stat_counters WHERE scope != 'meta'")
+    conn.execute('''
+        INSERT INTO stat_counters (scope, key, value)
+        SELECT 'total', 'documents', COUNT(*) FROM documents
+        UNION ALL
+        SELECT 'total', 'bytes', COALESCE(SUM(file_size), 0) FROM documents
+        UNION ALL
+        SELECT 'analysis', 'count', COUNT(*) FROM analysis_results
+        UNION ALL
+        SELECT 'analysis', 'processing_time', COALESCE(SUM(processing_time), 0) FROM analysis_results
+    ''')
+    conn.execute('''
+        INSERT INTO stat_counters (scope, key, value)
+        SELECT 'status', COALESCE(status, ''), COUNT(*) FROM documents GROUP BY COALESCE(status, '')
+    ''')
+    conn.execute('''
+        INSERT INTO stat_counters (scope, key, value)
+        SELECT 'type', COALESCE(file_type, ''), COUNT(*) FROM documents GROUP BY COALESCE(file_type, '')
+    ''')
+
+def _counter_upsert(scope: str, key: str, delta: str) -> str:
+    """SQL για πρόσθεση delta σε counter (μέσα σε trigger)"""
+    return (f"INSERT INTO stat_counters (scope, key, value) VALUES ('{scope}', {key}, {delta}) "
+            f"ON CONFLICT (scope, key) DO UPDATE SET value = value + excluded.value;")
+
+def _migrate_v4_stat_counters(conn: sqlite3.Connection):
+    """Προϋπολογισμένα στατιστικά, ενημερώνονται από triggers στο ίδιο transaction"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS stat_counters (
+            scope TEXT NOT NULL,  -- 'total', 'status', 'type', 'analysis'
+            key TEXT NOT NULL,
+            value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    ''')
+    
+    document_added = ' '.join([
+        _counter_upsert('total', "'documents'", '1'),
+        _counter_upsert('total', "'bytes'", 'COALESCE(NEW.file_size, 0)'),
+        _counter_upsert('status', "COALESCE(NEW.status, '')", '1'),
+        _counter_upsert('type', "COALESCE(NEW.file_type, '')", '1'),
+    ])
+    document_removed = ' '.join([
+        _counter_upsert('total', "'documents'", '-1'),
+        _counter_upsert('total', "'bytes'", '-COALESCE(OLD.file_size, 0)'),
+        _counter_upsert('status', "COALESCE(OLD.status, '')", '-1'),
+        _counter_upsert('type', "COALESCE(OLD.file_type, '')", '-1'),
+    ])
+    
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_documents_stats_insert AFTER INSERT ON documents "
+                 f"BEGIN {document_added} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_documents_stats_delete AFTER DELETE ON documents "
+                 f"BEGIN {document_removed} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_documents_stats_update "
+                 f"AFTER UPDATE OF status, file_type, file_size ON documents "
+                 f"BEGIN {document_removed} {document_added} END")
+    
+    analysis_added = ' '.join([
+        _counter_upsert('analysis', "'count'", '1'),
+        _counter_upsert('analysis', "'processing_time'", 'COALESCE(NEW.processing_time, 0)'),
+    ])
+    analysis_removed = ' '.join([
+        _counter_upsert('analysis', "'count'", '-1'),
+        _counter_upsert('analysis', "'processing_time'", '-COALESCE(OLD.processing_time, 0)'),
+    ])
+    
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_analysis_stats_insert AFTER INSERT ON analysis_results "
+                 f"BEGIN {analysis_added} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_analysis_stats_delete AFTER DELETE ON analysis_results "
+                 f"BEGIN {analysis_removed} END")
+    
+    rebuild_stat_counters(conn)
+
+def _migrate_v5_data_version(conn: sqlite3.Connection):
+    """Μετρητής έκδοσης δεδομένων για ακύρωση cache (αλλάζει σε κάθε εγγραφή)"""
+    # Το PRAGMA data_version δεν αρκεί: αλλάζει μόνο για commits άλλων συνδέσεων
+    # και η εφαρμογή ανοίγει νέα σύνδεση σε κάθε λειτουργία.
+    bump = _counter_upsert('meta', "'data_version'", '1')
+    
+    for table in ('documents', 'analysis_results'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} "
+                         f"AFTER {event} ON {table} BEGIN {bump} END")
+    
+    conn.execute(bump.rstrip(';'))
+
+def _migrate_v6_export_watermarks(conn: sqlite3.Connection):
+    """Watermarks για incremental exports (τελευταίο analysis_results.id ανά export)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            name TEXT PRIMARY KEY,
+            last_analysis_id INTEGER NOT NULL DEFAULT 0,
+            row_count INTEGER,
+            exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _migrate_v7_llm_token_stats(conn: sqlite3.Connection):
+    """Tokens και ρυθμός παραγωγής του LLM ανά ανάλυση"""
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(analysis_results)")}
+    for column, column_type in (('prompt_tokens', 'INTEGER'), ('eval_tokens', 'INTEGER'),
+                                ('tokens_per_second', 'REAL')):
+        if column not in existing_columns:
+            conn.execute(f"ALTER TABLE analysis_results ADD COLUMN {column} {column_type}")
+
+def _migrate_v8_chunk_embeddings(conn: sqlite3.Connection):
+    """Embeddings ανά chunk για σημασιολογική αναζήτηση (float32 blobs)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS chunk_embeddings (
+            chunk_id INTEGER NOT NULL,
+            document_id INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,  -- float32, κανονικοποιημένο σε μοναδιαίο μήκος
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (chunk_id, model),
+            FOREIGN KEY (chunk_id) REFERENCES document_chunks (id) ON DELETE CASCADE,
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_document ON chunk_embeddings(document_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_model ON chunk_embeddings(model, chunk_id)')
+
+def _migrate_v9_full_text_search(conn: sqlite3.Connection):
+    """
+    FTS5 indexes για κατάταξη BM25 (documents και chunks)
+    
+    Το κείμενο περνά από τη συνάρτηση search_text (πεζά, χωρίς τόνους) που
+    καταχωρεί το DatabaseManager, όπως και η chunk_text για τα συμπιεσμένα chunks.
+    """
+    # Filename, περίληψη και keywords ανά document (rowid = documents.id)
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS document_fts USING fts5(
+            filename, summary, keywords, tokenize = 'unicode61 remove_diacritics 2'
+        )
+    ''')
+    # Τα chunks δεν αποθηκεύονται δεύτερη φορά: external content από view με το
+    # αποσυμπιεσμένο κείμενο (rowid = document_chunks.id)
+    conn.execute('''
+        CREATE VIEW IF NOT EXISTS chunk_search_content AS
+        SELECT id, search_text(chunk_text(content, content_blob, compression)) AS content
+        FROM document_chunks
+    ''')
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS chunk_fts USING fts5(
+            content, content = 'chunk_search_content', content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    ''')
+    
+    chunk_content = "search_text(chunk_text({0}.content, {0}.content_blob, {0}.compression))"
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_chunks_fts_insert AFTER INSERT ON document_chunks "
+                 f"BEGIN INSERT INTO chunk_fts (rowid, content) "
+                 f"VALUES (NEW.id, {chunk_content.format('NEW')}); END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_chunks_fts_delete AFTER DELETE ON document_chunks "
+                 f"BEGIN INSERT INTO chunk_fts (chunk_fts, rowid, content) "
+                 f"VALUES ('delete', OLD.id, {chunk_content.format('OLD')}); END")
+    
+    # Τα keywords είναι JSON (με \u escapes για τα ελληνικά)
+    analysis_keywords = ("CASE WHEN json_valid(NEW.keywords) THEN "
+                         "(SELECT group_concat(value, ' ') FROM json_each(NEW.keywords)) END")
+    conn.execute("CREATE TRIGGER IF NOT EXISTS trg_documents_fts_insert AFTER INSERT ON documents "
+                 "BEGIN INSERT INTO document_fts (rowid, filename) "
+                 "VALUES (NEW.id, search_text(NEW.filename)); END")
+    conn.execute("CREATE TRIGGER IF NOT EXISTS trg_documents_fts_delete AFTER DELETE ON documents "
+                 "BEGIN DELETE FROM document_fts WHERE rowid = OLD.id; END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_analysis_fts_insert AFTER INSERT ON analysis_results "
+                 f"BEGIN UPDATE document_fts SET summary = search_text(NEW.summary), "
+                 f"keywords = search_text({analysis_keywords}) WHERE rowid = NEW.document_id; END")
+    
+    # Υπάρχοντα δεδομένα (η πιο πρόσφατη ανάλυση ανά document)
+    conn.execute('''
+        INSERT INTO document_fts (rowid, filename, summary, keywords)
+        SELECT d.id, search_text(d.filename), search_text(a.summary),
+               search_text(CASE WHEN json_valid(a.keywords) THEN
+                   (SELECT group_concat(value, ' ') FROM json_each(a.keywords)) END)
+        FROM documents d
+        LEFT JOIN analysis_results a ON a.id = (
+            SELECT MAX(id) FROM analysis_results WHERE document_id = d.id
+        )
+    ''')
+    conn.execute("INSERT INTO chunk_fts (chunk_fts) VALUES ('rebuild')")
+
+def _migrate_v10_analysis_tier(conn: sqlite3.Connection):
+    """Επίπεδο ανάλυσης: 'llm' ή 'local' (τοπική ανάλυση χωρίς LLM)"""
+    existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(analysis_results)")}
+    if 'analysis_tier' not in existing_columns:
+        conn.execute("ALTER TABLE analysis_results ADD COLUMN analysis_tier TEXT NOT NULL DEFAULT 'llm'")
+
+def _migrate_v11_keyword_statistics(conn: sqlite3.Connection):
+    """
+    Στατιστικά συλλογής για TF-IDF λέξεις-κλειδιά
+    
+    Κάθε έγγραφο έχει μία γραμμή με τους όρους και τις συχνότητές τους (sparse
+    γραμμή του πίνακα όρων-εγγράφων, ως JSON ώστε να τη διαβάζουν τα triggers).
+    Τα document frequencies και το πλήθος εγγράφων ενημερώνονται από triggers
+    στο ίδιο transaction, και στη διαγραφή εγγράφου (ON DELETE CASCADE).
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS keyword_terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE,  -- κανονικοποιημένος (search_text)
+            display TEXT NOT NULL,  -- μορφή εμφάνισης (πεζά, με τόνους)
+            document_frequency INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS document_terms (
+            document_id INTEGER PRIMARY KEY,
+            term_ids TEXT NOT NULL,  -- JSON λίστα keyword_terms.id
+            counts TEXT NOT NULL,  -- JSON λίστα συχνοτήτων, με την ίδια σειρά
+            FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS keyword_corpus (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            documents INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO keyword_corpus (id, documents) VALUES (1, 0)")
+    
+    for event, row, delta in (('insert', 'NEW', '+ 1'), ('delete', 'OLD', '- 1')):
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_document_terms_{event} "
+                     f"AFTER {event.upper()} ON document_terms BEGIN "
+                     f"UPDATE keyword_terms SET document_frequency = document_frequency {delta} "
+                     f"WHERE id IN (SELECT value FROM json_each({row}.term_ids)); "
+                     f"UPDATE keyword_corpus SET documents = documents {delta} WHERE id = 1; END")
+    
+    # Ο επανυπολογισμός των keywords ενημερώνει την πιο πρόσφατη ανάλυση: και ο FTS index
+    conn.execute("CREATE TRIGGER IF NOT EXISTS trg_analysis_fts_update "
+                 "AFTER UPDATE OF summary, keywords ON analysis_results "
+                 "WHEN NEW.id = (SELECT MAX(id) FROM analysis_results WHERE document_id = NEW.document_id) "
+                 "BEGIN UPDATE document_fts SET summary = search_text(NEW.summary), "
+                 "keywords = search_text(CASE WHEN json_valid(NEW.keywords) THEN "
+                 "(SELECT group_concat(value, ' ') FROM json_each(NEW.keywords)) END) "
+                 "WHERE rowid = NEW.document_id; END")
+
+def _migrate_v12_analysis_jobs(conn: sqlite3.Connection):
+    """
+    Ουρά εργασιών ανάλυσης και απαντήσεις ερωτήσεων στη database
+    
+    Η κατάσταση που κρατούσε ο web server στη μνήμη του (πρόοδος, διακοπή,
+    απάντηση σε εξέλιξη) μοιράζεται έτσι μεταξύ πολλών processes και workers.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            params TEXT NOT NULL,  -- JSON: folder_paths, recursive, extensions, detailed_analysis, watch
+            status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, watching, completed, failed, cancelled
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            total_files INTEGER NOT NULL DEFAULT 0,
+            processed_files INTEGER NOT NULL DEFAULT 0,
+            current_file TEXT,
+            worker TEXT,
+            error_message TEXT,
+            created_at TIMESTAMP,
+            started_at TIMESTAMP,
+            heartbeat_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON analysis_jobs(status, id)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS qa_answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',  -- running, completed, failed
+            answer TEXT NOT NULL DEFAULT '',
+            sources TEXT NOT NULL DEFAULT '[]',  -- JSON
+            citations TEXT NOT NULL DEFAULT '[]',  -- JSON λίστα refs
+            error_message TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_qa_answers_created_at ON qa_answers(created_at)')
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "Βασικό schema", _migrate_v1_base_schema),
+    (2, "ON DELETE CASCADE", _migrate_v2_cascade_deletes),
+    (3, "Indexes για queries", _migrate_v3_query_indexes),
+    (4, "Πίνακας στατιστικών με triggers", _migrate_v4_stat_counters),
+    (5, "Έκδοση δεδομένων για cache", _migrate_v5_data_version),
+    (6, "Watermarks για exports", _migrate_v6_export_watermarks),
+    (7, "Στατιστικά tokens LLM", _migrate_v7_llm_token_stats),
+    (8, "Embeddings chunks", _migrate_v8_chunk_embeddings),
+    (9, "Full-text search (FTS5)", _migrate_v9_full_text_search),
+    (10, "Επίπεδο ανάλυσης (LLM ή τοπική)", _migrate_v10_analysis_tier),
+    (11, "Στατιστικά όρων για TF-IDF", _migrate_v11_keyword_statistics),
+    (12, "Ουρά εργασιών ανάλυσης", _migrate_v12_analysis_jobs),
+]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Τρέχουσα έκδοση schema της database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Εφαρμογή όσων migrations δεν έχουν εφαρμοστεί
+    
+    Returns:
+        Η έκδοση του schema μετά τις migrations
+    """
+    current_version = get_schema_version(conn)
+    latest_version = MIGRATIONS[-1][0]
+    
+    if current_version > latest_version:
+        logger.warning(f"Η database είναι σε νεότερη έκδοση schema ({current_version}) "
+                       f"από την εφαρμογή ({latest_version})")
+        return current_version
+    
+    pending = [migration for migration in MIGRATIONS if migration[0] > current_version]
+    if not pending:
+        return current_version
+    
+    # Explicit transactions ανά migration. Τα foreign keys απενεργοποιούνται
+    # (δεν αλλάζουν μέσα σε transaction) ώστε να γίνεται αναδημιουργία tables.
+    isolation_level = conn.isolation_level
+    conn.commit()
+    conn.isolation_level = None
+    conn.execute("PRAGMA foreign_keys = OFF")
+    
+    try:
+        for version, description, migrate in pending:
+            # IMMEDIATE: με πολλά processes μόνο ένα εφαρμόζει κάθε migration,
+            # τα υπόλοιπα περιμένουν το lock και βρίσκουν την έκδοση ήδη ενημερωμένη
+            conn.execute("BEGIN IMMEDIATE")
+            if get_schema_version(conn) >= version:
+                conn.execute("COMMIT")
+                current_version = version
+                continue
+            logger.info(f"Database migration {version}: {description}")
+            try:
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            current_version = version
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.isolation_level = isolation_level
+    
+    return current_version
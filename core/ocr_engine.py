@@ -0,0 +1,245 @@
+"""
+OCR Engine για AI Document Analyzer
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from PIL import Image, ImageOps
+from config import config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+
+def _init_worker():
+    """Κάθε worker χρησιμοποιεί ένα thread Tesseract (αποφυγή oversubscription)"""
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+def _otsu_threshold(image: Image.Image) -> int:
+    """Υπολογισμός κατωφλίου Otsu από το histogram grayscale εικόνας"""
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    if total == 0:
+        return 128
+    
+    sum_total = sum(i * count for i, count in enumerate(histogram))
+    sum_background = 0.0
+    weight_background = 0
+    best_threshold, best_variance = 128, 0.0
+    
+    for threshold, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        
+        sum_background += threshold * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_total - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    
+    return best_threshold
+
+def preprocess_image(image: Image.Image, source_dpi: Optional[float] = None,
+                     target_dpi: int = None, max_dimension: int = None) -> Image.Image:
+    """
+    Προετοιμασία εικόνας για OCR: grayscale, σμίκρυνση στο target DPI και binarization
+    
+    Args:
+        image: Εικόνα PIL
+        source_dpi: DPI της εικόνας (αν είναι γνωστό)
+        target_dpi: Επιθυμητό DPI (default: config.OCR_TARGET_DPI)
+        max_dimension: Μέγιστη πλευρά σε pixels όταν το DPI είναι άγνωστο
+    """
+    target_dpi = target_dpi or config.OCR_TARGET_DPI
+    max_dimension = max_dimension or config.OCR_MAX_DIMENSION
+    
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('L')
+    
+    # Σμίκρυνση: μόνο προς τα κάτω, η μεγέθυνση δεν προσθέτει πληροφορία
+    scale = 1.0
+    if source_dpi and source_dpi > target_dpi:
+        scale = target_dpi / source_dpi
+    if max(image.size) * scale > max_dimension:
+        scale = max_dimension / max(image.size)
+    if scale < 1.0:
+        new_size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        image = image.resize(new_size, Image.LANCZOS)
+    
+    threshold = _otsu_threshold(image)
+    return image.point(lambda value: 255 if value > threshold else 0, mode='1')
+
+def _ocr_image_file(filepath: str, lang: str, tesseract_config: str) -> str:
+    """OCR αρχείου εικόνας (εκτελείται σε worker process)"""
+    with Image.open(filepath) as image:
+        dpi = image.info.get('dpi', (None,))[0]
+        prepared = preprocess_image(image, source_dpi=dpi)
+    
+    # Το pytesseract φέρνει μαζί του το pandas, οπότε φορτώνεται μόνο στους OCR workers
+    import pytesseract
+    return pytesseract.image_to_string(prepared, lang=lang, config=tesseract_config)
+
+def _ocr_pdf_page(filepath: str, page_index: int, lang: str, tesseract_config: str) -> str:
+    """Rasterization σελίδας PDF στο target DPI και OCR (εκτελείται σε worker process)"""
+    document = pdfium.PdfDocument(filepath)
+    try:
+        page = document[page_index]
+        bitmap = page.render(scale=config.OCR_TARGET_DPI / 72)
+        image = bitmap.to_pil()
+        page.close()
+    finally:
+        document.close()
+    
+    prepared = preprocess_image(image)
+    import pytesseract
+    return pytesseract.image_to_string(prepared, lang=lang, config=tesseract_config)
+
+class OCREngine:
+    """OCR με process pool, προεπεξεργασία εικόνων και cache αποτελεσμάτων"""
+    
+    def __init__(self, max_workers: int = None, use_process_pool: bool = True):
+        self.max_workers = max_workers or config.OCR_WORKERS
+        self.use_process_pool = use_process_pool
+        self.lang = config.OCR_LANG
+        self.tesseract_config = config.OCR_TESSERACT_CONFIG
+        self.cache_dir = Path(config.OCR_CACHE_DIR)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def ocr_image(self, filepath: str) -> str:
+        """OCR μίας εικόνας"""
+        return self.ocr_images([filepath])[0]
+    
+    def ocr_images(self, filepaths: List[str]) -> List[str]:
+        """OCR πολλών εικόνων παράλληλα (η σειρά διατηρείται)"""
+        results: List[Optional[str]] = [None] * len(filepaths)
+        jobs = {}
+        
+        for i, filepath in enumerate(filepaths):
+            cache_key = self._cache_key(self._file_hash(filepath))
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                jobs[i] = (cache_key, (_ocr_image_file, filepath, self.lang, self.tesseract_config))
+        
+        for i, text in self._run_jobs(jobs).items():
+            results[i] = text
+        
+        return results
+    
+    def ocr_pdf(self, filepath: str, page_indices: Iterable[int] = None) -> Dict[int, str]:
+        """
+        OCR σελίδων PDF (scanned) με παράλληλη rasterization ανά σελίδα
+        
+        Args:
+            filepath: Μονοπάτι PDF
+            page_indices: Σελίδες (0-based) για OCR, default όλες
+        
+        Returns:
+            Dict page_index -> κείμενο
+        """
+        if not PDFIUM_AVAILABLE:
+            raise Exception("Το OCR σελίδων PDF απαιτεί το πακέτο pypdfium2")
+        
+        if page_indices is None:
+            document = pdfium.PdfDocument(filepath)
+            try:
+                page_indices = range(len(document))
+            finally:
+                document.close()
+        
+        file_hash = self._file_hash(filepath)
+        results = {}
+        jobs = {}
+        
+        for page_index in page_indices:
+            cache_key = self._cache_key(f"{file_hash}:{page_index}")
+            cached = self._read_cache(cache_key)
+            if cached is not None:
+                results[page_index] = cached
+            else:
+                jobs[page_index] = (cache_key, (_ocr_pdf_page, filepath, page_index,
+                                                self.lang, self.tesseract_config))
+        
+        if jobs:
+            logger.info(f"OCR {len(jobs)} σελίδων PDF με {self.max_workers} workers: {filepath}")
+        
+        results.update(self._run_jobs(jobs))
+        return dict(sorted(results.items()))
+    
+    def _run_jobs(self, jobs: Dict) -> Dict:
+        """Εκτέλεση OCR jobs στο process pool και αποθήκευση στην cache"""
+        if not jobs:
+            return {}
+        
+        if self.use_process_pool:
+            executor = self._get_executor()
+            futures = {key: executor.submit(*call) for key, (_, call) in jobs.items()}
+            texts = {key: future.result() for key, future in futures.items()}
+        else:
+            texts = {key: call[0](*call[1:]) for key, (_, call) in jobs.items()}
+        
+        for key, text in texts.items():
+            self._write_cache(jobs[key][0], text)
+        
+        return texts
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=_init_worker)
+            return self._executor
+    
+    def shutdown(self, wait: bool = False):
+        """Τερματισμός του process pool (wait: αναμονή μέχρι να τερματιστούν τα processes)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+    
+    def _file_hash(self, filepath: str) -> str:
+        """SHA-1 περιεχομένου αρχείου (σε blocks για μεγάλα αρχεία)"""
+        digest = hashlib.sha1()
+        with open(filepath, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_key(self, content_key: str) -> str:
+        """Το κλειδί περιλαμβάνει τις ρυθμίσεις OCR ώστε αλλαγές να ακυρώνουν την cache"""
+        settings = f"{content_key}|{self.lang}|{self.tesseract_config}|{config.OCR_TARGET_DPI}"
+        return hashlib.sha1(settings.encode('utf-8')).hexdigest()
+    
+    def _read_cache(self, cache_key: str) -> Optional[str]:
+        cache_file = self.cache_dir / cache_key[:2] / f"{cache_key}.txt"
+        try:
+            return cache_file.read_text(encoding='utf-8')
+        except (FileNotFoundError, OSError):
+            return None
+    
+    def _write_cache(self, cache_key: str, text: str):
+        cache_file = self.cache_dir / cache_key[:2] / f"{cache_key}.txt"
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_suffix('.tmp')
+            temp_file.write_text(text, encoding='utf-8')
+            temp_file.replace(cache_file)
+        except OSError as e:
+            logger.warning(f"Αποτυχία αποθήκευσης OCR cache: {e}")
@@ -0,0 +1,172 @@
+"""
+PDF Extraction Backends για AI Document Analyzer
+"""
+import io
+from typing import Dict, List, Type
+from utils.helpers import module_available
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PyPDF2 (fallback) και pdfminer (μόνο ρητά) φορτώνονται όταν χρησιμοποιηθούν
+PDFMINER_AVAILABLE = module_available('pdfminer')
+
+class PDFBackend:
+    """Βασική κλάση backend εξαγωγής κειμένου από PDF"""
+    
+    name = 'base'
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+    
+    def page_count(self, filepath: str) -> int:
+        """Αριθμός σελίδων του PDF"""
+        raise NotImplementedError
+    
+    def extract_pages(self, filepath: str, page_numbers: List[int]) -> Dict[int, str]:
+        """
+        Εξαγωγή κειμένου σελίδων
+        
+        Args:
+            filepath: Μονοπάτι PDF
+            page_numbers: Σελίδες (0-based)
+        
+        Returns:
+            Dict page_number -> κείμενο (κενό για σελίδες που απέτυχαν)
+        """
+        raise NotImplementedError
+
+class PyPDF2Backend(PDFBackend):
+    """PyPDF2 (pure Python, αργό αλλά χωρίς εξαρτήσεις) - fallback"""
+    
+    name = 'pypdf2'
+    
+    def page_count(self, filepath: str) -> int:
+        import PyPDF2
+        
+        with open(filepath, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    
+    def extract_pages(self, filepath: str, page_numbers: List[int]) -> Dict[int, str]:
+        import PyPDF2
+        
+        page_texts = {}
+        with open(filepath, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            
+            for page_num in page_numbers:
+                try:
+                    page_texts[page_num] = reader.pages[page_num].extract_text() or ""
+                except Exception as e:
+                    logger.warning(f"Σφάλμα ανάγνωσης σελίδας {page_num + 1}: {e}")
+                    page_texts[page_num] = ""
+        
+        return page_texts
+
+class PdfiumBackend(PDFBackend):
+    """pypdfium2 (PDFium σε C++, το ταχύτερο)"""
+    
+    name = 'pypdfium2'
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        return pdfium is not None
+    
+    def page_count(self, filepath: str) -> int:
+        document = pdfium.PdfDocument(filepath)
+        try:
+            return len(document)
+        finally:
+            document.close()
+    
+    def extract_pages(self, filepath: str, page_numbers: List[int]) -> Dict[int, str]:
+        page_texts = {}
+        document = pdfium.PdfDocument(filepath)
+        try:
+            for page_num in page_numbers:
+                try:
+                    page = document[page_num]
+                    textpage = page.get_textpage()
+                    page_texts[page_num] = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                except Exception as e:
+                    logger.warning(f"Σφάλμα ανάγνωσης σελίδας {page_num + 1}: {e}")
+                    page_texts[page_num] = ""
+        finally:
+            document.close()
+        
+        return page_texts
+
+class PdfMinerBackend(PDFBackend):
+    """pdfminer.six με κοινό resource manager (cache fonts/layout ανά έγγραφο)"""
+    
+    name = 'pdfminer'
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        return PDFMINER_AVAILABLE
+    
+    def page_count(self, filepath: str) -> int:
+        from pdfminer.pdfpage import PDFPage
+        
+        with open(filepath, 'rb') as file:
+            return sum(1 for _ in PDFPage.get_pages(file))
+    
+    def extract_pages(self, filepath: str, page_numbers: List[int]) -> Dict[int, str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        
+        page_texts = {page_num: "" for page_num in page_numbers}
+        # caching=True: fonts και resources αναλύονται μία φορά για όλες τις σελίδες
+        resource_manager = PDFResourceManager(caching=True)
+        laparams = LAParams()
+        
+        with open(filepath, 'rb') as file:
+            pages = PDFPage.get_pages(file, pagenos=set(page_numbers))
+            for page_num, page in zip(sorted(page_numbers), pages):
+                output = io.StringIO()
+                device = TextConverter(resource_manager, output, laparams=laparams)
+                try:
+                    PDFPageInterpreter(resource_manager, device).process_page(page)
+                    page_texts[page_num] = output.getvalue()
+                except Exception as e:
+                    logger.warning(f"Σφάλμα ανάγνωσης σελίδας {page_num + 1}: {e}")
+                finally:
+                    device.close()
+        
+        return page_texts
+
+# Σειρά προτίμησης για την επιλογή 'auto'. Το pdfminer δίνει καλύτερο layout
+# αλλά είναι συνήθως πιο αργό από το PyPDF2, γι' αυτό επιλέγεται μόνο ρητά.
+PDF_BACKENDS: Dict[str, Type[PDFBackend]] = {
+    PdfiumBackend.name: PdfiumBackend,
+    PyPDF2Backend.name: PyPDF2Backend,
+    PdfMinerBackend.name: PdfMinerBackend,
+}
+
+def get_available_backends() -> List[str]:
+    """Ονόματα των backends που είναι εγκατεστημένα"""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.is_available()]
+
+def get_pdf_backend(name: str = 'auto') -> PDFBackend:
+    """Επιλογή backend κατά το runtime (με fallback στο PyPDF2)"""
+    if name != 'auto':
+        backend = PDF_BACKENDS.get(name)
+        if backend is not None and backend.is_available():
+            return backend()
+        logger.warning(f"Το PDF backend '{name}' δεν είναι διαθέσιμο, χρήση αυτόματης επιλογής")
+    
+    return PDF_BACKENDS[get_available_backends()[0]]()
+
+def extract_page_range(backend_name: str, filepath: str, start: int, end: int) -> Dict[int, str]:
+    """Εξαγωγή εύρους σελίδων [start, end) - εκτελείται σε worker process"""
+    return get_pdf_backend(backend_name).extract_pages(filepath, list(range(start, end)))
@@ -0,0 +1,154 @@
+"""
+Document Pipeline για AI Document Analyzer
+"""
+import time
+from typing import Dict
+from config import config
+from core.document_processor import DocumentProcessor
+from core.ai_analyzer import AIAnalyzer
+from core.database import DatabaseManager
+from core.deduplicator import DocumentDeduplicator
+from core.extraction_pool import ExtractionPool
+from core.keyword_engine import KeywordEngine
+from core.semantic_search import SemanticSearch
+from utils.logger import document_context, sampled_logger, setup_logger
+from utils.metrics import DOCUMENTS_PROCESSED, STAGE_SECONDS, stage_timer
+
+logger = setup_logger()
+# Μηνύματα ανά αρχείο (structured πεδία, sampling)
+file_logger = sampled_logger('pipeline')
+
+class DocumentPipeline:
+    """Επεξεργασία ενός αρχείου: καταχώρηση, εξαγωγή κειμένου και AI ανάλυση"""
+    
+    def __init__(self, doc_processor: DocumentProcessor = None, ai_analyzer: AIAnalyzer = None,
+                 db_manager: DatabaseManager = None, deduplicator: DocumentDeduplicator = None,
+                 semantic_search: SemanticSearch = None, keyword_engine: KeywordEngine = None):
+        self.doc_processor = doc_processor or DocumentProcessor()
+        self.ai_analyzer = ai_analyzer or AIAnalyzer()
+        self.db_manager = db_manager or DatabaseManager()
+        self.deduplicator = deduplicator
+        if self.deduplicator is None and config.DEDUP_ENABLED:
+            self.deduplicator = DocumentDeduplicator(self.db_manager)
+        self.semantic_search = semantic_search
+        if self.semantic_search is None and config.EMBEDDING_ENABLED:
+            self.semantic_search = SemanticSearch(self.db_manager)
+        self.keyword_engine = keyword_engine
+        if self.keyword_engine is None and config.KEYWORD_INDEX_ENABLED:
+            self.keyword_engine = KeywordEngine(self.db_manager)
+        
+        # Εξαγωγή σε απομονωμένα processes: ένα προβληματικό αρχείο δεν μπλοκάρει τα υπόλοιπα
+        self.extractor = ExtractionPool() if config.EXTRACTION_ISOLATION else self.doc_processor
+    
+    def process_file(self, file_info: Dict, detailed_analysis: bool = False) -> Dict:
+        """
+        Πλήρης επεξεργασία αρχείου
+        
+        Args:
+            file_info: Πληροφορίες αρχείου από FileScanner (με προαιρετικό
+                       'queued_at' = time.monotonic() κατά την είσοδο στην ουρά)
+            detailed_analysis: Ανάλυση όλων των chunks αντί των πρώτων 3
+        
+        Returns:
+            Dict με success, document_id και error
+        """
+        # Όλα τα μηνύματα του αρχείου (και των σταδίων του) παίρνουν το πεδίο file,
+        # οπότε το sampling κρατά ή απορρίπτει ολόκληρο το ίχνος του
+        with document_context(file=file_info['filepath']):
+            return self._process_file(file_info, detailed_analysis)
+    
+    def _process_file(self, file_info: Dict, detailed_analysis: bool) -> Dict:
+        doc_id = None
+        
+        queued_at = file_info.get('queued_at')
+        if queued_at is not None:
+            STAGE_SECONDS.observe(max(0.0, time.monotonic() - queued_at), stage='queue_wait')
+        
+        try:
+            with stage_timer('db_write'):
+                # Add document to database
+                doc_id = self.db_manager.add_document(
+                    filepath=file_info['filepath'],
+                    filename=file_info['filename'],
+                    file_size=file_info['file_size'],
+                    file_type=file_info['file_extension'][1:]  # Remove dot
+                )
+                
+                # Update status to processing
+                self.db_manager.update_document_status(doc_id, 'processing')
+            
+            # Process document
+            file_logger.bind(document_id=doc_id).info(f"Επεξεργασία: {file_info['filename']}")
+            with stage_timer('extract'):
+                doc_result = self.extractor.process_document(file_info)
+            
+            # Το OCR τρέχει μέσα στην εξαγωγή (πιθανώς σε άλλο process) και αναφέρεται στο metadata
+            ocr_time = doc_result['metadata'].get('ocr_time')
+            if ocr_time:
+                STAGE_SECONDS.observe(ocr_time, stage='ocr')
+            
+            if not doc_result['success']:
+                self.db_manager.update_document_status(doc_id, 'failed', doc_result['error'])
+                DOCUMENTS_PROCESSED.inc(result='failed')
+                return {'success': False, 'document_id': doc_id, 'error': doc_result['error']}
+            
+            # Add chunks to database
+            with stage_timer('db_write'):
+                self.db_manager.add_document_chunks(doc_id, doc_result['chunks'])
+            
+            # Deduplication: τα διπλότυπα δεν ξαναπερνούν από το LLM, και από τα
+            # near-duplicates αναλύονται μόνο οι διαφορές από το canonical έγγραφο
+            diff = None
+            if self.deduplicator is not None:
+                with stage_timer('dedup'):
+                    match = self.deduplicator.check_document(doc_id, doc_result['cleaned_text'])
+                    reused = bool(match) and self.deduplicator.reuse_analysis(doc_id, match)
+                    if match and not reused:
+                        diff = self.deduplicator.diff_against(doc_id, match, doc_result['cleaned_text'])
+                if reused:
+                    DOCUMENTS_PROCESSED.inc(result='duplicate')
+                    return {'success': True, 'document_id': doc_id, 'error': None,
+                            'duplicate_of': match['canonical_id']}
+            
+            # Στατιστικά όρων της συλλογής (TF-IDF λέξεις-κλειδιά)
+            if self.keyword_engine is not None:
+                with stage_timer('keywords'):
+                    self.keyword_engine.index_document(doc_id, doc_result['cleaned_text'])
+            
+            # Embeddings για σημασιολογική αναζήτηση (αποτυχία δεν σταματά την ανάλυση)
+            if self.semantic_search is not None:
+                with stage_timer('embed'):
+                    embed_result = self.semantic_search.embed_document(doc_id)
+                if not embed_result['success']:
+                    logger.warning(f"Αποτυχία embeddings για {file_info['filename']}: {embed_result['error']}")
+            
+            # AI Analysis (η λεπτομερής ανάλυση γίνεται πάντα με το LLM)
+            if diff is not None:
+                ai_result = self.ai_analyzer.analyze_document(doc_id, [diff['text']], allow_local=not detailed_analysis,
+                                                              base_analysis=diff)
+            elif detailed_analysis:
+                ai_result = self.ai_analyzer.analyze_document(doc_id, doc_result['chunks'], allow_local=False)
+            else:
+                # Quick analysis with fewer features
+                combined_text = '\n\n'.join(doc_result['chunks'][:3])  # First 3 chunks only
+                ai_result = self.ai_analyzer.analyze_document(doc_id, [combined_text])
+            
+            if ai_result['success']:
+                file_logger.bind(document_id=doc_id).info(f"Ολοκληρώθηκε: {file_info['filename']}")
+            else:
+                logger.warning(f"Αποτυχία AI ανάλυσης: {file_info['filename']}")
+            DOCUMENTS_PROCESSED.inc(result='completed' if ai_result['success'] else 'failed')
+            
+            return {'success': ai_result['success'], 'document_id': doc_id,
+                    'error': ai_result.get('error')}
+        
+        except Exception as e:
+            logger.error(f"Σφάλμα επεξεργασίας {file_info['filename']}: {e}")
+            DOCUMENTS_PROCESSED.inc(result='failed')
+            if doc_id is not None:
+                self.db_manager.update_document_status(doc_id, 'failed', str(e))
+            return {'success': False, 'document_id': doc_id, 'error': str(e)}
+    
+    def shutdown(self):
+        """Τερματισμός των worker processes εξαγωγής, ή των pools OCR/PDF χωρίς απομόνωση"""
+        self.extractor.shutdown()
@@ -0,0 +1,171 @@
+"""
+Ερωτήσεις-απαντήσεις πάνω στα αναλυμένα έγγραφα για AI Document Analyzer
+
+Για κάθε ερώτηση ανακτώνται τα πιο σχετικά chunks (full-text και σημασιολογικά),
+μπαίνουν στο prompt μέχρι το όριο tokens και το model απαντά με αναφορές [n]
+στις αριθμημένες πηγές. Οι απαντήσεις αποθηκεύονται ανά κανονικοποιημένη
+ερώτηση και έκδοση δεδομένων.
+"""
+import math
+import re
+import time
+from typing import Dict, Iterator, List, Tuple
+from config import config
+from core.database import DatabaseManager
+from core.text_search import normalize_query
+from utils.cache import VersionedCache
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+_CITATION_RE = re.compile(r'\[(\d+(?:\s*,\s*\d+)*)\]')
+
+_PROMPT_TEMPLATE = """Απάντησε στην ερώτηση στα ελληνικά χρησιμοποιώντας μόνο τις παρακάτω πηγές.
+Μετά από κάθε πληροφορία γράψε τον αριθμό της πηγής σε αγκύλες, π.χ. [1].
+Αν οι πηγές δεν περιέχουν την απάντηση, πες ότι δεν βρέθηκε στα έγγραφα.
+
+Πηγές:
+{sources}
+
+Ερώτηση: {question}
+
+Απάντηση:"""
+
+NO_SOURCES_ANSWER = "Δεν βρέθηκαν σχετικά αποσπάσματα στα έγγραφα."
+
+def estimate_tokens(text: str) -> int:
+    """Εκτίμηση tokens από το μήκος (χωρίς tokenizer του model)"""
+    return math.ceil(len(text) / config.QA_CHARS_PER_TOKEN)
+
+class QAEngine:
+    """Retrieval-augmented απαντήσεις με αναφορές στα έγγραφα"""
+    
+    def __init__(self, db_manager: DatabaseManager = None, llama_client=None, semantic_search=None):
+        """
+        Args:
+            db_manager: Database (full-text ανάκτηση chunks)
+            llama_client: LlamaClient (δημιουργείται στην πρώτη ερώτηση αν λείπει)
+            semantic_search: SemanticSearch για σημασιολογική ανάκτηση (προαιρετικό)
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        self._llama_client = llama_client
+        self.semantic_search = semantic_search
+        self.cache = VersionedCache(max_entries=config.QA_CACHE_SIZE)
+    
+    @property
+    def llama_client(self):
+        if self._llama_client is None:
+            from models.llama_client import LlamaClient
+            self._llama_client = LlamaClient()
+        return self._llama_client
+    
+    def retrieve(self, question: str) -> Dict:
+        """Τα πιο σχετικά chunks για την ερώτηση (ποικιλία εγγράφων, όριο χρόνου)"""
+        semantic_matches = None
+        if self.semantic_search is not None:
+            semantic_matches = self.semantic_search.search_chunks(question, top_k=config.SEARCH_CANDIDATES,
+                                                                  min_score=config.SEMANTIC_MIN_SCORE)
+        return self.db_manager.search_chunks(question, top_k=config.QA_TOP_K,
+                                             semantic_matches=semantic_matches,
+                                             max_per_document=config.QA_MAX_CHUNKS_PER_DOCUMENT)
+    
+    def build_prompt(self, question: str, chunks: List[Dict]) -> Tuple[str, List[Dict]]:
+        """
+        Prompt με αριθμημένες πηγές μέσα στο όριο QA_CONTEXT_TOKENS
+        
+        Τα chunks μπαίνουν με τη σειρά κατάταξης. Όποιο δεν χωράει ολόκληρο
+        περικόπτεται αν μένει αρκετός χώρος, αλλιώς παραλείπεται.
+        
+        Returns:
+            (prompt, πηγές με ref, document_id, filename, chunk_id)
+        """
+        remaining = config.QA_CONTEXT_TOKENS
+        sections, sources = [], []
+        for chunk in chunks:
+            ref = len(sources) + 1
+            header = f"[{ref}] (έγγραφο #{chunk['document_id']}, {chunk['filename']})\n"
+            text = ' '.join(chunk['text'].split())
+            available = remaining - estimate_tokens(header)
+            if estimate_tokens(text) > available:
+                if available < 100:
+                    continue
+                text = text[:int(available * config.QA_CHARS_PER_TOKEN)].rsplit(' ', 1)[0] + '…'
+            
+            sections.append(header + text)
+            remaining -= estimate_tokens(header + text)
+            sources.append({'ref': ref, 'document_id': chunk['document_id'], 'filename': chunk['filename'],
+                            'chunk_id': chunk['chunk_id'], 'score': chunk['score']})
+        
+        prompt = _PROMPT_TEMPLATE.format(sources='\n\n'.join(sections), question=question.strip())
+        return prompt, sources
+    
+    def ask_stream(self, question: str) -> Iterator[Dict]:
+        """
+        Απάντηση σε τμήματα καθώς παράγεται
+        
+        Yields:
+            {'type': 'sources', 'sources'} μετά την ανάκτηση,
+            {'type': 'token', 'content'} για κάθε τμήμα της απάντησης και
+            {'type': 'done', 'success', 'answer', 'sources', 'citations', 'cached', 'error', ...}
+        """
+        normalized = normalize_query(question)
+        if not normalized:
+            yield {'type': 'done', 'success': False, 'answer': '', 'sources': [], 'citations': [],
+                   'cached': False, 'error': "Κενή ερώτηση"}
+            return
+        
+        version = self.db_manager.get_data_version()
+        cached = self.cache.get(normalized, version)
+        if cached is not None:
+            yield {'type': 'sources', 'sources': cached['sources']}
+            yield {**cached, 'type': 'done', 'cached': True}
+            return
+        
+        start = time.perf_counter()
+        retrieval = self.retrieve(question)
+        retrieval_ms = (time.perf_counter() - start) * 1000
+        prompt, sources = self.build_prompt(question, retrieval['chunks'])
+        yield {'type': 'sources', 'sources': sources}
+        
+        result = {'type': 'done', 'success': True, 'answer': NO_SOURCES_ANSWER, 'sources': sources,
+                  'citations': [], 'cached': False, 'error': None, 'retrieval_ms': round(retrieval_ms, 2),
+                  'prompt_tokens': estimate_tokens(prompt)}
+        
+        if sources:
+            final = None
+            for part in self.llama_client.generate_stream(prompt, "qa", {"num_ctx": config.QA_NUM_CTX}):
+                if part['done']:
+                    final = part
+                else:
+                    yield {'type': 'token', 'content': part['content']}
+            
+            result['success'] = final['success']
+            result['answer'] = final['content']
+            result['error'] = final.get('error')
+            result['citations'] = self._citations(final['content'], sources)
+        
+        logger.info(f"Ερώτηση: {len(sources)} πηγές, ανάκτηση {retrieval_ms:.1f} ms, "
+                    f"σύνολο {(time.perf_counter() - start):.2f}s")
+        if result['success']:
+            self.cache.put(normalized, version, {key: value for key, value in result.items() if key != 'type'})
+        yield result
+    
+    def ask(self, question: str) -> Dict:
+        """Ολόκληρη η απάντηση (χωρίς stream)"""
+        result = None
+        for event in self.ask_stream(question):
+            if event['type'] == 'done':
+                result = event
+        return result
+    
+    @staticmethod
+    def _citations(answer: str, sources: List[Dict]) -> List[Dict]:
+        """Οι πηγές που αναφέρει η απάντηση ([1], [2, 3]), με τη σειρά πρώτης αναφοράς"""
+        by_ref = {source['ref']: source for source in sources}
+        refs = []
+        for match in _CITATION_RE.finditer(answer):
+            for ref in match.group(1).split(','):
+                ref = int(ref)
+                if ref in by_ref and ref not in refs:
+                    refs.append(ref)
+        return [by_ref[ref] for ref in refs]
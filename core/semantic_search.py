@@ -0,0 +1,406 @@
+"""
+Σημασιολογική αναζήτηση για AI Document Analyzer
+
+Κάθε chunk αποθηκεύεται ως κανονικοποιημένο float32 vector στη database
+(chunk_embeddings). Για την αναζήτηση τα vectors φορτώνονται σε έναν
+memory-mapped πίνακα NumPy (data/embeddings), οπότε η ομοιότητα συνημιτόνου
+είναι ένα γινόμενο πίνακα-vector. Σε μεγάλες συλλογές ένας IVF index
+περιορίζει τη σύγκριση στα κοντινότερα clusters.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config import config
+from core.database import DatabaseManager
+from utils.logger import sampled_logger, setup_logger
+
+logger = setup_logger()
+# Μηνύματα ανά έγγραφο (structured πεδία, sampling)
+file_logger = sampled_logger('embed')
+
+# Vectors που προστέθηκαν στο process πριν ξαναγραφτεί το snapshot στον δίσκο
+_DELTA_FLUSH_SIZE = 4096
+
+# Παλιές γενιές snapshot διαγράφονται μετά από τόσα seconds (μπορεί να φορτώνονται ακόμα)
+_GENERATION_GRACE = 300
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Μοναδιαίο μήκος ανά γραμμή (cosine similarity = εσωτερικό γινόμενο)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class IVFIndex:
+    """
+    Inverted file index με spherical k-means
+    
+    Κάθε vector ανήκει στο κοντινότερο centroid. Ένα query συγκρίνεται μόνο με τα
+    vectors των probes κοντινότερων clusters (προσεγγιστική αναζήτηση).
+    """
+    
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+    
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: int = None, iterations: int = 10,
+              seed: int = 42, batch_size: int = 65536) -> "IVFIndex":
+        """Εκπαίδευση centroids σε δείγμα και ανάθεση όλων των vectors"""
+        count = len(matrix)
+        n_lists = n_lists or max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        
+        sample_size = min(count, n_lists * 64)
+        sample = np.asarray(matrix[np.sort(rng.choice(count, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            sizes = np.bincount(assignments, minlength=n_lists)
+            # Άδεια clusters παίρνουν τυχαίο σημείο του δείγματος
+            empty = sizes == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = _normalize(sums)
+        
+        assignments = np.empty(count, dtype=np.int32)
+        for start in range(0, count, batch_size):
+            block = np.asarray(matrix[start:start + batch_size])
+            assignments[start:start + batch_size] = np.argmax(block @ centroids.T, axis=1)
+        
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        return cls(centroids, order, offsets)
+    
+    def candidates(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """Θέσεις των vectors στα probes κοντινότερα clusters"""
+        probes = min(probes, len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+        return np.concatenate([self.order[self.offsets[cluster]:self.offsets[cluster + 1]]
+                               for cluster in nearest])
+    
+    def save(self, path: Path):
+        with open(path, 'wb') as file:
+            np.savez(file, centroids=self.centroids, order=self.order, offsets=self.offsets)
+    
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(data['centroids'], data['order'], data['offsets'])
+
+class SemanticSearch:
+    """Embeddings chunks μέσω Ollama και αναζήτηση εγγράφων με ομοιότητα συνημιτόνου"""
+    
+    def __init__(self, db_manager: DatabaseManager = None, llama_client=None, model: str = None):
+        self.db_manager = db_manager or DatabaseManager()
+        self._llama_client = llama_client
+        self.model = model or config.EMBEDDING_MODEL
+        self.batch_size = config.EMBEDDING_BATCH_SIZE
+        self.index_dir = Path(config.EMBEDDING_DIR)
+        self._file_prefix = re.sub(r'[^\w.-]', '_', self.model)
+        
+        # Κατάσταση index: snapshot (memory-mapped) + vectors που προστέθηκαν μετά
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None  # (chunk_id, document_id) ανά γραμμή
+        self._ivf: Optional[IVFIndex] = None
+        self._delta_vectors: List[np.ndarray] = []
+        self._delta_ids: List[np.ndarray] = []
+        self._loaded_stats: Optional[Tuple[int, int]] = None
+        
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+    
+    @property
+    def llama_client(self):
+        """LlamaClient (και requests) φορτώνεται στην πρώτη κλήση στο Ollama"""
+        if self._llama_client is None:
+            from models.llama_client import LlamaClient
+            self._llama_client = LlamaClient()
+        return self._llama_client
+    
+    def embed_document(self, document_id: int) -> Dict:
+        """
+        Υπολογισμός και αποθήκευση embeddings για τα chunks ενός εγγράφου
+        
+        Returns:
+            Dict με success, chunks (πλήθος) και error
+        """
+        rows = self.db_manager.get_document_chunk_rows(document_id)
+        texts = [text for _, text in rows if text and text.strip()]
+        chunk_ids = [chunk_id for chunk_id, text in rows if text and text.strip()]
+        if not texts:
+            return {'success': True, 'chunks': 0, 'error': None}
+        
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            result = self.llama_client.embed(texts[start:start + self.batch_size], self.model)
+            if not result['success']:
+                return {'success': False, 'chunks': 0, 'error': result['error']}
+            embeddings.extend(result['embeddings'])
+        
+        vectors = _normalize(embeddings)
+        self.db_manager.add_chunk_embeddings(
+            self.model, vectors.shape[1],
+            [(chunk_id, document_id, vector.tobytes()) for chunk_id, vector in zip(chunk_ids, vectors)])
+        
+        ids = np.array([(chunk_id, document_id) for chunk_id in chunk_ids], dtype=np.int64)
+        self._append(vectors, ids)
+        
+        file_logger.bind(document_id=document_id).debug(
+            f"Embeddings για {len(chunk_ids)} chunks του document {document_id}")
+        return {'success': True, 'chunks': len(chunk_ids), 'error': None}
+    
+    def search(self, query: str, top_k: int = None, min_score: float = None) -> List[Dict]:
+        """
+        Έγγραφα ταξινομημένα κατά ομοιότητα με το query
+        
+        Returns:
+            Λίστα με document_id, score (το καλύτερο chunk) και chunk_id
+        """
+        query = (query or '').strip()
+        if not query:
+            return []
+        
+        vector = self._query_vector(query)
+        if vector is None:
+            return []
+        return self._rank(vector, top_k, min_score)
+    
+    def search_chunks(self, query: str, top_k: int = None, min_score: float = None) -> List[Dict]:
+        """Chunks ταξινομημένα κατά ομοιότητα (χωρίς ομαδοποίηση ανά έγγραφο, π.χ. για Q&A)"""
+        query = (query or '').strip()
+        vector = self._query_vector(query) if query else None
+        if vector is None:
+            return []
+        return self._rank(vector, top_k, min_score, per_document=False)
+    
+    def similar_documents(self, document_id: int, top_k: int = None, min_score: float = None) -> List[Dict]:
+        """Έγγραφα παρόμοια με ένα έγγραφο (μέσος όρος των vectors των chunks του)"""
+        with self._lock:
+            self._ensure_loaded()
+            vectors, ids = self._all_vectors()
+            positions = [np.flatnonzero(block_ids[:, 1] == document_id) for block_ids in ids]
+            own = [block[position] for block, position in zip(vectors, positions) if len(position)]
+        
+        if not own:
+            return []
+        centroid = _normalize(np.concatenate(own).mean(axis=0, keepdims=True))[0]
+        return self._rank(centroid, top_k, min_score, exclude_document=document_id)
+    
+    def _query_vector(self, query: str) -> Optional[np.ndarray]:
+        """Embedding του query (cache: το results panel ανανεώνεται κάθε δευτερόλεπτο)"""
+        with self._lock:
+            vector = self._query_cache.get(query)
+            if vector is not None:
+                self._query_cache.move_to_end(query)
+                return vector
+        
+        result = self.llama_client.embed([query], self.model)
+        if not result['success']:
+            logger.warning(f"Αποτυχία embedding για αναζήτηση: {result['error']}")
+            return None
+        vector = _normalize([result['embeddings'][0]])[0]
+        
+        with self._lock:
+            self._query_cache[query] = vector
+            while len(self._query_cache) > 128:
+                self._query_cache.popitem(last=False)
+        return vector
+    
+    def _rank(self, query: np.ndarray, top_k: int = None, min_score: float = None,
+              exclude_document: int = None, per_document: bool = True) -> List[Dict]:
+        top_k = top_k or config.SEMANTIC_TOP_K
+        min_score = config.SEMANTIC_MIN_SCORE if min_score is None else min_score
+        
+        with self._lock:
+            self._ensure_loaded()
+            if self._matrix is not None and len(self._matrix) and len(query) != self._matrix.shape[1]:
+                logger.warning(f"Διάσταση query {len(query)} διαφέρει από τον index ({self._matrix.shape[1]})")
+                return []
+            
+            scores, ids = [], []
+            if self._matrix is not None and len(self._matrix):
+                if self._ivf is not None:
+                    candidates = self._ivf.candidates(query, config.SEMANTIC_IVF_PROBES)
+                    scores.append(np.asarray(self._matrix[candidates]) @ query)
+                    ids.append(self._ids[candidates])
+                else:
+                    scores.append(np.asarray(self._matrix) @ query)
+                    ids.append(np.asarray(self._ids))
+            for block, block_ids in zip(self._delta_vectors, self._delta_ids):
+                scores.append(block @ query)
+                ids.append(block_ids)
+        
+        if not scores:
+            return []
+        scores = np.concatenate(scores)
+        ids = np.concatenate(ids)
+        
+        keep = scores >= min_score
+        if exclude_document is not None:
+            keep &= ids[:, 1] != exclude_document
+        scores, ids = scores[keep], ids[keep]
+        if not len(scores):
+            return []
+        
+        if per_document:
+            # Καλύτερο chunk ανά έγγραφο: πρώτη εμφάνιση κάθε εγγράφου σε φθίνουσα σειρά score
+            order = np.argsort(-scores, kind='stable')
+            _, first = np.unique(ids[order, 1], return_index=True)
+            best = order[np.sort(first)][:top_k]
+        else:
+            # Μερική ταξινόμηση: μόνο τα top_k ταξινομούνται
+            best = np.argpartition(-scores, top_k - 1)[:top_k] if len(scores) > top_k else np.arange(len(scores))
+            best = best[np.argsort(-scores[best], kind='stable')]
+        return [{'document_id': int(ids[position, 1]), 'chunk_id': int(ids[position, 0]),
+                 'score': round(float(scores[position]), 4)}
+                for position in best]
+    
+    def _all_vectors(self) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Snapshot και delta ως λίστες πινάκων (καλείται με το lock)"""
+        vectors, ids = list(self._delta_vectors), list(self._delta_ids)
+        if self._matrix is not None and len(self._matrix):
+            vectors.insert(0, self._matrix)
+            ids.insert(0, self._ids)
+        return vectors, ids
+    
+    def _append(self, vectors: np.ndarray, ids: np.ndarray):
+        """Νέα vectors του process: στο delta χωρίς ξαναδιάβασμα της database"""
+        with self._lock:
+            if self._loaded_stats is None:
+                return  # Ο index φορτώνεται ολόκληρος στην πρώτη αναζήτηση
+            self._delta_vectors.append(vectors)
+            self._delta_ids.append(ids)
+            count, max_chunk_id = self._loaded_stats
+            self._loaded_stats = (count + len(ids), max(max_chunk_id, int(ids[:, 0].max())))
+            
+            if sum(len(block) for block in self._delta_ids) >= _DELTA_FLUSH_SIZE:
+                self._loaded_stats = None  # Νέο snapshot στην επόμενη αναζήτηση
+    
+    def _ensure_loaded(self):
+        """Φόρτωση του index αν άλλαξαν τα embeddings στη database (καλείται με το lock)"""
+        stats = self.db_manager.get_embedding_stats(self.model)
+        current = (stats['count'], stats['max_chunk_id'])
+        if current == self._loaded_stats:
+            return
+        
+        self._delta_vectors, self._delta_ids = [], []
+        self._ivf = None
+        if not stats['count']:
+            self._matrix = self._ids = None
+            self._loaded_stats = current
+            return
+        
+        if not self._load_snapshot(current):
+            matrix, ids = self._read_from_database(stats)
+            ivf = self._write_snapshot(matrix, ids)
+            if not self._load_snapshot(current):
+                # Η database άλλαξε κατά την ανάγνωση ή άλλο process έγραψε νεότερο
+                # snapshot: χρήση των vectors όπως διαβάστηκαν
+                self._matrix, self._ids, self._ivf = matrix, ids, ivf
+                self._loaded_stats = (len(ids), int(ids[:, 0].max()) if len(ids) else 0)
+    
+    @property
+    def _meta_path(self) -> Path:
+        """Δείκτης στην τρέχουσα γενιά του snapshot (αλλάζει με atomic rename)"""
+        return self.index_dir / f"{self._file_prefix}.meta.json"
+    
+    @property
+    def _generations_dir(self) -> Path:
+        """Ένας φάκελος ανά γενιά snapshot: vectors.npy, ids.npy και ivf.npz"""
+        return self.index_dir / self._file_prefix
+    
+    def _load_snapshot(self, expected: Optional[Tuple[int, int]]) -> bool:
+        """Memory-mapped φόρτωση του snapshot αν αντιστοιχεί στα expected stats"""
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        
+        stats = (meta['count'], meta['max_chunk_id'])
+        if 'generation' not in meta or (expected is not None and stats != expected):
+            return False
+        
+        generation_dir = self._generations_dir / meta['generation']
+        try:
+            matrix = np.load(generation_dir / 'vectors.npy', mmap_mode='r')
+            ids = np.load(generation_dir / 'ids.npy')
+            ivf = IVFIndex.load(generation_dir / 'ivf.npz') if meta.get('ivf') else None
+        except (OSError, ValueError):
+            # Γενιά που διαγράφηκε μετά την ανάγνωση του meta από νεότερο snapshot
+            return False
+        
+        self._matrix, self._ids, self._ivf = matrix, ids, ivf
+        self._loaded_stats = stats
+        return True
+    
+    def _read_from_database(self, stats: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        dim = stats['dim']
+        matrix = np.empty((stats['count'], dim), dtype=np.float32)
+        ids = np.empty((stats['count'], 2), dtype=np.int64)
+        
+        count = 0
+        for chunk_id, document_id, vector in self.db_manager.iter_chunk_embeddings(self.model):
+            if count == len(matrix):
+                break
+            row = np.frombuffer(vector, dtype=np.float32)
+            if len(row) != dim:
+                continue
+            matrix[count] = row
+            ids[count] = (chunk_id, document_id)
+            count += 1
+        return matrix[:count], ids[:count]
+    
+    def _write_snapshot(self, matrix: np.ndarray, ids: np.ndarray) -> Optional[IVFIndex]:
+        """
+        Εγγραφή νέας γενιάς snapshot (και IVF index για μεγάλες συλλογές)
+        
+        Κάθε γενιά γράφεται σε δικό της φάκελο και γίνεται τρέχουσα με atomic
+        rename του meta, οπότε processes που ξαναχτίζουν ταυτόχρονα δεν
+        γράφουν στα ίδια αρχεία και οι αναγνώστες βλέπουν πάντα πλήρη γενιά.
+        """
+        generation = f"{time.time_ns():x}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        generation_dir = self._generations_dir / generation
+        generation_dir.mkdir(parents=True)
+        
+        ivf = None
+        if len(matrix) >= config.SEMANTIC_IVF_MIN_VECTORS:
+            logger.info(f"Δημιουργία IVF index για {len(matrix)} vectors")
+            ivf = IVFIndex.build(matrix)
+            ivf.save(generation_dir / 'ivf.npz')
+        
+        for kind, array in (('vectors.npy', matrix), ('ids.npy', ids)):
+            with open(generation_dir / kind, 'wb') as file:
+                np.save(file, array)
+        
+        meta = {'model': self.model, 'generation': generation, 'count': len(matrix),
+                'dim': int(matrix.shape[1]), 'max_chunk_id': int(ids[:, 0].max()) if len(ids) else 0,
+                'ivf': ivf is not None}
+        temp_path = self._meta_path.with_name(f"{self._meta_path.name}.{generation}.tmp")
+        temp_path.write_text(json.dumps(meta), encoding='utf-8')
+        os.replace(temp_path, self._meta_path)
+        logger.debug(f"Snapshot embeddings: {len(matrix)} vectors ({self.model}, γενιά {generation})")
+        
+        self._remove_old_generations(generation)
+        return ivf
+    
+    def _remove_old_generations(self, keep: str):
+        """Διαγραφή παλιών γενιών (τα memory-mapped αρχεία μένουν διαθέσιμα σε όσους τα έχουν ανοιχτά)"""
+        cutoff = time.time() - _GENERATION_GRACE
+        for generation_dir in self._generations_dir.iterdir():
+            try:
+                if generation_dir.name != keep and generation_dir.stat().st_mtime < cutoff:
+                    shutil.rmtree(generation_dir)
+            except OSError:
+                pass  # Π.χ. ανοιχτό memory map στα Windows: διαγράφεται σε επόμενο snapshot
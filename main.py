@@ -1,6 +1,8 @@
 """
 AI Document Analyzer - Κύριο αρχείο εκκίνησης
 """
+import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -10,7 +12,6 @@ sys.path.insert(0, str(project_root))
 
 from config import config
 from utils.logger import setup_logger
-from app.dash_app import create_app
 from core.database import DatabaseManager
 
 def initialize_app():
@@ -29,23 +30,222 @@ def initialize_app():
     
     return logger
 
+def compress_chunks(vacuum: bool):
+    """Συμπίεση των ασυμπίεστων chunks μιας υπάρχουσας database"""
+    initialize_app()
+    db_manager = DatabaseManager()
+    
+    stats = db_manager.compress_existing_chunks(vacuum=vacuum)
+    stats['storage'] = db_manager.get_chunk_storage_report()
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+def reconcile_stats():
+    """Επανυπολογισμός των στατιστικών από τα δεδομένα"""
+    initialize_app()
+    db_manager = DatabaseManager()
+    
+    drift = db_manager.reconcile_statistics()
+    print(json.dumps({
+        'corrected': [{'scope': scope, 'key': key, 'old': old_value, 'new': new_value}
+                      for (scope, key), (old_value, new_value) in sorted(drift.items())],
+        'statistics': db_manager.get_statistics()
+    }, ensure_ascii=False, indent=2))
+
+def export_results(args):
+    """Export αποτελεσμάτων ανάλυσης σε αρχείο"""
+    initialize_app()
+    output = args.output or str(config.EXPORT_DIR / f"{args.name or 'analysis_results'}.{args.format}")
+    
+    result = DatabaseManager().export_results(output, args.format, name=args.name,
+                                              since_analysis_id=args.since_id,
+                                              include_chunks=args.include_chunks)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if not result['success']:
+        sys.exit(1)
+
+def embed_documents(limit: int = None):
+    """Embeddings για έγγραφα που αναλύθηκαν πριν ενεργοποιηθεί η σημασιολογική αναζήτηση"""
+    logger = initialize_app()
+    from core.semantic_search import SemanticSearch
+    
+    db_manager = DatabaseManager()
+    semantic_search = SemanticSearch(db_manager)
+    document_ids = db_manager.get_documents_without_embeddings(semantic_search.model, limit)
+    
+    embedded, failed, chunks = 0, 0, 0
+    for document_id in document_ids:
+        result = semantic_search.embed_document(document_id)
+        if result['success']:
+            embedded += 1
+            chunks += result['chunks']
+        else:
+            failed += 1
+            logger.warning(f"Αποτυχία embeddings για document {document_id}: {result['error']}")
+    
+    print(json.dumps({'model': semantic_search.model, 'documents': embedded, 'failed': failed,
+                      'chunks': chunks}, ensure_ascii=False, indent=2))
+    if failed:
+        sys.exit(1)
+
+def rank_keywords(apply: str = None, limit: int = None):
+    """TF-IDF λέξεις-κλειδιά για όλη τη συλλογή με τα τρέχοντα στατιστικά όρων"""
+    initialize_app()
+    from core.keyword_engine import KeywordEngine
+    
+    engine = KeywordEngine()
+    indexed = engine.index_missing(limit)
+    result = engine.rerank_corpus(apply_tier=apply if apply != 'all' else None, apply_all=apply == 'all')
+    print(json.dumps({'indexed': indexed, **result}, ensure_ascii=False, indent=2))
+    if indexed['failed']:
+        sys.exit(1)
+
+def ask_question(question: str):
+    """Ερώτηση πάνω στα έγγραφα με την απάντηση να τυπώνεται καθώς παράγεται"""
+    initialize_app()
+    from core.qa_engine import QAEngine
+    
+    semantic_search = None
+    if config.EMBEDDING_ENABLED:
+        from core.semantic_search import SemanticSearch
+        semantic_search = SemanticSearch()
+    
+    result = None
+    for event in QAEngine(semantic_search=semantic_search).ask_stream(question):
+        if event['type'] == 'token':
+            print(event['content'], end='', flush=True)
+        elif event['type'] == 'done':
+            result = event
+    
+    # Η απάντηση από την cache (ή χωρίς πηγές) δεν πέρασε από το stream
+    if result['cached'] or not result['sources']:
+        print(result['answer'])
+    else:
+        print()
+    for source in result['citations'] or result['sources']:
+        print(f"[{source['ref']}] #{source['document_id']} {source['filename']}")
+    if not result['success']:
+        print(result['error'], file=sys.stderr)
+        sys.exit(1)
+
+def run_worker(once: bool = False, metrics_port: int = None):
+    """Worker ανάλυσης: εκτελεί τις εργασίες της ουράς μέχρι Ctrl+C ή SIGTERM"""
+    logger = initialize_app()
+    import signal
+    from core.analysis_worker import AnalysisWorker
+    
+    # Τα metrics του pipeline και του LLM καταγράφονται σε αυτό το process, όχι στον web server
+    metrics_port = config.WORKER_METRICS_PORT if metrics_port is None else metrics_port
+    if metrics_port:
+        from utils.metrics import start_metrics_server
+        try:
+            start_metrics_server(config.HOST, metrics_port)
+            logger.info(f"Metrics του worker στο http://{config.HOST}:{metrics_port}/metrics")
+        except OSError as e:
+            logger.warning(f"Χωρίς metrics endpoint στο port {metrics_port}: {e}")
+    
+    worker = AnalysisWorker()
+    # Ο τερματισμός περιμένει το τρέχον αρχείο· η εργασία ξαναμπαίνει στην ουρά
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda received, frame: worker.stop())
+    worker.run(once=once)
+
+def serve_production(app, logger):
+    """Production server με waitress (ένα process, πολλά threads)"""
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.error("Ο production server χρειάζεται waitress (pip install waitress) "
+                     f"ή gunicorn: gunicorn -w 4 -b {config.HOST}:{config.PORT} wsgi:application")
+        sys.exit(1)
+    
+    serve(app.server, host=config.HOST, port=config.PORT, threads=config.SERVER_THREADS)
+
+def parse_args():
+    """Ορίσματα γραμμής εντολών (χωρίς εντολή: εκκίνηση server)"""
+    parser = argparse.ArgumentParser(description="AI Document Analyzer")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    compress_parser = subparsers.add_parser('compress-chunks', help="Συμπίεση υπαρχόντων chunks")
+    compress_parser.add_argument('--vacuum', action='store_true',
+                                 help="VACUUM μετά τη συμπίεση ώστε να μικρύνει το αρχείο")
+    
+    subparsers.add_parser('reconcile-stats', help="Διόρθωση απόκλισης στατιστικών")
+    
+    export_parser = subparsers.add_parser('export', help="Export αποτελεσμάτων ανάλυσης")
+    export_parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default='csv')
+    export_parser.add_argument('--output', help="Αρχείο εξόδου (default: data/exports/<name>.<format>)")
+    export_parser.add_argument('--name', help="Όνομα incremental export - εξάγονται μόνο οι νέες αναλύσεις")
+    export_parser.add_argument('--since-id', type=int, help="Export αναλύσεων με id μεγαλύτερο από αυτό")
+    export_parser.add_argument('--include-chunks', action='store_true', help="Προσθήκη πλήρους κειμένου")
+    
+    embed_parser = subparsers.add_parser('embed', help="Embeddings για σημασιολογική αναζήτηση")
+    embed_parser.add_argument('--limit', type=int, help="Μέγιστος αριθμός εγγράφων")
+    
+    keywords_parser = subparsers.add_parser('keywords', help="TF-IDF λέξεις-κλειδιά για όλη τη συλλογή")
+    keywords_parser.add_argument('--apply', choices=['local', 'llm', 'all'],
+                                 help="Αντικατάσταση των keywords των αναλύσεων (local: μόνο τοπικές)")
+    keywords_parser.add_argument('--limit', type=int, help="Μέγιστος αριθμός εγγράφων προς καταχώρηση")
+    
+    ask_parser = subparsers.add_parser('ask', help="Ερώτηση πάνω στα αναλυμένα έγγραφα")
+    ask_parser.add_argument('question')
+    
+    worker_parser = subparsers.add_parser('worker', help="Worker που εκτελεί τις εργασίες ανάλυσης")
+    worker_parser.add_argument('--once', action='store_true', help="Τερματισμός όταν αδειάσει η ουρά")
+    worker_parser.add_argument('--metrics-port', type=int,
+                               help="Port του /metrics (default: WORKER_METRICS_PORT, 0: χωρίς)")
+    
+    return parser.parse_args()
+
 def main():
     """Κύρια συνάρτηση εκκίνησης"""
+    args = parse_args()
+    
+    if args.command == 'compress-chunks':
+        compress_chunks(args.vacuum)
+        return
+    if args.command == 'reconcile-stats':
+        reconcile_stats()
+        return
+    if args.command == 'export':
+        export_results(args)
+        return
+    if args.command == 'embed':
+        embed_documents(args.limit)
+        return
+    if args.command == 'keywords':
+        rank_keywords(args.apply, args.limit)
+        return
+    if args.command == 'ask':
+        ask_question(args.question)
+        return
+    if args.command == 'worker':
+        run_worker(args.once, args.metrics_port)
+        return
+    
     try:
         # Αρχικοποίηση
         logger = initialize_app()
         
-        # Δημιουργία και εκκίνηση Dash app
+        # Δημιουργία και εκκίνηση Dash app (το Dash φορτώνεται μόνο για τον server)
+        from app.dash_app import create_app
         app = create_app()
         
         logger.info(f"Εκκίνηση server στο http://{config.HOST}:{config.PORT}")
+        if config.HOST not in ('127.0.0.1', 'localhost', '::1'):
+            logger.warning(f"Ο server ακούει στο {config.HOST} χωρίς authentication: "
+                           "η πρόσβαση πρέπει να περνά από reverse proxy με authentication")
+        if not config.EMBEDDED_WORKER:
+            logger.info("Οι εργασίες ανάλυσης εκτελούνται από: python main.py worker")
         
-        # Εκκίνηση εφαρμογής
-        app.run(
-            debug=config.DEBUG,
-            host=config.HOST,
-            port=config.PORT
-        )
+        # Εκκίνηση εφαρμογής (dev server μόνο με DEBUG)
+        if config.DEBUG:
+            app.run(
+                debug=config.DEBUG,
+                host=config.HOST,
+                port=config.PORT
+            )
+        else:
+            serve_production(app, logger)
         
     except KeyboardInterrupt:
         logger.info("Τερματισμός εφαρμογής από χρήστη")
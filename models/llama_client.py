@@ -4,11 +4,14 @@ Llama AI Client για AI Document Analyzer
 import requests
 import json
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from config import config
-from utils.logger import setup_logger
+from utils.logger import sampled_logger, setup_logger
+from utils.metrics import LLM_REQUESTS, LLM_TOKENS_PER_SECOND, observe_llm_response
 
 logger = setup_logger()
+# Μηνύματα ανά έγγραφο/κλήση (structured πεδία, sampling)
+llm_logger = sampled_logger('llm')
 
 class LlamaClient:
     """Client για επικοινωνία με Ollama Llama model"""
@@ -133,7 +136,7 @@ class LlamaClient:
     
     def comprehensive_analysis(self, text: str) -> Dict:
         """Πλήρης ανάλυση κειμένου"""
-        logger.info("Έναρξη πλήρους ανάλυσης κειμένου")
+        llm_logger.info("Έναρξη πλήρους ανάλυσης κειμένου")
         start_time = time.time()
         
         results = {
@@ -144,12 +147,17 @@ class LlamaClient:
             'sentiment_score': 0.0,
             'confidence_score': 0.0,
             'processing_time': 0.0,
+            'prompt_tokens': 0,
+            'eval_tokens': 0,
+            'tokens_per_second': None,
             'errors': []
         }
+        operation_results = []
         
         # Περίληψη
         try:
             summary_result = self.generate_summary(text)
+            operation_results.append(summary_result)
             if summary_result['success']:
                 results['summary'] = summary_result['content']
             else:
@@ -160,6 +168,7 @@ class LlamaClient:
         # Λέξεις-κλειδιά
         try:
             keywords_result = self.extract_keywords(text)
+            operation_results.append(keywords_result)
             if keywords_result['success']:
                 results['keywords'] = keywords_result.get('keywords', [])
             else:
@@ -170,6 +179,7 @@ class LlamaClient:
         # Κατηγορίες
         try:
             categories_result = self.categorize_content(text)
+            operation_results.append(categories_result)
             if categories_result['success']:
                 results['categories'] = categories_result.get('categories', [])
             else:
@@ -180,6 +190,7 @@ class LlamaClient:
         # Συναίσθημα
         try:
             sentiment_result = self.analyze_sentiment(text)
+            operation_results.append(sentiment_result)
             if sentiment_result['success']:
                 results['sentiment_score'] = sentiment_result.get('sentiment_score', 0.0)
             else:
@@ -194,19 +205,31 @@ class LlamaClient:
         # Χρόνος επεξεργασίας
         results['processing_time'] = time.time() - start_time
         
+        # Tokens και ρυθμός παραγωγής από τα στοιχεία του Ollama
+        eval_duration = 0
+        for operation_result in operation_results:
+            model_info = operation_result.get('model_info') or {}
+            results['prompt_tokens'] += model_info.get('prompt_eval_count') or 0
+            results['eval_tokens'] += model_info.get('eval_count') or 0
+            eval_duration += model_info.get('eval_duration') or 0
+        if eval_duration:
+            results['tokens_per_second'] = results['eval_tokens'] / (eval_duration / 1e9)
+            LLM_TOKENS_PER_SECOND.observe(results['tokens_per_second'])
+        
         # Αν υπάρχουν πολλά σφάλματα, θεωρούμε την ανάλυση ανεπιτυχή
         if len(results['errors']) >= 3:
             results['success'] = False
         
-        logger.info(f"Ανάλυση ολοκληρώθηκε σε {results['processing_time']:.2f}s "
-                   f"(confidence: {results['confidence_score']:.2f})")
+        llm_logger.info(f"Ανάλυση ολοκληρώθηκε σε {results['processing_time']:.2f}s "
+                       f"(confidence: {results['confidence_score']:.2f})")
         
         return results
     
     def _generate_response(self, prompt: str, operation_type: str) -> Dict:
         """Βοηθητική συνάρτηση για αποστολή prompts στο model"""
         try:
-            logger.debug(f"Αποστολή {operation_type} prompt στο model")
+            llm_logger.debug(f"Αποστολή {operation_type} prompt στο model")
+            request_start = time.perf_counter()
             
             payload = {
                 "model": self.model_name,
@@ -229,6 +252,7 @@ class LlamaClient:
             if response.status_code == 200:
                 result = response.json()
                 content = result.get('response', '').strip()
+                observe_llm_response(operation_type, result, time.perf_counter() - request_start)
                 
                 return {
                     'success': True,
@@ -238,10 +262,13 @@ class LlamaClient:
                         'total_duration': result.get('total_duration', 0),
                         'load_duration': result.get('load_duration', 0),
                         'prompt_eval_count': result.get('prompt_eval_count', 0),
-                        'eval_count': result.get('eval_count', 0)
+                        'prompt_eval_duration': result.get('prompt_eval_duration', 0),
+                        'eval_count': result.get('eval_count', 0),
+                        'eval_duration': result.get('eval_duration', 0)
                     }
                 }
             else:
+                LLM_REQUESTS.inc(operation=operation_type, result='error')
                 error_msg = f"HTTP {response.status_code}: {response.text}"
                 logger.error(f"Σφάλμα API για {operation_type}: {error_msg}")
                 return {
@@ -251,11 +278,13 @@ class LlamaClient:
                 }
                 
         except requests.exceptions.Timeout:
+            LLM_REQUESTS.inc(operation=operation_type, result='timeout')
             error_msg = f"Timeout για {operation_type} operation"
             logger.error(error_msg)
             return {'success': False, 'content': '', 'error': error_msg}
             
         except requests.exceptions.ConnectionError:
+            LLM_REQUESTS.inc(operation=operation_type, result='connection_error')
             error_msg = "Δεν μπόρεσα να συνδεθώ στο Ollama. Βεβαιωθείτε ότι τρέχει."
             logger.error(error_msg)
             return {'success': False, 'content': '', 'error': error_msg}
@@ -265,6 +294,165 @@ class LlamaClient:
             logger.error(error_msg)
             return {'success': False, 'content': '', 'error': error_msg}
     
+    def generate_stream(self, prompt: str, operation_type: str = "qa", options: Dict = None) -> Iterator[Dict]:
+        """
+        Απάντηση του model σε τμήματα, καθώς παράγεται ("stream": true)
+        
+        Args:
+            prompt: Το prompt
+            operation_type: Ετικέτα για metrics και logs
+            options: Επιπλέον options του Ollama (π.χ. num_ctx)
+        
+        Yields:
+            Dict με done=False και content για κάθε τμήμα, και στο τέλος done=True
+            με success, content (όλη η απάντηση), model_info και error
+        """
+        parts = []
+        try:
+            llm_logger.debug(f"Αποστολή {operation_type} prompt στο model (stream)")
+            request_start = time.perf_counter()
+            
+            payload = {
+                "model": self.model_name,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": 0.3,
+                    "top_p": 0.9,
+                    "top_k": 40,
+                    **(options or {})
+                }
+            }
+            
+            with requests.post(f"{self.api_url}/api/generate", json=payload, timeout=self.timeout,
+                               headers={'Content-Type': 'application/json'}, stream=True) as response:
+                if response.status_code != 200:
+                    LLM_REQUESTS.inc(operation=operation_type, result='error')
+                    error_msg = f"HTTP {response.status_code}: {response.text}"
+                    logger.error(f"Σφάλμα API για {operation_type}: {error_msg}")
+                    yield {'done': True, 'success': False, 'content': '', 'error': error_msg}
+                    return
+                
+                # NDJSON: ένα object ανά γραμμή, το τελευταίο με done και τα στατιστικά
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    result = json.loads(line)
+                    if result.get('error'):
+                        raise RuntimeError(result['error'])
+                    if result.get('response'):
+                        parts.append(result['response'])
+                        yield {'done': False, 'content': result['response']}
+                    if result.get('done'):
+                        observe_llm_response(operation_type, result, time.perf_counter() - request_start)
+                        yield {
+                            'done': True,
+                            'success': True,
+                            'content': ''.join(parts).strip(),
+                            'model_info': {
+                                'model': self.model_name,
+                                'total_duration': result.get('total_duration', 0),
+                                'prompt_eval_count': result.get('prompt_eval_count', 0),
+                                'eval_count': result.get('eval_count', 0),
+                                'eval_duration': result.get('eval_duration', 0)
+                            },
+                            'error': None
+                        }
+                        return
+            
+            raise RuntimeError("Η απάντηση τελείωσε χωρίς done")
+        
+        except requests.exceptions.Timeout:
+            LLM_REQUESTS.inc(operation=operation_type, result='timeout')
+            error_msg = f"Timeout για {operation_type} operation"
+        except requests.exceptions.ConnectionError:
+            LLM_REQUESTS.inc(operation=operation_type, result='connection_error')
+            error_msg = "Δεν μπόρεσα να συνδεθώ στο Ollama. Βεβαιωθείτε ότι τρέχει."
+        except Exception as e:
+            LLM_REQUESTS.inc(operation=operation_type, result='error')
+            error_msg = f"Απροσδόκητο σφάλμα για {operation_type}: {str(e)}"
+        
+        logger.error(error_msg)
+        yield {'done': True, 'success': False, 'content': ''.join(parts).strip(), 'error': error_msg}
+    
+    def embed(self, texts: List[str], model: str = None) -> Dict:
+        """
+        Embeddings για μια παρτίδα κειμένων (μία κλήση στο /api/embed)
+        
+        Args:
+            texts: Κείμενα (π.χ. chunks εγγράφου)
+            model: Embedding model (default config.EMBEDDING_MODEL)
+        
+        Returns:
+            Dict με success, embeddings (λίστα vectors με τη σειρά των texts) και error
+        """
+        model = model or config.EMBEDDING_MODEL
+        try:
+            llm_logger.debug(f"Embeddings για {len(texts)} κείμενα ({model})")
+            request_start = time.perf_counter()
+            
+            response = requests.post(
+                f"{self.api_url}/api/embed",
+                json={"model": model, "input": texts, "truncate": True},
+                timeout=self.timeout,
+                headers={'Content-Type': 'application/json'}
+            )
+            
+            if response.status_code == 404 and 'model' not in response.text:
+                # Παλαιότερο Ollama χωρίς /api/embed: ένα κείμενο ανά κλήση
+                return self._embed_legacy(texts, model)
+            
+            if response.status_code == 200:
+                result = response.json()
+                observe_llm_response('embed', result, time.perf_counter() - request_start)
+                embeddings = result.get('embeddings') or []
+                if len(embeddings) != len(texts):
+                    return {'success': False, 'embeddings': [],
+                            'error': f"Αναμένονταν {len(texts)} embeddings, επιστράφηκαν {len(embeddings)}"}
+                return {'success': True, 'embeddings': embeddings, 'error': None}
+            
+            LLM_REQUESTS.inc(operation='embed', result='error')
+            error_msg = f"HTTP {response.status_code}: {response.text}"
+            logger.error(f"Σφάλμα API για embeddings: {error_msg}")
+            return {'success': False, 'embeddings': [], 'error': error_msg}
+        
+        except requests.exceptions.Timeout:
+            LLM_REQUESTS.inc(operation='embed', result='timeout')
+            error_msg = "Timeout για embeddings"
+            logger.error(error_msg)
+            return {'success': False, 'embeddings': [], 'error': error_msg}
+        
+        except requests.exceptions.ConnectionError:
+            LLM_REQUESTS.inc(operation='embed', result='connection_error')
+            error_msg = "Δεν μπόρεσα να συνδεθώ στο Ollama. Βεβαιωθείτε ότι τρέχει."
+            logger.error(error_msg)
+            return {'success': False, 'embeddings': [], 'error': error_msg}
+        
+        except Exception as e:
+            error_msg = f"Απροσδόκητο σφάλμα για embeddings: {str(e)}"
+            logger.error(error_msg)
+            return {'success': False, 'embeddings': [], 'error': error_msg}
+    
+    def _embed_legacy(self, texts: List[str], model: str) -> Dict:
+        """Embeddings μέσω του παλιού /api/embeddings (ένα κείμενο ανά κλήση)"""
+        embeddings = []
+        for text in texts:
+            request_start = time.perf_counter()
+            response = requests.post(
+                f"{self.api_url}/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=self.timeout,
+                headers={'Content-Type': 'application/json'}
+            )
+            if response.status_code != 200:
+                LLM_REQUESTS.inc(operation='embed', result='error')
+                return {'success': False, 'embeddings': [],
+                        'error': f"HTTP {response.status_code}: {response.text}"}
+            result = response.json()
+            observe_llm_response('embed', result, time.perf_counter() - request_start)
+            embeddings.append(result.get('embedding') or [])
+        return {'success': True, 'embeddings': embeddings, 'error': None}
+    
     def test_connection(self) -> Dict:
         """Test της σύνδεσης με το AI model"""
         try:
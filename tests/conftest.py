@@ -0,0 +1,29 @@
+"""
+Κοινά fixtures των tests
+"""
+import pytest
+from core.database import DatabaseManager
+
+@pytest.fixture
+def db(tmp_path):
+    """Νέα database σε προσωρινό φάκελο, με όλα τα migrations"""
+    manager = DatabaseManager(db_path=tmp_path / 'test.db')
+    manager.initialize_database()
+    return manager
+
+@pytest.fixture
+def make_document(db):
+    """Δημιουργία document (και chunks) στη database του test"""
+    counter = {'next': 0}
+    
+    def make(filename: str = None, chunks=None, file_type: str = 'txt', status: str = None) -> int:
+        counter['next'] += 1
+        filename = filename or f"document_{counter['next']}.{file_type}"
+        document_id = db.add_document(f"/test/{counter['next']}/{filename}", filename, 1024, file_type)
+        if chunks:
+            db.add_document_chunks(document_id, chunks)
+        if status:
+            db.update_document_status(document_id, status)
+        return document_id
+    
+    return make
@@ -0,0 +1,184 @@
+"""
+Tests για την ουρά εργασιών ανάλυσης (claim, heartbeat, διακοπή) και τον AnalysisWorker
+"""
+import threading
+from datetime import datetime, timedelta
+import pytest
+from core.analysis_worker import AnalysisWorker
+from core.database import DatabaseManager
+
+STALE_AFTER = 120
+
+def job_params(folder, **overrides) -> dict:
+    params = {'folder_paths': [str(folder)], 'recursive': True, 'extensions': ['.txt'],
+              'detailed_analysis': False, 'watch': False}
+    params.update(overrides)
+    return params
+
+def set_heartbeat(db, job_id: int, age_seconds: float):
+    with db.get_connection() as conn:
+        conn.execute("UPDATE analysis_jobs SET heartbeat_at = ? WHERE id = ?",
+                     (datetime.now() - timedelta(seconds=age_seconds), job_id))
+        conn.commit()
+
+# Ουρά στη database
+
+def test_claim_oldest_queued_job(db):
+    first = db.enqueue_analysis_job({'folder_paths': ['/α']})
+    second = db.enqueue_analysis_job({'folder_paths': ['/β']})
+    
+    job = db.claim_analysis_job('worker-1', STALE_AFTER)
+    
+    assert job['id'] == first
+    assert job['status'] == 'running'
+    assert job['worker'] == 'worker-1'
+    assert job['params'] == {'folder_paths': ['/α']}
+    assert db.claim_analysis_job('worker-2', STALE_AFTER)['id'] == second
+    assert db.claim_analysis_job('worker-3', STALE_AFTER) is None
+
+def test_concurrent_claims_take_each_job_once(db):
+    job_ids = {db.enqueue_analysis_job({'index': index}) for index in range(20)}
+    claimed, lock = [], threading.Lock()
+    
+    def worker(name):
+        # Δική του σύνδεση ανά worker, όπως σε ξεχωριστά processes
+        manager = DatabaseManager(db_path=db.db_path)
+        while True:
+            job = manager.claim_analysis_job(name, STALE_AFTER)
+            if job is None:
+                return
+            with lock:
+                claimed.append(job['id'])
+    
+    threads = [threading.Thread(target=worker, args=(f"worker-{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(claimed) == sorted(job_ids)
+
+def test_stale_job_is_reclaimed(db):
+    job_id = db.enqueue_analysis_job({})
+    db.claim_analysis_job('crashed', STALE_AFTER)
+    
+    set_heartbeat(db, job_id, STALE_AFTER - 10)
+    assert db.claim_analysis_job('worker-2', STALE_AFTER) is None
+    
+    set_heartbeat(db, job_id, STALE_AFTER + 10)
+    job = db.claim_analysis_job('worker-2', STALE_AFTER)
+    assert job['id'] == job_id
+    assert job['worker'] == 'worker-2'
+    assert job['processed_files'] == 0
+
+def test_heartbeat_keeps_job_claimed(db):
+    job_id = db.enqueue_analysis_job({})
+    db.claim_analysis_job('worker-1', STALE_AFTER)
+    set_heartbeat(db, job_id, STALE_AFTER + 10)
+    
+    assert db.heartbeat_analysis_jobs('worker-1') == 1
+    assert db.heartbeat_analysis_jobs('other') == 0
+    assert db.claim_analysis_job('worker-2', STALE_AFTER) is None
+
+def test_cancel_queued_and_running_jobs(db):
+    running = db.enqueue_analysis_job({})
+    queued = db.enqueue_analysis_job({})
+    db.claim_analysis_job('worker-1', STALE_AFTER)
+    
+    assert db.update_analysis_job(running, processed_files=1) is False
+    assert db.cancel_analysis_jobs() == 2
+    
+    # Η εργασία σε αναμονή ακυρώνεται αμέσως, η ενεργή σταματά από τον worker της
+    assert db.get_analysis_job(queued)['status'] == 'cancelled'
+    assert db.get_analysis_job(running)['status'] == 'running'
+    assert db.update_analysis_job(running, processed_files=2) is True
+    assert db.get_active_analysis_job()['id'] == running
+
+def test_cancel_single_job(db):
+    kept = db.enqueue_analysis_job({})
+    cancelled = db.enqueue_analysis_job({})
+    
+    assert db.cancel_analysis_jobs(cancelled) == 1
+    assert db.get_analysis_job(kept)['status'] == 'queued'
+    assert db.get_active_analysis_job()['id'] == kept
+
+def test_update_finished_job(db):
+    job_id = db.enqueue_analysis_job({})
+    db.claim_analysis_job('worker-1', STALE_AFTER)
+    db.update_analysis_job(job_id, status='completed', total_files=3, processed_files=3, current_file='')
+    
+    job = db.get_analysis_job(job_id)
+    assert (job['status'], job['total_files'], job['processed_files']) == ('completed', 3, 3)
+    assert job['finished_at'] is not None
+    assert db.get_active_analysis_job() is None
+
+# Worker
+
+class FakePipeline:
+    """Pipeline που καταγράφει τα αρχεία και εκτελεί ενέργεια στο πρώτο"""
+    
+    def __init__(self, on_file=None):
+        self.files = []
+        self.on_file = on_file
+    
+    def process_file(self, file_info, detailed_analysis=False):
+        self.files.append(file_info['filename'])
+        if self.on_file is not None:
+            self.on_file(file_info)
+        return {'success': True}
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / 'έγγραφα'
+    folder.mkdir()
+    for index in range(3):
+        (folder / f"αρχείο_{index}.txt").write_text(f"Κείμενο {index}", encoding='utf-8')
+    (folder / 'εικόνα.png').write_bytes(b'')
+    return folder
+
+def make_worker(db, pipeline) -> AnalysisWorker:
+    return AnalysisWorker(db, pipeline_factory=lambda: pipeline, name='test-worker')
+
+def test_worker_completes_job(db, folder):
+    pipeline = FakePipeline()
+    job_id = db.enqueue_analysis_job(job_params(folder))
+    
+    make_worker(db, pipeline).run(once=True)
+    
+    job = db.get_analysis_job(job_id)
+    assert (job['status'], job['total_files'], job['processed_files']) == ('completed', 3, 3)
+    assert job['worker'] == 'test-worker'
+    assert sorted(pipeline.files) == [f"αρχείο_{index}.txt" for index in range(3)]
+
+def test_worker_stops_cancelled_job(db, folder):
+    job_id = db.enqueue_analysis_job(job_params(folder))
+    pipeline = FakePipeline(on_file=lambda file_info: db.cancel_analysis_jobs(job_id))
+    
+    make_worker(db, pipeline).run(once=True)
+    
+    job = db.get_analysis_job(job_id)
+    assert job['status'] == 'cancelled'
+    assert job['processed_files'] == 1
+    assert len(pipeline.files) == 1
+
+def test_stopped_worker_requeues_job(db, folder):
+    job_id = db.enqueue_analysis_job(job_params(folder))
+    pipeline = FakePipeline()
+    worker = make_worker(db, pipeline)
+    pipeline.on_file = lambda file_info: worker.stop()
+    
+    worker.run()
+    
+    assert db.get_analysis_job(job_id)['status'] == 'queued'
+    assert db.claim_analysis_job('worker-2', STALE_AFTER)['id'] == job_id
+
+def test_failed_job_records_error(db, folder):
+    def fail(file_info):
+        raise RuntimeError("σφάλμα pipeline")
+    
+    job_id = db.enqueue_analysis_job(job_params(folder))
+    make_worker(db, FakePipeline(on_file=fail)).run(once=True)
+    
+    job = db.get_analysis_job(job_id)
+    assert job['status'] == 'failed'
+    assert job['error_message'] == "σφάλμα pipeline"
@@ -0,0 +1,113 @@
+"""
+Tests για τη VersionedCache και την έκδοση δεδομένων που την ακυρώνει
+"""
+import threading
+from utils.cache import VersionedCache
+
+class Compute:
+    """Callable που μετρά τις κλήσεις του"""
+    
+    def __init__(self, value=None):
+        self.value = value
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.value if self.value is not None else self.calls
+
+def test_hit_for_same_version():
+    cache, compute = VersionedCache(), Compute('σελίδα')
+    
+    assert cache.get_or_compute('key', 1, compute) == 'σελίδα'
+    assert cache.get_or_compute('key', 1, compute) == 'σελίδα'
+    assert compute.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_new_version_invalidates_entry():
+    cache, compute = VersionedCache(), Compute()
+    
+    assert cache.get_or_compute('key', 1, compute) == 1
+    assert cache.get_or_compute('key', 2, compute) == 2
+    assert cache.get('key', 1) is None
+    assert cache.get('key', 2) == 2
+
+def test_entries_are_independent_per_key():
+    cache = VersionedCache()
+    cache.put(('query', 1), 5, 'πρώτη')
+    cache.put(('query', 2), 5, 'δεύτερη')
+    
+    assert cache.get(('query', 1), 5) == 'πρώτη'
+    assert cache.get(('query', 2), 5) == 'δεύτερη'
+    assert cache.get(('query', 3), 5) is None
+
+def test_least_recently_used_is_evicted():
+    cache = VersionedCache(max_entries=2)
+    cache.put('a', 1, 'A')
+    cache.put('b', 1, 'B')
+    cache.get('a', 1)  # Το 'b' γίνεται το λιγότερο πρόσφατο
+    cache.put('c', 1, 'C')
+    
+    assert cache.get('a', 1) == 'A'
+    assert cache.get('b', 1) is None
+    assert cache.get('c', 1) == 'C'
+
+def test_clear():
+    cache = VersionedCache()
+    cache.put('key', 1, 'τιμή')
+    cache.clear()
+    
+    assert cache.get('key', 1) is None
+
+def test_concurrent_get_or_compute():
+    cache = VersionedCache(max_entries=8)
+    errors = []
+    
+    def worker(offset):
+        try:
+            for index in range(200):
+                key = (offset + index) % 16
+                assert cache.get_or_compute(key, index % 3, lambda: (key, index % 3)) == (key, index % 3)
+        except AssertionError as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert len(cache._entries) <= 8
+
+def test_data_version_changes_on_every_write(db, make_document):
+    versions = [db.get_data_version()]
+    
+    document_id = make_document()
+    versions.append(db.get_data_version())
+    db.update_document_status(document_id, 'completed')
+    versions.append(db.get_data_version())
+    db.add_analysis_result(document_id, 'Περίληψη', [], [], 0.0, 0.9, 1.0)
+    versions.append(db.get_data_version())
+    db.reconcile_statistics()
+    versions.append(db.get_data_version())
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+        conn.commit()
+    versions.append(db.get_data_version())
+    
+    assert all(later > earlier for earlier, later in zip(versions, versions[1:]))
+
+def test_cached_page_is_recomputed_after_write(db, make_document):
+    cache = VersionedCache()
+    make_document('πρώτο.txt')
+    
+    def page():
+        return [document['filename'] for document in db.query_documents()['documents']]
+    
+    assert cache.get_or_compute('page', db.get_data_version(), page) == ['πρώτο.txt']
+    assert cache.get_or_compute('page', db.get_data_version(), page) == ['πρώτο.txt']
+    assert cache.hits == 1
+    
+    make_document('δεύτερο.txt')
+    assert sorted(cache.get_or_compute('page', db.get_data_version(), page)) == ['δεύτερο.txt', 'πρώτο.txt']
+    assert cache.misses == 2
@@ -0,0 +1,107 @@
+"""
+Tests για τον ChunkCodec και την αποθήκευση συμπιεσμένων chunks
+"""
+import random
+import pytest
+from config import config
+from core.chunk_codec import ZLIB_MAX_DICT_SIZE, ChunkCodec
+from core.database import DatabaseManager
+
+WORDS = ['σύμβαση', 'μίσθωσης', 'ακινήτου', 'εκμισθωτής', 'μισθωτής', 'μίσθωμα', 'ευρώ', 'άρθρο',
+         'υποχρεούται', 'καταβάλλει', 'μηνιαίως', 'λήξη', 'ανανέωση', 'εγγύηση', 'Αθήνα', 'ΦΠΑ']
+
+def make_chunk(rng: random.Random, words: int = 120) -> str:
+    """Chunk με επαναλαμβανόμενο λεξιλόγιο, αριθμούς και αλλαγές γραμμής"""
+    sentences = []
+    while sum(len(sentence.split()) for sentence in sentences) < words:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(5, 12)))
+        sentences.append(f"{sentence.capitalize()} {rng.randrange(1, 10000)}.")
+    return '\n'.join(sentences)
+
+def stored_compression(db, document_id: int) -> list:
+    with db.get_connection() as conn:
+        return [row['compression'] for row in conn.execute(
+            "SELECT compression FROM document_chunks WHERE document_id = ? ORDER BY chunk_index", (document_id,))]
+
+def chunk_texts_in_sql(db) -> list:
+    with db.get_connection() as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT chunk_text(content, content_blob, compression) FROM document_chunks "
+            "ORDER BY document_id, chunk_index")]
+
+def test_round_trip_without_dictionary(db, make_document):
+    rng = random.Random(1)
+    chunks = [make_chunk(rng) for _ in range(3)]
+    document_id = make_document(chunks=chunks)
+    
+    assert stored_compression(db, document_id) == ['zlib'] * 3
+    assert db.get_document_chunks(document_id) == chunks
+
+def test_small_chunks_stay_uncompressed(db, make_document):
+    chunks = ['Σύντομο κείμενο.', 'x' * (config.CHUNK_COMPRESSION_MIN_SIZE - 1), '']
+    document_id = make_document(chunks=chunks)
+    
+    assert stored_compression(db, document_id) == [None, None, None]
+    assert db.get_document_chunks(document_id) == chunks
+    assert chunk_texts_in_sql(db) == chunks
+
+def test_round_trip_with_trained_dictionary(db, make_document, monkeypatch):
+    monkeypatch.setattr(type(config), 'CHUNK_DICT_MIN_CHUNKS', 6)
+    rng = random.Random(2)
+    documents = {}
+    for _ in range(5):
+        chunks = [make_chunk(rng) for _ in range(2)]
+        documents[make_document(chunks=chunks)] = chunks
+    
+    compression = stored_compression(db, list(documents)[-1])
+    assert compression[0].startswith('zlib:')
+    for document_id, chunks in documents.items():
+        assert db.get_document_chunks(document_id) == chunks
+    
+    # Νέο instance (π.χ. άλλο process): το dictionary φορτώνεται από τη database κατά την ανάγνωση
+    fresh = DatabaseManager(db_path=db.db_path)
+    assert fresh.chunk_codec.active_dict_id is None
+    for document_id, chunks in documents.items():
+        assert fresh.get_document_chunks(document_id) == chunks
+    
+    # Η SQL συνάρτηση chunk_text δίνει το ίδιο κείμενο με το decode
+    expected = [chunk for chunks in documents.values() for chunk in chunks]
+    assert chunk_texts_in_sql(DatabaseManager(db_path=db.db_path)) == expected
+
+def test_trained_zlib_dictionary(monkeypatch):
+    monkeypatch.setattr(type(config), 'CHUNK_COMPRESSION_MIN_SIZE', 0)
+    rng = random.Random(3)
+    codec = ChunkCodec('zlib')
+    dictionary = codec.train_dictionary([make_chunk(rng) for _ in range(50)])
+    assert 0 < len(dictionary) <= ZLIB_MAX_DICT_SIZE
+    
+    chunk = make_chunk(rng, words=60)
+    _, plain_blob, plain = codec.encode(chunk)
+    codec.register_dictionary(7, 'zlib', dictionary)
+    _, dict_blob, compression = codec.encode(chunk)
+    
+    assert (plain, compression) == ('zlib', 'zlib:7')
+    assert len(dict_blob) < len(plain_blob)
+    assert codec.decode(None, dict_blob, compression) == chunk
+    assert ChunkCodec('zlib', dict_loader=lambda dict_id: ('zlib', dictionary)).decode(
+        None, dict_blob, compression) == chunk
+
+def test_unknown_dictionary_raises():
+    codec = ChunkCodec('zlib', dict_loader=lambda dict_id: None)
+    with pytest.raises(Exception, match='dictionary 3'):
+        codec.decode(None, b'', 'zlib:3')
+
+def test_zstd_round_trip(monkeypatch):
+    pytest.importorskip('zstandard')
+    monkeypatch.setattr(type(config), 'CHUNK_COMPRESSION_MIN_SIZE', 0)
+    rng = random.Random(4)
+    codec = ChunkCodec('zstd')
+    samples = [make_chunk(rng) for _ in range(200)]
+    dictionary = codec.train_dictionary(samples, dict_size=4096)
+    codec.register_dictionary(1, 'zstd', dictionary)
+    
+    for chunk in samples[:10]:
+        content, blob, compression = codec.encode(chunk)
+        assert compression == 'zstd:1'
+        assert ChunkCodec('zstd', dict_loader=lambda dict_id: ('zstd', dictionary)).decode(
+            content, blob, compression) == chunk
@@ -0,0 +1,156 @@
+"""
+Tests για τον DatabaseManager
+"""
+import pytest
+from config import config
+
+def delete_document(db, document_id: int):
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+        conn.commit()
+
+# Counters στατιστικών (triggers)
+
+def test_counters_follow_inserts_and_status_changes(db, make_document):
+    pdf = make_document(file_type='pdf')
+    make_document(file_type='txt')
+    make_document(file_type='txt')
+    db.update_document_status(pdf, 'completed')
+    
+    statistics = db.get_statistics()
+    assert statistics['total_documents'] == 3
+    assert statistics['total_bytes'] == 3 * 1024
+    assert statistics['by_status'] == {'completed': 1, 'pending': 2}
+    assert statistics['by_type'] == {'pdf': 1, 'txt': 2}
+    assert statistics['success_rate'] == pytest.approx(100 / 3)
+
+def test_counters_follow_size_and_type_updates(db, make_document):
+    document_id = make_document(file_type='txt')
+    with db.get_connection() as conn:
+        conn.execute("UPDATE documents SET file_size = 4096, file_type = 'docx' WHERE id = ?", (document_id,))
+        conn.commit()
+    
+    statistics = db.get_statistics()
+    assert statistics['total_bytes'] == 4096
+    assert statistics['by_type'] == {'docx': 1}
+
+def test_counters_follow_analysis_results(db, make_document):
+    first, second = make_document(), make_document()
+    db.add_analysis_result(first, 'Α', [], [], 0.0, 0.9, 2.0)
+    db.add_analysis_result(second, 'Β', [], [], 0.0, 0.9, 4.0)
+    
+    statistics = db.get_statistics()
+    assert statistics['analysis_count'] == 2
+    assert statistics['avg_processing_time'] == 3.0
+
+def test_delete_cascades_to_counters(db, make_document):
+    kept = make_document(file_type='pdf')
+    removed = make_document(file_type='txt', chunks=['κείμενο'])
+    db.add_analysis_result(removed, 'Α', [], [], 0.0, 0.9, 5.0)
+    db.update_document_status(removed, 'completed')
+    
+    delete_document(db, removed)
+    
+    statistics = db.get_statistics()
+    assert statistics['total_documents'] == 1
+    assert statistics['by_status'] == {'pending': 1}
+    assert statistics['by_type'] == {'pdf': 1}
+    assert statistics['analysis_count'] == 0
+    assert db.get_document_with_analysis(kept) is not None
+
+def test_insert_or_replace_counts_once(db):
+    # Το REPLACE διαγράφει την παλιά γραμμή: με recursive_triggers μετρά ως delete + insert
+    db.add_document('/test/same.txt', 'same.txt', 100, 'txt')
+    db.add_document('/test/same.txt', 'same.txt', 300, 'txt')
+    
+    statistics = db.get_statistics()
+    assert statistics['total_documents'] == 1
+    assert statistics['total_bytes'] == 300
+    assert statistics['by_type'] == {'txt': 1}
+
+def test_reconcile_statistics_without_drift(db, make_document):
+    document_id = make_document(chunks=['κείμενο'])
+    db.add_analysis_result(document_id, 'Α', [], [], 0.0, 0.9, 1.0)
+    db.update_document_status(document_id, 'completed')
+    delete_document(db, make_document())
+    
+    assert db.reconcile_statistics() == {}
+
+def test_reconcile_statistics_fixes_drift(db, make_document):
+    make_document()
+    make_document()
+    with db.get_connection() as conn:
+        conn.execute("UPDATE stat_counters SET value = 7 WHERE scope = 'total' AND key = 'documents'")
+        conn.commit()
+    
+    assert db.reconcile_statistics() == {('total', 'documents'): (7, 2)}
+    assert db.get_statistics()['total_documents'] == 2
+
+# Αναζήτηση με κατάταξη (BM25 και fusion)
+
+def rrf(*ranks: int) -> float:
+    return round(sum(1.0 / (config.SEARCH_RRF_K + rank) for rank in ranks), 6)
+
+@pytest.fixture
+def search_documents(db, make_document):
+    """Έγγραφο με lexical hits (filename, περίληψη, chunk) και έγγραφο μόνο με σημασιολογικό hit"""
+    budget = make_document('προϋπολογισμός_2024.pdf', chunks=['Ο προϋπολογισμός του έτους εγκρίθηκε.'])
+    db.add_analysis_result(budget, 'Έγκριση προϋπολογισμού', ['προϋπολογισμός'], [], 0.0, 0.9, 1.0)
+    related = make_document('σημειώσεις.txt', chunks=['Οικονομικός σχεδιασμός για τη νέα χρονιά.'])
+    other = make_document('άσχετο.txt', chunks=['Πρόγραμμα αθλητικών αγώνων.'])
+    related_chunk = db.get_document_chunk_rows(related)[0][0]
+    return {'budget': budget, 'related': related, 'other': other, 'related_chunk': related_chunk}
+
+def test_hybrid_search_is_accent_insensitive(db, search_documents):
+    for query in ('ΠΡΟΫΠΟΛΟΓΙΣΜΟΣ', 'προυπολογισμου'):
+        results = db.hybrid_search(query)['results']
+        assert [result['document_id'] for result in results] == [search_documents['budget']]
+
+def test_hybrid_search_reciprocal_rank_fusion(db, search_documents):
+    semantic = [
+        {'document_id': search_documents['related'], 'chunk_id': search_documents['related_chunk'], 'score': 0.9},
+        {'document_id': search_documents['budget'], 'chunk_id': None, 'score': 0.6},
+    ]
+    
+    search = db.hybrid_search('προϋπολογισμός', semantic_matches=semantic)
+    results = {result['document_id']: result for result in search['results']}
+    
+    assert not search['truncated']
+    assert [result['document_id'] for result in search['results']] == [
+        search_documents['budget'], search_documents['related']]
+    # Πρώτο στις λίστες documents και chunks, δεύτερο στη σημασιολογική
+    budget = results[search_documents['budget']]
+    assert budget['score'] == rrf(1, 1, 2)
+    assert set(budget['sources']) == {'documents', 'chunks', 'semantic'}
+    
+    related = results[search_documents['related']]
+    assert related['score'] == rrf(1)
+    assert related['sources'] == ['semantic']
+    assert related['chunk_id'] == search_documents['related_chunk']
+    assert related['snippet'] == 'Οικονομικός σχεδιασμός για τη νέα χρονιά.'
+
+def test_hybrid_search_snippet_from_matching_chunk(db, search_documents):
+    result = db.hybrid_search('εγκρίθηκε')['results'][0]
+    
+    assert result['document_id'] == search_documents['budget']
+    assert result['snippet'] == 'Ο προϋπολογισμός του έτους εγκρίθηκε.'
+    assert [result['snippet'][start:end] for start, end in result['highlights']] == ['εγκρίθηκε']
+
+def test_hybrid_search_weighted_fusion(db, search_documents, monkeypatch):
+    monkeypatch.setattr(type(config), 'SEARCH_FUSION', 'weighted')
+    semantic = [{'document_id': search_documents['related'], 'chunk_id': None, 'score': 0.8},
+                {'document_id': search_documents['budget'], 'chunk_id': None, 'score': 0.4}]
+    
+    results = {result['document_id']: result['score']
+               for result in db.hybrid_search('προϋπολογισμός', semantic_matches=semantic)['results']}
+    
+    weight = config.SEARCH_SEMANTIC_WEIGHT
+    assert results[search_documents['budget']] == pytest.approx((1 - weight) * 1.0 + weight * 0.5, abs=1e-6)
+    assert results[search_documents['related']] == pytest.approx(weight * 1.0, abs=1e-6)
+
+def test_hybrid_search_top_k(db, make_document):
+    for index in range(5):
+        make_document(f"έκθεση_{index}.txt", chunks=[f"Ετήσια έκθεση αριθμός {index}"])
+    
+    assert len(db.hybrid_search('έκθεση', top_k=3)['results']) == 3
+    assert db.hybrid_search('...')['results'] == []
@@ -0,0 +1,169 @@
+"""
+Tests για τον DocumentDeduplicator (ακριβή διπλότυπα, MinHash/LSH, επαναχρησιμοποίηση)
+"""
+import random
+import pytest
+from config import config
+from core.deduplicator import DocumentDeduplicator
+
+def make_text(seed: int, sentences: int = 40, words: int = 10) -> str:
+    """Κείμενο από προτάσεις τυχαίων λέξεων (σταθερό ανά seed)"""
+    rng = random.Random(seed)
+    return ' '.join(' '.join(f"λέξη{rng.randrange(5000)}" for _ in range(words)) + '.'
+                    for _ in range(sentences))
+
+def replace_sentences(text: str, count: int, seed: int = 99) -> str:
+    """Αντικατάσταση των τελευταίων count προτάσεων με νέες"""
+    sentences = text.split('. ')
+    replacement = make_text(seed, sentences=count).split('. ')
+    return '. '.join(sentences[:-count] + replacement)
+
+def jaccard(deduplicator: DocumentDeduplicator, text_a: str, text_b: str) -> float:
+    """Πραγματική Jaccard ομοιότητα των shingles"""
+    def shingles(text):
+        words = text.lower().replace('.', ' ').split()
+        size = deduplicator.shingle_size
+        return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    a, b = shingles(text_a), shingles(text_b)
+    return len(a & b) / len(a | b)
+
+@pytest.fixture
+def deduplicator(db):
+    return DocumentDeduplicator(db)
+
+def test_exact_duplicate_ignores_case_and_whitespace(deduplicator, make_document):
+    text = make_text(1)
+    original = make_document()
+    duplicate = make_document()
+    
+    assert deduplicator.check_document(original, text) is None
+    match = deduplicator.check_document(duplicate, '  ' + text.upper().replace(' ', '\n  ') + '\n')
+    
+    assert match == {'canonical_id': original, 'similarity': 1.0, 'match_type': 'exact'}
+
+def test_minhash_estimates_jaccard(deduplicator):
+    text = make_text(2)
+    for changed in (2, 6, 12):
+        other = replace_sentences(text, changed)
+        estimate = deduplicator.estimate_similarity(deduplicator.minhash_signature(text),
+                                                    deduplicator.minhash_signature(other))
+        # Τυπική απόκλιση sqrt(J(1-J)/128) < 0.045
+        assert estimate == pytest.approx(jaccard(deduplicator, text, other), abs=0.15)
+
+def test_near_duplicate_above_threshold(deduplicator, make_document):
+    text = make_text(3)
+    near = replace_sentences(text, 2)
+    assert jaccard(deduplicator, text, near) > config.DEDUP_SIMILARITY_THRESHOLD
+    
+    original = make_document()
+    copy = make_document()
+    deduplicator.check_document(original, text)
+    match = deduplicator.check_document(copy, near)
+    
+    assert match['canonical_id'] == original
+    assert match['match_type'] == 'near'
+    assert config.DEDUP_SIMILARITY_THRESHOLD <= match['similarity'] < 1.0
+
+def test_below_threshold_is_not_a_duplicate(deduplicator, make_document):
+    text = make_text(4)
+    different = replace_sentences(text, 20)
+    assert jaccard(deduplicator, text, different) < 0.5
+    
+    deduplicator.check_document(make_document(), text)
+    assert deduplicator.check_document(make_document(), different) is None
+    assert deduplicator.check_document(make_document(), make_text(5)) is None
+
+def test_threshold_is_configurable(db, make_document, monkeypatch):
+    text = make_text(6)
+    partial = replace_sentences(text, 8)
+    similarity = jaccard(DocumentDeduplicator(db), text, partial)
+    
+    monkeypatch.setattr(type(config), 'DEDUP_SIMILARITY_THRESHOLD', similarity + 0.15)
+    strict = DocumentDeduplicator(db)
+    strict.check_document(make_document(), text)
+    assert strict.check_document(make_document(), partial) is None
+    
+    # Με 32 bands των 4 rows το LSH φέρνει υποψήφιους και σε χαμηλότερη ομοιότητα
+    text, partial = make_text(13), replace_sentences(make_text(13), 8)
+    similarity = jaccard(strict, text, partial)
+    monkeypatch.setattr(type(config), 'DEDUP_SIMILARITY_THRESHOLD', similarity - 0.15)
+    monkeypatch.setattr(type(config), 'DEDUP_LSH_BANDS', 32)
+    loose = DocumentDeduplicator(db)
+    original = make_document()
+    loose.check_document(original, text)
+    match = loose.check_document(make_document(), partial)
+    assert match['canonical_id'] == original
+    assert match['match_type'] == 'near'
+
+def test_index_is_loaded_from_database(db, make_document):
+    text = make_text(7)
+    original = make_document()
+    DocumentDeduplicator(db).check_document(original, text)
+    
+    # Νέα instance (π.χ. νέο process): ο index γεμίζει από τις αποθηκευμένες υπογραφές
+    fresh = DocumentDeduplicator(db)
+    match = fresh.check_document(make_document(), replace_sentences(text, 1))
+    
+    assert fresh._index_loaded
+    assert match['canonical_id'] == original
+
+def test_duplicates_group_around_first_canonical(deduplicator, make_document):
+    text = make_text(8)
+    original, second, third = make_document(), make_document(), make_document()
+    deduplicator.check_document(original, text)
+    deduplicator.check_document(second, replace_sentences(text, 1, seed=10))
+    match = deduplicator.check_document(third, replace_sentences(text, 1, seed=11))
+    
+    assert match['canonical_id'] == original
+
+def test_reuse_analysis_only_above_reuse_threshold(db, deduplicator, make_document):
+    original = make_document()
+    db.add_analysis_result(original, 'Περίληψη', ['λέξη'], ['κατηγορία'], 0.5, 0.9, 1.0)
+    
+    close, far = make_document(), make_document()
+    threshold = config.DEDUP_REUSE_THRESHOLD
+    
+    assert not deduplicator.reuse_analysis(far, {'canonical_id': original, 'similarity': threshold - 0.01})
+    assert db.get_document_with_analysis(far)['summary'] is None
+    
+    assert deduplicator.reuse_analysis(close, {'canonical_id': original, 'similarity': threshold})
+    copied = db.get_document_with_analysis(close)
+    assert copied['summary'] == 'Περίληψη'
+    assert copied['keywords'] == ['λέξη']
+    assert copied['status'] == 'completed'
+
+def test_diff_against_returns_only_new_sentences(db, deduplicator, make_document):
+    text = make_text(9)
+    original = make_document(chunks=[text])
+    db.add_analysis_result(original, 'Περίληψη', ['λέξη'], [], 0.0, 0.9, 1.0)
+    near = replace_sentences(text, 2, seed=12)
+    
+    diff = deduplicator.diff_against(make_document(), {'canonical_id': original}, near)
+    
+    new_sentences = make_text(12, sentences=2)
+    assert diff['text'] == new_sentences
+    assert diff['ratio'] == pytest.approx(len(new_sentences) / len(near), abs=0.02)
+    assert diff['base']['summary'] == 'Περίληψη'
+
+def test_diff_against_requires_small_change_and_base_analysis(db, deduplicator, make_document):
+    text = make_text(10)
+    unanalyzed = make_document(chunks=[text])
+    assert deduplicator.diff_against(make_document(), {'canonical_id': unanalyzed},
+                                     replace_sentences(text, 2)) is None
+    
+    db.add_analysis_result(unanalyzed, 'Περίληψη', [], [], 0.0, 0.9, 1.0)
+    mostly_new = replace_sentences(text, 20)
+    assert deduplicator.diff_against(make_document(), {'canonical_id': unanalyzed}, mostly_new) is None
+
+def test_diff_against_uses_latest_analysis(db, deduplicator, make_document):
+    text = make_text(14)
+    original = make_document(chunks=[text])
+    db.add_analysis_result(original, 'Παλιά περίληψη', ['παλιά'], [], 0.0, 0.9, 1.0)
+    db.add_analysis_result(original, 'Νέα περίληψη', ['νέα'], ['κατηγορία'], 0.5, 0.9, 1.0)
+    
+    diff = deduplicator.diff_against(make_document(), {'canonical_id': original},
+                                     replace_sentences(text, 2))
+    
+    assert diff['base']['summary'] == 'Νέα περίληψη'
+    assert diff['base']['keywords'] == ['νέα']
+    assert diff['base']['categories'] == ['κατηγορία']
@@ -0,0 +1,70 @@
+"""
+Tests για τον DocumentProcessor (ανίχνευση encoding και streaming εξαγωγή TXT)
+"""
+import codecs
+import pytest
+from config import config
+from core.document_processor import DocumentProcessor
+from utils.helpers import detect_text_encoding
+
+GREEK_TEXT = ("Άρθρο 1. Ο μισθωτής υποχρεούται να καταβάλλει το μίσθωμα «εγκαίρως» κάθε μήνα.\n"
+              "Άρθρο 2. Η σύμβαση λήγει στις 31/12 και ανανεώνεται αυτόματα για ένα έτος.\n")
+
+@pytest.fixture
+def processor():
+    return DocumentProcessor(use_process_pools=False)
+
+# Ανίχνευση encoding
+
+def test_detects_utf8_with_and_without_bom():
+    data = GREEK_TEXT.encode('utf-8')
+    assert detect_text_encoding(codecs.BOM_UTF8 + data) == 'utf-8-sig'
+    assert detect_text_encoding(data) == 'utf-8'
+    # Χαρακτήρας κομμένος στο τέλος του δείγματος
+    assert detect_text_encoding(data[:2]) == 'utf-8'
+
+def test_detects_cp1253():
+    # Τα “ ” και … είναι στο 0x80-0x9F (C1), που δεν χρησιμοποιεί το ISO-8859-7,
+    # και αποφασίζουν ακόμη κι όταν το 0xB6 (εδώ "¶") θα έδειχνε ISO-8859-7
+    with_c1 = "¶ 3. Ο μισθωτής “ισχύει” κανονικά …\n".encode('cp1253')
+    assert with_c1.count(0xB6) > with_c1.count(0xA2)
+    assert detect_text_encoding(with_c1) == 'cp1253'
+    # Χωρίς C1 αποφασίζει το "Ά" (0xA2 στο cp1253)
+    assert detect_text_encoding(GREEK_TEXT.encode('cp1253')) == 'cp1253'
+
+def test_detects_iso_8859_7():
+    data = GREEK_TEXT.encode('iso-8859-7')
+    assert data != GREEK_TEXT.encode('cp1253')
+    assert detect_text_encoding(data) == 'iso-8859-7'
+
+@pytest.mark.parametrize('encoding', ['utf-8-sig', 'cp1253', 'iso-8859-7'])
+def test_txt_decoded_with_detected_encoding(processor, tmp_path, encoding):
+    path = tmp_path / 'έγγραφο.txt'
+    path.write_bytes(GREEK_TEXT.encode(encoding))
+    assert processor._extract_from_txt(str(path)) == GREEK_TEXT
+
+# Streaming εξαγωγή
+
+STREAMING_TEXT = ("  Άρθρο 1.\tΗ σύμβαση   μίσθωσης\n\n\nισχύει από σήμερα.\r\n"
+                  "Μακριάλέξηχωρίςκενάπουξεπερνάειπολλάblocks τέλος\n\n"
+                  + "Ο μισθωτής καταβάλλει το μίσθωμα. " * 20 + "\n  ")
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-8-sig', 'cp1253'])
+@pytest.mark.parametrize('block_size', [1, 3, 7, 64])
+def test_streaming_matches_whole_file(processor, tmp_path, monkeypatch, encoding, block_size):
+    # Blocks μικρότερα από λέξεις και μονά μεγέθη: κόβονται και multibyte χαρακτήρες
+    monkeypatch.setattr(type(config), 'TXT_BLOCK_SIZE', block_size)
+    path = tmp_path / 'μεγάλο.txt'
+    path.write_bytes(STREAMING_TEXT.encode(encoding))
+    
+    whole = processor._extract_from_txt(str(path))
+    original_length, cleaned = processor._extract_from_txt_streaming(str(path))
+    
+    assert whole == STREAMING_TEXT
+    assert original_length == len(whole)
+    assert cleaned == processor._clean_text(whole)
+
+def test_streaming_empty_file(processor, tmp_path):
+    path = tmp_path / 'κενό.txt'
+    path.write_bytes(b'')
+    assert processor._extract_from_txt_streaming(str(path)) == (0, '')
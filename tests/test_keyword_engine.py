@@ -0,0 +1,106 @@
+"""
+Tests για τον KeywordEngine (TF-IDF λέξεις-κλειδιά σε επίπεδο συλλογής)
+"""
+import math
+import random
+import pytest
+from config import config
+from core.keyword_engine import KeywordEngine, term_counts
+
+SYLLABLES = ['κα', 'λο', 'με', 'τρι', 'σπα', 'νου', 'φη', 'ρω', 'δυ', 'χει']
+
+def make_vocabulary(seed: int, size: int) -> list:
+    """Διαφορετικές λέξεις χωρίς τόνους (η μορφή εμφάνισης συμπίπτει με τον όρο)"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(3)))
+    return sorted(words)
+
+def make_text(rng: random.Random, vocabulary: list, words: int = 200) -> str:
+    """Κείμενο με ανομοιόμορφες συχνότητες όρων"""
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return ' '.join(rng.choices(vocabulary, weights=weights, k=words))
+
+def brute_force_weights(texts: dict, documents: int) -> dict:
+    """document_id -> {όρος: TF-IDF βάρος}, με τον τύπο του KeywordEngine ανά όρο"""
+    counts = {document_id: term_counts(text) for document_id, text in texts.items()}
+    frequency = {}
+    for terms in counts.values():
+        for term in terms:
+            frequency[term] = frequency.get(term, 0) + 1
+    return {document_id: {term: (1 + math.log(count)) * (math.log((1 + documents) / (1 + frequency[term])) + 1)
+                          for term, (count, _) in terms.items()}
+            for document_id, terms in counts.items()}
+
+@pytest.fixture
+def engine(db):
+    return KeywordEngine(db, top_k=5)
+
+def index_texts(engine, make_document, texts: list) -> dict:
+    indexed = {}
+    for text in texts:
+        document_id = make_document()
+        engine.index_document(document_id, text)
+        indexed[document_id] = text
+    return indexed
+
+def test_empty_document_in_batch(engine, make_document):
+    rng = random.Random(1)
+    first_words, last_words = make_vocabulary(1, 20), make_vocabulary(2, 20)
+    first, empty, numbers, last = index_texts(engine, make_document, [
+        make_text(rng, first_words), '', '12345 6789', make_text(rng, last_words)])
+    
+    keywords = engine.keywords_for([first, empty, numbers, last])
+    
+    assert keywords[empty] == [] and keywords[numbers] == []
+    # Οι όροι των γειτονικών εγγράφων δεν μετατοπίζονται από τις κενές γραμμές
+    assert len(keywords[first]) == len(keywords[last]) == 5
+    assert set(keywords[first]) <= set(first_words)
+    assert set(keywords[last]) <= set(last_words)
+
+def test_top_k_per_document(db, make_document):
+    vocabulary = make_vocabulary(3, 12)
+    engine = KeywordEngine(db, top_k=3)
+    many, few, single = index_texts(engine, make_document, [
+        ' '.join(vocabulary), ' '.join(vocabulary[:2]), vocabulary[5]])
+    
+    keywords = engine.keywords_for([many, few, single])
+    
+    assert len(keywords[many]) == 3
+    assert sorted(keywords[few]) == sorted(vocabulary[:2])
+    assert keywords[single] == [vocabulary[5]]
+
+def test_matches_brute_force_tfidf(engine, make_document, monkeypatch):
+    # Μικρά batches: τα έγγραφα μοιράζονται σε πολλές κλήσεις _parse/_score
+    monkeypatch.setattr(type(config), 'KEYWORD_BATCH_SIZE', 3)
+    rng = random.Random(4)
+    vocabulary = make_vocabulary(4, 40)
+    texts = index_texts(engine, make_document, [
+        make_text(rng, rng.sample(vocabulary, 25), words=rng.randrange(20, 300)) for _ in range(10)])
+    documents, _ = engine.db_manager.get_term_statistics()
+    assert documents == len(texts)
+    expected = brute_force_weights(texts, documents)
+    
+    keywords = engine.keywords_for(list(texts))
+    
+    for document_id, weights in expected.items():
+        # Σύγκριση βαρών (οι ισοβαθμίες μπορούν να εμφανιστούν με οποιαδήποτε σειρά)
+        ranked = [weights[keyword] for keyword in keywords[document_id]]
+        assert ranked == pytest.approx(sorted(weights.values(), reverse=True)[:engine.top_k])
+
+def test_rerank_corpus_updates_only_tier(db, engine, make_document):
+    rng = random.Random(5)
+    vocabulary = make_vocabulary(5, 30)
+    local, llm = index_texts(engine, make_document, [make_text(rng, vocabulary), make_text(rng, vocabulary)])
+    db.add_analysis_result(local, 'Α', ['παλιά'], [], 0.0, 0.9, 1.0, analysis_tier='local')
+    db.add_analysis_result(llm, 'Β', ['llm'], [], 0.0, 0.9, 1.0, analysis_tier='llm')
+    
+    result = engine.rerank_corpus(apply_tier='local')
+    
+    assert result['documents'] == 2
+    assert result['updated'] == 1
+    assert db.get_document_with_analysis(local)['keywords'] == engine.keywords_for([local])[local]
+    assert db.get_document_with_analysis(llm)['keywords'] == ['llm']
+    
+    assert engine.rerank_corpus()['updated'] == 0
@@ -0,0 +1,184 @@
+"""
+Tests για τα versioned migrations της database
+"""
+import sqlite3
+import pytest
+from core import migrations
+from core.database import DatabaseManager
+from core.migrations import MIGRATIONS, get_schema_version, run_migrations
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Schema πριν το versioning (user_version = 0)
+LEGACY_SCHEMA = '''
+    CREATE TABLE documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filepath TEXT UNIQUE NOT NULL,
+        filename TEXT NOT NULL,
+        file_size INTEGER,
+        file_type TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        modified_at TIMESTAMP,
+        processed_at TIMESTAMP,
+        status TEXT DEFAULT 'pending',
+        error_message TEXT
+    );
+    CREATE TABLE analysis_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        document_id INTEGER,
+        summary TEXT,
+        keywords TEXT,
+        categories TEXT,
+        sentiment_score REAL,
+        confidence_score REAL,
+        processing_time REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (document_id) REFERENCES documents (id)
+    );
+    CREATE TABLE document_chunks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        document_id INTEGER,
+        chunk_index INTEGER,
+        content TEXT,
+        word_count INTEGER,
+        FOREIGN KEY (document_id) REFERENCES documents (id)
+    );
+    CREATE INDEX idx_documents_status ON documents(status);
+    CREATE INDEX idx_documents_filepath ON documents(filepath);
+    CREATE INDEX idx_analysis_document_id ON analysis_results(document_id);
+'''
+
+def table_names(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+
+def index_names(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """Database του παλιού schema με δεδομένα και ένα orphan chunk"""
+    path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO documents (filepath, filename, file_size, file_type, status) VALUES (?, ?, ?, ?, ?)",
+        [('/docs/τιμολόγιο.pdf', 'τιμολόγιο.pdf', 2000, 'pdf', 'completed'),
+         ('/docs/notes.txt', 'notes.txt', 500, 'txt', 'pending')])
+    conn.execute("INSERT INTO analysis_results (document_id, summary, keywords, categories, processing_time) "
+                 "VALUES (1, 'Πληρωμή προμηθευτή', '[\"πληρωμή\"]', '[\"Οικονομικά\"]', 2.5)")
+    conn.executemany("INSERT INTO document_chunks (document_id, chunk_index, content, word_count) "
+                     "VALUES (?, ?, ?, ?)",
+                     [(1, 0, 'Εξόφληση τιμολογίου αριθμός 42', 4), (2, 0, 'meeting notes', 2),
+                      (99, 0, 'orphan chunk', 2)])
+    conn.commit()
+    conn.close()
+    return path
+
+def test_versions_are_contiguous():
+    assert [version for version, _, _ in MIGRATIONS] == list(range(1, LATEST_VERSION + 1))
+
+def test_fresh_database_reaches_latest_version(db):
+    with db.get_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        tables = table_names(conn)
+    
+    assert {'documents', 'analysis_results', 'document_chunks', 'document_signatures',
+            'document_duplicates', 'stat_counters', 'export_watermarks', 'chunk_embeddings',
+            'document_fts', 'chunk_fts', 'keyword_terms', 'document_terms', 'keyword_corpus',
+            'analysis_jobs', 'qa_answers'} <= tables
+
+def test_initialize_is_idempotent(db, make_document):
+    document_id = make_document(chunks=['κείμενο'])
+    db.initialize_database()
+    
+    with db.get_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+    assert db.get_document_chunks(document_id) == ['κείμενο']
+
+@pytest.mark.parametrize('start_version', range(1, LATEST_VERSION))
+def test_upgrade_from_each_version(tmp_path, monkeypatch, start_version):
+    manager = DatabaseManager(db_path=tmp_path / 'test.db')
+    with monkeypatch.context() as patch:
+        patch.setattr(migrations, 'MIGRATIONS', MIGRATIONS[:start_version])
+        manager.initialize_database()
+    with manager.get_connection() as conn:
+        assert get_schema_version(conn) == start_version
+        conn.execute("INSERT INTO documents (filepath, filename, file_size, file_type, status) "
+                     "VALUES ('/docs/a.txt', 'a.txt', 10, 'txt', 'completed')")
+        conn.commit()
+    
+    manager.initialize_database()
+    
+    with manager.get_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+    assert manager.get_statistics()['total_documents'] == 1
+    assert manager.enqueue_analysis_job({'folder_paths': ['/docs']}) > 0
+
+def test_upgrade_legacy_database(legacy_db):
+    manager = DatabaseManager(db_path=legacy_db)
+    manager.initialize_database()
+    
+    with manager.get_connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        indexes = index_names(conn)
+        orphans = conn.execute("SELECT COUNT(*) FROM document_chunks WHERE document_id = 99").fetchone()[0]
+    
+    # v2: τα orphan rows δεν αντιγράφονται, v3: indexes των queries
+    assert orphans == 0
+    assert 'idx_documents_status_created' in indexes
+    assert 'idx_documents_filepath' not in indexes and 'idx_documents_status' not in indexes
+    
+    document = manager.get_document_with_analysis(1)
+    assert document['summary'] == 'Πληρωμή προμηθευτή'
+    assert document['categories'] == ['Οικονομικά']
+    assert document['analysis_tier'] == 'llm'
+    assert manager.get_document_chunks(1) == ['Εξόφληση τιμολογίου αριθμός 42']
+    
+    # v4: counters από τα υπάρχοντα δεδομένα
+    statistics = manager.get_statistics()
+    assert statistics['total_documents'] == 2
+    assert statistics['total_bytes'] == 2500
+    assert statistics['by_status'] == {'completed': 1, 'pending': 1}
+    assert statistics['analysis_count'] == 1
+    assert manager.reconcile_statistics() == {}
+    
+    # v9: FTS index με τα υπάρχοντα chunks και αναλύσεις (χωρίς τόνους)
+    results = manager.hybrid_search('τιμολογιο')['results']
+    assert [result['document_id'] for result in results] == [1]
+    assert set(results[0]['sources']) == {'documents', 'chunks'}
+
+def test_upgrade_adds_cascade_deletes(legacy_db):
+    manager = DatabaseManager(db_path=legacy_db)
+    manager.initialize_database()
+    
+    with manager.get_connection() as conn:
+        conn.execute("DELETE FROM documents WHERE id = 1")
+        conn.commit()
+        remaining = [conn.execute(f"SELECT COUNT(*) FROM {table} WHERE document_id = 1").fetchone()[0]
+                     for table in ('analysis_results', 'document_chunks')]
+    
+    assert remaining == [0, 0]
+    assert manager.get_statistics()['total_documents'] == 1
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("broken migration")
+    
+    monkeypatch.setattr(migrations, 'MIGRATIONS', MIGRATIONS[:2] + [(3, "Broken", broken)])
+    conn = sqlite3.connect(tmp_path / 'test.db')
+    with pytest.raises(sqlite3.OperationalError):
+        run_migrations(conn)
+    
+    assert get_schema_version(conn) == 2
+    assert 'half_done' not in table_names(conn)
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.close()
+
+def test_newer_schema_is_left_untouched(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'test.db')
+    conn.execute(f"PRAGMA user_version = {LATEST_VERSION + 1}")
+    
+    assert run_migrations(conn) == LATEST_VERSION + 1
+    assert table_names(conn) == set()
+    conn.close()
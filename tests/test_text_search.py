@@ -0,0 +1,69 @@
+"""
+Tests για την κανονικοποίηση κειμένου, τα FTS5 queries και τα αποσπάσματα
+"""
+import unicodedata
+from core.text_search import (MAX_QUERY_TERMS, build_match_query, fold_search_text, make_snippet,
+                              normalize_query, query_terms)
+
+def test_fold_removes_case_and_diacritics():
+    assert fold_search_text('Πληρωμής ΤΙΜΟΛΌΓΙΟΥ Αϊδίνι ΐ') == 'πληρωμησ τιμολογιου αιδινι ι'
+    assert fold_search_text('Café') == 'cafe'
+
+def test_fold_passes_empty_values():
+    assert fold_search_text(None) is None
+    assert fold_search_text('') == ''
+
+def test_fold_keeps_length_of_nfc_text():
+    text = unicodedata.normalize('NFC', 'Η ΰλη, οι Ϊόνιοι και ο Σωκράτης ξεκίνησαν το έργο.')
+    assert len(fold_search_text(text)) == len(text)
+
+def test_query_terms_are_stemmed_and_unique():
+    assert query_terms('Πληρωμής πληρωμές, ΠΛΗΡΩΜΗ!') == ['πληρωμ']
+    assert query_terms('α β προϋπολογισμός') == ['προυπολογισμ']
+    assert query_terms('α') == ['α']
+
+def test_query_terms_are_limited():
+    query = ' '.join(f"όρος{index}" for index in range(MAX_QUERY_TERMS + 5))
+    assert len(query_terms(query)) == MAX_QUERY_TERMS
+
+def test_match_query_quotes_user_syntax():
+    assert build_match_query('"τιμολόγια" NEAR(x) -πληρωμή*') == '"τιμολογ"* OR "near"* OR "πληρωμ"*'
+    assert build_match_query('  ...  ') is None
+
+def test_normalize_query():
+    assert normalize_query('  Τι ΠΟΣΌ; πληρώθηκε!') == 'τι ποσο πληρωθηκε'
+
+def highlighted(snippet, highlights):
+    return [snippet[start:end] for start, end in highlights]
+
+def test_snippet_highlights_accented_terms():
+    snippet, highlights = make_snippet('Η πληρωμή του τιμολογίου έγινε. Οι πληρωμές καθυστερούν.', 'ΠΛΗΡΩΜΗ')
+    assert snippet == 'Η πληρωμή του τιμολογίου έγινε. Οι πληρωμές καθυστερούν.'
+    assert highlighted(snippet, highlights) == ['πληρωμή', 'πληρωμές']
+
+def test_snippet_window_around_first_hit():
+    words = [f"λέξη{index}" for index in range(100)]
+    words[60] = 'Προϋπολογισμός'
+    snippet, highlights = make_snippet(' '.join(words), 'προυπολογισμος', words=20)
+    
+    assert snippet.startswith('…λέξη55 ') and snippet.endswith('λέξη74…')
+    assert highlighted(snippet, highlights) == ['Προϋπολογισμός']
+
+def test_snippet_offsets_after_whitespace_collapse():
+    text = 'Αρχή\n\n\tτου   κειμένου  με\n τιμολόγιο   και  ΤΙΜΟΛΌΓΙΑ'
+    snippet, highlights = make_snippet(text, 'τιμολόγιο')
+    
+    assert snippet == 'Αρχή του κειμένου με τιμολόγιο και ΤΙΜΟΛΌΓΙΑ'
+    assert highlighted(snippet, highlights) == ['τιμολόγιο', 'ΤΙΜΟΛΌΓΙΑ']
+
+def test_snippet_offsets_with_decomposed_input():
+    # NFD είσοδος: οι θέσεις αναφέρονται στο απόσπασμα σε NFC
+    text = unicodedata.normalize('NFD', 'Η απόφαση για την πληρωμή')
+    snippet, highlights = make_snippet(text, 'αποφαση')
+    
+    assert highlighted(snippet, highlights) == ['απόφαση']
+
+def test_snippet_without_hits_or_text():
+    assert make_snippet('Κείμενο χωρίς όρο', 'τιμολόγιο') == ('Κείμενο χωρίς όρο', [])
+    assert make_snippet('', 'τιμολόγιο') == ('', [])
+    assert make_snippet(None, '') == ('', [])
@@ -0,0 +1,128 @@
+"""
+UI Components (plotly figures) για AI Document Analyzer
+"""
+from typing import Dict, List
+import plotly.graph_objects as go
+
+_PRIMARY = '#3498db'
+_SUCCESS = '#27ae60'
+_DANGER = '#e74c3c'
+
+def _base_layout(figure: go.Figure, title: str, x_title: str = None, y_title: str = None) -> go.Figure:
+    """Κοινή εμφάνιση για όλα τα γραφήματα"""
+    figure.update_layout(
+        title={'text': title, 'font': {'size': 14}},
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        margin={'l': 40, 'r': 20, 't': 40, 'b': 40},
+        height=300,
+        template='plotly_white',
+        font={'family': 'Inter, sans-serif'},
+        showlegend=False
+    )
+    return figure
+
+def create_empty_figure(title: str) -> go.Figure:
+    """Κενό γράφημα όταν δεν υπάρχουν δεδομένα"""
+    figure = go.Figure()
+    figure.add_annotation(text="Δεν υπάρχουν δεδομένα", showarrow=False,
+                          xref='paper', yref='paper', x=0.5, y=0.5,
+                          font={'color': '#95a5a6'})
+    figure.update_xaxes(visible=False)
+    figure.update_yaxes(visible=False)
+    return _base_layout(figure, title)
+
+def create_processing_time_figure(histogram: List[Dict]) -> go.Figure:
+    """Histogram χρόνων ανάλυσης"""
+    title = "Χρόνος Ανάλυσης"
+    if not histogram:
+        return create_empty_figure(title)
+    
+    figure = go.Figure(go.Bar(
+        x=[(bucket['start'] + bucket['end']) / 2 for bucket in histogram],
+        y=[bucket['count'] for bucket in histogram],
+        width=[bucket['end'] - bucket['start'] for bucket in histogram],
+        marker_color=_PRIMARY,
+        hovertemplate="%{x:.1f}s: %{y} έγγραφα<extra></extra>"
+    ))
+    return _base_layout(figure, title, "Δευτερόλεπτα", "Έγγραφα")
+
+def create_throughput_figure(throughput: List[Dict]) -> go.Figure:
+    """Επεξεργασμένα έγγραφα ανά περίοδο και σωρευτικό σύνολο"""
+    title = "Ρυθμός Επεξεργασίας"
+    if not throughput:
+        return create_empty_figure(title)
+    
+    periods = [row['period'] for row in throughput]
+    figure = go.Figure([
+        go.Bar(x=periods, y=[row['completed'] for row in throughput],
+               name="Ολοκληρωμένα", marker_color=_SUCCESS),
+        go.Bar(x=periods, y=[row['failed'] for row in throughput],
+               name="Αποτυχημένα", marker_color=_DANGER),
+        go.Scatter(x=periods, y=[row['cumulative'] for row in throughput],
+                   name="Σύνολο", yaxis='y2', mode='lines', line={'color': '#2c3e50'})
+    ])
+    _base_layout(figure, title, None, "Έγγραφα")
+    figure.update_layout(barmode='stack', showlegend=True,
+                         legend={'orientation': 'h', 'y': -0.2},
+                         yaxis2={'overlaying': 'y', 'side': 'right', 'showgrid': False})
+    return figure
+
+def create_category_figure(categories: List[Dict]) -> go.Figure:
+    """Συχνότερες κατηγορίες (οριζόντιες μπάρες)"""
+    title = "Κατηγορίες"
+    if not categories:
+        return create_empty_figure(title)
+    
+    ordered = list(reversed(categories))
+    figure = go.Figure(go.Bar(
+        x=[row['count'] for row in ordered],
+        y=[row['category'] for row in ordered],
+        orientation='h',
+        marker_color=_PRIMARY
+    ))
+    return _base_layout(figure, title, "Έγγραφα")
+
+def create_sentiment_figure(sentiment: List[Dict]) -> go.Figure:
+    """Κατανομή sentiment με χρώμα ανά πρόσημο"""
+    title = "Κατανομή Sentiment"
+    if not sentiment:
+        return create_empty_figure(title)
+    
+    centers = [(bucket['start'] + bucket['end']) / 2 for bucket in sentiment]
+    colors = [_SUCCESS if center > 0.1 else _DANGER if center < -0.1 else '#95a5a6' for center in centers]
+    figure = go.Figure(go.Bar(
+        x=centers,
+        y=[bucket['count'] for bucket in sentiment],
+        width=[bucket['end'] - bucket['start'] for bucket in sentiment],
+        marker_color=colors
+    ))
+    _base_layout(figure, title, "Sentiment", "Έγγραφα")
+    figure.update_xaxes(range=[-1, 1])
+    return figure
+
+def create_failure_figure(failures: List[Dict]) -> go.Figure:
+    """Συχνότερες αιτίες αποτυχίας"""
+    title = "Αιτίες Αποτυχίας"
+    if not failures:
+        return create_empty_figure(title)
+    
+    ordered = list(reversed(failures))
+    figure = go.Figure(go.Bar(
+        x=[row['count'] for row in ordered],
+        y=[row['reason'][:50] for row in ordered],
+        orientation='h',
+        marker_color=_DANGER,
+        hovertext=[row['reason'] for row in ordered]
+    ))
+    return _base_layout(figure, title, "Έγγραφα")
+
+def create_analytics_figures(analytics: Dict) -> Dict[str, go.Figure]:
+    """Όλα τα γραφήματα του analytics dashboard"""
+    return {
+        'processing_time': create_processing_time_figure(analytics['processing_time']),
+        'throughput': create_throughput_figure(analytics['throughput']),
+        'categories': create_category_figure(analytics['categories']),
+        'sentiment': create_sentiment_figure(analytics['sentiment']),
+        'failures': create_failure_figure(analytics['failures'])
+    }
@@ -12,6 +12,8 @@ def create_main_layout():
         dcc.Store(id='documents-store', data=[]),
         dcc.Store(id='selected-folder-store', data=''),
         dcc.Store(id='processing-status-store', data={'active': False, 'progress': 0}),
+        dcc.Store(id='similar-store', data=None),
+        dcc.Store(id='analysis-job-store', data=None),
         
         # Intervals για auto-refresh
         dcc.Interval(
@@ -43,6 +45,12 @@ def create_main_layout():
                 html.Hr(),
                 create_stats_section(),
                 
+                # Ερωτήσεις στα έγγραφα
+                create_qa_section(),
+                
+                # Analytics
+                create_analytics_section(),
+                
             ], fluid=True, className="main-container")
         ]),
         
@@ -128,7 +136,8 @@ def create_control_panel():
                 options=[
                     {"label": "Recursive σάρωση υποφακέλων", "value": "recursive"},
                     {"label": "Συμπερίληψη εικόνων (OCR)", "value": "include_images"},
-                    {"label": "Λεπτομερής ανάλυση", "value": "detailed_analysis"}
+                    {"label": "Λεπτομερής ανάλυση", "value": "detailed_analysis"},
+                    {"label": "Συνεχής παρακολούθηση φακέλου", "value": "watch"}
                 ],
                 value=["recursive", "include_images"],
                 className="mb-3"
@@ -206,6 +215,16 @@ def create_results_panel():
                 ], width="auto"),
                 dbc.Col([
                     dbc.InputGroup([
+                        dbc.Select(
+                            id="search-mode",
+                            options=[
+                                {"label": "Λέξεις-κλειδιά", "value": "keyword"},
+                                {"label": "Σημασιολογική", "value": "semantic"},
+                                {"label": "Υβριδική", "value": "hybrid"}
+                            ],
+                            value="keyword",
+                            size="sm"
+                        ),
                         dbc.Input(
                             id="search-input",
                             placeholder="Αναζήτηση...",
@@ -266,7 +285,14 @@ def create_results_panel():
                         value="date_desc",
                         size="sm"
                     )
-                ], width=3)
+                ], width=3),
+                dbc.Col([
+                    dbc.DropdownMenu([
+                        dbc.DropdownMenuItem("CSV", href="/export/csv", external_link=True),
+                        dbc.DropdownMenuItem("JSON Lines", href="/export/jsonl", external_link=True),
+                        dbc.DropdownMenuItem("Parquet", href="/export/parquet", external_link=True)
+                    ], label="Export", size="sm", color="outline-secondary", align_end=True)
+                ], width=3, className="text-end")
             ], className="mb-3"),
             
             # Results Container
@@ -285,8 +311,22 @@ def create_results_panel():
             # Pagination
             html.Div(
                 id="pagination-container",
-                className="mt-3"
-            )
+                children=[
+                    dbc.Pagination(
+                        id="results-page",
+                        active_page=1,
+                        max_value=1,
+                        fully_expanded=False,
+                        previous_next=True,
+                        size="sm"
+                    )
+                ],
+                className="mt-3 d-flex justify-content-center",
+                style={'display': 'none'}
+            ),
+            
+            # Κλειδί της σελίδας που εμφανίζεται (χωρίς αλλαγές δεν ξαναστέλνονται οι κάρτες)
+            dcc.Store(id='results-key-store', data=None)
         ])
     ], className="card-custom")
 
@@ -335,6 +375,68 @@ def create_stats_section():
         ], width=3)
     ], className="mb-4")
 
+def create_qa_section():
+    """Δημιουργία section ερωτήσεων πάνω στα έγγραφα (απάντηση με αναφορές σε πηγές)"""
+    return dbc.Card([
+        # Ανανέωση της απάντησης όσο παράγεται
+        dcc.Interval(id='qa-interval', interval=300, n_intervals=0, disabled=True),
+        dcc.Store(id='qa-answer-store', data=None),
+        
+        dbc.CardHeader([
+            html.H5([
+                html.I(className="fas fa-comments me-2"),
+                "Ερωτήσεις στα Έγγραφα"
+            ], className="mb-0")
+        ]),
+        dbc.CardBody([
+            dbc.InputGroup([
+                dbc.Input(
+                    id="qa-question",
+                    placeholder="π.χ. Ποιοι είναι οι όροι πληρωμής;",
+                    type="text",
+                    debounce=False
+                ),
+                dbc.Button([
+                    html.I(className="fas fa-paper-plane me-2"),
+                    "Ερώτηση"
+                ], id="qa-ask-btn", color="primary")
+            ], className="mb-3"),
+            html.Div(id="qa-answer", className="mb-2", style={'whiteSpace': 'pre-wrap'}),
+            html.Div(id="qa-sources")
+        ])
+    ], className="card-custom mb-4")
+
+def create_analytics_section():
+    """Δημιουργία section analytics (γραφήματα από SQL συναθροίσεις)"""
+    def graph_col(graph_id, width):
+        return dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    dcc.Graph(id=graph_id, config={'displayModeBar': False})
+                ])
+            ], className="card-custom")
+        ], width=width)
+    
+    return html.Div([
+        # Έλεγχος για νέα δεδομένα: τα γραφήματα ξαναϋπολογίζονται μόνο αν άλλαξε η έκδοση
+        dcc.Interval(id='analytics-interval', interval=10000, n_intervals=0),
+        dcc.Store(id='analytics-version-store', data=None),
+        
+        html.H5([
+            html.I(className="fas fa-chart-bar me-2"),
+            "Analytics"
+        ], className="mb-3"),
+        dbc.Row([
+            graph_col('processing-time-graph', 6),
+            graph_col('throughput-graph', 6)
+        ], className="g-4 mb-4"),
+        dbc.Row([
+            graph_col('categories-graph', 4),
+            graph_col('sentiment-graph', 4),
+            graph_col('failures-graph', 4)
+        ], className="g-4 mb-4")
+    ])
+
 def create_document_card(doc):
     """Δημιουργία card για έγγραφο"""
     # Status badge
@@ -401,6 +503,31 @@ def create_document_card(doc):
         ], className="mb-2")
     ]
     
+    # Similarity (σημασιολογική αναζήτηση)
+    if doc.get('similarity') is not None:
+        card_content.append(
+            dbc.Badge(f"Ομοιότητα {doc['similarity']:.2f}", color="info", className="mb-2")
+        )
+    
+    # Απόσπασμα αναζήτησης με τους όρους τονισμένους
+    if doc.get('snippet'):
+        snippet, parts, position = doc['snippet'], [], 0
+        for start, end in doc.get('highlights', []):
+            parts.extend([snippet[position:start], html.Mark(snippet[start:end])])
+            position = end
+        parts.append(snippet[position:])
+        card_content.append(html.Small(parts, className="text-muted d-block mb-2"))
+    
+    # Duplicate indicator
+    if doc.get('duplicate_of'):
+        duplicate_label = "Αντίγραφο" if doc.get('duplicate_type') == 'exact' else "Παρόμοιο"
+        card_content.append(
+            html.Small([
+                html.I(className="fas fa-copy me-1"),
+                f"{duplicate_label} του εγγράφου #{doc['duplicate_of']}"
+            ], className="text-muted d-block mb-2")
+        )
+    
     # Analysis results (if completed)
     if doc['status'] == 'completed' and doc.get('summary'):
         card_content.extend([
@@ -447,7 +574,8 @@ def create_document_card(doc):
                 dbc.Col([
                     html.Small([
                         html.Strong("Χρόνος: "),
-                        f"{doc.get('processing_time', 0):.1f}s"
+                        f"{doc.get('processing_time', 0):.1f}s",
+                        " (τοπική ανάλυση)" if doc.get('analysis_tier') == 'local' else ""
                     ], className="text-muted")
                 ], width=6)
             ])
@@ -473,6 +601,16 @@ def create_document_card(doc):
             ], color="danger", className="mt-2 py-2")
         )
     
+    # Παρόμοια έγγραφα (σημασιολογική ομοιότητα των chunks)
+    if doc['status'] == 'completed':
+        card_content.append(
+            dbc.Button([
+                html.I(className="fas fa-project-diagram me-1"),
+                "Παρόμοια"
+            ], id={'type': 'similar-btn', 'index': doc['id']}, color="link", size="sm",
+               className="p-0 mt-1")
+        )
+    
     # Filter out None items
     card_content = [item for item in card_content if item is not None]
     
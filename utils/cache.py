@@ -0,0 +1,64 @@
+"""
+Cache utilities για AI Document Analyzer
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class VersionedCache:
+    """
+    LRU cache με τιμές δεμένες σε έκδοση δεδομένων
+    
+    Μια τιμή επιστρέφεται μόνο αν υπολογίστηκε για την τρέχουσα έκδοση,
+    οπότε κάθε εγγραφή στη database ακυρώνει αυτόματα τα παλιά αποτελέσματα.
+    """
+    
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, key: Hashable, version: int, compute: Callable[[], Any]) -> Any:
+        """Τιμή από την cache για την έκδοση ή υπολογισμός και αποθήκευση"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        value = compute()
+        
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        return value
+    
+    def get(self, key: Hashable, version: int) -> Any:
+        """Τιμή για την έκδοση ή None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: Hashable, version: int, value: Any):
+        """Αποθήκευση τιμής που υπολογίστηκε εκτός cache (π.χ. απάντηση σε stream)"""
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,12 +1,14 @@
 """
 Helper functions για AI Document Analyzer
 """
+import codecs
+import importlib.util
 import os
 import re
 import mimetypes
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Iterator, List, Dict, Optional, Union
 
 def format_file_size(size_bytes: int) -> str:
     """Μετατροπή bytes σε human-readable format"""
@@ -103,6 +105,47 @@ def validate_path(path: Union[str, Path]) -> Dict:
     
     return validation
 
+def split_folder_paths(value: str, separator: str = ';') -> List[str]:
+    """Διαχωρισμός πολλαπλών φακέλων από το πεδίο εισαγωγής"""
+    if not value:
+        return []
+    
+    paths = []
+    for part in re.split(rf'[{re.escape(separator)}\n]', value):
+        part = part.strip().strip('"')
+        if part and part not in paths:
+            paths.append(part)
+    
+    return paths
+
+# Stop words (απλή λίστα, ελληνικά και αγγλικά)
+STOP_WORDS = {
+    'και', 'ή', 'αλλά', 'όμως', 'για', 'με', 'από', 'στο', 'στη', 'στον', 'στην',
+    'του', 'της', 'των', 'τον', 'την', 'τα', 'το', 'ο', 'η', 'οι', 'ένα', 'μια',
+    'είναι', 'ήταν', 'θα', 'να', 'σε', 'κι', 'κα', 'πω', 'πως', 'που', 'ποια',
+    'the', 'and', 'or', 'but', 'for', 'with', 'from', 'to', 'in', 'on', 'at',
+    'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'a', 'an'
+}
+
+# Λέξεις-ενδείξεις ανά κατηγορία (οι κατηγορίες του prompt κατηγοριοποίησης)
+CATEGORY_KEYWORDS = {
+    'Νομικό': ['νόμος', 'δικαστήριο', 'συμβόλαιο', 'δικηγόρος', 'αγωγή', 'κανονισμός',
+               'σύμβαση', 'συμβαλλόμενος', 'διάταξη', 'contract', 'court'],
+    'Οικονομικό': ['χρήματα', 'τράπεζα', 'επένδυση', 'οικονομία', 'φόρος', 'budget',
+                   'τιμολόγιο', 'πληρωμή', 'προϋπολογισμός', 'λογαριασμός', 'invoice', 'payment'],
+    'Τεχνολογικό': ['τεχνολογία', 'software', 'hardware', 'κώδικας', 'προγραμματισμός',
+                    'λογισμικό', 'server', 'εφαρμογή', 'δίκτυο'],
+    'Εκπαιδευτικό': ['σχολείο', 'μάθημα', 'εκπαίδευση', 'φοιτητής', 'διδασκαλία',
+                     'μαθητής', 'πανεπιστήμιο', 'εξάμηνο'],
+    'Ιατρικό': ['υγεία', 'γιατρός', 'ασθένεια', 'θεραπεία', 'φάρμακο', 'νοσοκομείο',
+                'ασθενής', 'διάγνωση'],
+    'Επιστημονικό': ['έρευνα', 'μελέτη', 'πείραμα', 'υπόθεση', 'μεθοδολογία', 'research'],
+    'Διοικητικό': ['διοίκηση', 'γραφείο', 'υπάλληλος', 'διαδικασία', 'έγγραφο',
+                   'αίτηση', 'πρωτόκολλο', 'υπηρεσία'],
+    'Μάρκετινγκ': ['διαφήμιση', 'προώθηση', 'καμπάνια', 'πωλήσεις', 'marketing', 'brand'],
+    'Προσωπικό': ['αγαπητέ', 'αγαπητή', 'οικογένεια', 'διακοπές', 'γενέθλια']
+}
+
 def clean_text_for_display(text: str, max_length: int = 200) -> str:
     """Καθαρισμός κειμένου για εμφάνιση στο UI"""
     if not text:
@@ -126,19 +169,10 @@ def extract_keywords_simple(text: str, max_keywords: int = 10) -> List[str]:
     text = re.sub(r'[^\w\s]', ' ', text.lower())
     words = text.split()
     
-    # Αφαίρεση stop words (απλή λίστα)
-    stop_words = {
-        'και', 'ή', 'αλλά', 'όμως', 'για', 'με', 'από', 'στο', 'στη', 'στον', 'στην',
-        'του', 'της', 'των', 'τον', 'την', 'τα', 'το', 'ο', 'η', 'οι', 'ένα', 'μια',
-        'είναι', 'ήταν', 'θα', 'να', 'σε', 'κι', 'κα', 'πω', 'πως', 'που', 'ποια',
-        'the', 'and', 'or', 'but', 'for', 'with', 'from', 'to', 'in', 'on', 'at',
-        'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'a', 'an'
-    }
-    
     # Φιλτράρισμα και μέτρηση
     word_count = {}
     for word in words:
-        if len(word) > 3 and word not in stop_words:
+        if len(word) > 3 and word not in STOP_WORDS:
             word_count[word] = word_count.get(word, 0) + 1
     
     # Ταξινόμηση και επιστροφή top keywords
@@ -150,16 +184,7 @@ def categorize_by_keywords(keywords: List[str]) -> List[str]:
     categories = []
     keyword_str = ' '.join(keywords).lower()
     
-    category_keywords = {
-        'Νομικό': ['νόμος', 'δικαστήριο', 'συμβόλαιο', 'δικηγόρος', 'αγωγή', 'κανονισμός'],
-        'Οικονομικό': ['χρήματα', 'τράπεζα', 'επένδυση', 'οικονομία', 'φόρος', 'budget'],
-        'Τεχνολογικό': ['τεχνολογία', 'software', 'hardware', 'κώδικας', 'προγραμματισμός'],
-        'Εκπαιδευτικό': ['σχολείο', 'μάθημα', 'εκπαίδευση', 'φοιτητής', 'διδασκαλία'],
-        'Ιατρικό': ['υγεία', 'γιατρός', 'ασθένεια', 'θεραπεία', 'φάρμακο', 'νοσοκομείο'],
-        'Διοικητικό': ['διοίκηση', 'γραφείο', 'υπάλληλος', 'διαδικασία', 'έγγραφο']
-    }
-    
-    for category, cat_keywords in category_keywords.items():
+    for category, cat_keywords in CATEGORY_KEYWORDS.items():
         if any(kw in keyword_str for kw in cat_keywords):
             categories.append(category)
     
@@ -174,21 +199,80 @@ def estimate_reading_time(text: str, words_per_minute: int = 200) -> int:
     minutes = max(1, round(word_count / words_per_minute))
     return minutes
 
-def get_file_encoding(file_path: Union[str, Path]) -> str:
-    """Ανίχνευση encoding αρχείου"""
+_HIGH_BYTES = bytes(range(0x80, 0x100))
+_C1_BYTES = bytes(range(0x80, 0xA0))
+_GREEK_LETTER_BYTES = bytes(range(0xC1, 0xFF))
+
+def detect_text_encoding(sample: bytes) -> str:
+    """
+    Ανίχνευση encoding από δείγμα bytes (BOM, εγκυρότητα UTF-8, στατιστικά ελληνικών)
+    
+    Args:
+        sample: Τα πρώτα bytes του αρχείου
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    # Incremental decoder: ένας χαρακτήρας κομμένος στο τέλος του δείγματος δεν είναι σφάλμα
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    high_count = len(sample) - len(sample.translate(None, _HIGH_BYTES))
+    greek_count = len(sample) - len(sample.translate(None, _GREEK_LETTER_BYTES))
+    
+    if high_count and greek_count * 2 >= high_count:
+        # Στο ISO-8859-7 το 0x80-0x9F είναι control χαρακτήρες, στο cp1253 σημεία στίξης
+        if len(sample) - len(sample.translate(None, _C1_BYTES)) > 0:
+            return 'cp1253'
+        # Το "Ά" είναι 0xB6 στο ISO-8859-7 και 0xA2 στο cp1253
+        if sample.count(0xB6) > sample.count(0xA2):
+            return 'iso-8859-7'
+        return 'cp1253'
+    
     try:
         import chardet
         
-        with open(file_path, 'rb') as file:
-            raw_data = file.read(10000)  # Διάβασμα πρώτων 10KB
-            result = chardet.detect(raw_data)
-            return result.get('encoding', 'utf-8')
+        result = chardet.detect(sample)
+        if result.get('encoding') and result.get('confidence', 0) >= 0.5:
+            return result['encoding'].lower()
     except ImportError:
-        # Fallback αν δεν υπάρχει chardet
-        return 'utf-8'
+        pass
+    
+    return 'latin1'
+
+def get_file_encoding(file_path: Union[str, Path], sample_size: int = 65536) -> str:
+    """Ανίχνευση encoding αρχείου από τα πρώτα bytes του"""
+    try:
+        with open(file_path, 'rb') as file:
+            return detect_text_encoding(file.read(sample_size))
     except Exception:
         return 'utf-8'
 
+def iter_decoded_blocks(file_path: Union[str, Path], encoding: str,
+                        block_size: int = 1024 * 1024) -> Iterator[str]:
+    """
+    Streaming αποκωδικοποίηση αρχείου σε blocks κειμένου
+    
+    Ο incremental decoder κρατάει τους multibyte χαρακτήρες που κόβονται
+    στα όρια των blocks, οπότε το αποτέλεσμα είναι ίδιο με ένα ενιαίο decode.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            text = decoder.decode(block)
+            if text:
+                yield text
+    
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
 def create_backup_filename(original_path: Union[str, Path]) -> Path:
     """Δημιουργία backup filename"""
     path = Path(original_path)
@@ -250,4 +334,11 @@ def create_safe_directory(path: Union[str, Path]) -> bool:
         Path(path).mkdir(parents=True, exist_ok=True)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+def module_available(name: str) -> bool:
+    """Έλεγχος αν υπάρχει εγκατεστημένο module χωρίς να γίνει import"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -2,16 +2,49 @@
 Logging configuration για AI Document Analyzer
 """
 from loguru import logger
+import contextvars
+import itertools
+import json
 import sys
+import zlib
+from contextlib import contextmanager
 from config import config
 
-def setup_logger():
-    """Ρύθμιση logging συστήματος"""
+# Τα handlers προστίθενται μία φορά ανά process (κάθε module καλεί το setup_logger)
+_configured = False
+
+# Απόφαση sampling για το έγγραφο που επεξεργάζεται το τρέχον thread (None = καμία)
+_sampling_decision = contextvars.ContextVar('log_sampling_decision', default=None)
+_sampling_counter = itertools.count()
+
+def _json_format(record) -> str:
+    """Μία γραμμή JSON ανά μήνυμα με τα structured πεδία"""
+    extra = record['extra']
+    record['extra']['_json'] = json.dumps({
+        'time': record['time'].isoformat(),
+        'level': record['level'].name,
+        'message': record['message'],
+        'stage': extra.get('stage'),
+        'document_id': extra.get('document_id'),
+        'file': extra.get('file'),
+        'module': record['name'],
+        'function': record['function'],
+        'line': record['line'],
+        'process': record['process'].id,
+        'exception': str(record['exception'].value) if record['exception'] else None
+    }, ensure_ascii=False, default=str)
+    return "{extra[_json]}\n"
+
+def configure_logging():
+    """(Επανα)ρύθμιση των sinks με βάση το config"""
+    global _configured
+    _configured = True
     
     # Αφαίρεση default handler
     logger.remove()
     
-    # Console logging
+    # Console logging (σύγχρονο: το enqueue κάνει pickle κάθε record και κοστίζει
+    # περισσότερο από την ίδια την εγγραφή στο terminal)
     logger.add(
         sys.stdout,
         format=config.LOG_FORMAT,
@@ -26,16 +59,108 @@ def setup_logger():
         level=config.LOG_LEVEL,
         rotation="1 day",
         retention="30 days",
-        compression="zip"
+        compression="zip",
+        enqueue=config.LOG_ENQUEUE
     )
     
+    # Structured logging (JSON Lines)
+    if config.LOG_JSON:
+        logger.add(
+            config.LOGS_DIR / "app_{time:YYYY-MM-DD}.jsonl",
+            format=_json_format,
+            level=config.LOG_LEVEL,
+            rotation="1 day",
+            retention="30 days",
+            compression="zip",
+            enqueue=config.LOG_ENQUEUE
+        )
+    
     # Error logging
     logger.add(
         config.LOGS_DIR / "errors_{time:YYYY-MM-DD}.log",
         format=config.LOG_FORMAT,
         level="ERROR",
         rotation="1 day",
-        retention="90 days"
+        retention="90 days",
+        enqueue=config.LOG_ENQUEUE
     )
     
     return logger
+
+def setup_logger():
+    """Ρύθμιση logging συστήματος"""
+    if _configured:
+        return logger
+    return configure_logging()
+
+def _sample(key) -> bool:
+    """
+    Αν κρατούνται τα μηνύματα ενός εγγράφου (LOG_SAMPLE_RATE)
+    
+    Η απόφαση βασίζεται στο hash του αρχείου/document_id, οπότε είναι ίδια σε
+    κάθε process. Χωρίς κλειδί κρατείται ένα μήνυμα ανά 1/rate.
+    """
+    rate = config.LOG_SAMPLE_RATE
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    if key is None:
+        return next(_sampling_counter) % max(1, round(1 / rate)) == 0
+    return zlib.crc32(str(key).encode('utf-8')) % 10000 < rate * 10000
+
+@contextmanager
+def document_context(**fields):
+    """
+    Structured πεδία (π.χ. file, document_id) για όλα τα μηνύματα του block
+    
+    Η απόφαση sampling παίρνεται μία φορά, ώστε για κάθε έγγραφο να κρατούνται
+    είτε όλα τα μηνύματα ανά αρχείο είτε κανένα.
+    """
+    token = _sampling_decision.set(_sample(fields.get('file') or fields.get('document_id')))
+    try:
+        with logger.contextualize(**fields):
+            yield
+    finally:
+        _sampling_decision.reset(token)
+
+class SampledLogger:
+    """
+    Logger για τα μηνύματα που γράφονται για κάθε αρχείο
+    
+    Τα DEBUG/INFO μηνύματα εγγράφων που δεν επιλέχθηκαν από το sampling
+    απορρίπτονται πριν φτάσουν στο loguru (χωρίς κόστος record/sinks).
+    Τα WARNING και πάνω γράφονται πάντα.
+    """
+    
+    def __init__(self, **extra):
+        self._extra = extra
+        # depth=1: file/function/line του record δείχνουν τον caller, όχι αυτή την κλάση
+        self._logger = logger.bind(**extra).opt(depth=1)
+    
+    def bind(self, **extra) -> "SampledLogger":
+        return SampledLogger(**{**self._extra, **extra})
+    
+    def _keep(self) -> bool:
+        decision = _sampling_decision.get()
+        if decision is not None:
+            return decision
+        return _sample(self._extra.get('file') or self._extra.get('document_id'))
+    
+    def debug(self, message, *args, **kwargs):
+        if self._keep():
+            self._logger.debug(message, *args, **kwargs)
+    
+    def info(self, message, *args, **kwargs):
+        if self._keep():
+            self._logger.info(message, *args, **kwargs)
+    
+    def warning(self, message, *args, **kwargs):
+        self._logger.warning(message, *args, **kwargs)
+    
+    def error(self, message, *args, **kwargs):
+        self._logger.error(message, *args, **kwargs)
+
+def sampled_logger(stage: str) -> SampledLogger:
+    """Logger ανά αρχείο με το πεδίο stage (δειγματοληψία με LOG_SAMPLE_RATE)"""
+    return SampledLogger(stage=stage)
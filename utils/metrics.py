@@ -0,0 +1,284 @@
+"""
+Metrics (counters, gauges, histograms) για AI Document Analyzer
+
+Τα metrics κρατιούνται στη μνήμη του process και εκτίθενται σε Prometheus
+text format: ο web server από το route /metrics και κάθε worker ανάλυσης
+(`python main.py worker`) από δικό του port (WORKER_METRICS_PORT), οπότε το
+Prometheus συλλέγει κάθε process ως ξεχωριστό target.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Buckets σε seconds: από γρήγορες εγγραφές database έως LLM κλήσεις λεπτών
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 120.0, 300.0)
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    escaped = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+class _Metric:
+    """Βάση για metrics με labels"""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Το metric {self.name} απαιτεί τα labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(self._labels(key), value))
+        return lines
+    
+    def _render_sample(self, labels: Dict[str, str], value) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    """Μετρητής που μόνο αυξάνεται"""
+    
+    metric_type = 'counter'
+    
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Ο counter δεν μειώνεται")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+class Gauge(_Metric):
+    """Τιμή που ανεβοκατεβαίνει (π.χ. εργασίες σε εξέλιξη)"""
+    
+    metric_type = 'gauge'
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+    
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+class Histogram(_Metric):
+    """Κατανομή τιμών σε σωρευτικά buckets (με sum και count)"""
+    
+    metric_type = 'histogram'
+    
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Μετρήσεις ανά bucket (τελευταίο = +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+    
+    def snapshot(self, **labels) -> Dict:
+        """Count και sum για συγκεκριμένα labels"""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            if state is None:
+                return {'count': 0, 'sum': 0.0}
+            return {'count': state[2], 'sum': state[1]}
+    
+    def _render_sample(self, labels: Dict[str, str], state) -> List[str]:
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            bucket_labels = dict(labels, le=_format_value(bound))
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """Συλλογή metrics του process"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Το metric {metric.name} υπάρχει ήδη με άλλο ορισμό")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+    
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, description, labelnames))
+    
+    def histogram(self, name: str, description: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+    
+    def render(self) -> str:
+        """Όλα τα metrics σε Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+# Pipeline
+STAGE_SECONDS = registry.histogram(
+    'docanalyzer_stage_duration_seconds',
+    "Διάρκεια σταδίων επεξεργασίας (scan, queue_wait, extract, ocr, dedup, keywords, embed, "
+    "analyze_local, analyze, db_write)",
+    ['stage'])
+STAGE_IN_FLIGHT = registry.gauge(
+    'docanalyzer_stage_in_flight', "Εργασίες σε εξέλιξη ανά στάδιο", ['stage'])
+STAGE_ERRORS = registry.counter(
+    'docanalyzer_stage_errors_total', "Εξαιρέσεις ανά στάδιο", ['stage'])
+DOCUMENTS_PROCESSED = registry.counter(
+    'docanalyzer_documents_processed_total', "Έγγραφα που επεξεργάστηκαν ανά αποτέλεσμα", ['result'])
+ANALYSES = registry.counter(
+    'docanalyzer_analyses_total', "Αναλύσεις ανά επίπεδο (llm, local)", ['tier'])
+EXTRACTION_WORKER_RESTARTS = registry.counter(
+    'docanalyzer_extraction_worker_restarts_total', "Αντικαταστάσεις workers εξαγωγής", ['reason'])
+
+# LLM (Ollama)
+LLM_REQUEST_SECONDS = registry.histogram(
+    'docanalyzer_llm_request_duration_seconds', "Συνολική διάρκεια κλήσης στο Ollama", ['operation'])
+LLM_PROMPT_EVAL_SECONDS = registry.histogram(
+    'docanalyzer_llm_prompt_eval_duration_seconds', "Χρόνος επεξεργασίας prompt (prompt_eval_duration)",
+    ['operation'])
+LLM_EVAL_SECONDS = registry.histogram(
+    'docanalyzer_llm_eval_duration_seconds', "Χρόνος παραγωγής απάντησης (eval_duration)", ['operation'])
+LLM_LOAD_SECONDS = registry.histogram(
+    'docanalyzer_llm_load_duration_seconds', "Χρόνος φόρτωσης model (load_duration)", ['operation'])
+LLM_TOKENS = registry.counter(
+    'docanalyzer_llm_tokens_total', "Tokens που επεξεργάστηκε το model", ['operation', 'kind'])
+LLM_REQUESTS = registry.counter(
+    'docanalyzer_llm_requests_total', "Κλήσεις στο Ollama ανά αποτέλεσμα", ['operation', 'result'])
+LLM_TOKENS_PER_SECOND = registry.histogram(
+    'docanalyzer_llm_tokens_per_second', "Ρυθμός παραγωγής tokens ανά έγγραφο", [],
+    buckets=(1, 2, 5, 10, 15, 20, 30, 40, 60, 80, 120, 200))
+
+@contextmanager
+def stage_timer(stage: str):
+    """
+    Μέτρηση σταδίου: διάρκεια στο histogram, in-flight gauge και σφάλματα
+    
+    Χρήση:
+        with stage_timer('extract'):
+            ...
+    """
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        STAGE_IN_FLIGHT.dec(stage=stage)
+
+def observe_llm_response(operation: str, response: Dict, elapsed: float):
+    """Καταγραφή των durations/counts που επιστρέφει το Ollama (σε nanoseconds)"""
+    LLM_REQUEST_SECONDS.observe(elapsed, operation=operation)
+    LLM_REQUESTS.inc(operation=operation, result='success')
+    
+    for field, histogram in (('prompt_eval_duration', LLM_PROMPT_EVAL_SECONDS),
+                             ('eval_duration', LLM_EVAL_SECONDS),
+                             ('load_duration', LLM_LOAD_SECONDS)):
+        if response.get(field):
+            histogram.observe(response[field] / 1e9, operation=operation)
+    
+    LLM_TOKENS.inc(response.get('prompt_eval_count') or 0, operation=operation, kind='prompt')
+    LLM_TOKENS.inc(response.get('eval_count') or 0, operation=operation, kind='eval')
+
+def render_metrics() -> str:
+    """Κείμενο για το /metrics endpoint"""
+    return registry.render()
+
+def start_metrics_server(host: str, port: int):
+    """
+    /metrics του process σε δικό του port, για processes χωρίς web server (worker ανάλυσης)
+    
+    Returns:
+        Ο ThreadingHTTPServer (τρέχει σε daemon thread· shutdown() για τερματισμό)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass  # Τα scrapes δεν γράφονται στα logs
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
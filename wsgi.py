@@ -0,0 +1,22 @@
+"""
+WSGI entry point για production deployment του AI Document Analyzer
+
+Ο web server δεν εκτελεί αναλύσεις: οι εργασίες μπαίνουν στην ουρά της
+database και τις εκτελούν ξεχωριστά processes, οπότε ο server κλιμακώνεται
+σε πολλούς workers:
+
+    APP_ENV=production gunicorn -w 4 -b 127.0.0.1:8050 wsgi:application
+    APP_ENV=production waitress-serve --listen=127.0.0.1:8050 --threads=8 wsgi:application
+    APP_ENV=production python main.py worker
+
+Η εφαρμογή δεν έχει authentication: ο server ακούει τοπικά και η πρόσβαση
+από το δίκτυο γίνεται μέσω reverse proxy με authentication (βλ. README).
+"""
+from main import initialize_app
+
+initialize_app()
+
+from app.dash_app import create_app
+
+app = create_app()
+application = app.server